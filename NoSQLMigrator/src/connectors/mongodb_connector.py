@@ -53,6 +53,16 @@ class MongoDBConnector:
             logger.error(f"Error clearing collection {collection_name}: {e}")
             raise
 
+    def create_index(self, collection_name, keys, **kwargs):
+        """Create an index if it does not exist yet"""
+        try:
+            name = self.db[collection_name].create_index(keys, **kwargs)
+            logger.info(f"Ensured index {name} on {collection_name}")
+            return name
+        except PyMongoError as e:
+            logger.error(f"Error creating index on {collection_name}: {e}")
+            raise
+
     def close(self):
         if self.client:
             self.client.close()
@@ -271,33 +271,79 @@ class MySQLToMongoDBMigration:
             raise
 
     def _update_game_ratings(self):
-        """Update average ratings in games based on reviews"""
-        logger.info("Updating game average ratings based on reviews...")
+        """Review count, star sum, star histogram and average rating per game"""
+        logger.info("Updating game review aggregates based on reviews...")
 
         try:
             pipeline = [
-                {"$group": {"_id": "$game_id", "avg_rating": {"$avg": "$star_amount"}}}
+                {
+                    "$group": {
+                        "_id": {"game": "$game_id", "stars": "$star_amount"},
+                        "count": {"$sum": 1},
+                    }
+                }
             ]
 
             collection = self.mongodb_conn.db["reviews"]
-            results = list(collection.aggregate(pipeline))
+            histograms = {}
+            for result in collection.aggregate(pipeline):
+                key = result["_id"]
+                stars = histograms.setdefault(key["game"], {})
+                stars[str(key["stars"])] = result["count"]
 
             games_collection = self.mongodb_conn.db["games"]
 
-            for result in results:
-                game_id = result["_id"]
-                avg_rating = result["avg_rating"]
+            for game_id, stars in histograms.items():
+                count = sum(stars.values())
+                total = sum(int(s) * n for s, n in stars.items())
 
+                # the API keeps these up to date on every review write
                 games_collection.update_one(
                     {"_id": game_id},
-                    {"$set": {"ratings.average_user_rating": avg_rating}},
+                    {
+                        "$set": {
+                            "review_count": count,
+                            "rating_sum": total,
+                            "star_histogram": stars,
+                            "user_rating": total / count,
+                            "ratings.average_user_rating": total / count,
+                        }
+                    },
                 )
 
-            logger.info(f"Updated average ratings for {len(results)} games")
+            logger.info(f"Updated review aggregates for {len(histograms)} games")
 
         except Exception as e:
             logger.error(f"Error updating ratings: {e}")
 
+    def create_indexes(self):
+        """Indexes backing keyset pagination and the text index for game search"""
+        for field in (
+            "bgg_rating",
+            "year_published",
+            "playing_time",
+            "name",
+            "user_rating",
+        ):
+            self.mongodb_conn.create_index("games", [(field, 1), ("_id", 1)])
+
+        # reviews of a game newest first; migrated reviews only have _id
+        self.mongodb_conn.create_index("reviews", [("game_id", 1), ("_id", -1)])
+
+        # The purger's lookups: a deleted user's reviews and the tombstone queue
+        # (reviews from the API carry user_id, migrated ones an embedded user.id)
+        self.mongodb_conn.create_index("reviews", [("user_id", 1)])
+        self.mongodb_conn.create_index("reviews", [("user.id", 1)])
+        self.mongodb_conn.create_index("tombstones", [("entity", 1), ("deleted_at", 1)])
+
+        # Ranked game search; a name hit counts for more than a description hit
+        self.mongodb_conn.create_index(
+            "games",
+            [("name", "text"), ("description", "text")],
+            weights={"name": 10, "description": 1},
+            name="game_search",
+        )
+
     def migrate_all(self):
         """Run all migrations"""
         logger.info("Starting complete migration from MySQL to MongoDB")
@@ -308,6 +354,7 @@ class MySQLToMongoDBMigration:
             self.migrate_games()
 
             self._update_game_ratings()
+            self.create_indexes()
 
             logger.info("All migrations completed successfully")
 
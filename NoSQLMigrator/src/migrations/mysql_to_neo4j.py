@@ -87,6 +87,29 @@ class MySQLToNeo4jMigration:
                     f"Could not create constraint {constraint}: {e}",
                 )
 
+        # Range indexes so keyset pagination on /api/games can seek by sort key
+        indexes = [
+            "CREATE INDEX game_bgg_rating IF NOT EXISTS FOR (g:Game) ON (g.bgg_rating)",
+            "CREATE INDEX game_year_published IF NOT EXISTS FOR (g:Game) ON (g.year_published)",
+            "CREATE INDEX game_playing_time IF NOT EXISTS FOR (g:Game) ON (g.playing_time)",
+            "CREATE INDEX game_name IF NOT EXISTS FOR (g:Game) ON (g.name)",
+            "CREATE INDEX game_user_rating IF NOT EXISTS FOR (g:Game) ON (g.user_rating)",
+            # Ranked game search on /api/games/search
+            "CREATE FULLTEXT INDEX game_search IF NOT EXISTS "
+            "FOR (g:Game) ON EACH [g.name, g.description]",
+            # The purger's queue of soft-deleted nodes and a deleted game's videos
+            "CREATE INDEX deleted_game_at IF NOT EXISTS FOR (g:DeletedGame) ON (g.deleted_at)",
+            "CREATE INDEX deleted_user_at IF NOT EXISTS FOR (u:DeletedUser) ON (u.deleted_at)",
+            "CREATE INDEX video_game_id IF NOT EXISTS FOR (v:Video) ON (v.game_id)",
+        ]
+
+        for index in indexes:
+            try:
+                self.neo4j_conn.execute_query(index)
+                logger.info(f"Created index: {index}")
+            except Exception as e:
+                logger.warning(f"Could not create index {index}: {e}")
+
     def migrate_users(self):
         """Migrate users to Neo4j"""
         logger.info("Starting users migration to Neo4j...")
@@ -265,6 +288,29 @@ class MySQLToNeo4jMigration:
             logger.error(f"Error in reviews migration: {e}")
             raise
 
+    def update_game_ratings(self):
+        """Review count, star sum, one count per star and average rating per game"""
+        logger.info("Updating game review aggregates...")
+
+        # the API keeps these up to date on every review write
+        stars = ",\n".join(
+            f"g.stars_{s} = size([x IN stars WHERE x = {s}])" for s in range(1, 11)
+        )
+        self.neo4j_conn.execute_query(
+            f"""
+            MATCH (g:Game)
+            OPTIONAL MATCH (r:Review)-[:FOR_GAME]->(g)
+            WITH g, collect(r.star_amount) AS stars
+            WITH g, stars, reduce(t = 0, x IN stars | t + x) AS total
+            SET g.review_count = size(stars),
+                g.rating_sum = total,
+                g.user_rating = CASE WHEN size(stars) > 0
+                    THEN toFloat(total) / size(stars) END,
+                {stars}
+            """,
+            {},
+        )
+
     def migrate_all(self):
         """Run complete Neo4j migration"""
         logger.info("Starting complete MySQL to Neo4j migration")
@@ -277,6 +323,7 @@ class MySQLToNeo4jMigration:
             self.migrate_users()
             self.migrate_games_and_related()
             self.migrate_reviews()
+            self.update_game_ratings()
 
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
@@ -1,23 +1,39 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from app.schema.artist_schema import ArtistCreate, ArtistRead, ArtistUpdate
 from app.service.artist_service import ArtistService
 from app.utility.auth import require_admin
+from app.utility.bulk import run_bulk
+from app.utility.etag import conditional
+from app.utility.totals import TotalMode
 
 router = APIRouter(prefix="/api/artists", tags=["artists"])
 
 
-@router.get("", response_model=dict[str, Any])
+@router.get(
+    "",
+    response_model=dict[str, Any],
+    dependencies=[Depends(conditional("artist"))],
+)
 def list_artists(
     q: str | None = Query(None, description="Search by name"),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: ArtistService = Depends(),
 ):
-    svc = ArtistService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
@@ -27,19 +43,33 @@ def list_artists(
 )
 def create_artist(
     payload: ArtistCreate,
+    svc: ArtistService = Depends(),
 ):
-    svc = ArtistService()
     try:
         return svc.create(payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{artist_id}", response_model=ArtistRead)
+@router.post(
+    "/bulk",
+    response_model=dict[str, Any],
+    dependencies=[Depends(require_admin)],
+)
+async def create_artists_bulk(request: Request, svc: ArtistService = Depends()):
+    """A JSON array or NDJSON stream of artists, validated and written in chunks."""
+    return await run_bulk(request, svc.create_many)
+
+
+@router.get(
+    "/{artist_id}",
+    response_model=ArtistRead,
+    dependencies=[Depends(conditional("artist"))],
+)
 def get_artist(
     artist_id: int,
+    svc: ArtistService = Depends(),
 ):
-    svc = ArtistService()
     item = svc.get(artist_id)
     if not item:
         raise HTTPException(status_code=404, detail="Artist not found")
@@ -52,9 +82,10 @@ def get_artist(
     dependencies=[Depends(require_admin)],
 )
 def update_artist(
-    artist_id: int, payload: ArtistUpdate
+    artist_id: int,
+    payload: ArtistUpdate,
+    svc: ArtistService = Depends(),
 ):
-    svc = ArtistService()
     try:
         item = svc.update(artist_id, payload)
         if not item:
@@ -71,7 +102,7 @@ def update_artist(
 )
 def delete_artist(
     artist_id: int,
+    svc: ArtistService = Depends(),
 ):
-    svc = ArtistService()
     if not svc.delete(artist_id):
         raise HTTPException(status_code=404, detail="Artist not found")
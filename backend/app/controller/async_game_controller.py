@@ -0,0 +1,5 @@
+from app.controller.game_controller import build_router
+from app.service.game_service import AsyncGameService
+
+# the games routes, served from the async drivers when DB_ASYNC is on
+router = build_router(AsyncGameService)
@@ -0,0 +1,5 @@
+from app.controller.review_controller import build_router
+from app.service.review_service import AsyncReviewService
+
+# the reviews routes, served from the async drivers when DB_ASYNC is on
+router = build_router(AsyncReviewService)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -6,19 +6,22 @@ from app.schema.auth_schema import LoginRequest, LoginResponse
 from app.service.user_service import UserService
 from app.utility.auth import create_access_token
 from app.utility.db_sql import get_sql_db
+from app.utility.login_admission import login_admission
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest):
-    svc = UserService()
-    user = svc.authenticate(payload.username, payload.password)
+async def login(payload: LoginRequest, request: Request, svc: UserService = Depends()):
+    login_admission.admit(payload.username, request.client and request.client.host)
+    user = await svc.authenticate(payload.username, payload.password)
 
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_access_token(user_id=user.id, username=user.username)
+    token = create_access_token(
+        user_id=user.id, username=user.username, is_admin=user.is_admin
+    )
 
     return LoginResponse(
         access_token=token,
@@ -29,11 +32,13 @@ def login(payload: LoginRequest):
 
 
 @router.post("/token")
-def login_for_access_token(
+async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
+    svc: UserService = Depends(),
 ):
-    svc = UserService()
-    user = svc.authenticate(form_data.username, form_data.password)
+    login_admission.admit(form_data.username, request.client and request.client.host)
+    user = await svc.authenticate(form_data.username, form_data.password)
 
     if not user:
         raise HTTPException(
@@ -41,7 +46,9 @@ def login_for_access_token(
             detail="Incorrect username or password",
         )
 
-    access_token = create_access_token(user_id=user.id, username=user.username)
+    access_token = create_access_token(
+        user_id=user.id, username=user.username, is_admin=user.is_admin
+    )
 
     return {
         "access_token": access_token,
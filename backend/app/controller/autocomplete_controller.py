@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.schema.autocomplete_schema import AutocompleteRead
+from app.service.autocomplete_service import AutocompleteService
+
+router = APIRouter(prefix="/api/autocomplete", tags=["autocomplete"])
+
+
+@router.get("", response_model=AutocompleteRead)
+async def autocomplete(
+    q: str = Query(..., min_length=1, description="What has been typed so far"),
+    limit: int = Query(5, ge=1, le=20),
+    svc: AutocompleteService = Depends(),
+):
+    """Top matches per kind from the in-memory index; never touches the database."""
+    return svc.suggest(q, limit)
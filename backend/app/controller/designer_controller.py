@@ -1,6 +1,6 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from app.schema.designer_schema import (
     DesignerCreate,
@@ -9,19 +9,35 @@ from app.schema.designer_schema import (
 )
 from app.service.designer_service import DesignerService
 from app.utility.auth import require_admin
+from app.utility.bulk import run_bulk
+from app.utility.etag import conditional
+from app.utility.totals import TotalMode
 
 router = APIRouter(prefix="/api/designers", tags=["designers"])
 
 
-@router.get("", response_model=dict[str, Any])
+@router.get(
+    "",
+    response_model=dict[str, Any],
+    dependencies=[Depends(conditional("designer"))],
+)
 def list_designers(
     q: str | None = Query(None, description="Search by name"),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: DesignerService = Depends(),
 ):
-    svc = DesignerService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
@@ -31,17 +47,30 @@ def list_designers(
 )
 def create_designer(
     payload: DesignerCreate,
+    svc: DesignerService = Depends(),
 ):
-    svc = DesignerService()
     try:
         return svc.create(payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{designer_id}", response_model=DesignerRead)
-def get_designer(designer_id: int):
-    svc = DesignerService()
+@router.post(
+    "/bulk",
+    response_model=dict[str, Any],
+    dependencies=[Depends(require_admin)],
+)
+async def create_designers_bulk(request: Request, svc: DesignerService = Depends()):
+    """A JSON array or NDJSON stream of designers, validated and written in chunks."""
+    return await run_bulk(request, svc.create_many)
+
+
+@router.get(
+    "/{designer_id}",
+    response_model=DesignerRead,
+    dependencies=[Depends(conditional("designer"))],
+)
+def get_designer(designer_id: int, svc: DesignerService = Depends()):
     item = svc.get(designer_id)
     if not item:
         raise HTTPException(status_code=404, detail="Designer not found")
@@ -56,8 +85,8 @@ def get_designer(designer_id: int):
 def update_designer(
     designer_id: int,
     payload: DesignerUpdate,
+    svc: DesignerService = Depends(),
 ):
-    svc = DesignerService()
     try:
         item = svc.update(designer_id, payload)
         if not item:
@@ -74,7 +103,7 @@ def update_designer(
 )
 def delete_designer(
     designer_id: int,
+    svc: DesignerService = Depends(),
 ):
-    svc = DesignerService()
     if not svc.delete(designer_id):
         raise HTTPException(status_code=404, detail="Designer not found")
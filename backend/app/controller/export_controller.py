@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.service.game_service import GAME_READ_FIELDS, GameService
+from app.service.review_service import REVIEW_EXPORT_FIELDS, ReviewService
+from app.service.user_service import USER_EXPORT_FIELDS, UserService
+from app.utility.auth import require_admin
+from app.utility.export import ExportFormat, export_response
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+FORMAT = Query(ExportFormat.ndjson, description="ndjson or csv")
+AFTER = Query(None, ge=0, description="Resume after this id")
+
+
+@router.get("/games")
+def export_games(
+    request: Request,
+    format: ExportFormat = FORMAT,
+    after: int | None = AFTER,
+    svc: GameService = Depends(),
+):
+    return export_response(
+        request, svc.export(after), GAME_READ_FIELDS, format, "games"
+    )
+
+
+@router.get("/reviews", dependencies=[Depends(require_admin)])
+def export_reviews(
+    request: Request,
+    format: ExportFormat = FORMAT,
+    after: int | None = AFTER,
+    svc: ReviewService = Depends(),
+):
+    return export_response(
+        request, svc.export(after), REVIEW_EXPORT_FIELDS, format, "reviews"
+    )
+
+
+@router.get("/users", dependencies=[Depends(require_admin)])
+def export_users(
+    request: Request,
+    format: ExportFormat = FORMAT,
+    after: int | None = AFTER,
+    svc: UserService = Depends(),
+):
+    return export_response(
+        request, svc.export(after), USER_EXPORT_FIELDS, format, "users"
+    )
@@ -1,82 +1,243 @@
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 # from sqlalchemy.orm import Session
-from app.schema.game_schema import GameCreate, GameDetail, GameRead, GameUpdate
+from app.schema.game_schema import (
+    SIMILAR_TOP_K,
+    GameCreate,
+    GameDetail,
+    GameFilter,
+    GameRead,
+    GameUpdate,
+    SimilarGame,
+)
 from app.service.game_service import GameService
 from app.utility.auth import require_admin
+from app.utility.bulk import run_bulk
+from app.utility.dispatch import call
+from app.utility.etag import conditional
+from app.utility.responses import fast_json
+from app.utility.totals import TotalMode
 
-router = APIRouter(prefix="/api/games", tags=["games"])
+FIELDS_DESCRIPTION = "Comma separated fields to return, e.g. id,name,thumbnail"
+# a game detail embeds these, so a write to any of them changes its ETag
+DETAIL_ENTITIES = ("game", "artist", "designer", "publisher", "mechanic")
+# deleting any of the linked entities changes who is similar to whom
+SIMILAR_ENTITIES = ("game", "artist", "designer", "genre", "mechanic")
+# deleting any of the filterable entities changes the matches and counts
+FACET_ENTITIES = ("game", "designer", "genre", "mechanic", "publisher")
 
 
-@router.get("", response_model=dict[str, Any])
-def list_games(
-    q: str | None = None,
-    sort_by: str | None = None,
-    sort_order: str = "asc",
-    offset: int = 0,
-    limit: int = 50,
-):
-    svc = GameService()
-    items, total = svc.list(offset=offset, limit=limit, search=q, sort_by=sort_by, sort_order=sort_order,)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+def build_router(service: type) -> APIRouter:
+    """The games routes over ``service``, GameService or AsyncGameService."""
+    router = APIRouter(prefix="/api/games", tags=["games"])
 
+    @router.get(
+        "",
+        response_model=dict[str, Any],
+        dependencies=[Depends(conditional("game"))],
+    )
+    async def list_games(
+        response: Response,
+        q: str | None = None,
+        sort_by: str | None = None,
+        sort_order: str = "asc",
+        offset: int = 0,
+        limit: int = 50,
+        cursor: str | None = None,
+        count: TotalMode = TotalMode.exact,
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        svc=Depends(service),
+    ):
+        try:
+            items, total, next_cursor = await call(
+                svc.list,
+                offset=offset,
+                limit=limit,
+                search=q,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                cursor=cursor,
+                count=count,
+                fields=fields,
+            )
+        except ValueError as e:
+            raise HTTPException(400, str(e))
 
-@router.get(
-    "/{game_id}/detail",
-    response_model=GameDetail,
-)
-def get_game_detail(game_id: str):
-    svc = GameService()
-    item = svc.get_detail(game_id)
-    if not item:
-        raise HTTPException(404, "Game not found")
-    return item
-
-
-@router.get("/{game_id}", response_model=GameRead)
-def get_game(game_id: str):
-    svc = GameService()
-    item = svc.get(game_id)
-    if not item:
-        raise HTTPException(404, "Game not found")
-    return item
-
-
-@router.post(
-    "",
-    response_model=GameRead,
-    status_code=201,
-    dependencies=[
-        Depends(require_admin),
-    ],
-)
-def create_game(payload: GameCreate):
-    svc = GameService()
-    return svc.create(payload)
+        # items are read models already; skip validating them against response_model
+        return fast_json(
+            {
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "items": items,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            },
+            response,
+        )
 
+    @router.get(
+        "/search",
+        response_model=dict[str, Any],
+        dependencies=[Depends(conditional("game"))],
+    )
+    async def search_games(
+        response: Response,
+        q: str = Query(
+            ..., min_length=1, description="Words to look for in name and description"
+        ),
+        offset: int = Query(0, ge=0),
+        limit: int = Query(20, ge=1, le=100),
+        count: TotalMode = TotalMode.exact,
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        svc=Depends(service),
+    ):
+        """Games ranked by full-text relevance, best match first."""
+        try:
+            items, total, has_more = await call(
+                svc.search, q, offset, limit, count, fields
+            )
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        return fast_json(
+            {
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "items": items,
+                "has_more": has_more,
+            },
+            response,
+        )
 
-@router.patch(
-    "/{game_id}",
-    response_model=GameRead,
-    dependencies=[Depends(require_admin)],
-)
-def update_game(game_id: str, payload: GameUpdate):
-    svc = GameService()
-    item = svc.update(game_id, payload)
-    if not item:
-        raise HTTPException(404, "Game not found")
-    return item
-
-
-@router.delete(
-    "/{game_id}",
-    status_code=204,
-    dependencies=[Depends(require_admin)],
-)
-def delete_game(game_id: str):
-    svc = GameService()
-    ok = svc.delete(game_id)
-    if not ok:
-        raise HTTPException(404, "Game not found")
+    @router.get(
+        "/filter",
+        response_model=dict[str, Any],
+        dependencies=[Depends(conditional(*FACET_ENTITIES))],
+    )
+    async def filter_games(
+        response: Response,
+        query: Annotated[GameFilter, Query()],
+        svc=Depends(service),
+    ):
+        """Games matching every given facet, in id order, with facet counts."""
+        try:
+            items, total, counts = await call(svc.filter, query)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        return fast_json(
+            {
+                "total": total,
+                "offset": query.offset,
+                "limit": query.limit,
+                "items": items,
+                "has_more": query.offset + len(items) < total,
+                "facets": counts,
+            },
+            response,
+        )
+
+    @router.get(
+        "/{game_id}/detail",
+        response_model=GameDetail,
+        dependencies=[Depends(conditional(*DETAIL_ENTITIES))],
+    )
+    async def get_game_detail(
+        game_id: str,
+        response: Response,
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        svc=Depends(service),
+    ):
+        try:
+            item = await call(svc.get_detail, game_id, fields)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        if not item:
+            raise HTTPException(404, "Game not found")
+        # also carries partial games, which would not fit the response model
+        return fast_json(item, response)
+
+    @router.get(
+        "/{game_id}/similar",
+        response_model=list[SimilarGame],
+        dependencies=[Depends(conditional(*SIMILAR_ENTITIES))],
+    )
+    async def list_similar_games(
+        game_id: str,
+        limit: int = Query(10, ge=1, le=SIMILAR_TOP_K),
+        svc=Depends(service),
+    ):
+        """Games sharing the most mechanics, genres, designers and artists, best first."""
+        try:
+            items = await call(svc.similar, game_id, limit)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        if items is None:
+            raise HTTPException(404, "Game not found")
+        return items
+
+    @router.get(
+        "/{game_id}",
+        response_model=GameRead,
+        dependencies=[Depends(conditional("game"))],
+    )
+    async def get_game(
+        game_id: str,
+        response: Response,
+        fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+        svc=Depends(service),
+    ):
+        try:
+            item = await call(svc.get, game_id, fields)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        if not item:
+            raise HTTPException(404, "Game not found")
+        # also carries partial games, which would not fit the response model
+        return fast_json(item, response)
+
+    @router.post(
+        "",
+        response_model=GameRead,
+        status_code=201,
+        dependencies=[Depends(require_admin)],
+    )
+    async def create_game(payload: GameCreate, svc=Depends(service)):
+        return await call(svc.create, payload)
+
+    @router.post(
+        "/bulk",
+        response_model=dict[str, Any],
+        dependencies=[Depends(require_admin)],
+    )
+    async def create_games_bulk(request: Request, svc=Depends(service)):
+        """A JSON array or NDJSON stream of games, validated and written in chunks."""
+        return await run_bulk(request, svc.create_many)
+
+    @router.patch(
+        "/{game_id}",
+        response_model=GameRead,
+        dependencies=[Depends(require_admin)],
+    )
+    async def update_game(game_id: str, payload: GameUpdate, svc=Depends(service)):
+        item = await call(svc.update, game_id, payload)
+        if not item:
+            raise HTTPException(404, "Game not found")
+        return item
+
+    @router.delete(
+        "/{game_id}",
+        status_code=204,
+        dependencies=[Depends(require_admin)],
+    )
+    async def delete_game(game_id: str, svc=Depends(service)):
+        ok = await call(svc.delete, game_id)
+        if not ok:
+            raise HTTPException(404, "Game not found")
+
+    return router
+
+
+router = build_router(GameService)
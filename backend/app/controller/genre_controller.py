@@ -1,25 +1,41 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from app.schema.genre_schema import GenreCreate, GenreRead, GenreUpdate
 from app.service.genre_service import GenreService
 from app.utility.auth import require_admin
+from app.utility.bulk import run_bulk
 from app.utility.db_sql import get_sql_db
+from app.utility.etag import conditional
+from app.utility.totals import TotalMode
 
 router = APIRouter(prefix="/api/genres", tags=["genres"])
 
 
-@router.get("", response_model=dict[str, Any])
+@router.get(
+    "",
+    response_model=dict[str, Any],
+    dependencies=[Depends(conditional("genre"))],
+)
 def list_genres(
     q: str | None = Query(None, description="Search by title"),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: GenreService = Depends(),
 ):
-    svc = GenreService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
@@ -27,17 +43,29 @@ def list_genres(
     response_model=GenreRead,
     dependencies=[Depends(require_admin)],
 )
-def create_genre(payload: GenreCreate):
-    svc = GenreService()
+def create_genre(payload: GenreCreate, svc: GenreService = Depends()):
     try:
         return svc.create(payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{genre_id}", response_model=GenreRead)
-def get_genre(genre_id: int):
-    svc = GenreService()
+@router.post(
+    "/bulk",
+    response_model=dict[str, Any],
+    dependencies=[Depends(require_admin)],
+)
+async def create_genres_bulk(request: Request, svc: GenreService = Depends()):
+    """A JSON array or NDJSON stream of genres, validated and written in chunks."""
+    return await run_bulk(request, svc.create_many)
+
+
+@router.get(
+    "/{genre_id}",
+    response_model=GenreRead,
+    dependencies=[Depends(conditional("genre"))],
+)
+def get_genre(genre_id: int, svc: GenreService = Depends()):
     item = svc.get(genre_id)
     if not item:
         raise HTTPException(status_code=404, detail="Genre not found")
@@ -50,9 +78,10 @@ def get_genre(genre_id: int):
     dependencies=[Depends(require_admin)],
 )
 def update_genre(
-    genre_id: int, payload: GenreUpdate
+    genre_id: int,
+    payload: GenreUpdate,
+    svc: GenreService = Depends(),
 ):
-    svc = GenreService()
     try:
         item = svc.update(genre_id, payload)
         if not item:
@@ -67,7 +96,6 @@ def update_genre(
     status_code=204,
     dependencies=[Depends(require_admin)],
 )
-def delete_genre(genre_id: int):
-    svc = GenreService()
+def delete_genre(genre_id: int, svc: GenreService = Depends()):
     if not svc.delete(genre_id):
         raise HTTPException(status_code=404, detail="Genre not found")
@@ -5,19 +5,34 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from app.schema.language_schema import LanguageCreate, LanguageRead, LanguageUpdate
 from app.service.language_service import LanguageService
 from app.utility.auth import require_admin
+from app.utility.etag import conditional
+from app.utility.totals import TotalMode
 
 router = APIRouter(prefix="/api/languages", tags=["languages"])
 
 
-@router.get("", response_model=dict[str, Any])
+@router.get(
+    "",
+    response_model=dict[str, Any],
+    dependencies=[Depends(conditional("language"))],
+)
 def list_languages(
     q: str | None = Query(None, description="Search by language name"),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: LanguageService = Depends(),
 ):
-    svc = LanguageService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
@@ -26,17 +41,19 @@ def list_languages(
     status_code=201,
     dependencies=[Depends(require_admin)],
 )
-def create_language(payload: LanguageCreate):
-    svc = LanguageService()
+def create_language(payload: LanguageCreate, svc: LanguageService = Depends()):
     try:
         return svc.create(payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{language_id}", response_model=LanguageRead)
-def get_language(language_id: int):
-    svc = LanguageService()
+@router.get(
+    "/{language_id}",
+    response_model=LanguageRead,
+    dependencies=[Depends(conditional("language"))],
+)
+def get_language(language_id: int, svc: LanguageService = Depends()):
     item = svc.get(language_id)
     if not item:
         raise HTTPException(status_code=404, detail="Language not found")
@@ -48,8 +65,9 @@ def get_language(language_id: int):
     response_model=LanguageRead,
     dependencies=[Depends(require_admin)],
 )
-def update_language(language_id: int, payload: LanguageUpdate):
-    svc = LanguageService()
+def update_language(
+    language_id: int, payload: LanguageUpdate, svc: LanguageService = Depends()
+):
     try:
         item = svc.update(language_id, payload)
         if not item:
@@ -64,8 +82,7 @@ def update_language(language_id: int, payload: LanguageUpdate):
     status_code=204,
     dependencies=[Depends(require_admin)],
 )
-def delete_language(language_id: int):
-    svc = LanguageService()
+def delete_language(language_id: int, svc: LanguageService = Depends()):
     try:
         if not svc.delete(language_id):
             raise HTTPException(status_code=404, detail="Language not found")
@@ -1,23 +1,39 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from app.schema.mechanic_schema import MechanicCreate, MechanicRead, MechanicUpdate
 from app.service.mechanic_service import MechanicService
 from app.utility.auth import require_admin
+from app.utility.bulk import run_bulk
+from app.utility.etag import conditional
+from app.utility.totals import TotalMode
 
 router = APIRouter(prefix="/api/mechanics", tags=["mechanics"])
 
 
-@router.get("", response_model=dict[str, Any])
+@router.get(
+    "",
+    response_model=dict[str, Any],
+    dependencies=[Depends(conditional("mechanic"))],
+)
 def list_mechanics(
     q: str | None = Query(None, description="Search by mechanic name"),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: MechanicService = Depends(),
 ):
-    svc = MechanicService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
@@ -26,17 +42,29 @@ def list_mechanics(
     status_code=201,
     dependencies=[Depends(require_admin)],
 )
-def create_mechanic(payload: MechanicCreate):
-    svc = MechanicService()
+def create_mechanic(payload: MechanicCreate, svc: MechanicService = Depends()):
     try:
         return svc.create(payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{mechanic_id}", response_model=MechanicRead)
-def get_mechanic(mechanic_id: int):
-    svc = MechanicService()
+@router.post(
+    "/bulk",
+    response_model=dict[str, Any],
+    dependencies=[Depends(require_admin)],
+)
+async def create_mechanics_bulk(request: Request, svc: MechanicService = Depends()):
+    """A JSON array or NDJSON stream of mechanics, validated and written in chunks."""
+    return await run_bulk(request, svc.create_many)
+
+
+@router.get(
+    "/{mechanic_id}",
+    response_model=MechanicRead,
+    dependencies=[Depends(conditional("mechanic"))],
+)
+def get_mechanic(mechanic_id: int, svc: MechanicService = Depends()):
     item = svc.get(mechanic_id)
     if not item:
         raise HTTPException(status_code=404, detail="Mechanic not found")
@@ -48,8 +76,9 @@ def get_mechanic(mechanic_id: int):
     response_model=MechanicRead,
     dependencies=[Depends(require_admin)],
 )
-def update_mechanic(mechanic_id: int, payload: MechanicUpdate):
-    svc = MechanicService()
+def update_mechanic(
+    mechanic_id: int, payload: MechanicUpdate, svc: MechanicService = Depends()
+):
     try:
         item = svc.update(mechanic_id, payload)
         if not item:
@@ -64,7 +93,6 @@ def update_mechanic(mechanic_id: int, payload: MechanicUpdate):
     status_code=204,
     dependencies=[Depends(require_admin)],
 )
-def delete_mechanic(mechanic_id: int):
-    svc = MechanicService()
+def delete_mechanic(mechanic_id: int, svc: MechanicService = Depends()):
     if not svc.delete(mechanic_id):
         raise HTTPException(status_code=404, detail="Mechanic not found")
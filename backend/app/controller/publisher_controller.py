@@ -1,23 +1,39 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from app.schema.publisher_schema import PublisherCreate, PublisherRead, PublisherUpdate
 from app.service.publisher_service import PublisherService
 from app.utility.auth import require_admin
+from app.utility.bulk import run_bulk
+from app.utility.etag import conditional
+from app.utility.totals import TotalMode
 
 router = APIRouter(prefix="/api/publishers", tags=["publishers"])
 
 
-@router.get("", response_model=dict[str, Any])
+@router.get(
+    "",
+    response_model=dict[str, Any],
+    dependencies=[Depends(conditional("publisher"))],
+)
 def list_publishers(
     q: str | None = Query(None, description="Search by publisher name"),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: PublisherService = Depends(),
 ):
-    svc = PublisherService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
@@ -26,17 +42,29 @@ def list_publishers(
     status_code=201,
     dependencies=[Depends(require_admin)],
 )
-def create_publisher(payload: PublisherCreate):
-    svc = PublisherService()
+def create_publisher(payload: PublisherCreate, svc: PublisherService = Depends()):
     try:
         return svc.create(payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{publisher_id}", response_model=PublisherRead)
-def get_publisher(publisher_id: int):
-    svc = PublisherService()
+@router.post(
+    "/bulk",
+    response_model=dict[str, Any],
+    dependencies=[Depends(require_admin)],
+)
+async def create_publishers_bulk(request: Request, svc: PublisherService = Depends()):
+    """A JSON array or NDJSON stream of publishers, validated and written in chunks."""
+    return await run_bulk(request, svc.create_many)
+
+
+@router.get(
+    "/{publisher_id}",
+    response_model=PublisherRead,
+    dependencies=[Depends(conditional("publisher"))],
+)
+def get_publisher(publisher_id: int, svc: PublisherService = Depends()):
     item = svc.get(publisher_id)
     if not item:
         raise HTTPException(status_code=404, detail="Publisher not found")
@@ -48,8 +76,9 @@ def get_publisher(publisher_id: int):
     response_model=PublisherRead,
     dependencies=[Depends(require_admin)],
 )
-def update_publisher(publisher_id: int, payload: PublisherUpdate):
-    svc = PublisherService()
+def update_publisher(
+    publisher_id: int, payload: PublisherUpdate, svc: PublisherService = Depends()
+):
     try:
         item = svc.update(publisher_id, payload)
         if not item:
@@ -64,7 +93,6 @@ def update_publisher(publisher_id: int, payload: PublisherUpdate):
     status_code=204,
     dependencies=[Depends(require_admin)],
 )
-def delete_publisher(publisher_id: int):
-    svc = PublisherService()
+def delete_publisher(publisher_id: int, svc: PublisherService = Depends()):
     if not svc.delete(publisher_id):
         raise HTTPException(status_code=404, detail="Publisher not found")
@@ -1,91 +1,136 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from app.schema.review_schema import ReviewCreate, ReviewRead, ReviewUpdate
 from app.service.review_service import ReviewService
 from app.utility.auth import require_admin
+from app.utility.bulk import run_bulk
+from app.utility.dispatch import call
+from app.utility.totals import TotalMode
+
+
+def build_router(service: type) -> APIRouter:
+    """The reviews routes over ``service``, ReviewService or AsyncReviewService."""
+    router = APIRouter(prefix="/api/reviews", tags=["reviews"])
+
+    @router.get("", response_model=dict[str, Any])
+    async def list_reviews(
+        q: str | None = Query(None, description="Search by title"),
+        offset: int = Query(0, ge=0),
+        limit: int = Query(50, ge=1, le=200),
+        count: TotalMode = Query(
+            TotalMode.exact, description="exact, cached, estimate or none"
+        ),
+        svc=Depends(service),
+    ):
+        items, total, has_more = await call(
+            svc.list, offset=offset, limit=limit, search=q, count=count
+        )
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "items": items,
+            "has_more": has_more,
+        }
+
+    @router.get("/count", response_model=dict[str, int])
+    async def get_review_count_for_game(
+        game_id: int = Query(..., description="ID of the game"),
+        svc=Depends(service),
+    ):
+        count = await call(svc.get_review_count_for_game, game_id)
+        return {"game_id": game_id, "review_count": count}
+
+    @router.get("/gameid/{game_id}", response_model=dict[str, Any])
+    async def list_reviews_by_game(
+        game_id: int,
+        offset: int = Query(0, ge=0),
+        limit: int = Query(5, ge=1),
+        cursor: str | None = Query(
+            None, description="next_cursor of the previous page"
+        ),
+        count: TotalMode = Query(
+            TotalMode.exact, description="exact, cached, estimate or none"
+        ),
+        svc=Depends(service),
+    ):
+        try:
+            items, total, next_cursor = await call(
+                svc.list_by_game,
+                game_id=game_id,
+                offset=offset,
+                limit=limit,
+                cursor=cursor,
+                count=count,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "items": items,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }
+
+    @router.post(
+        "",
+        response_model=ReviewRead,
+        status_code=201,
+        dependencies=[Depends(require_admin)],
+    )
+    async def create_review(payload: ReviewCreate, svc=Depends(service)):
+        try:
+            return await call(svc.create, payload)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.post(
+        "/bulk",
+        response_model=dict[str, Any],
+        dependencies=[Depends(require_admin)],
+    )
+    async def create_reviews_bulk(request: Request, svc=Depends(service)):
+        """A JSON array or NDJSON stream of reviews, validated and written in chunks."""
+        return await run_bulk(request, svc.create_many)
+
+    @router.get("/{review_id}", response_model=ReviewRead)
+    async def get_review(review_id: int, svc=Depends(service)):
+        item = await call(svc.get, review_id)
+        if not item:
+            raise HTTPException(status_code=404, detail="Review not found")
+        return item
 
-router = APIRouter(prefix="/api/reviews", tags=["reviews"])
-
-
-@router.get("", response_model=dict[str, Any])
-def list_reviews(
-    q: str | None = Query(None, description="Search by title"),
-    offset: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=200),
-):
-    svc = ReviewService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
-
-
-@router.get("/count", response_model=dict[str, int])
-def get_review_count_for_game(
-    game_id: int = Query(..., description="ID of the game"),
-):
-    svc = ReviewService()
-    count = svc.get_review_count_for_game(game_id)
-    return {"game_id": game_id, "review_count": count}
-
-
-@router.get("/gameid/{game_id}", response_model=dict[str, Any])
-def list_reviews_by_game(
-    game_id: int,
-    offset: int = Query(0, ge=0),
-    limit: int = Query(5, ge=1),
-):
-    svc = ReviewService()
-    items, total = svc.list_by_game(game_id=game_id, offset=offset, limit=limit)
-
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
-
-
-@router.post(
-    "",
-    response_model=ReviewRead,
-    status_code=201,
-    dependencies=[Depends(require_admin)],
-)
-def create_review(payload: ReviewCreate):
-    svc = ReviewService()
-    try:
-        return svc.create(payload)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-
-@router.get("/{review_id}", response_model=ReviewRead)
-def get_review(review_id: int):
-    svc = ReviewService()
-    item = svc.get(review_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Review not found")
-    return item
-
-
-@router.patch(
-    "/{review_id}",
-    response_model=ReviewRead,
-    dependencies=[Depends(require_admin)],
-)
-def update_review(review_id: int, payload: ReviewUpdate):
-    svc = ReviewService()
-    try:
-        item = svc.update(review_id, payload)
+    @router.patch(
+        "/{review_id}",
+        response_model=ReviewRead,
+        dependencies=[Depends(require_admin)],
+    )
+    async def update_review(
+        review_id: int, payload: ReviewUpdate, svc=Depends(service)
+    ):
+        try:
+            item = await call(svc.update, review_id, payload)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         if not item:
             raise HTTPException(status_code=404, detail="Review not found")
         return item
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-
-@router.delete(
-    "/{review_id}",
-    status_code=204,
-    dependencies=[Depends(require_admin)],
-)
-def delete_review(review_id: int):
-    svc = ReviewService()
-    if not svc.delete(review_id):
-        raise HTTPException(status_code=404, detail="Review not found")
+
+    @router.delete(
+        "/{review_id}",
+        status_code=204,
+        dependencies=[Depends(require_admin)],
+    )
+    async def delete_review(review_id: int, svc=Depends(service)):
+        if not await call(svc.delete, review_id):
+            raise HTTPException(status_code=404, detail="Review not found")
+
+    return router
+
+
+router = build_router(ReviewService)
@@ -1,20 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.model.user_model import User
+from app.schema.game_schema import RecommendedGame
 from app.schema.user_schema import UserCreate, UserRead, UserUpdate
+from app.service.recommendation_service import RecommendationService
 from app.service.user_service import UserService
 from app.utility.auth import get_current_user, require_admin, require_self_or_admin
 from app.utility.db_sql import get_sql_db
+from app.utility.totals import TotalMode
 
 router = APIRouter(tags=["users"])
 
 
 @router.get("/me", response_model=UserRead)
-def read_current_user(current_user: User = Depends(get_current_user)):
+def read_current_user(current_user: UserRead = Depends(get_current_user)):
     return current_user
 
 
+@router.get("/me/recommendations", response_model=list[RecommendedGame])
+def read_my_recommendations(
+    limit: int = Query(10, ge=1, le=100),
+    current_user: UserRead = Depends(get_current_user),
+    svc: RecommendationService = Depends(),
+):
+    return svc.for_user(current_user.id, limit)
+
+
 @router.get("/api/users")
 def list_users(
     q: str | None = Query(
@@ -23,19 +34,26 @@ def list_users(
     ),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: UserService = Depends(),
 ):
-    svc = UserService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
     "/api/users",
     response_model=UserRead,
 )
-def create_user(payload: UserCreate):
-    svc = UserService()
-
+def create_user(payload: UserCreate, svc: UserService = Depends()):
     if svc.get_by_username(payload.username):
         raise HTTPException(
             status_code=400,
@@ -52,8 +70,7 @@ def create_user(payload: UserCreate):
     "/api/user/{user_id}",
     response_model=UserRead,
 )
-def get_user(user_id: int):
-    svc = UserService()
+def get_user(user_id: int, svc: UserService = Depends()):
     item = svc.get(user_id)
     if not item:
         raise HTTPException(status_code=404, detail="User not found")
@@ -64,10 +81,9 @@ def get_user(user_id: int):
 def update_user(
     user_id: int,
     payload: UserUpdate,
-    _: User = Depends(require_self_or_admin),
+    _: UserRead = Depends(require_self_or_admin),
+    svc: UserService = Depends(),
 ):
-    svc = UserService()
-
     if payload.username is not None:
         existing_user = svc.get_by_username(payload.username)
         if existing_user and existing_user.id != user_id:
@@ -97,7 +113,6 @@ def update_user(
         Depends(require_admin),
     ],
 )
-def delete_user(user_id: int):
-    svc = UserService()
+def delete_user(user_id: int, svc: UserService = Depends()):
     if not svc.delete(user_id):
         raise HTTPException(status_code=404, detail="User not found")
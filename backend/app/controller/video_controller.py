@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from app.schema.video_schema import VideoCreate, VideoRead, VideoUpdate
 from app.service.video_service import VideoService
 from app.utility.auth import require_admin
+from app.utility.totals import TotalMode
 
 router = APIRouter(prefix="/api/videos", tags=["videos"])
 
@@ -14,10 +15,19 @@ def list_videos(
     q: str | None = Query(None, description="Search by title"),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    count: TotalMode = Query(
+        TotalMode.exact, description="exact, cached, estimate or none"
+    ),
+    svc: VideoService = Depends(),
 ):
-    svc = VideoService()
-    items, total = svc.list(offset=offset, limit=limit, search=q)
-    return {"total": total, "offset": offset, "limit": limit, "items": items}
+    items, total, has_more = svc.list(offset=offset, limit=limit, search=q, count=count)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "has_more": has_more,
+    }
 
 
 @router.post(
@@ -26,8 +36,7 @@ def list_videos(
     status_code=201,
     dependencies=[Depends(require_admin)],
 )
-def create_video(payload: VideoCreate):
-    svc = VideoService()
+def create_video(payload: VideoCreate, svc: VideoService = Depends()):
     try:
         return svc.create(payload)
     except ValueError as e:
@@ -35,8 +44,7 @@ def create_video(payload: VideoCreate):
 
 
 @router.get("/{video_id}", response_model=VideoRead)
-def get_video(video_id: int):
-    svc = VideoService()
+def get_video(video_id: int, svc: VideoService = Depends()):
     item = svc.get(video_id)
     if not item:
         raise HTTPException(status_code=404, detail="Video not found")
@@ -48,8 +56,7 @@ def get_video(video_id: int):
     response_model=VideoRead,
     dependencies=[Depends(require_admin)],
 )
-def update_video(video_id: int, payload: VideoUpdate):
-    svc = VideoService()
+def update_video(video_id: int, payload: VideoUpdate, svc: VideoService = Depends()):
     try:
         item = svc.update(video_id, payload)
         if not item:
@@ -64,7 +71,6 @@ def update_video(video_id: int, payload: VideoUpdate):
     status_code=204,
     dependencies=[Depends(require_admin)],
 )
-def delete_video(video_id: int):
-    svc = VideoService()
+def delete_video(video_id: int, svc: VideoService = Depends()):
     if not svc.delete(video_id):
         raise HTTPException(status_code=404, detail="Video not found")
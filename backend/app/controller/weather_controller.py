@@ -1,37 +1,25 @@
 from typing import Any
 
-import requests
 from fastapi import APIRouter, HTTPException, Query
 
-router = APIRouter(prefix="/api/weather", tags=["weather"])
+from app.utility.weather_client import WeatherUnavailable, weather_client
 
-OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+router = APIRouter(prefix="/api/weather", tags=["weather"])
 
 
 @router.get(
     "/geo",
     response_model=dict[str, Any],
 )
-def get_weather_geo(
+async def get_weather_geo(
     latitude: float = Query(...),
     longitude: float = Query(...),
 ):
-    return fetch_weather(latitude, longitude)
+    return await fetch_weather(latitude, longitude)
 
 
-def fetch_weather(latitude: float, longitude: float):
-    params = {
-        "latitude": latitude,
-        "longitude": longitude,
-        "hourly": "temperature_2m",
-    }
+async def fetch_weather(latitude: float, longitude: float):
     try:
-        r = requests.get(OPEN_METEO_URL, params=params, timeout=5)
-    except requests.RequestException as exc:
-        raise HTTPException(
-            502, f"Failed to contact weather provider (open-meteo): {exc}"
-        )
-
-    if r.status_code != 200:
-        raise HTTPException(502, "Weather provider (open-meteo) returned an error")
-    return r.json()
+        return await weather_client.get(latitude, longitude)
+    except WeatherUnavailable as exc:
+        raise HTTPException(502, str(exc))
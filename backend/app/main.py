@@ -1,28 +1,136 @@
+import asyncio
+import contextlib
+import logging
 import os
+import time
+from contextlib import asynccontextmanager
 
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import APIRouter, Depends, FastAPI, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
+import app as app_package
 from app.controller.artist_controller import router as artist_router
 from app.controller.auth_controller import router as auth_router
+from app.controller.autocomplete_controller import router as autocomplete_router
 from app.controller.designer_controller import router as designer_router
-from app.controller.game_controller import router as game_router
+from app.controller.export_controller import router as export_router
 from app.controller.genre_controller import router as genre_router
 from app.controller.language_controller import router as language_router
 from app.controller.mechanic_controller import router as mechanic_router
 from app.controller.publisher_controller import router as publisher_router
-from app.controller.review_controller import router as review_router
 from app.controller.user_controller import router as user_router
 from app.controller.video_controller import router as video_router
 from app.controller.weather_controller import router as weather_router
+from app.service.autocomplete_service import build_autocomplete_index
+from app.service.game_service import build_facet_index, build_similar_index
+from app.utility.auth import require_admin
+from app.utility.autocomplete import autocomplete_index
+from app.utility.db_sql import SessionLocal, get_engine
+from app.utility.login_admission import login_admission
+from app.utility.metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    instrument_repositories,
+    registry,
+)
+from app.utility.outbox import install_outbox
+from app.utility.password_hasher import password_hasher
+from app.utility.pool_metrics import get_pool_stats
+from app.utility.principal_cache import principal_cache
+from app.utility.sql_profiler import SQLProfilerMiddleware
+from app.utility.startup import startup_report, warm_up, warm_up_async
+from app.utility.weather_client import weather_client
 
 sentry_sdk.init(
     dsn="https://44232220511edf33f1a2422be8aa5e47@o4510501532860416.ingest.de.sentry.io/4510501534498896",
     send_default_pii=True,
 )
 
-app = FastAPI(title="Game API")
+
+logger = logging.getLogger(__name__)
+
+DB_MODE = os.getenv("DB_MODE", "sql").lower()
+# "true" serves games and reviews from the async drivers instead of the threadpool
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    started = time.perf_counter()
+    # requests are only accepted once this returns, so warm the backend first
+    try:
+        with startup_report.phase("warm_up"):
+            await run_in_threadpool(warm_up, DB_MODE)
+            if DB_ASYNC:
+                await warm_up_async(DB_MODE)
+    except Exception as exc:
+        # keep starting: the backend may come up later, /readyz says it is not
+        logger.exception("warm-up of the %s backend failed", DB_MODE)
+        startup_report.errors["warm_up"] = repr(exc)
+
+    with startup_report.phase("autocomplete"):
+        get_engine()
+        sql_db = SessionLocal()
+        try:
+            await run_in_threadpool(build_autocomplete_index, sql_db)
+        finally:
+            sql_db.close()
+
+    with startup_report.phase("similar"):
+        sql_db = SessionLocal()
+        try:
+            await run_in_threadpool(build_similar_index, sql_db)
+        finally:
+            sql_db.close()
+
+    with startup_report.phase("facets"):
+        sql_db = SessionLocal()
+        try:
+            await run_in_threadpool(build_facet_index, sql_db)
+        finally:
+            sql_db.close()
+
+    startup_report.record("startup", time.perf_counter() - started)
+    startup_report.ready = not startup_report.errors
+    logger.info("startup timings: %s", startup_report.snapshot())
+    # the workers load here so importing the app stays free of them and numpy
+    from app.utility.outbox_sync import OUTBOX_SYNC, outbox_sync
+    from app.utility.purger import PURGE_WORKER, purger
+    from app.utility.recommender import RECOMMEND_WORKER, recommender
+
+    sync_task = asyncio.create_task(outbox_sync.run_forever()) if OUTBOX_SYNC else None
+    purge_task = asyncio.create_task(purger.run_forever()) if PURGE_WORKER else None
+    recommend_task = (
+        asyncio.create_task(recommender.run_forever()) if RECOMMEND_WORKER else None
+    )
+    yield
+    for task in (sync_task, purge_task, recommend_task):
+        if task:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    password_hasher.shutdown()
+    if DB_MODE == "hybrid":
+        from app.repository.hybrid_repository import shadow_runner
+
+        shadow_runner.shutdown()
+    await weather_client.aclose()
+
+
+app = FastAPI(title="Game API", lifespan=lifespan)
+
+# game and review writes append to outbox_event when OUTBOX=true
+install_outbox()
+
+# times every repository method of the active backend, or all three when hybrid
+if DB_MODE == "hybrid":
+    from app.repository.hybrid_repository import HYBRID_BACKENDS
+
+    instrument_repositories(backends=HYBRID_BACKENDS)
+else:
+    instrument_repositories(backends=(DB_MODE,))
 
 
 @app.get("/sentry-debug")
@@ -35,9 +143,11 @@ origins = [
     "http://127.0.0.1:3000",
     "http://localhost:5173",
     "http://127.0.0.1:5173",
-    "https://www.gametable.online/"
+    "https://www.gametable.online/",
 ]
 
+app.add_middleware(SQLProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -47,9 +157,19 @@ app.add_middleware(
 )
 
 app.include_router(auth_router)
+app.include_router(autocomplete_router)
 app.include_router(artist_router)
 app.include_router(designer_router)
-app.include_router(game_router)
+app.include_router(export_router)
+# only the controllers, and so the drivers, of the chosen mode are imported
+if DB_ASYNC:
+    from app.controller.async_game_controller import router as async_game_router
+
+    app.include_router(async_game_router)
+else:
+    from app.controller.game_controller import router as game_router
+
+    app.include_router(game_router)
 app.include_router(genre_router)
 app.include_router(publisher_router)
 app.include_router(mechanic_router)
@@ -58,7 +178,14 @@ app.include_router(user_router)
 app.include_router(video_router)
 app.include_router(weather_router)
 
-app.include_router(review_router)
+if DB_ASYNC:
+    from app.controller.async_review_controller import router as async_review_router
+
+    app.include_router(async_review_router)
+else:
+    from app.controller.review_controller import router as review_router
+
+    app.include_router(review_router)
 
 
 @app.get("/healthz")
@@ -66,6 +193,94 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/readyz")
+def ready(response: Response):
+    if not startup_report.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return startup_report.snapshot()
+
+
 @app.get("/db")
 def db_info():
-    return {"active_database": os.getenv("DB_MODE")}
+    return {"active_database": DB_MODE, "async": DB_ASYNC}
+
+
+# operational stats and metrics show internals, so only admins may read them
+ops_router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@ops_router.get("/pools")
+def pool_info():
+    return get_pool_stats()
+
+
+@ops_router.get("/autocomplete/stats")
+def autocomplete_info():
+    return autocomplete_index.snapshot()
+
+
+@ops_router.get("/similar/stats")
+def similar_info():
+    from app.utility.similarity import similar_games
+
+    return similar_games.snapshot()
+
+
+@ops_router.get("/facets/stats")
+def facets_info():
+    from app.utility.facets import game_facets
+
+    return game_facets.snapshot()
+
+
+@ops_router.get("/auth/stats")
+def auth_info():
+    return {
+        "principals": principal_cache.snapshot(),
+        "hasher": password_hasher.snapshot(),
+        "admission": login_admission.snapshot(),
+    }
+
+
+@ops_router.get("/weather/stats")
+def weather_info():
+    return weather_client.snapshot()
+
+
+@ops_router.get("/hybrid/stats")
+def hybrid_info():
+    from app.repository.hybrid_repository import hybrid_stats
+
+    return hybrid_stats.snapshot()
+
+
+@ops_router.get("/outbox/stats")
+def outbox_info():
+    from app.utility.outbox_sync import outbox_sync
+
+    return outbox_sync.snapshot()
+
+
+@ops_router.get("/purge/stats")
+def purge_info():
+    from app.utility.purger import purger
+
+    return purger.snapshot()
+
+
+@ops_router.get("/recommend/stats")
+def recommend_info():
+    from app.utility.recommender import recommender
+
+    return recommender.snapshot()
+
+
+@ops_router.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+app.include_router(ops_router)
+
+
+startup_report.record("import", time.perf_counter() - app_package.IMPORT_STARTED)
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.utility.db_sql import Base
+
+
+class EntityVersion(Base):
+    """How many writes an entity has had; the ETags of its reads follow it.
+
+    Shared by every worker and replica, so a write seen by one changes the
+    ETag all of them answer with.
+    """
+
+    __tablename__ = "entity_version"
+
+    entity = Column(String(32), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
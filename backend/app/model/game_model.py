@@ -1,4 +1,15 @@
-from sqlalchemy import Column, Double, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Double,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from app.model.artists_model import Artist
@@ -46,6 +57,20 @@ game_genres = Table(
 
 class Game(Base):
     __tablename__ = "game"
+    # (sort key, id) indexes back keyset pagination on /api/games
+    __table_args__ = (
+        Index("ix_game_bgg_rating_id", "bgg_rating", "id"),
+        Index("ix_game_year_published_id", "year_published", "id"),
+        Index("ix_game_playing_time_id", "playing_time", "id"),
+        Index("ix_game_name_id", "name", "id"),
+        Index("ix_game_user_rating_id", "user_rating", "id"),
+        # the purger's queue of soft-deleted games
+        Index("ix_game_deleted_at", "deleted_at"),
+        # ranked search on /api/games/search
+        Index(
+            "ft_game_name_description", "name", "description", mysql_prefix="FULLTEXT"
+        ).ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
@@ -59,6 +84,14 @@ class Game(Base):
     max_players = Column(Integer, nullable=True)
     image = Column(String(1024), nullable=True)
     thumbnail = Column(String(1024), nullable=True)
+    # review aggregates, kept up to date by the review repositories
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    user_rating = Column(Double, nullable=True)
+    # review count per star amount, keyed by the amount as a string
+    star_histogram = Column(JSON, nullable=True)
+    # set by DELETE; the row is hidden until the purger removes it for good
+    deleted_at = Column(DateTime, nullable=True)
 
     artists = relationship(Artist, secondary=game_artists, lazy="select")
     designers = relationship(Designer, secondary=game_designers, lazy="select")
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Float, Integer
+
+from app.utility.db_sql import Base
+
+
+class GameRecommendation(Base):
+    """One of a game's most similar games by how the same users rated both.
+
+    Rebuilt as a whole by the recommender job, so it has no foreign keys: a
+    purged game only leaves rows that reads join away until the next build.
+    """
+
+    __tablename__ = "game_recommendation"
+
+    game_id = Column(Integer, primary_key=True)
+    similar_game_id = Column(Integer, primary_key=True)
+    # adjusted cosine of the two games' ratings, in (0, 1]
+    score = Column(Float, nullable=False)
+    # users who rated both
+    support = Column(Integer, nullable=False)
@@ -0,0 +1,32 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.utility.db_sql import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class OutboxEvent(Base):
+    """A game or review that changed, written in the same transaction as the change."""
+
+    __tablename__ = "outbox_event"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    # "upsert" or "delete"; sync reads the current row either way
+    op = Column(String(8), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
+
+
+class OutboxCursor(Base):
+    """How far one sync target has applied the outbox."""
+
+    __tablename__ = "outbox_cursor"
+
+    target = Column(String(32), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    synced_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.utility.db_sql import Base
@@ -6,6 +6,7 @@ from app.utility.db_sql import Base
 
 class Review(Base):
     __tablename__ = "review"
+    __table_args__ = (Index("ix_review_game_id_id", "game_id", "id"),)
 
     id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
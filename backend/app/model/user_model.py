@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Date, Integer, String
+from sqlalchemy import Boolean, Column, Date, DateTime, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.utility.db_sql import Base
@@ -15,5 +15,7 @@ class User(Base):
     email = Column(String(255), nullable=False)
 
     is_admin = Column(Boolean, default=False)
+    # set by DELETE; the row is hidden until the purger removes it for good
+    deleted_at = Column(DateTime, nullable=True, index=True)
 
     reviews = relationship("Review", back_populates="user", lazy="select")
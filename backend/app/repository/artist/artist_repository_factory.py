@@ -1,24 +1,45 @@
 import os
 
-from app.repository.artist.artist_repository_mongo import ArtistRepositoryMongo
-from app.repository.artist.artist_repository_neo import ArtistRepositoryNeo
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
 from app.repository.artist.sql_artist_repository import ArtistRepositorySQL
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
 from app.utility.db_sql import get_sql_db
 
 DB_MODE = os.getenv("DB_MODE", "sql").lower()
 
 
-def get_artist_repository():
+def _mongo_repository():
+    from app.repository.artist.artist_repository_mongo import ArtistRepositoryMongo
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return ArtistRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.artist.artist_repository_neo import ArtistRepositoryNeo
+    from app.utility.db_neo import get_neo
+
+    db = get_neo()
+    return ArtistRepositoryNeo(db)
+
+
+def get_artist_repository(sql_db: Session = Depends(get_sql_db)):
     if DB_MODE == "sql":
-        db = next(get_sql_db())
-        return ArtistRepositorySQL(db)
+        return ArtistRepositorySQL(sql_db)
     elif DB_MODE == "mongo":
-        db = next(get_mongo_db())
-        return ArtistRepositoryMongo(db)
+        return _mongo_repository()
     elif DB_MODE == "neo":
-        db = get_neo()
-        return ArtistRepositoryNeo(db)
+        return _neo_repository()
+    elif DB_MODE == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "artist",
+            ArtistRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {DB_MODE}")
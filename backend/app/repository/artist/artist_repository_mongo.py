@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from datetime import date, datetime
 from typing import Any
 
@@ -5,6 +6,7 @@ from pymongo.collection import Collection
 
 from app.repository.artist.i_artist_repository import IArtistRepository
 from app.schema.artist_schema import ArtistCreate, ArtistRead, ArtistUpdate
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class ArtistRepositoryMongo(IArtistRepository):
@@ -60,42 +62,54 @@ class ArtistRepositoryMongo(IArtistRepository):
         return doc
 
     def list(
-		self,
-		offset: int,
-		limit: int,
-		search: str | None,
-		sort_order: str | None = "asc",
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         sort_dir = 1 if (sort_order or "asc") == "asc" else -1
 
         match_stage = {}
         if search:
             match_stage["artists.name"] = {
-				"$regex": search,
-				"$options": "i",
-			}
+                "$regex": search,
+                "$options": "i",
+            }
 
         count_pipeline = [
-			{"$unwind": "$artists"},
-			{"$match": match_stage} if match_stage else {"$match": {}},
-			{"$count": "total"},
-		]
+            {"$unwind": "$artists"},
+            {"$match": match_stage} if match_stage else {"$match": {}},
+            {"$count": "total"},
+        ]
+
+        def count():
+            count_result = list(self.games.aggregate(count_pipeline))
+            return count_result[0]["total"] if count_result else 0
 
-        count_result = list(self.games.aggregate(count_pipeline))
-        total = count_result[0]["total"] if count_result else 0
+        total = totals.resolve(count)
 
         pipeline = [
-			{"$unwind": "$artists"},
-			{"$match": match_stage} if match_stage else {"$match": {}},
-			{"$sort": {"artists.name": sort_dir}},
-			{"$skip": offset},
-			{"$limit": limit},
-			{"$replaceRoot": {"newRoot": "$artists"}},
-		]
+            {"$unwind": "$artists"},
+            {"$match": match_stage} if match_stage else {"$match": {}},
+            {"$sort": {"artists.name": sort_dir}},
+            {"$skip": offset},
+            {"$limit": limit},
+            {"$replaceRoot": {"newRoot": "$artists"}},
+        ]
 
         docs = list(self.games.aggregate(pipeline))
         return [self._doc(d) for d in docs], total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        pipeline = [
+            {"$unwind": "$artists"},
+            {"$group": {"_id": "$artists.id", "name": {"$first": "$artists.name"}}},
+        ]
+        for doc in self.games.aggregate(pipeline, allowDiskUse=True):
+            yield int(doc["_id"]), doc["name"]
+
     def create(self, artist_data: ArtistCreate | dict) -> ArtistRead:
         doc = self._convert_dates(artist_data)
 
@@ -103,6 +117,11 @@ class ArtistRepositoryMongo(IArtistRepository):
         doc["_id"] = res.inserted_id
         return self._doc_to_artist(doc)
 
+    def create_many(self, rows):
+        raise NotImplementedError(
+            "Artists are embedded in games in Mongo. Create them by updating game documents."
+        )
+
     def update(
         self, artist_id: Any, artist_data: ArtistUpdate | dict
     ) -> ArtistRead | None:
@@ -1,7 +1,11 @@
+from collections.abc import Iterator
+
 from neo4j import Driver
 
 from app.repository.artist.i_artist_repository import IArtistRepository
 from app.schema.artist_schema import ArtistCreate, ArtistRead, ArtistUpdate
+from app.utility.db_neo import create_nodes
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class ArtistRepositoryNeo(IArtistRepository):
@@ -16,6 +20,12 @@ class ArtistRepositoryNeo(IArtistRepository):
         data["id"] = data.get("id") or 0
         return ArtistRead(**data)
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        query = "MATCH (a:Artist) RETURN a.id AS id, a.name AS name"
+        with self.driver.session() as session:
+            for record in session.run(query):
+                yield record["id"], record["name"]
+
     def create(self, artist_data) -> ArtistRead:
         with self.driver.session() as session:
             with session.begin_transaction() as tx:
@@ -51,6 +61,7 @@ class ArtistRepositoryNeo(IArtistRepository):
         offset: int,
         limit: int,
         search: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ) -> tuple[list[ArtistRead], int]:
         with self.driver.session() as session:
             query = "MATCH (a:Artist)"
@@ -65,18 +76,24 @@ class ArtistRepositoryNeo(IArtistRepository):
             records = session.run(query, **params)
             artists = [self._doc_to_artist(r["a"]) for r in records]
 
-            # Count with optional search
-            count_query = "MATCH (a:Artist)"
-            count_params = {}
-            if search:
-                count_query += " WHERE a.name CONTAINS $search"
-                count_params["search"] = search
-            count_query += " RETURN count(a) AS count"
-            count_res = session.run(count_query, **count_params).single()
-
-            total = count_res["count"] if count_res else 0
+            def count():
+                # Count with optional search
+                count_query = "MATCH (a:Artist)"
+                count_params = {}
+                if search:
+                    count_query += " WHERE a.name CONTAINS $search"
+                    count_params["search"] = search
+                count_query += " RETURN count(a) AS count"
+                count_res = session.run(count_query, **count_params).single()
+                return count_res["count"] if count_res else 0
+
+            total = totals.resolve(count, None if search else count)
             return artists, total
 
+    def create_many(self, rows):
+        with self.driver.session() as session:
+            return session.execute_write(create_nodes, "Artist", rows)
+
     def update(self, artist_id: int, artist_data: ArtistUpdate) -> ArtistRead | None:
         set_clause = ", ".join(f"a.{k} = ${k}" for k in artist_data)
         params = {"id": artist_id, **artist_data}
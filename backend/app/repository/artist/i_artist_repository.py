@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
 
 class IArtistRepository(ABC):
     @abstractmethod
@@ -15,11 +18,20 @@ class IArtistRepository(ABC):
         offset: int,
         limit: int,
         search: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ): ...
 
+    @abstractmethod
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        """(id, name) of every artist, streamed to build the autocomplete index."""
+
     @abstractmethod
     def create(self, artist_data): ...
 
+    @abstractmethod
+    def create_many(self, rows):
+        """Inserts ``rows`` as one batch and returns their new ids in order."""
+
     @abstractmethod
     def update(self, artist_id: Any, artist_data): ...
 
@@ -1,8 +1,12 @@
-from sqlalchemy import func, select
+from collections.abc import Iterator
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.model.artists_model import Artist
 from app.repository.artist.i_artist_repository import IArtistRepository
+from app.utility.db_sql import count_rows, estimate_row_count, insert_many
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class ArtistRepositorySQL(IArtistRepository):
@@ -18,23 +22,42 @@ class ArtistRepositorySQL(IArtistRepository):
         ).scalar_one_or_none()
 
     def list(
-        self, offset: int = 0, limit: int = 50, search: str | None = None
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ) -> tuple[list[Artist], int]:
         stmt = select(Artist)
         if search:
             like = f"%{search}%"
             stmt = stmt.where(Artist.name.ilike(like))
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "artist"),
+        )
         rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
         return rows, total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        stmt = select(Artist.id, Artist.name)
+        for row in self.db.execute(stmt.execution_options(yield_per=5000)):
+            yield row.id, row.name
+
     def create(self, artist: Artist) -> Artist:
         self.db.add(artist)
         self.db.commit()
         return artist
 
+    def create_many(self, rows):
+        try:
+            ids = insert_many(self.db, Artist, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ids
+
     def update(self, artist: Artist) -> Artist:
         self.db.merge(artist)
         self.db.commit()
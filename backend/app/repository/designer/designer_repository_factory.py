@@ -1,24 +1,49 @@
 import os
 
-from app.repository.designer.designer_repository_mongo import DesignerRepositoryMongo
-from app.repository.designer.designer_repository_neo import DesignerRepositoryNeo
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
 from app.repository.designer.sql_designer_repository import SQLDesignerRepository
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
 from app.utility.db_sql import get_sql_db
 
 DB_MODE = os.getenv("DB_MODE", "sql").lower()
 
 
-def get_designer_repository():
+def _mongo_repository():
+    from app.repository.designer.designer_repository_mongo import (
+        DesignerRepositoryMongo,
+    )
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return DesignerRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.designer.designer_repository_neo import (
+        DesignerRepositoryNeo,
+    )
+    from app.utility.db_neo import get_neo
+
+    db = get_neo()
+    return DesignerRepositoryNeo(db)
+
+
+def get_designer_repository(sql_db: Session = Depends(get_sql_db)):
     if DB_MODE == "sql":
-        db = next(get_sql_db())
-        return SQLDesignerRepository(db)
+        return SQLDesignerRepository(sql_db)
     elif DB_MODE == "mongo":
-        db = next(get_mongo_db())
-        return DesignerRepositoryMongo(db)
+        return _mongo_repository()
     elif DB_MODE == "neo":
-        db = get_neo()
-        return DesignerRepositoryNeo(db)
+        return _neo_repository()
+    elif DB_MODE == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "designer",
+            SQLDesignerRepository(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {DB_MODE}")
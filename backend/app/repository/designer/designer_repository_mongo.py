@@ -1,6 +1,10 @@
-from app.repository.designer.i_designer_repository import IDesignerRepository
+from collections.abc import Iterator
+
 from pymongo.collection import Collection
 
+from app.repository.designer.i_designer_repository import IDesignerRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
 
 class DesignerRepositoryMongo(IDesignerRepository):
     def __init__(self, db):
@@ -50,42 +54,54 @@ class DesignerRepositoryMongo(IDesignerRepository):
         return doc
 
     def list(
-		self,
-		offset: int,
-		limit: int,
-		search: str | None,
-		sort_order: str | None = "asc",
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         sort_dir = 1 if (sort_order or "asc") == "asc" else -1
 
         match_stage = {}
         if search:
             match_stage["designers.name"] = {
-				"$regex": search,
-				"$options": "i",
-			}
+                "$regex": search,
+                "$options": "i",
+            }
 
         count_pipeline = [
-			{"$unwind": "$artists"},
-			{"$match": match_stage} if match_stage else {"$match": {}},
-			{"$count": "total"},
-		]
+            {"$unwind": "$artists"},
+            {"$match": match_stage} if match_stage else {"$match": {}},
+            {"$count": "total"},
+        ]
+
+        def count():
+            count_result = list(self.games.aggregate(count_pipeline))
+            return count_result[0]["total"] if count_result else 0
 
-        count_result = list(self.games.aggregate(count_pipeline))
-        total = count_result[0]["total"] if count_result else 0
+        total = totals.resolve(count)
 
         pipeline = [
-			{"$unwind": "$artists"},
-			{"$match": match_stage} if match_stage else {"$match": {}},
-			{"$sort": {"artists.name": sort_dir}},
-			{"$skip": offset},
-			{"$limit": limit},
-			{"$replaceRoot": {"newRoot": "$artists"}},
-		]
+            {"$unwind": "$artists"},
+            {"$match": match_stage} if match_stage else {"$match": {}},
+            {"$sort": {"artists.name": sort_dir}},
+            {"$skip": offset},
+            {"$limit": limit},
+            {"$replaceRoot": {"newRoot": "$artists"}},
+        ]
 
         docs = list(self.games.aggregate(pipeline))
         return [self._doc(d) for d in docs], total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        pipeline = [
+            {"$unwind": "$designers"},
+            {"$group": {"_id": "$designers.id", "name": {"$first": "$designers.name"}}},
+        ]
+        for doc in self.games.aggregate(pipeline, allowDiskUse=True):
+            yield int(doc["_id"]), doc["name"]
+
     def create(self, designer_data: dict):
         doc = dict(designer_data)
 
@@ -99,6 +115,11 @@ class DesignerRepositoryMongo(IDesignerRepository):
         doc["_id"] = res.inserted_id
         return self._doc(doc)
 
+    def create_many(self, rows):
+        raise NotImplementedError(
+            "Designers are embedded in games in Mongo. Create them by updating game documents."
+        )
+
     def update(self, designer_id: int, designer_data: dict):
         res = self.col.update_one(
             {"id": int(designer_id)}, {"$set": dict(designer_data)}
@@ -1,7 +1,11 @@
-from sqlalchemy import func, select
+from collections.abc import Iterator
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.model.designer_model import Designer
+from app.utility.db_sql import count_rows, estimate_row_count, insert_many
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class SQLDesignerRepository:
@@ -17,23 +21,42 @@ class SQLDesignerRepository:
         ).scalar_one_or_none()
 
     def list(
-        self, offset: int = 0, limit: int = 50, search: str | None = None
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ) -> tuple[list[Designer], int]:
         stmt = select(Designer)
         if search:
             like = f"%{search}%"
             stmt = stmt.where(Designer.name.ilike(like))
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "designer"),
+        )
         rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
         return rows, total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        stmt = select(Designer.id, Designer.name)
+        for row in self.db.execute(stmt.execution_options(yield_per=5000)):
+            yield row.id, row.name
+
     def create(self, designer: Designer) -> Designer:
         self.db.add(designer)
         self.db.commit()
         return designer
 
+    def create_many(self, rows):
+        try:
+            ids = insert_many(self.db, Designer, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ids
+
     def update(self, designer: Designer) -> Designer:
         self.db.merge(designer)
         self.db.commit()
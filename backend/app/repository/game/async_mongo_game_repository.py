@@ -0,0 +1,96 @@
+from typing import Any
+
+from app.repository.game.mongo_game_repository import GameRepositoryMongo
+from app.schema.game_schema import GameDetail, GameRead
+from app.utility.db_mongo import ainsert_many, tombstone
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+
+class GameRepositoryMongoAsync(GameRepositoryMongo):
+    """GameRepositoryMongo on an AsyncMongoClient database."""
+
+    async def get(
+        self, game_id: Any, fields: tuple[str, ...] | None = None
+    ) -> GameRead | dict | None:
+        doc = await self.col.find_one({"_id": int(game_id)}, self._projection(fields))
+        return self._doc_to_row(doc, fields) if doc else None
+
+    async def get_many(
+        self, game_ids: list[int], fields: tuple[str, ...]
+    ) -> list[dict]:
+        cursor = self.col.find({"_id": {"$in": game_ids}}, self._projection(fields))
+        rows = [self._doc_to_fields(d, fields) async for d in cursor]
+        return self._in_order(rows, game_ids)
+
+    async def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[GameRead], int | None]:
+        filt, score, sort = self._search_query(query)
+        projection = {**self._projection(fields), **score}
+
+        total = await totals.aresolve(lambda: self.col.count_documents(filt))
+        cursor = self.col.find(filt, projection).sort(sort).skip(offset).limit(limit)
+
+        return [self._doc_to_row(d, fields) async for d in cursor], total
+
+    async def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None = None,
+        sort_by: str | None = None,
+        sort_order: str = "desc",
+        after: tuple[Any, int] | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[GameRead], int | None]:
+        query = self._list_query(search)
+
+        total = await totals.aresolve(
+            lambda: self.col.count_documents(query),
+            None if query else self.col.estimated_document_count,
+        )
+        page = self._page_query(query, sort_by, sort_order, after)
+        cursor = self._sorted(
+            self.col.find(page, self._projection(fields)).skip(offset).limit(limit),
+            sort_by,
+            sort_order,
+        )
+
+        return [self._doc_to_row(d, fields) async for d in cursor], total
+
+    async def create(self, game_data: dict) -> GameRead:
+        doc = dict(game_data)
+        result = await self.col.insert_one(doc)
+        doc["_id"] = result.inserted_id
+        return self._doc_to_game(doc)
+
+    async def create_many(self, rows):
+        return await ainsert_many(self.col, [dict(r) for r in rows])
+
+    async def update(self, game_id: Any, game_data: dict) -> GameRead | None:
+        res = await self.col.update_one(
+            {"_id": int(game_id)}, {"$set": dict(game_data)}
+        )
+        if res.matched_count == 0:
+            return None
+        return await self.get(game_id)
+
+    async def get_detail(
+        self, game_id: Any, fields: tuple[str, ...] | None = None
+    ) -> GameDetail | dict | None:
+        projection = self._projection(fields, GameDetail)
+        doc = await self.col.find_one({"_id": int(game_id)}, projection)
+        return self._doc_to_detail_row(doc, fields)
+
+    async def delete(self, game_id: Any) -> bool:
+        res = await self.col.delete_one({"_id": int(game_id)})
+        if res.deleted_count != 1:
+            return False
+        await self.tombstones.insert_one(tombstone("game", game_id))
+        return True
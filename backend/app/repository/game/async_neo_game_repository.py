@@ -0,0 +1,131 @@
+from typing import Any
+
+from neo4j import AsyncDriver
+
+from app.repository.game.neo_game_repository import GameRepositoryNeo, lucene_escape
+from app.schema.game_schema import GameDetail, GameRead
+from app.utility.db_neo import acreate_nodes
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+
+class GameRepositoryNeoAsync(GameRepositoryNeo):
+    """GameRepositoryNeo on the async Neo4j driver. Queries are shared with the sync class."""
+
+    def __init__(self, driver: AsyncDriver):
+        self.driver = driver
+
+    async def create(self, game_data: dict) -> GameRead:
+        props = {**dict.fromkeys(GameRead.model_fields), "available": None, **game_data}
+        props["id"] = props.get("id") or 0
+
+        async with self.driver.session() as session:
+            result = await session.run(self.CREATE_QUERY, **props)
+            await result.consume()
+        return GameRead(**props)
+
+    async def create_many(self, rows):
+        async with self.driver.session() as session:
+            return await session.execute_write(acreate_nodes, "Game", rows)
+
+    async def get_many(
+        self, game_ids: list[int], fields: tuple[str, ...]
+    ) -> list[dict]:
+        query = self.GET_MANY_QUERY.format(returns=self._returns(fields))
+        async with self.driver.session() as session:
+            result = await session.run(query, ids=game_ids)
+            rows = [dict(record["g"]) async for record in result]
+        return self._in_order(rows, game_ids)
+
+    async def get(
+        self, game_id: int, fields: tuple[str, ...] | None = None
+    ) -> GameRead | dict | None:
+        async with self.driver.session() as session:
+            result = await session.run(
+                f"MATCH (g:Game) WHERE g.id = $game_id RETURN {self._returns(fields)}",
+                game_id=int(game_id),
+            )
+            record = await result.single()
+            if record:
+                return self._record_to_row(record, fields)
+        return None
+
+    async def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[GameRead], int | None]:
+        search = lucene_escape(query)
+
+        async with self.driver.session() as session:
+            result = await session.run(
+                self._search_query(fields), search=search, skip=offset, limit=limit
+            )
+            games = [self._record_to_row(record, fields) async for record in result]
+
+            async def count():
+                count_result = await session.run(self.SEARCH_COUNT_QUERY, search=search)
+                count_res = await count_result.single()
+                return count_res["count"] if count_res else 0
+
+            total = await totals.aresolve(count)
+
+            return games, total
+
+    async def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None = None,
+        sort_by: str | None = None,
+        sort_order: str = "desc",
+        after: tuple[Any, int] | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[GameRead], int | None]:
+        query, count_query, params = self._list_queries(
+            offset, limit, search, sort_by, sort_order, after, fields
+        )
+
+        async with self.driver.session() as session:
+            result = await session.run(query, **params)
+            games = [self._record_to_row(record, fields) async for record in result]
+
+            async def count():
+                count_result = await session.run(
+                    count_query, **({"search": search} if search else {})
+                )
+                count_res = await count_result.single()
+                return count_res["count"] if count_res else 0
+
+            total = await totals.aresolve(count, None if search else count)
+
+            return games, total
+
+    async def update(self, game_id: int, game_data: dict) -> GameRead | None:
+        if not game_data:
+            return await self.get(game_id)
+
+        async with self.driver.session() as session:
+            result = await session.run(
+                "MATCH (g:Game {id: $id}) SET g += $props RETURN g",
+                id=int(game_id),
+                props=dict(game_data),
+            )
+            record = await result.single()
+            return self._doc_to_game(record["g"]) if record else None
+
+    async def delete(self, game_id: int) -> bool:
+        async with self.driver.session() as session:
+            result = await session.run(self.DELETE_QUERY, id=int(game_id))
+            res = await result.single()
+            return res["deleted"] > 0 if res else False
+
+    async def get_detail(
+        self, game_id: int, fields: tuple[str, ...] | None = None
+    ) -> GameDetail | dict | None:
+        async with self.driver.session() as session:
+            result = await session.run(self._detail_query(fields), id=int(game_id))
+            return self._record_to_detail(await result.single(), fields)
@@ -0,0 +1,97 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.game_model import Game
+from app.repository.game.sql_game_repository import GameRepositorySQL
+from app.utility.db_sql import count_rows, estimate_row_count
+from app.utility.outbox import record_change
+from app.utility.totals import EXACT_TOTAL
+
+
+class GameRepositorySQLAsync(GameRepositorySQL):
+    """GameRepositorySQL on an AsyncSession. Statements are shared with the sync class."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, game_id, fields=None):
+        if fields is None:
+            return (await self.db.execute(self._get_stmt(game_id))).scalars().first()
+        stmt = self._columns(self._get_stmt(game_id), fields)
+        row = (await self.db.execute(stmt)).mappings().first()
+        return dict(row) if row else None
+
+    async def get_many(self, game_ids, fields):
+        result = await self.db.execute(self._get_many_stmt(game_ids, fields))
+        return self._in_order(self._rows(result, fields), game_ids)
+
+    async def list(
+        self,
+        offset,
+        limit,
+        search,
+        sort_by,
+        sort_order="desc",
+        after=None,
+        totals=EXACT_TOTAL,
+        fields=None,
+    ):
+        stmt = self._list_stmt(search, sort_by, sort_order)
+
+        total = await totals.aresolve(
+            lambda: self.db.run_sync(count_rows, stmt),
+            None if search else lambda: self.db.run_sync(estimate_row_count, "game"),
+        )
+        page = self._page_stmt(stmt, offset, limit, sort_by, sort_order, after)
+        rows = self._rows(await self.db.execute(self._columns(page, fields)), fields)
+        return rows, total
+
+    async def search(self, query, offset, limit, totals=EXACT_TOTAL, fields=None):
+        stmt = self._search_stmt(query, self.db.bind.dialect.name)
+
+        total = await totals.aresolve(lambda: self.db.run_sync(count_rows, stmt))
+        page = self._columns(stmt.offset(offset).limit(limit), fields)
+        return self._rows(await self.db.execute(page), fields), total
+
+    async def create(self, game_data):
+        obj = Game(**game_data)
+        self.db.add(obj)
+        await self.db.commit()
+        await self.db.refresh(obj)
+        return obj
+
+    async def create_many(self, rows):
+        try:
+            ids = await self.db.run_sync(self._insert_many, rows)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return ids
+
+    async def update(self, game_id, game_data):
+        obj = await self.get(game_id)
+        if not obj:
+            return None
+
+        for k, v in game_data.items():
+            setattr(obj, k, v)
+
+        await self.db.commit()
+        await self.db.refresh(obj)
+        return obj
+
+    async def delete(self, game_id):
+        try:
+            result = await self.db.execute(self._delete_stmt(game_id))
+            deleted = result.rowcount == 1
+            if deleted:
+                record_change(self.db, "game", int(game_id), "delete")
+            await self.db.commit()
+            return deleted
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def get_detail(self, game_id, fields=None):
+        stmt = self._detail_stmt(game_id, fields)
+        return (await self.db.execute(stmt)).scalars().first()
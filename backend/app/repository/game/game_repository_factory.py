@@ -1,24 +1,88 @@
 import os
 
-from app.repository.game.mongo_game_repository import GameRepositoryMongo
-from app.repository.game.neo_game_repository import GameRepositoryNeo
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.repository.game.async_sql_game_repository import GameRepositorySQLAsync
 from app.repository.game.sql_game_repository import GameRepositorySQL
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
 from app.utility.db_sql import get_sql_db
+from app.utility.db_sql_async import get_async_sql_db
 
 DB_MODE = os.getenv("DB_MODE", "sql").lower()
 
 
-def get_game_repository():
+def _mongo_repository():
+    from app.repository.game.mongo_game_repository import GameRepositoryMongo
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return GameRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.game.neo_game_repository import GameRepositoryNeo
+    from app.utility.db_neo import get_neo
+
+    db = get_neo()
+    return GameRepositoryNeo(db)
+
+
+def get_game_repository(sql_db: Session = Depends(get_sql_db)):
+    if DB_MODE == "sql":
+        return GameRepositorySQL(sql_db)
+    elif DB_MODE == "mongo":
+        return _mongo_repository()
+    elif DB_MODE == "neo":
+        return _neo_repository()
+    elif DB_MODE == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "game",
+            GameRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
+
+    raise ValueError(f"Unknown DB_MODE: {DB_MODE}")
+
+
+def _mongo_async_repository():
+    from app.repository.game.async_mongo_game_repository import (
+        GameRepositoryMongoAsync,
+    )
+    from app.utility.db_mongo import MONGO_DB, get_async_client
+
+    return GameRepositoryMongoAsync(get_async_client()[MONGO_DB])
+
+
+def _neo_async_repository():
+    from app.repository.game.async_neo_game_repository import (
+        GameRepositoryNeoAsync,
+    )
+    from app.utility.db_neo import get_async_neo
+
+    return GameRepositoryNeoAsync(get_async_neo())
+
+
+async def get_async_game_repository(
+    sql_db: AsyncSession = Depends(get_async_sql_db),
+):
     if DB_MODE == "sql":
-        db = next(get_sql_db())
-        return GameRepositorySQL(db)
+        return GameRepositorySQLAsync(sql_db)
     elif DB_MODE == "mongo":
-        db = next(get_mongo_db())
-        return GameRepositoryMongo(db)
+        return _mongo_async_repository()
     elif DB_MODE == "neo":
-        db = get_neo()
-        return GameRepositoryNeo(db)
+        return _neo_async_repository()
+    elif DB_MODE == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "game",
+            GameRepositorySQLAsync(sql_db),
+            mongo=_mongo_async_repository,
+            neo=_neo_async_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {DB_MODE}")
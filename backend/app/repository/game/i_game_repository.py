@@ -1,10 +1,40 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
 
 class IGameRepository(ABC):
+    SORT_FIELDS: dict = {}
+    # field the list is ordered by when sort_by is not given (None = id only)
+    DEFAULT_SORT: str | None = None
+    # GameDetail fields that come from related entities rather than columns
+    DETAIL_RELATIONS = ("artists", "designers", "publishers", "mechanics")
+    # links that describe what a game is like, for the similar games index
+    FEATURE_KINDS = ("mechanics", "genres", "designers", "artists")
+    # every link iter_features can read
+    LINK_KINDS = (*FEATURE_KINDS, "publishers")
+
+    def cursor_field(self, sort_by: str | None) -> str | None:
+        """Field a keyset cursor compares on, in addition to the id tiebreaker."""
+        return sort_by if sort_by in self.SORT_FIELDS else self.DEFAULT_SORT
+
     @abstractmethod
-    def get(self, game_id: Any): ...
+    def get(self, game_id: Any, fields: tuple[str, ...] | None = None):
+        """One game; with ``fields``, a dict of only those fields."""
+
+    @abstractmethod
+    def get_many(self, game_ids: list[int], fields: tuple[str, ...]) -> list[dict]:
+        """``fields`` of the games with these ids, in the order given.
+
+        Ids that do not exist are left out.
+        """
+
+    @staticmethod
+    def _in_order(rows, game_ids: list[int]) -> list[dict]:
+        by_id = {row["id"]: row for row in rows}
+        return [by_id[i] for i in game_ids if i in by_id]
 
     @abstractmethod
     def list(
@@ -14,11 +44,64 @@ class IGameRepository(ABC):
         search: str | None = None,
         sort_by: str | None = None,
         sort_order: str = "desc",
-    ): ...
+        after: tuple[Any, int] | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ):
+        """Page of games plus the unpaged total.
+
+        ``after`` is a ``(sort value, id)`` keyset position; rows strictly
+        after it are returned, so deep pages cost the same as the first one.
+        ``totals`` decides whether the total is counted, cached, estimated or
+        skipped. ``fields`` limits what is read from the store; rows are then
+        dicts holding just those keys.
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ):
+        """Games matching ``query`` in name or description, best match first.
+
+        Served by the store's full-text index (MySQL FULLTEXT, a MongoDB text
+        index, a Neo4j full-text index) rather than a substring scan.
+        """
+
+    @abstractmethod
+    def iter_names(self) -> Iterator[tuple[int, str, float | None]]:
+        """(id, name, bgg_rating) of every game, streamed for the autocomplete index."""
+
+    @abstractmethod
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """``fields`` of every game with an id above ``after``, in id order.
+
+        Streamed from a server-side cursor ``batch_size`` rows at a time, so
+        memory stays flat however many there are.
+        """
+
+    @abstractmethod
+    def iter_features(
+        self, kinds: tuple[str, ...] | None = None
+    ) -> Iterator[tuple[int, str, int]]:
+        """(game id, kind, linked id) of every link of every game.
+
+        ``kinds`` are LINK_KINDS names, FEATURE_KINDS by default.
+        """
 
     @abstractmethod
     def create(self, game_data: dict): ...
 
+    @abstractmethod
+    def create_many(self, rows):
+        """Inserts ``rows`` as one batch and returns their new ids in order."""
+
     @abstractmethod
     def update(self, game_id: Any, game_data: dict): ...
 
@@ -26,4 +109,6 @@ class IGameRepository(ABC):
     def delete(self, game_id: Any) -> bool: ...
 
     @abstractmethod
-    def get_detail(self, game_id: Any): ...
+    def get_detail(self, game_id: Any, fields: tuple[str, ...] | None = None):
+        """A game with its related entities, or only ``fields`` of it (columns
+        and DETAIL_RELATIONS names alike)."""
@@ -1,3 +1,5 @@
+import re
+from collections.abc import Iterator
 from typing import Any
 
 from pymongo.collection import Collection
@@ -9,6 +11,8 @@ from app.schema.game_schema import GameCreate, GameDetail, GameRead, GameUpdate
 from app.schema.genre_schema import GenreRead
 from app.schema.mechanic_schema import MechanicRead
 from app.schema.publisher_schema import PublisherRead
+from app.utility.db_mongo import TOMBSTONES, insert_many, tombstone
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class GameRepositoryMongo(IGameRepository):
@@ -17,10 +21,18 @@ class GameRepositoryMongo(IGameRepository):
         "year_published": "year_published",
         "playing_time": "playing_time",
         "name": "name",
+        "user_rating": "user_rating",
+    }
+    # fields stored under another path in the game document
+    FIELD_PATHS = {
+        "id": "_id",
+        "thumbnail": "images.thumbnail",
+        "image": "images.image",
     }
 
     def __init__(self, db):
         self.col: Collection = db["games"]
+        self.tombstones: Collection = db[TOMBSTONES]
 
     def _doc_to_game(self, doc: dict) -> GameRead:
         if not doc:
@@ -31,10 +43,116 @@ class GameRepositoryMongo(IGameRepository):
         doc["image"] = images.get("image")
         return GameRead(**doc)
 
-    def get(self, game_id: Any) -> GameRead | None:
+    def _projection(self, fields: tuple[str, ...] | None, model=GameRead) -> dict:
+        # by default only what ``model`` shows, so videos and review_ids stay put
+        return {self.FIELD_PATHS.get(f, f): 1 for f in fields or model.model_fields}
+
+    def _doc_to_fields(self, doc: dict, fields: tuple[str, ...]) -> dict:
+        images = doc.get("images") or {}
+        doc = {
+            **doc,
+            "id": doc["_id"],
+            **{f: images.get(f) for f in ("thumbnail", "image")},
+        }
+        return {f: doc.get(f) for f in fields}
+
+    def _doc_to_row(self, doc: dict, fields: tuple[str, ...] | None):
+        return (
+            self._doc_to_game(doc)
+            if fields is None
+            else self._doc_to_fields(doc, fields)
+        )
+
+    def _list_query(self, search: str | None) -> dict:
+        query = {}
+        if search:
+            query["name"] = {"$regex": re.escape(search), "$options": "i"}
+        return query
+
+    def _search_query(self, query: str) -> tuple[dict, dict, list]:
+        """Filter, projection and sort for a ranked $text search."""
+        score = {"$meta": "textScore"}
+        return (
+            {"$text": {"$search": query}},
+            {"score": score},
+            [("score", score), ("_id", 1)],
+        )
+
+    def _ascending(self, sort_by: str | None, sort_order: str) -> bool:
+        if sort_by not in self.SORT_FIELDS:
+            return True
+        return sort_order != "desc"
+
+    def _sorted(self, cursor, sort_by: str | None, sort_order: str):
+        # _id breaks ties so the order is stable for both skip and keyset paging
+        pymongo_order = 1 if self._ascending(sort_by, sort_order) else -1
+        keys = [("_id", pymongo_order)]
+        if sort_by in self.SORT_FIELDS:
+            keys.insert(0, (self.SORT_FIELDS[sort_by], pymongo_order))
+        return cursor.sort(keys)
+
+    def _after_query(
+        self, sort_by: str | None, sort_order: str, after: tuple[Any, int]
+    ) -> dict:
+        value, last_id = after
+        ascending = self._ascending(sort_by, sort_order)
+        op = "$gt" if ascending else "$lt"
+        id_beyond = {"_id": {op: last_id}}
+
+        field = self.cursor_field(sort_by)
+        if field is None:
+            return id_beyond
+
+        field = self.SORT_FIELDS[field]
+        # MongoDB sorts null and missing fields before any value
+        if value is None:
+            clause = {"$and": [{field: None}, id_beyond]}
+            return {"$or": [clause, {field: {"$ne": None}}]} if ascending else clause
+
+        clauses = [{field: {op: value}}, {"$and": [{field: value}, id_beyond]}]
+        if not ascending:
+            clauses.append({field: None})
+        return {"$or": clauses}
+
+    def _page_query(
+        self,
+        query: dict,
+        sort_by: str | None,
+        sort_order: str,
+        after: tuple[Any, int] | None,
+    ) -> dict:
+        if after is None:
+            return query
+        return {"$and": [query, self._after_query(sort_by, sort_order, after)]}
+
+    def get(
+        self, game_id: Any, fields: tuple[str, ...] | None = None
+    ) -> GameRead | dict | None:
         # casting to int is apparently important
-        doc = self.col.find_one({"_id": int(game_id)})
-        return self._doc_to_game(doc)
+        doc = self.col.find_one({"_id": int(game_id)}, self._projection(fields))
+        return self._doc_to_row(doc, fields) if doc else None
+
+    def get_many(self, game_ids: list[int], fields: tuple[str, ...]) -> list[dict]:
+        cursor = self.col.find({"_id": {"$in": game_ids}}, self._projection(fields))
+        return self._in_order(
+            (self._doc_to_fields(d, fields) for d in cursor), game_ids
+        )
+
+    def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[GameRead], int | None]:
+        filt, score, sort = self._search_query(query)
+        projection = {**self._projection(fields), **score}
+
+        total = totals.resolve(lambda: self.col.count_documents(filt))
+        cursor = self.col.find(filt, projection).sort(sort).skip(offset).limit(limit)
+
+        return [self._doc_to_row(d, fields) for d in cursor], total
 
     def list(
         self,
@@ -43,20 +161,46 @@ class GameRepositoryMongo(IGameRepository):
         search: str | None = None,
         sort_by: str | None = None,
         sort_order: str = "desc",
-    ) -> tuple[list[dict], int]:
-        query = {}
-        if search:
-            query["name"] = {"$regex": search, "$options": "i"}
+        after: tuple[Any, int] | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[dict], int | None]:
+        query = self._list_query(search)
 
-        total = self.col.count_documents(query)
-        cursor = self.col.find(query).skip(offset).limit(limit)
+        total = totals.resolve(
+            lambda: self.col.count_documents(query),
+            None if query else self.col.estimated_document_count,
+        )
+        page = self._page_query(query, sort_by, sort_order, after)
+        cursor = self._sorted(
+            self.col.find(page, self._projection(fields)).skip(offset).limit(limit),
+            sort_by,
+            sort_order,
+        )
 
-        if sort_by in self.SORT_FIELDS:
-            sort_field = self.SORT_FIELDS[sort_by]
-            pymongo_order = -1 if sort_order == "desc" else 1
-            cursor = cursor.sort(sort_field, pymongo_order)
+        return [self._doc_to_row(d, fields) for d in cursor], total
+
+    def iter_names(self) -> Iterator[tuple[int, str, float | None]]:
+        for doc in self.col.find({}, {"name": 1, "bgg_rating": 1}):
+            yield doc["_id"], doc.get("name"), doc.get("bgg_rating")
 
-        return [self._doc_to_game(d) for d in cursor], total
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        # a numeric bound keeps to the integer ids and walks the _id index
+        query = {"_id": {"$gt": -1 if after is None else after}}
+        cursor = self.col.find(query, self._projection(fields)).sort("_id", 1)
+        for doc in cursor.batch_size(batch_size):
+            yield self._doc_to_fields(doc, fields)
+
+    def iter_features(self, kinds=None) -> Iterator[tuple[int, str, int]]:
+        kinds = kinds or self.FEATURE_KINDS
+        # links are embedded in the game document as {id, name} lists
+        projection = {f"{kind}.id": 1 for kind in kinds}
+        for doc in self.col.find({}, projection):
+            for kind in kinds:
+                for item in doc.get(kind) or ():
+                    yield doc["_id"], kind, item["id"]
 
     def create(self, game_data: GameCreate) -> GameRead:
         doc = game_data.model_dump(exclude_unset=True)
@@ -64,6 +208,9 @@ class GameRepositoryMongo(IGameRepository):
         doc["_id"] = result.inserted_id
         return self._doc_to_game(doc)
 
+    def create_many(self, rows):
+        return insert_many(self.col, [dict(r) for r in rows])
+
     def update(self, game_id: Any, game_data: GameUpdate) -> GameRead | None:
         update_doc = game_data.model_dump(exclude_unset=True)
         res = self.col.update_one({"_id": game_id}, {"$set": update_doc})
@@ -71,9 +218,20 @@ class GameRepositoryMongo(IGameRepository):
             return None
         return self.get(game_id)
 
-    def get_detail(self, game_id: Any) -> GameDetail | None:
+    def get_detail(
+        self, game_id: Any, fields: tuple[str, ...] | None = None
+    ) -> GameDetail | dict | None:
         """Return a game with all related embedded documents"""
-        doc = self.col.find_one({"_id": int(game_id)})
+        projection = self._projection(fields, GameDetail)
+        doc = self.col.find_one({"_id": int(game_id)}, projection)
+        return self._doc_to_detail_row(doc, fields)
+
+    def _doc_to_detail_row(self, doc: dict | None, fields: tuple[str, ...] | None):
+        if fields is None:
+            return self._doc_to_detail(doc)
+        return self._doc_to_fields(doc, fields) if doc else None
+
+    def _doc_to_detail(self, doc: dict | None) -> GameDetail | None:
         if not doc:
             return None
 
@@ -103,5 +261,9 @@ class GameRepositoryMongo(IGameRepository):
         return GameDetail.model_validate(game_data)
 
     def delete(self, game_id: Any) -> bool:
-        res = self.col.delete_one({"_id": game_id})
-        return res.deleted_count == 1
+        res = self.col.delete_one({"_id": int(game_id)})
+        if res.deleted_count != 1:
+            return False
+        # the game's reviews are left to the purger
+        self.tombstones.insert_one(tombstone("game", game_id))
+        return True
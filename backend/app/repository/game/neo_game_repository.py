@@ -1,3 +1,7 @@
+import re
+from collections.abc import Iterator
+from typing import Any
+
 from neo4j import Driver
 
 from app.repository.game.i_game_repository import IGameRepository
@@ -6,6 +10,17 @@ from app.schema.designer_schema import DesignerRead
 from app.schema.game_schema import GameCreate, GameDetail, GameRead, GameUpdate
 from app.schema.mechanic_schema import MechanicRead
 from app.schema.publisher_schema import PublisherRead
+from app.utility.db_neo import create_nodes
+from app.utility.review_aggregates import NEO_STAR_PROPS, neo_histogram
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+# characters with a meaning in Lucene query syntax
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+
+def lucene_escape(query: str) -> str:
+    """Treat user input as plain terms in a full-text index query."""
+    return _LUCENE_SPECIAL.sub(r"\\\1", query)
 
 
 class GameRepositoryNeo(IGameRepository):
@@ -14,11 +29,131 @@ class GameRepositoryNeo(IGameRepository):
         "year_published": "g.year_published",
         "playing_time": "g.playing_time",
         "name": "g.name",
+        "user_rating": "g.user_rating",
+    }
+    DEFAULT_SORT = "name"
+
+    CREATE_QUERY = """
+        CREATE (g:Game {
+            id: $id,
+            name: $name,
+            slug: $slug,
+            year_published: $year_published,
+            bgg_rating: $bgg_rating,
+            difficulty_rating: $difficulty_rating,
+            description: $description,
+            playing_time: $playing_time,
+            available: $available,
+            min_players: $min_players,
+            max_players: $max_players,
+            image: $image,
+            thumbnail: $thumbnail
+        })
+    """
+
+    DETAIL_QUERY = """
+        MATCH (g:Game {id: $id})
+        OPTIONAL MATCH (g)-[:ART_BY]->(a:Artist)
+        OPTIONAL MATCH (g)-[:DESIGNED_BY]->(d:Designer)
+        OPTIONAL MATCH (g)-[:PUBLISHED_BY]->(p:Publisher)
+        OPTIONAL MATCH (g)-[:USES_MECHANIC]->(m:Mechanic)
+        RETURN g,
+            collect(DISTINCT a) AS artists,
+            collect(DISTINCT d) AS designers,
+            collect(DISTINCT p) AS publishers,
+            collect(DISTINCT m) AS mechanics
+    """
+
+    # the label swap hides the node from every (g:Game) match and index at once;
+    # the purger removes its reviews and videos, then the node
+    DELETE_QUERY = """
+        MATCH (g:Game {id: $id})
+        REMOVE g:Game
+        SET g:DeletedGame, g.deleted_at = datetime()
+        RETURN count(g) AS deleted
+    """
+
+    EXPORT_QUERY = """
+        MATCH (g:Game)
+        WHERE g.id > $after
+        RETURN {returns}
+        ORDER BY g.id
+    """
+
+    GET_MANY_QUERY = "MATCH (g:Game) WHERE g.id IN $ids RETURN {returns}"
+
+    # relationship type -> LINK_KINDS name
+    FEATURE_RELATIONSHIPS = {
+        "USES_MECHANIC": "mechanics",
+        "IN_GENRE": "genres",
+        "DESIGNED_BY": "designers",
+        "ART_BY": "artists",
+        "PUBLISHED_BY": "publishers",
+    }
+
+    FEATURES_QUERY = """
+        MATCH (g:Game)-[r:{types}]->(x)
+        RETURN g.id AS game_id, type(r) AS rel, x.id AS feature_id
+    """
+
+    SEARCH_QUERY = """
+        CALL db.index.fulltext.queryNodes('game_search', $search)
+        YIELD node AS g, score
+        WITH g, score ORDER BY score DESC, g.id ASC SKIP $skip LIMIT $limit
+        RETURN {returns}
+    """
+
+    SEARCH_COUNT_QUERY = """
+        CALL db.index.fulltext.queryNodes('game_search', $search)
+        YIELD node
+        RETURN count(node) AS count
+    """
+
+    # pattern comprehensions for the related nodes a sparse detail asks for
+    RELATION_PATTERNS = {
+        "artists": ("(g)-[:ART_BY]->(x:Artist)", ArtistRead),
+        "designers": ("(g)-[:DESIGNED_BY]->(x:Designer)", DesignerRead),
+        "publishers": ("(g)-[:PUBLISHED_BY]->(x:Publisher)", PublisherRead),
+        "mechanics": ("(g)-[:USES_MECHANIC]->(x:Mechanic)", MechanicRead),
     }
 
     def __init__(self, driver: Driver):
         self.driver = driver
 
+    @staticmethod
+    def _map(var: str, fields) -> str:
+        return var + " {" + ", ".join(f".{f}" for f in fields) + "}"
+
+    def _returns(self, fields: tuple[str, ...] | None) -> str:
+        # a map projection, so unrequested properties never leave the database
+        return "g" if fields is None else self._map("g", fields) + " AS g"
+
+    def _search_query(self, fields: tuple[str, ...] | None) -> str:
+        return self.SEARCH_QUERY.format(returns=self._returns(fields))
+
+    def _detail_query(self, fields: tuple[str, ...] | None) -> str:
+        if fields is None:
+            return self.DETAIL_QUERY
+
+        columns = [f for f in fields if f not in self.DETAIL_RELATIONS]
+        if "star_histogram" in columns:
+            # stored as one property per star amount
+            columns.remove("star_histogram")
+            columns += NEO_STAR_PROPS
+        returns = [self._returns(columns)]
+        for name in fields:
+            if name in self.RELATION_PATTERNS:
+                pattern, model = self.RELATION_PATTERNS[name]
+                returns.append(
+                    f"[{pattern} | {self._map('x', model.model_fields)}] AS {name}"
+                )
+        return "MATCH (g:Game {id: $id}) RETURN " + ", ".join(returns)
+
+    def _record_to_row(self, record, fields: tuple[str, ...] | None):
+        if fields is None:
+            return self._doc_to_game(record["g"])
+        return dict(record["g"])
+
     def _doc_to_game(self, record: dict) -> GameRead:
         if not record:
             return None
@@ -31,15 +166,53 @@ class GameRepositoryNeo(IGameRepository):
             session.write_transaction(self._create_node, game_data)
         return GameRead(id=game_data.id or 0, **game_data.model_dump())
 
-    def get(self, game_id: int) -> GameRead | None:
+    def create_many(self, rows):
         with self.driver.session() as session:
-            query = "MATCH (g:Game) WHERE g.id = $game_id RETURN g"
+            return session.execute_write(create_nodes, "Game", rows)
+
+    def get(
+        self, game_id: int, fields: tuple[str, ...] | None = None
+    ) -> GameRead | dict | None:
+        with self.driver.session() as session:
+            query = (
+                f"MATCH (g:Game) WHERE g.id = $game_id RETURN {self._returns(fields)}"
+            )
             # casting to int is apparently important
             record = session.run(query, game_id=int(game_id)).single()
             if record:
-                return self._doc_to_game(record["g"])
+                return self._record_to_row(record, fields)
         return None
 
+    def get_many(self, game_ids: list[int], fields: tuple[str, ...]) -> list[dict]:
+        query = self.GET_MANY_QUERY.format(returns=self._returns(fields))
+        with self.driver.session() as session:
+            rows = [dict(record["g"]) for record in session.run(query, ids=game_ids)]
+        return self._in_order(rows, game_ids)
+
+    def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[GameRead], int | None]:
+        search = lucene_escape(query)
+
+        with self.driver.session() as session:
+            records = session.run(
+                self._search_query(fields), search=search, skip=offset, limit=limit
+            )
+            games = [self._record_to_row(record, fields) for record in records]
+
+            def count():
+                count_res = session.run(self.SEARCH_COUNT_QUERY, search=search).single()
+                return count_res["count"] if count_res else 0
+
+            total = totals.resolve(count)
+
+            return games, total
+
     def list(
         self,
         offset: int,
@@ -47,32 +220,120 @@ class GameRepositoryNeo(IGameRepository):
         search: str | None = None,
         sort_by: str | None = None,
         sort_order: str = "desc",
-    ) -> tuple[list[GameRead], int]:
+        after: tuple[Any, int] | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[GameRead], int | None]:
+        query, count_query, params = self._list_queries(
+            offset, limit, search, sort_by, sort_order, after, fields
+        )
+
         with self.driver.session() as session:
-            params = {"skip": offset, "limit": limit}
+            records = session.run(query, **params)
+            games = [self._record_to_row(record, fields) for record in records]
 
-            query = "MATCH (g:Game)"
-            if search:
-                query += " WHERE g.name CONTAINS $search"
-                params["search"] = search
+            def count():
+                count_res = session.run(
+                    count_query, **({"search": search} if search else {})
+                ).single()
+                return count_res["count"] if count_res else 0
 
-            if sort_by in self.SORT_FIELDS:
-                order = "DESC" if sort_order == "desc" else "ASC"
-                query += f" RETURN g ORDER BY {self.SORT_FIELDS[sort_by]} {order} SKIP $skip LIMIT $limit"
-            else:
-                query += " RETURN g ORDER BY g.name ASC SKIP $skip LIMIT $limit"
+            # an unfiltered label count is served from the count store
+            total = totals.resolve(count, None if search else count)
 
-            records = session.run(query, **params)
-            games = [self._doc_to_game(record["g"]) for record in records]
+            return games, total
 
-            count_query = "MATCH (g:Game)"
-            if search:
-                count_query += " WHERE g.name CONTAINS $search"
-            count_query += " RETURN count(g) AS count"
-            count_res = session.run(count_query, **({"search": search} if search else {})).single()
-            total = count_res["count"] if count_res else 0
+    def _ascending(self, sort_by: str | None, sort_order: str) -> bool:
+        if sort_by not in self.SORT_FIELDS:
+            return True
+        return sort_order != "desc"
 
-            return games, total
+    def _after_clause(
+        self, sort_by: str | None, sort_order: str, after: tuple[Any, int]
+    ) -> str:
+        value, _ = after
+        ascending = self._ascending(sort_by, sort_order)
+        op = ">" if ascending else "<"
+        id_beyond = f"g.id {op} $after_id"
+
+        field = self.SORT_FIELDS[self.cursor_field(sort_by)]
+        # Neo4j sorts null after any value
+        if value is None:
+            clause = f"({field} IS NULL AND {id_beyond})"
+            return clause if ascending else f"({clause} OR {field} IS NOT NULL)"
+
+        clause = (
+            f"({field} {op} $after_value OR ({field} = $after_value AND {id_beyond}))"
+        )
+        return f"({clause} OR {field} IS NULL)" if ascending else clause
+
+    def _list_queries(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        sort_by: str | None,
+        sort_order: str,
+        after: tuple[Any, int] | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[str, str, dict]:
+        params = {"skip": offset, "limit": limit}
+
+        where = []
+        if search:
+            where.append("g.name CONTAINS $search")
+            params["search"] = search
+
+        count_query = "MATCH (g:Game)"
+        if where:
+            count_query += " WHERE " + " AND ".join(where)
+        count_query += " RETURN count(g) AS count"
+
+        if after is not None:
+            where.append(self._after_clause(sort_by, sort_order, after))
+            params["after_value"], params["after_id"] = after
+
+        query = "MATCH (g:Game)"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+
+        # g.id breaks ties so the order is stable for both skip and keyset paging
+        order = "ASC" if self._ascending(sort_by, sort_order) else "DESC"
+        field = self.SORT_FIELDS[self.cursor_field(sort_by)]
+        query += (
+            f" WITH g ORDER BY {field} {order}, g.id {order} SKIP $skip LIMIT $limit"
+        )
+        query += f" RETURN {self._returns(fields)}"
+
+        return query, count_query, params
+
+    def iter_names(self) -> Iterator[tuple[int, str, float | None]]:
+        query = (
+            "MATCH (g:Game) RETURN g.id AS id, g.name AS name, g.bgg_rating AS rating"
+        )
+        with self.driver.session() as session:
+            for record in session.run(query):
+                yield record["id"], record["name"], record["rating"]
+
+    def iter_features(self, kinds=None) -> Iterator[tuple[int, str, int]]:
+        kinds = kinds or self.FEATURE_KINDS
+        types = "|".join(
+            rel for rel, kind in self.FEATURE_RELATIONSHIPS.items() if kind in kinds
+        )
+        with self.driver.session() as session:
+            for record in session.run(self.FEATURES_QUERY.format(types=types)):
+                kind = self.FEATURE_RELATIONSHIPS[record["rel"]]
+                yield record["game_id"], kind, record["feature_id"]
+
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        query = self.EXPORT_QUERY.format(returns=self._returns(fields))
+        # records are pulled fetch_size at a time as the caller iterates
+        with self.driver.session(fetch_size=batch_size) as session:
+            after = -1 if after is None else after
+            for record in session.run(query, after=after):
+                yield dict(record["g"])
 
     def update(self, game_id: int, game_data: GameUpdate) -> GameRead | None:
         update_fields = game_data.model_dump(exclude_unset=True)
@@ -90,63 +351,42 @@ class GameRepositoryNeo(IGameRepository):
 
     def delete(self, game_id: int) -> bool:
         with self.driver.session() as session:
-            res = session.run(
-                "MATCH (g:Game {id: $id}) DETACH DELETE g RETURN COUNT(g) AS deleted",
-                id=game_id,
-            ).single()
+            res = session.run(self.DELETE_QUERY, id=int(game_id)).single()
             return res["deleted"] > 0 if res else False
 
-    @staticmethod
-    def _create_node(tx, game_data: GameCreate):
-        query = """
-        CREATE (g:Game {
-            id: $id,
-            name: $name,
-            slug: $slug,
-            year_published: $year_published,
-            bgg_rating: $bgg_rating,
-            difficulty_rating: $difficulty_rating,
-            description: $description,
-            playing_time: $playing_time,
-            available: $available,
-            min_players: $min_players,
-            max_players: $max_players,
-            image: $image,
-            thumbnail: $thumbnail
-        })
-        """
-
-        tx.run(query, **game_data.model_dump())
+    @classmethod
+    def _create_node(cls, tx, game_data: GameCreate):
+        tx.run(cls.CREATE_QUERY, **game_data.model_dump())
 
-    def get_detail(self, game_id: int) -> GameDetail | None:
+    def get_detail(
+        self, game_id: int, fields: tuple[str, ...] | None = None
+    ) -> GameDetail | dict | None:
         """Return a game with all related nodes (artists, designers, publishers, mechanics)."""
         with self.driver.session() as session:
-            query = """
-            MATCH (g:Game {id: $id})
-            OPTIONAL MATCH (g)-[:ART_BY]->(a:Artist)
-            OPTIONAL MATCH (g)-[:DESIGNED_BY]->(d:Designer)
-            OPTIONAL MATCH (g)-[:PUBLISHED_BY]->(p:Publisher)
-            OPTIONAL MATCH (g)-[:USES_MECHANIC]->(m:Mechanic)
-            RETURN g,
-                collect(DISTINCT a) AS artists,
-                collect(DISTINCT d) AS designers,
-                collect(DISTINCT p) AS publishers,
-                collect(DISTINCT m) AS mechanics
-            """
-            record = session.run(query, id=int(game_id)).single()
-            if not record:
-                return None
-
-            g = self._doc_to_game(record["g"])
-            return GameDetail.model_validate(
-                {
-                    **g.model_dump(),
-                    "artists": list(record["artists"]),
-                    "designers": list(record["designers"]),
-                    "publishers": list(record["publishers"]),
-                    "mechanics": list(record["mechanics"]),
-                }
-            )
+            record = session.run(self._detail_query(fields), id=int(game_id)).single()
+            return self._record_to_detail(record, fields)
+
+    def _record_to_detail(
+        self, record, fields: tuple[str, ...] | None = None
+    ) -> GameDetail | dict | None:
+        if not record:
+            return None
+        if fields is not None:
+            row = {**record["g"], **{k: record[k] for k in record.keys() if k != "g"}}
+            row["star_histogram"] = neo_histogram(row)
+            return {f: row.get(f) for f in fields}
+
+        g = self._doc_to_game(record["g"])
+        return GameDetail.model_validate(
+            {
+                **g.model_dump(),
+                "star_histogram": neo_histogram(record["g"]),
+                "artists": list(record["artists"]),
+                "designers": list(record["designers"]),
+                "publishers": list(record["publishers"]),
+                "mechanics": list(record["mechanics"]),
+            }
+        )
 
     @staticmethod
     def _get_node(tx, game_id: int):
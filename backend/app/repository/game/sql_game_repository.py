@@ -1,8 +1,21 @@
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+from datetime import UTC, datetime
 
-from app.model.game_model import Game
+from sqlalchemy import and_, case, literal, or_, select, union_all, update
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import load_only, selectinload
+
+from app.model.game_model import (
+    Game,
+    game_artists,
+    game_designers,
+    game_genres,
+    game_mechanics,
+    game_publishers,
+)
 from app.repository.game.i_game_repository import IGameRepository
+from app.utility.db_sql import count_rows, estimate_row_count, insert_many, iter_rows
+from app.utility.outbox import record_change
+from app.utility.totals import EXACT_TOTAL
 
 
 class GameRepositorySQL(IGameRepository):
@@ -11,30 +24,171 @@ class GameRepositorySQL(IGameRepository):
         "year_published": Game.year_published.desc(),
         "playing_time": Game.playing_time.asc(),
         "name": Game.name.asc(),
+        "user_rating": Game.user_rating.desc(),
+    }
+
+    # soft-deleted games wait for the purger; every read leaves them out
+    ALIVE = Game.deleted_at.is_(None)
+
+    # LINK_KINDS name -> (association table, linked id column)
+    FEATURE_TABLES = {
+        "mechanics": (game_mechanics, "mechanic_id"),
+        "genres": (game_genres, "genre_id"),
+        "designers": (game_designers, "designer_id"),
+        "artists": (game_artists, "artist_id"),
+        "publishers": (game_publishers, "publisher_id"),
     }
 
     def __init__(self, db):
         self.db = db
 
-    def get(self, game_id):
-        return self.db.get(Game, game_id)
+    def _get_stmt(self, game_id):
+        return select(Game).where(Game.id == game_id, self.ALIVE)
+
+    def get(self, game_id, fields=None):
+        if fields is None:
+            return self.db.execute(self._get_stmt(game_id)).scalars().first()
+        stmt = self._columns(self._get_stmt(game_id), fields)
+        row = self.db.execute(stmt).mappings().first()
+        return dict(row) if row else None
+
+    def _get_many_stmt(self, game_ids, fields):
+        stmt = select(Game).where(Game.id.in_(game_ids), self.ALIVE)
+        return self._columns(stmt, fields)
+
+    def get_many(self, game_ids, fields):
+        result = self.db.execute(self._get_many_stmt(game_ids, fields))
+        return self._in_order(self._rows(result, fields), game_ids)
 
-    def list(self, offset, limit, search, sort_by, sort_order="desc"):
-        stmt = select(Game)
+    def _columns(self, stmt, fields):
+        # only the requested columns are selected; rows then come back as dicts
+        if fields is None:
+            return stmt
+        return stmt.with_only_columns(*(getattr(Game, f) for f in fields))
+
+    def _rows(self, result, fields):
+        if fields is None:
+            return result.scalars().all()
+        keys = list(result.keys())
+        return [dict(zip(keys, row, strict=True)) for row in result]
+
+    def _ascending(self, sort_by, sort_order):
+        if sort_by not in self.SORT_FIELDS:
+            return True
+        return sort_order == "desc"
+
+    def _list_stmt(self, search, sort_by, sort_order):
+        stmt = select(Game).where(self.ALIVE)
 
         if search:
             stmt = stmt.where(Game.name.ilike(f"%{search}%"))
 
+        # id breaks ties so the order is stable for both offset and keyset paging
+        ascending = self._ascending(sort_by, sort_order)
         if sort_by in self.SORT_FIELDS:
             col = getattr(Game, sort_by)
-            stmt = stmt.order_by(col.asc() if sort_order == "desc" else col.desc())
+            stmt = stmt.order_by(col.asc() if ascending else col.desc())
+        stmt = stmt.order_by(Game.id.asc() if ascending else Game.id.desc())
+
+        return stmt
+
+    def _after_clause(self, sort_by, sort_order, after):
+        value, last_id = after
+        ascending = self._ascending(sort_by, sort_order)
+        id_beyond = Game.id > last_id if ascending else Game.id < last_id
 
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
-        rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
+        field = self.cursor_field(sort_by)
+        if field is None:
+            return id_beyond
+
+        col = getattr(Game, field)
+        # MySQL and SQLite sort NULL before any value
+        if value is None:
+            clause = and_(col.is_(None), id_beyond)
+            return or_(clause, col.is_not(None)) if ascending else clause
+
+        beyond = col > value if ascending else col < value
+        clause = or_(beyond, and_(col == value, id_beyond))
+        return clause if ascending else or_(clause, col.is_(None))
+
+    def _page_stmt(self, stmt, offset, limit, sort_by, sort_order, after):
+        if after is not None:
+            stmt = stmt.where(self._after_clause(sort_by, sort_order, after))
+        return stmt.offset(offset).limit(limit)
+
+    def list(
+        self,
+        offset,
+        limit,
+        search,
+        sort_by,
+        sort_order="desc",
+        after=None,
+        totals=EXACT_TOTAL,
+        fields=None,
+    ):
+        stmt = self._list_stmt(search, sort_by, sort_order)
+
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "game"),
+        )
+        page = self._page_stmt(stmt, offset, limit, sort_by, sort_order, after)
+        rows = self._rows(self.db.execute(self._columns(page, fields)), fields)
         return rows, total
 
+    def _search_stmt(self, query, dialect):
+        if dialect == "mysql":
+            score = match(Game.name, Game.description, against=query)
+            score = score.in_natural_language_mode()
+            return (
+                select(Game)
+                .where(score > 0, self.ALIVE)
+                .order_by(score.desc(), Game.id.asc())
+            )
+
+        # no full-text index elsewhere (SQLite in tests): substring match with
+        # names that start with the query ranked first
+        pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        prefix = case((Game.name.ilike(f"{pattern}%", escape="\\"), 0), else_=1)
+        return (
+            select(Game)
+            .where(Game.name.ilike(f"%{pattern}%", escape="\\"), self.ALIVE)
+            .order_by(prefix, Game.name.asc(), Game.id.asc())
+        )
+
+    def search(self, query, offset, limit, totals=EXACT_TOTAL, fields=None):
+        stmt = self._search_stmt(query, self.db.get_bind().dialect.name)
+
+        total = totals.resolve(lambda: count_rows(self.db, stmt))
+        page = self._columns(stmt.offset(offset).limit(limit), fields)
+        return self._rows(self.db.execute(page), fields), total
+
+    def iter_names(self):
+        stmt = select(Game.id, Game.name, Game.bgg_rating).where(self.ALIVE)
+        for row in self.db.execute(stmt.execution_options(yield_per=5000)):
+            yield row.id, row.name, row.bgg_rating
+
+    def iter_export(self, fields, after=None, batch_size=1000):
+        yield from iter_rows(self.db, Game, fields, after, batch_size, self.ALIVE)
+
+    def iter_features(self, kinds=None):
+        tables = {k: self.FEATURE_TABLES[k] for k in kinds or self.FEATURE_KINDS}
+        stmt = union_all(
+            *(
+                select(
+                    table.c.game_id,
+                    literal(kind).label("kind"),
+                    table.c[column].label("feature_id"),
+                )
+                .join_from(table, Game, Game.id == table.c.game_id)
+                .where(self.ALIVE)
+                for kind, (table, column) in tables.items()
+            )
+        )
+        for row in self.db.execute(stmt.execution_options(yield_per=5000)):
+            yield row.game_id, row.kind, row.feature_id
+
     def create(self, game_data):
         obj = Game(**game_data)
         self.db.add(obj)
@@ -42,6 +196,23 @@ class GameRepositorySQL(IGameRepository):
         self.db.refresh(obj)
         return obj
 
+    @staticmethod
+    def _insert_many(db, rows):
+        ids = insert_many(db, Game, rows)
+        # a Core insert, so the outbox flush hooks do not see it
+        for game_id in ids:
+            record_change(db, "game", game_id)
+        return ids
+
+    def create_many(self, rows):
+        try:
+            ids = self._insert_many(self.db, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ids
+
     def update(self, game_id, game_data):
         obj = self.get(game_id)
         if not obj:
@@ -54,40 +225,49 @@ class GameRepositorySQL(IGameRepository):
         self.db.refresh(obj)
         return obj
 
+    def _delete_stmt(self, game_id):
+        # O(1) whatever the game has; reviews, videos and links go in the purger
+        return (
+            update(Game)
+            .where(Game.id == game_id, self.ALIVE)
+            .values(deleted_at=datetime.now(UTC).replace(tzinfo=None))
+            .execution_options(synchronize_session=False)
+        )
+
     def delete(self, game_id):
         try:
-            obj = self.get(game_id)
-            if not obj:
-                return False
-
-            for review in obj.reviews:
-                self.db.delete(review)
-
-            for video in obj.videos:
-                self.db.delete(video)
-
-            obj.artists.clear()
-            obj.designers.clear()
-            obj.publishers.clear()
-            obj.mechanics.clear()
-            obj.genres.clear()
-
-            self.db.delete(obj)
+            deleted = self.db.execute(self._delete_stmt(game_id)).rowcount == 1
+            if deleted:
+                # outbox targets drop their copy, as the game reads as gone
+                record_change(self.db, "game", int(game_id), "delete")
             self.db.commit()
-            return True
+            return deleted
         except Exception:
             self.db.rollback()
             raise
 
-    def get_detail(self, game_id):
-        stmt = (
-            select(Game)
-            .options(
-                selectinload(Game.artists),
-                selectinload(Game.designers),
-                selectinload(Game.publishers),
-                selectinload(Game.mechanics),
+    def _detail_stmt(self, game_id, fields=None):
+        if fields is None:
+            return (
+                select(Game)
+                .options(
+                    selectinload(Game.artists),
+                    selectinload(Game.designers),
+                    selectinload(Game.publishers),
+                    selectinload(Game.mechanics),
+                )
+                .where(Game.id == game_id, self.ALIVE)
             )
-            .where(Game.id == game_id)
+
+        # unrequested columns stay deferred and unrequested relations unloaded
+        columns = [getattr(Game, f) for f in fields if f not in self.DETAIL_RELATIONS]
+        relations = [getattr(Game, f) for f in fields if f in self.DETAIL_RELATIONS]
+        return (
+            select(Game)
+            .options(load_only(*columns), *(selectinload(r) for r in relations))
+            .where(Game.id == game_id, self.ALIVE)
         )
+
+    def get_detail(self, game_id, fields=None):
+        stmt = self._detail_stmt(game_id, fields)
         return self.db.execute(stmt).scalars().first()
@@ -1,24 +1,45 @@
 import os
 
-from app.repository.genre.mongo_genre_repository import GenreRepositoryMongo
-from app.repository.genre.neo_genre_repository import GenreRepositoryNeo
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
 from app.repository.genre.sql_genre_repository import SQLGenreRepository
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
 from app.utility.db_sql import get_sql_db
 
 DB_MODE = os.getenv("DB_MODE", "sql").lower()
 
 
-def get_genre_repository():
+def _mongo_repository():
+    from app.repository.genre.mongo_genre_repository import GenreRepositoryMongo
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return GenreRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.genre.neo_genre_repository import GenreRepositoryNeo
+    from app.utility.db_neo import get_neo
+
+    db = get_neo()
+    return GenreRepositoryNeo(db)
+
+
+def get_genre_repository(sql_db: Session = Depends(get_sql_db)):
     if DB_MODE == "sql":
-        db = next(get_sql_db())
-        return SQLGenreRepository(db)
+        return SQLGenreRepository(sql_db)
     elif DB_MODE == "mongo":
-        db = next(get_mongo_db())
-        return GenreRepositoryMongo(db)
+        return _mongo_repository()
     elif DB_MODE == "neo":
-        db = get_neo()
-        return GenreRepositoryNeo(db)
+        return _neo_repository()
+    elif DB_MODE == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "genre",
+            SQLGenreRepository(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {DB_MODE}")
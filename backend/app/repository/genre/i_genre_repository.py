@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
 
 class IGenreRepository(ABC):
     @abstractmethod
@@ -15,11 +17,16 @@ class IGenreRepository(ABC):
         offset: int,
         limit: int,
         search: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ): ...
 
     @abstractmethod
     def create(self, genre_data): ...
 
+    @abstractmethod
+    def create_many(self, rows):
+        """Inserts ``rows`` as one batch and returns their new ids in order."""
+
     @abstractmethod
     def update(self, genre_id: Any, genre_data): ...
 
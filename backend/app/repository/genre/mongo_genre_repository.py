@@ -1,7 +1,7 @@
-
 from pymongo.collection import Collection
 
 from app.repository.genre.i_genre_repository import IGenreRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class GenreRepositoryMongo(IGenreRepository):
@@ -52,38 +52,42 @@ class GenreRepositoryMongo(IGenreRepository):
         return doc
 
     def list(
-		self,
-		offset: int,
-		limit: int,
-		search: str | None,
-		sort_order: str | None = "asc",
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         sort_dir = 1 if (sort_order or "asc") == "asc" else -1
 
         match_stage = {}
         if search:
             match_stage["genres.name"] = {
-				"$regex": search,
-				"$options": "i",
-			}
+                "$regex": search,
+                "$options": "i",
+            }
 
         count_pipeline = [
-			{"$unwind": "$genres"},
-			{"$match": match_stage} if match_stage else {"$match": {}},
-			{"$count": "total"},
-		]
+            {"$unwind": "$genres"},
+            {"$match": match_stage} if match_stage else {"$match": {}},
+            {"$count": "total"},
+        ]
 
-        count_result = list(self.games.aggregate(count_pipeline))
-        total = count_result[0]["total"] if count_result else 0
+        def count():
+            count_result = list(self.games.aggregate(count_pipeline))
+            return count_result[0]["total"] if count_result else 0
+
+        total = totals.resolve(count)
 
         pipeline = [
-			{"$unwind": "$genres"},
-			{"$match": match_stage} if match_stage else {"$match": {}},
-			{"$sort": {"genres.name": sort_dir}},
-			{"$skip": offset},
-			{"$limit": limit},
-			{"$replaceRoot": {"newRoot": "$genres"}},
-		]
+            {"$unwind": "$genres"},
+            {"$match": match_stage} if match_stage else {"$match": {}},
+            {"$sort": {"genres.name": sort_dir}},
+            {"$skip": offset},
+            {"$limit": limit},
+            {"$replaceRoot": {"newRoot": "$genres"}},
+        ]
 
         docs = list(self.games.aggregate(pipeline))
         return [self._doc(d) for d in docs], total
@@ -101,10 +105,13 @@ class GenreRepositoryMongo(IGenreRepository):
         doc["_id"] = res.inserted_id
         return self._doc(doc)
 
-    def update(self, genre_id: int, genre_data: dict):
-        res = self.col.update_one(
-            {"id": int(genre_id)}, {"$set": dict(genre_data)}
+    def create_many(self, rows):
+        raise NotImplementedError(
+            "Genres are embedded in games in Mongo. Create them by updating game documents."
         )
+
+    def update(self, genre_id: int, genre_data: dict):
+        res = self.col.update_one({"id": int(genre_id)}, {"$set": dict(genre_data)})
         if res.matched_count == 0:
             return None
         return self.get(genre_id)
@@ -1,6 +1,10 @@
-from app.repository.genre.i_genre_repository import IGenreRepository
 from neo4j import Driver
 
+from app.repository.genre.i_genre_repository import IGenreRepository
+from app.utility.db_neo import create_nodes
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+
 class GenreRepositoryNeo(IGenreRepository):
     def __init__(self, driver: Driver):
         self.driver = driver
@@ -40,6 +44,7 @@ class GenreRepositoryNeo(IGenreRepository):
         limit: int,
         search: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         with self.driver.session() as session:
             base = "MATCH (p:Genre)"
@@ -63,11 +68,14 @@ class GenreRepositoryNeo(IGenreRepository):
             records = session.run(query, **params)
             items = [self._node(r["p"]) for r in records]
 
-            count_q = base + where + " RETURN count(p) AS count"
-            count_res = session.run(
-                count_q, **({"search": search} if search else {})
-            ).single()
-            total = count_res["count"] if count_res else 0
+            def count():
+                count_q = base + where + " RETURN count(p) AS count"
+                count_res = session.run(
+                    count_q, **({"search": search} if search else {})
+                ).single()
+                return count_res["count"] if count_res else 0
+
+            total = totals.resolve(count, None if search else count)
 
             return items, total
 
@@ -84,6 +92,10 @@ class GenreRepositoryNeo(IGenreRepository):
             )
         return dict(genre_data)
 
+    def create_many(self, rows):
+        with self.driver.session() as session:
+            return session.execute_write(create_nodes, "Genre", rows)
+
     def update(self, genre_id: int, genre_data: dict):
         with self.driver.session() as session:
             rec = session.run(
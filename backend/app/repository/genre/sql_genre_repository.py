@@ -1,8 +1,10 @@
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.model.genre_model import Genre
 from app.repository.genre.i_genre_repository import IGenreRepository
+from app.utility.db_sql import count_rows, estimate_row_count, insert_many
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class SQLGenreRepository(IGenreRepository):
@@ -18,15 +20,20 @@ class SQLGenreRepository(IGenreRepository):
         ).scalar_one_or_none()
 
     def list(
-        self, offset: int = 0, limit: int = 50, search: str | None = None
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ) -> tuple[list[Genre], int]:
         stmt = select(Genre)
         if search:
             like = f"%{search}%"
             stmt = stmt.where(Genre.name.ilike(like))
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "genre"),
+        )
         rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
         return rows, total
 
@@ -35,6 +42,15 @@ class SQLGenreRepository(IGenreRepository):
         self.db.commit()
         return genre
 
+    def create_many(self, rows):
+        try:
+            ids = insert_many(self.db, Genre, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ids
+
     def update(self, genre: Genre) -> Genre:
         self.db.merge(genre)
         self.db.commit()
@@ -0,0 +1,329 @@
+import asyncio
+import inspect
+import os
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager, suppress
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# read operations served by another store than MySQL, as "<entity>.<method>"
+DEFAULT_ROUTES = {"game.get_detail": "mongo"}
+HYBRID_BACKENDS = ("sql", "mongo", "neo")
+# only reads may be routed; everything else, writes included, stays on SQL
+READ_PREFIXES = ("get", "list", "search", "iter")
+# share of routed reads also run against the other backends, to compare them
+HYBRID_SHADOW_RATE = float(os.getenv("HYBRID_SHADOW_RATE", "0"))
+# latencies kept per operation and backend for the percentiles
+HYBRID_SAMPLES = int(os.getenv("HYBRID_SAMPLES", "1000"))
+# shadow reads run at once, off the request path
+HYBRID_SHADOW_WORKERS = int(os.getenv("HYBRID_SHADOW_WORKERS", "2"))
+# shadow reads allowed to wait for a worker before new ones are dropped
+HYBRID_SHADOW_QUEUE = int(os.getenv("HYBRID_SHADOW_QUEUE", "32"))
+
+
+def parse_routes(spec: str | None) -> dict[str, str]:
+    """DEFAULT_ROUTES overridden by ``game.list=neo,review.list_by_game=mongo``.
+
+    Raises ValueError for unknown backends and for methods that are not reads.
+    """
+    routes = dict(DEFAULT_ROUTES)
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        operation, _, backend = item.partition("=")
+        entity, _, method = operation.strip().partition(".")
+        backend = backend.strip().lower()
+        if not entity or not method or backend not in HYBRID_BACKENDS:
+            raise ValueError(f"Invalid HYBRID_ROUTES entry: {item!r}")
+        if not method.startswith(READ_PREFIXES):
+            raise ValueError(f"Only reads can be routed, not {operation!r}")
+        routes[f"{entity}.{method}"] = backend
+    return routes
+
+
+HYBRID_ROUTES = parse_routes(os.getenv("HYBRID_ROUTES"))
+
+
+class HybridStats:
+    """Latency per (operation, backend), served and shadow calls alike."""
+
+    def __init__(self, samples: int):
+        self.samples = samples
+        self._lock = threading.Lock()
+        # (operation, backend) -> [calls, errors, shadow calls, recent seconds]
+        self._series: dict[tuple[str, str], list] = {}
+
+    def record(
+        self, operation: str, backend: str, seconds: float, error: bool, shadow: bool
+    ) -> None:
+        with self._lock:
+            series = self._series.get((operation, backend))
+            if series is None:
+                series = self._series[(operation, backend)] = [
+                    0,
+                    0,
+                    0,
+                    deque(maxlen=self.samples),
+                ]
+            series[0] += 1
+            series[1] += error
+            series[2] += shadow
+            series[3].append(seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            series = [
+                (k, n, e, s, sorted(d)) for k, (n, e, s, d) in self._series.items()
+            ]
+        operations: dict[str, dict] = {}
+        for (operation, backend), calls, errors, shadow, latencies in series:
+            operations.setdefault(operation, {})[backend] = {
+                "served_by": HYBRID_ROUTES.get(operation, "sql") == backend,
+                "calls": calls,
+                "shadow_calls": shadow,
+                "errors": errors,
+                "p50_ms": _percentile_ms(latencies, 0.50),
+                "p95_ms": _percentile_ms(latencies, 0.95),
+            }
+        return {
+            "routes": dict(HYBRID_ROUTES),
+            "shadow_rate": HYBRID_SHADOW_RATE,
+            "shadows": shadow_runner.snapshot(),
+            "operations": operations,
+        }
+
+
+def _percentile_ms(latencies: list[float], q: float) -> float:
+    if not latencies:
+        return 0.0
+    return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
+
+
+class ShadowRunner:
+    """Shadow reads on a small executor of their own, after the response.
+
+    Only ``workers`` shadows run at once and at most ``max_queue`` more may
+    wait; beyond that a shadow is dropped and counted, since it only
+    measures. Async shadows are tasks on the request's event loop, bounded
+    by the same count.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # running tasks, so they are not garbage collected half way
+        self._tasks: set[asyncio.Task] = set()
+        self.pending = 0
+        self.completed = 0
+        self.dropped = 0
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.dropped += 1
+                return False
+            self.pending += 1
+            return True
+
+    def _done(self, _) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self._idle.notify_all()
+
+    def submit(self, fn: Callable[[], object]) -> bool:
+        """Run ``fn`` on the executor; False if it was dropped."""
+        if not self._reserve():
+            return False
+        with self._lock:
+            # created on first use, so a run without shadows starts no threads
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="hybrid-shadow"
+                )
+            executor = self._executor
+        executor.submit(fn).add_done_callback(self._done)
+        return True
+
+    def submit_async(self, fn: Callable[[], object]) -> bool:
+        """Run the coroutine ``fn()`` as a task; False if it was dropped."""
+        if not self._reserve():
+            return False
+        task = asyncio.get_running_loop().create_task(fn())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(self._done)
+        return True
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Wait until no shadow is pending; False on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self.pending, timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "pending": self.pending,
+                "completed": self.completed,
+                "dropped": self.dropped,
+            }
+
+
+hybrid_stats = HybridStats(HYBRID_SAMPLES)
+shadow_runner = ShadowRunner(HYBRID_SHADOW_WORKERS, HYBRID_SHADOW_QUEUE)
+
+
+class HybridRepository:
+    """One entity's repositories across stores, behind a single interface.
+
+    Writes, and every read HYBRID_ROUTES does not name, go to the SQL
+    repository, which stays the system of record. Routed reads go to the
+    configured store; its repository is only built on first use. Non-method
+    attributes (SORT_FIELDS and the like) come from the SQL repository.
+    """
+
+    def __init__(self, entity: str, sql, **readers: Callable[[], object]):
+        self._entity = entity
+        self._readers = readers
+        self._built = {"sql": sql}
+
+    def _repository(self, backend: str):
+        repository = self._built.get(backend)
+        if repository is None:
+            repository = self._built[backend] = self._readers[backend]()
+        return repository
+
+    def __getattr__(self, name: str):
+        operation = f"{self._entity}.{name}"
+        backend = HYBRID_ROUTES.get(operation, "sql")
+        target = getattr(self._repository(backend), name)
+        if (
+            name.startswith("_")
+            or not callable(target)
+            or inspect.isgeneratorfunction(target)
+            or inspect.isasyncgenfunction(target)
+        ):
+            return target
+
+        if operation not in HYBRID_ROUTES and not HYBRID_SHADOW_RATE:
+            # plain SQL calls are already timed by the repository metrics
+            return target
+        if inspect.iscoroutinefunction(target):
+            return self._routed_async(operation, backend, target)
+        return self._routed(operation, backend, target)
+
+    def _shadow_backends(self, name: str, backend: str) -> list[str]:
+        """The other backends, for a sampled share of read calls."""
+        if not name.startswith(READ_PREFIXES) or random.random() >= HYBRID_SHADOW_RATE:
+            return []
+        return [other for other in ("sql", *self._readers) if other != backend]
+
+    @contextmanager
+    def _shadow_repository(self, backend: str):
+        """``backend``'s repository for a shadow, which outlives the request.
+
+        The request's SQL session must not be shared with it, so a SQL
+        shadow gets a session of its own on the same engine.
+        """
+        repository = self._repository(backend)
+        db = getattr(repository, "db", None)
+        if backend != "sql" or db is None:
+            yield repository
+            return
+        with Session(bind=db.get_bind()) as session:
+            yield type(repository)(session)
+
+    @asynccontextmanager
+    async def _shadow_repository_async(self, backend: str):
+        repository = self._repository(backend)
+        db = getattr(repository, "db", None)
+        if backend != "sql" or db is None:
+            yield repository
+            return
+        async with AsyncSession(bind=db.bind) as session:
+            yield type(repository)(session)
+
+    def _routed(self, operation: str, backend: str, target):
+        name = target.__name__
+
+        def call(*args, **kwargs):
+            result = _timed(operation, backend, target, args, kwargs)
+            others = self._shadow_backends(name, backend)
+            if others:
+                shadow_runner.submit(lambda: shadows(others, args, kwargs))
+            return result
+
+        def shadows(others, args, kwargs):
+            for other in others:
+                # a shadow only measures; its failures are counted, not raised
+                with suppress(Exception), self._shadow_repository(other) as repo:
+                    shadow = getattr(repo, name)
+                    _timed(operation, other, shadow, args, kwargs, shadow=True)
+
+        return call
+
+    def _routed_async(self, operation: str, backend: str, target):
+        name = target.__name__
+
+        async def call(*args, **kwargs):
+            result = await _timed_async(operation, backend, target, args, kwargs)
+            others = self._shadow_backends(name, backend)
+            if others:
+                shadow_runner.submit_async(lambda: shadows(others, args, kwargs))
+            return result
+
+        async def shadows(others, args, kwargs):
+            for other in others:
+                with suppress(Exception):
+                    async with self._shadow_repository_async(other) as repo:
+                        shadow = getattr(repo, name)
+                        await _timed_async(
+                            operation, other, shadow, args, kwargs, shadow=True
+                        )
+
+        return call
+
+
+def _timed(operation, backend, fn, args, kwargs, shadow: bool = False):
+    start = time.perf_counter()
+    error = True
+    try:
+        result = fn(*args, **kwargs)
+        error = False
+        return result
+    finally:
+        hybrid_stats.record(
+            operation, backend, time.perf_counter() - start, error, shadow
+        )
+
+
+async def _timed_async(operation, backend, fn, args, kwargs, shadow: bool = False):
+    start = time.perf_counter()
+    error = True
+    try:
+        result = await fn(*args, **kwargs)
+        error = False
+        return result
+    finally:
+        hybrid_stats.record(
+            operation, backend, time.perf_counter() - start, error, shadow
+        )
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
 
 class ILanguageRepository(ABC):
     @abstractmethod
@@ -9,7 +11,13 @@ class ILanguageRepository(ABC):
     def get_by_name(self, name: str): ...
 
     @abstractmethod
-    def list(self, offset: int, limit: int, search: str | None): ...
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ): ...
 
     @abstractmethod
     def create(self, language_data: dict): ...
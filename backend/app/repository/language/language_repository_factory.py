@@ -1,29 +1,55 @@
 import os
 
-from app.repository.language.mongo_language_repository import LanguageRepositoryMongo
-from app.repository.language.neo_language_repository import LanguageRepositoryNeo
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
 from app.repository.language.sql_language_repository import LanguageRepositorySQL
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
 from app.utility.db_sql import get_sql_db
 
 
-def get_language_repository():
+def _mongo_repository():
+    from app.repository.language.mongo_language_repository import (
+        LanguageRepositoryMongo,
+    )
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return LanguageRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.language.neo_language_repository import (
+        LanguageRepositoryNeo,
+    )
+    from app.utility.db_neo import get_neo
+
+    driver = get_neo()
+    return LanguageRepositoryNeo(driver)
+
+
+def get_language_repository(sql_db: Session = Depends(get_sql_db)):
     db_mode = os.getenv("DB_MODE", "sql").lower()
     print("------------------------------------")
     print("DB_MODE seen by backend:", db_mode)
     print("------------------------------------")
 
     if db_mode == "sql":
-        db = next(get_sql_db())
-        return LanguageRepositorySQL(db)
+        return LanguageRepositorySQL(sql_db)
 
     if db_mode == "mongo":
-        db = next(get_mongo_db())
-        return LanguageRepositoryMongo(db)
+        return _mongo_repository()
 
     if db_mode == "neo":
-        driver = get_neo()
-        return LanguageRepositoryNeo(driver)
+        return _neo_repository()
+
+    if db_mode == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "language",
+            LanguageRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {db_mode}")
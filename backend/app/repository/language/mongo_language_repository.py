@@ -1,6 +1,7 @@
 from pymongo.collection import Collection
 
 from app.repository.language.i_language_repository import ILanguageRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class LanguageRepositoryMongo(ILanguageRepository):
@@ -22,12 +23,21 @@ class LanguageRepositoryMongo(ILanguageRepository):
         doc = self.col.find_one({"language": name})
         return self._doc(doc)
 
-    def list(self, offset: int, limit: int, search: str | None):
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
         query = {}
         if search:
             query["language"] = {"$regex": search, "$options": "i"}
 
-        total = self.col.count_documents(query)
+        total = totals.resolve(
+            lambda: self.col.count_documents(query),
+            None if query else self.col.estimated_document_count,
+        )
         cursor = self.col.find(query).sort("id", -1).skip(int(offset)).limit(int(limit))
         return [self._doc(d) for d in cursor], total
 
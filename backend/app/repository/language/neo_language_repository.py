@@ -1,6 +1,7 @@
 from neo4j import Driver
 
 from app.repository.language.i_language_repository import ILanguageRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class LanguageRepositoryNeo(ILanguageRepository):
@@ -37,7 +38,13 @@ class LanguageRepositoryNeo(ILanguageRepository):
             ).single()
             return self._node(rec["l"]) if rec else None
 
-    def list(self, offset: int, limit: int, search: str | None):
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
         with self.driver.session() as session:
             params = {"skip": int(offset), "limit": int(limit)}
             where = ""
@@ -58,16 +65,18 @@ class LanguageRepositoryNeo(ILanguageRepository):
 
             items = [self._node(r["l"]) for r in recs]
 
-            count_rec = session.run(
-                f"""
-                MATCH (l:Language)
-                {where}
-                RETURN count(l) AS count
-                """,
-                **({"search": search} if search else {}),
-            ).single()
+            def count():
+                count_rec = session.run(
+                    f"""
+                    MATCH (l:Language)
+                    {where}
+                    RETURN count(l) AS count
+                    """,
+                    **({"search": search} if search else {}),
+                ).single()
+                return int(count_rec["count"]) if count_rec else 0
 
-            total = int(count_rec["count"]) if count_rec else 0
+            total = totals.resolve(count, None if search else count)
             return items, total
 
     def create(self, language_data):
@@ -1,8 +1,10 @@
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.model.language_model import Language
 from app.repository.language.i_language_repository import ILanguageRepository
+from app.utility.db_sql import count_rows, estimate_row_count
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class LanguageRepositorySQL(ILanguageRepository):
@@ -16,14 +18,21 @@ class LanguageRepositorySQL(ILanguageRepository):
         stmt = select(Language).where(Language.language == name)
         return self.db.execute(stmt).scalars().first()
 
-    def list(self, offset: int, limit: int, search: str | None):
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
         stmt = select(Language)
         if search:
             stmt = stmt.where(Language.language.ilike(f"%{search}%"))
 
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "language"),
+        )
 
         rows = (
             self.db.execute(
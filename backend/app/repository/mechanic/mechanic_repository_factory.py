@@ -1,27 +1,52 @@
 import os
 
-from app.repository.mechanic.mongo_mechanic_repository import MechanicRepositoryMongo
-from app.repository.mechanic.neo_mechanic_repository import MechanicRepositoryNeo
-from app.repository.mechanic.sql_mechanic_repository import MechanicRepositorySQL
+from fastapi import Depends
+from sqlalchemy.orm import Session
 
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
+from app.repository.mechanic.sql_mechanic_repository import MechanicRepositorySQL
 from app.utility.db_sql import get_sql_db
 
 
-def get_mechanic_repository():
+def _mongo_repository():
+    from app.repository.mechanic.mongo_mechanic_repository import (
+        MechanicRepositoryMongo,
+    )
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return MechanicRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.mechanic.neo_mechanic_repository import (
+        MechanicRepositoryNeo,
+    )
+    from app.utility.db_neo import get_neo
+
+    driver = get_neo()
+    return MechanicRepositoryNeo(driver)
+
+
+def get_mechanic_repository(sql_db: Session = Depends(get_sql_db)):
     db_mode = os.getenv("DB_MODE", "sql").lower()
 
     if db_mode == "sql":
-        db = next(get_sql_db())
-        return MechanicRepositorySQL(db)
+        return MechanicRepositorySQL(sql_db)
 
     if db_mode == "mongo":
-        db = next(get_mongo_db())
-        return MechanicRepositoryMongo(db)
+        return _mongo_repository()
 
     if db_mode == "neo":
-        driver = get_neo()
-        return MechanicRepositoryNeo(driver)
+        return _neo_repository()
+
+    if db_mode == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "mechanic",
+            MechanicRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {db_mode}")
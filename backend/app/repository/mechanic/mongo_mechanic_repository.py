@@ -1,6 +1,9 @@
+from collections.abc import Iterator
+
 from pymongo.collection import Collection
 
 from app.repository.mechanic.i_mechanic_repository import IMechanicRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class MechanicRepositoryMongo(IMechanicRepository):
@@ -45,6 +48,7 @@ class MechanicRepositoryMongo(IMechanicRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         sort_dir = 1 if (sort_order or "asc") == "asc" else -1
 
@@ -69,8 +73,11 @@ class MechanicRepositoryMongo(IMechanicRepository):
             {"$sort": {"name": sort_dir}},
         ]
 
-        count_docs = list(self.games.aggregate(pipeline + [{"$count": "count"}]))
-        total = int(count_docs[0]["count"]) if count_docs else 0
+        def count():
+            count_docs = list(self.games.aggregate(pipeline + [{"$count": "count"}]))
+            return int(count_docs[0]["count"]) if count_docs else 0
+
+        total = totals.resolve(count)
 
         items = list(
             self.games.aggregate(
@@ -81,11 +88,24 @@ class MechanicRepositoryMongo(IMechanicRepository):
             it["id"] = int(it["id"])
         return items, total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        pipeline = [
+            {"$unwind": "$mechanics"},
+            {"$group": {"_id": "$mechanics.id", "name": {"$first": "$mechanics.name"}}},
+        ]
+        for doc in self.games.aggregate(pipeline, allowDiskUse=True):
+            yield int(doc["_id"]), doc["name"]
+
     def create(self, mechanic_data: dict):
         raise NotImplementedError(
             "Mechanics are embedded in games in Mongo. Create them by updating game documents or normalize into a mechanics collection."
         )
 
+    def create_many(self, rows):
+        raise NotImplementedError(
+            "Mechanics are embedded in games in Mongo. Create them by updating game documents."
+        )
+
     def update(self, mechanic_id: int, mechanic_data: dict):
         raise NotImplementedError(
             "Mechanics are embedded in games in Mongo. Update embedded mechanics in game documents or normalize into a mechanics collection."
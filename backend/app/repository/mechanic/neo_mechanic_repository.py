@@ -1,6 +1,10 @@
+from collections.abc import Iterator
+
 from neo4j import Driver
 
 from app.repository.mechanic.i_mechanic_repository import IMechanicRepository
+from app.utility.db_neo import create_nodes
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class MechanicRepositoryNeo(IMechanicRepository):
@@ -37,6 +41,7 @@ class MechanicRepositoryNeo(IMechanicRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         with self.driver.session() as session:
             base = "MATCH (m:Mechanic)"
@@ -58,14 +63,23 @@ class MechanicRepositoryNeo(IMechanicRepository):
             records = session.run(query, **params)
             items = [self._node(r["m"]) for r in records]
 
-            count_q = base + where + " RETURN count(m) AS count"
-            count_res = session.run(
-                count_q, **({"search": search} if search else {})
-            ).single()
-            total = int(count_res["count"]) if count_res else 0
+            def count():
+                count_q = base + where + " RETURN count(m) AS count"
+                count_res = session.run(
+                    count_q, **({"search": search} if search else {})
+                ).single()
+                return int(count_res["count"]) if count_res else 0
+
+            total = totals.resolve(count, None if search else count)
 
             return items, total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        query = "MATCH (m:Mechanic) RETURN m.id AS id, m.name AS name"
+        with self.driver.session() as session:
+            for record in session.run(query):
+                yield record["id"], record["name"]
+
     def create(self, mechanic_data: dict):
         with self.driver.session() as session:
             session.run(
@@ -79,6 +93,10 @@ class MechanicRepositoryNeo(IMechanicRepository):
             )
         return dict(mechanic_data)
 
+    def create_many(self, rows):
+        with self.driver.session() as session:
+            return session.execute_write(create_nodes, "Mechanic", rows)
+
     def update(self, mechanic_id: int, mechanic_data: dict):
         with self.driver.session() as session:
             rec = session.run(
@@ -1,8 +1,12 @@
-from sqlalchemy import func, select
+from collections.abc import Iterator
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.model.mechanic_model import Mechanic
 from app.repository.mechanic.i_mechanic_repository import IMechanicRepository
+from app.utility.db_sql import count_rows, estimate_row_count, insert_many
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class MechanicRepositorySQL(IMechanicRepository):
@@ -23,6 +27,7 @@ class MechanicRepositorySQL(IMechanicRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ) -> tuple[list[Mechanic], int]:
         stmt = select(Mechanic)
 
@@ -38,14 +43,20 @@ class MechanicRepositorySQL(IMechanicRepository):
         else:
             stmt = stmt.order_by(Mechanic.name.asc())
 
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "mechanic"),
+        )
         rows = (
             self.db.execute(stmt.offset(int(offset)).limit(int(limit))).scalars().all()
         )
         return rows, total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        stmt = select(Mechanic.id, Mechanic.name)
+        for row in self.db.execute(stmt.execution_options(yield_per=5000)):
+            yield row.id, row.name
+
     def create(self, mechanic_data: dict) -> Mechanic:
         obj = Mechanic(**mechanic_data)
         self.db.add(obj)
@@ -53,6 +64,15 @@ class MechanicRepositorySQL(IMechanicRepository):
         self.db.refresh(obj)
         return obj
 
+    def create_many(self, rows):
+        try:
+            ids = insert_many(self.db, Mechanic, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ids
+
     def update(self, mechanic_id: int, mechanic_data: dict) -> Mechanic | None:
         obj = self.get(mechanic_id)
         if not obj:
@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class IPublisherRepository(ABC):
@@ -16,11 +19,20 @@ class IPublisherRepository(ABC):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ): ...
 
+    @abstractmethod
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        """(id, name) of every publisher, streamed to build the autocomplete index."""
+
     @abstractmethod
     def create(self, publisher_data: dict): ...
 
+    @abstractmethod
+    def create_many(self, rows):
+        """Inserts ``rows`` as one batch and returns their new ids in order."""
+
     @abstractmethod
     def update(self, publisher_id: int, publisher_data: dict): ...
 
@@ -1,6 +1,9 @@
+from collections.abc import Iterator
+
 from pymongo.collection import Collection
 
 from app.repository.publisher.i_publisher_repository import IPublisherRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class PublisherRepositoryMongo(IPublisherRepository):
@@ -57,17 +60,34 @@ class PublisherRepositoryMongo(IPublisherRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         query = {}
         if search:
             query["name"] = {"$regex": search, "$options": "i"}
 
-        total = self.col.count_documents(query)
+        total = totals.resolve(
+            lambda: self.col.count_documents(query),
+            None if query else self.col.estimated_document_count,
+        )
         sort_dir = 1 if (sort_order or "asc") == "asc" else -1
         cursor = self.col.find(query).skip(offset).limit(limit).sort("name", sort_dir)
 
         return [self._doc(d) for d in cursor], total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        pipeline = [
+            {"$unwind": "$publishers"},
+            {
+                "$group": {
+                    "_id": "$publishers.id",
+                    "name": {"$first": "$publishers.name"},
+                }
+            },
+        ]
+        for doc in self.games.aggregate(pipeline, allowDiskUse=True):
+            yield int(doc["_id"]), doc["name"]
+
     def create(self, publisher_data: dict):
         doc = dict(publisher_data)
 
@@ -81,6 +101,11 @@ class PublisherRepositoryMongo(IPublisherRepository):
         doc["_id"] = res.inserted_id
         return self._doc(doc)
 
+    def create_many(self, rows):
+        raise NotImplementedError(
+            "Publishers are embedded in games in Mongo. Create them by updating game documents."
+        )
+
     def update(self, publisher_id: int, publisher_data: dict):
         res = self.col.update_one(
             {"id": int(publisher_id)}, {"$set": dict(publisher_data)}
@@ -1,6 +1,10 @@
+from collections.abc import Iterator
+
 from neo4j import Driver
 
 from app.repository.publisher.i_publisher_repository import IPublisherRepository
+from app.utility.db_neo import create_nodes
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class PublisherRepositoryNeo(IPublisherRepository):
@@ -37,6 +41,7 @@ class PublisherRepositoryNeo(IPublisherRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         with self.driver.session() as session:
             base = "MATCH (p:Publisher)"
@@ -60,14 +65,23 @@ class PublisherRepositoryNeo(IPublisherRepository):
             records = session.run(query, **params)
             items = [self._node(r["p"]) for r in records]
 
-            count_q = base + where + " RETURN count(p) AS count"
-            count_res = session.run(
-                count_q, **({"search": search} if search else {})
-            ).single()
-            total = count_res["count"] if count_res else 0
+            def count():
+                count_q = base + where + " RETURN count(p) AS count"
+                count_res = session.run(
+                    count_q, **({"search": search} if search else {})
+                ).single()
+                return count_res["count"] if count_res else 0
+
+            total = totals.resolve(count, None if search else count)
 
             return items, total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        query = "MATCH (p:Publisher) RETURN p.id AS id, p.name AS name"
+        with self.driver.session() as session:
+            for record in session.run(query):
+                yield record["id"], record["name"]
+
     def create(self, publisher_data: dict):
         with self.driver.session() as session:
             session.run(
@@ -81,6 +95,10 @@ class PublisherRepositoryNeo(IPublisherRepository):
             )
         return dict(publisher_data)
 
+    def create_many(self, rows):
+        with self.driver.session() as session:
+            return session.execute_write(create_nodes, "Publisher", rows)
+
     def update(self, publisher_id: int, publisher_data: dict):
         with self.driver.session() as session:
             rec = session.run(
@@ -1,26 +1,52 @@
 import os
 
-from app.repository.publisher.mongo_publisher_repository import PublisherRepositoryMongo
-from app.repository.publisher.neo_publisher_repository import PublisherRepositoryNeo
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
 from app.repository.publisher.sql_publisher_repository import PublisherRepositorySQL
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
 from app.utility.db_sql import get_sql_db
 
 
-def get_publisher_repository():
+def _mongo_repository():
+    from app.repository.publisher.mongo_publisher_repository import (
+        PublisherRepositoryMongo,
+    )
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return PublisherRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.publisher.neo_publisher_repository import (
+        PublisherRepositoryNeo,
+    )
+    from app.utility.db_neo import get_neo
+
+    driver = get_neo()
+    return PublisherRepositoryNeo(driver)
+
+
+def get_publisher_repository(sql_db: Session = Depends(get_sql_db)):
     db_mode = os.getenv("DB_MODE", "sql").lower()
 
     if db_mode == "sql":
-        db = next(get_sql_db())
-        return PublisherRepositorySQL(db)
+        return PublisherRepositorySQL(sql_db)
 
     if db_mode == "mongo":
-        db = next(get_mongo_db())
-        return PublisherRepositoryMongo(db)
+        return _mongo_repository()
 
     if db_mode == "neo":
-        driver = get_neo()
-        return PublisherRepositoryNeo(driver)
+        return _neo_repository()
+
+    if db_mode == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "publisher",
+            PublisherRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {db_mode}")
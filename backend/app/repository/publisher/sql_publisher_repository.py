@@ -1,8 +1,12 @@
-from sqlalchemy import func, select
+from collections.abc import Iterator
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.model.publisher_model import Publisher
 from app.repository.publisher.i_publisher_repository import IPublisherRepository
+from app.utility.db_sql import count_rows, estimate_row_count, insert_many
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class PublisherRepositorySQL(IPublisherRepository):
@@ -23,6 +27,7 @@ class PublisherRepositorySQL(IPublisherRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ) -> tuple[list[Publisher], int]:
         stmt = select(Publisher)
 
@@ -38,12 +43,18 @@ class PublisherRepositorySQL(IPublisherRepository):
         else:
             stmt = stmt.order_by(Publisher.name.asc())
 
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "publisher"),
+        )
         rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
         return rows, total
 
+    def iter_names(self) -> Iterator[tuple[int, str]]:
+        stmt = select(Publisher.id, Publisher.name)
+        for row in self.db.execute(stmt.execution_options(yield_per=5000)):
+            yield row.id, row.name
+
     def create(self, publisher_data: dict) -> Publisher:
         obj = Publisher(**publisher_data)
         self.db.add(obj)
@@ -51,6 +62,15 @@ class PublisherRepositorySQL(IPublisherRepository):
         self.db.refresh(obj)
         return obj
 
+    def create_many(self, rows):
+        try:
+            ids = insert_many(self.db, Publisher, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ids
+
     def update(self, publisher_id: int, publisher_data: dict) -> Publisher | None:
         obj = self.get(publisher_id)
         if not obj:
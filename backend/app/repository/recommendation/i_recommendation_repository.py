@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class IRecommendationRepository(ABC):
+    @abstractmethod
+    def list_for_user(self, user_id: Any, limit: int) -> list[tuple[int, float, int]]:
+        """Games the user has not reviewed, liked most by similar raters first.
+
+        Each is (game id, predicted stars, support): the prediction is the
+        user's own stars averaged over their reviewed games, weighted by each
+        one's similarity to the game, and support counts those games.
+        """
@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+from pymongo.collection import Collection
+
+from app.repository.recommendation.i_recommendation_repository import (
+    IRecommendationRepository,
+)
+from app.utility.db_mongo import GAME_RECOMMENDATIONS
+
+
+class RecommendationRepositoryMongo(IRecommendationRepository):
+    def __init__(self, db):
+        self.reviews: Collection = db["reviews"]
+        self.recommendations: Collection = db[GAME_RECOMMENDATIONS]
+
+    def list_for_user(self, user_id: int, limit: int):
+        uid = int(user_id)
+        # migrated reviews only have the user embedded
+        cursor = self.reviews.find(
+            {"$or": [{"user_id": uid}, {"user.id": uid}]},
+            {"game_id": 1, "star_amount": 1},
+        )
+        stars = {doc["game_id"]: doc["star_amount"] for doc in cursor}
+        if not stars:
+            return []
+
+        weighted, weights, support = (
+            defaultdict(float),
+            defaultdict(float),
+            defaultdict(int),
+        )
+        for doc in self.recommendations.find({"_id": {"$in": list(stars)}}):
+            for other in doc.get("similar", ()):
+                game_id = other["id"]
+                if game_id in stars:
+                    continue
+                weighted[game_id] += other["score"] * stars[doc["_id"]]
+                weights[game_id] += other["score"]
+                support[game_id] += 1
+
+        ranked = sorted(
+            ((g, weighted[g] / weights[g], support[g]) for g in weights),
+            key=lambda r: (-r[1], -r[2], r[0]),
+        )
+        return ranked[:limit]
@@ -0,0 +1,31 @@
+from neo4j import Driver
+
+from app.repository.recommendation.i_recommendation_repository import (
+    IRecommendationRepository,
+)
+
+
+class RecommendationRepositoryNeo(IRecommendationRepository):
+    FOR_USER_QUERY = """
+        MATCH (u:User {id: $user_id})-[:WROTE]->(r:Review)-[:FOR_GAME]->(:Game)
+              -[s:ALSO_LIKED]->(g:Game)
+        WHERE NOT EXISTS { MATCH (u)-[:WROTE]->(:Review)-[:FOR_GAME]->(g) }
+        WITH g, sum(s.score * r.star_amount) / sum(s.score) AS predicted,
+             count(*) AS support
+        RETURN g.id AS game_id, predicted, support
+        ORDER BY predicted DESC, support DESC, game_id
+        LIMIT $limit
+    """
+
+    def __init__(self, driver: Driver):
+        self.driver = driver
+
+    def list_for_user(self, user_id: int, limit: int):
+        with self.driver.session() as session:
+            result = session.run(
+                self.FOR_USER_QUERY, user_id=int(user_id), limit=int(limit)
+            )
+            return [
+                (int(rec["game_id"]), float(rec["predicted"]), int(rec["support"]))
+                for rec in result
+            ]
@@ -0,0 +1,51 @@
+import os
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.repository.recommendation.sql_recommendation_repository import (
+    SQLRecommendationRepository,
+)
+from app.utility.db_sql import get_sql_db
+
+DB_MODE = os.getenv("DB_MODE", "sql").lower()
+
+
+def _mongo_repository():
+    from app.repository.recommendation.mongo_recommendation_repository import (
+        RecommendationRepositoryMongo,
+    )
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return RecommendationRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.recommendation.neo_recommendation_repository import (
+        RecommendationRepositoryNeo,
+    )
+    from app.utility.db_neo import get_neo
+
+    db = get_neo()
+    return RecommendationRepositoryNeo(db)
+
+
+def get_recommendation_repository(sql_db: Session = Depends(get_sql_db)):
+    if DB_MODE == "sql":
+        return SQLRecommendationRepository(sql_db)
+    elif DB_MODE == "mongo":
+        return _mongo_repository()
+    elif DB_MODE == "neo":
+        return _neo_repository()
+    elif DB_MODE == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "recommendation",
+            SQLRecommendationRepository(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
+
+    raise ValueError(f"Unknown DB_MODE: {DB_MODE}")
@@ -0,0 +1,40 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.model.game_model import Game
+from app.model.game_recommendation_model import GameRecommendation
+from app.model.review_model import Review
+from app.repository.recommendation.i_recommendation_repository import (
+    IRecommendationRepository,
+)
+
+
+class SQLRecommendationRepository(IRecommendationRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_for_user(self, user_id: int, limit: int):
+        # the user's reviews, each fanning out to at most RECOMMEND_TOP_K rows
+        # of the primary key, are the whole read
+        similar = GameRecommendation.similar_game_id
+        reviewed = select(Review.game_id).where(Review.user_id == int(user_id))
+        predicted = func.sum(GameRecommendation.score * Review.star_amount) / func.sum(
+            GameRecommendation.score
+        )
+        support = func.count()
+        stmt = (
+            select(similar, predicted, support)
+            .join_from(
+                Review, GameRecommendation, GameRecommendation.game_id == Review.game_id
+            )
+            .join(Game, Game.id == similar)
+            .where(
+                Review.user_id == int(user_id),
+                Game.deleted_at.is_(None),
+                similar.not_in(reviewed),
+            )
+            .group_by(similar)
+            .order_by(predicted.desc(), support.desc(), similar)
+            .limit(limit)
+        )
+        return [(int(g), float(p), int(s)) for g, p, s in self.db.execute(stmt)]
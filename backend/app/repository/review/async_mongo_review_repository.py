@@ -0,0 +1,123 @@
+from pymongo import ReturnDocument
+
+from app.repository.review.mongo_review_repository import RATED, ReviewRepositoryMongo
+from app.utility.bulk import BulkRowsRejected
+from app.utility.db_mongo import ainsert_many
+from app.utility.review_aggregates import AggregateDelta, mongo_update, review_deltas
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+
+class ReviewRepositoryMongoAsync(ReviewRepositoryMongo):
+    """ReviewRepositoryMongo on an AsyncMongoClient database."""
+
+    async def _tombstoned(self) -> dict[str, list[int]]:
+        cursor = self.tombstones.find({}, {"entity": 1, "entity_id": 1})
+        return self._gone([doc async for doc in cursor])
+
+    async def get(self, review_id: int):
+        query = self._alive(self._get_query(review_id), await self._tombstoned())
+        return self._doc(await self.col.find_one(query))
+
+    async def get_review_count_for_game(self, game_id: int) -> int:
+        doc = await self.games.find_one({"_id": int(game_id)}, {"review_count": 1})
+        return (doc or {}).get("review_count") or 0
+
+    async def _update_games(self, deltas: dict[int, AggregateDelta]) -> None:
+        for game_id, delta in deltas.items():
+            await self.games.update_one({"_id": int(game_id)}, mongo_update(delta))
+
+    async def _page(
+        self,
+        query: dict,
+        offset: int,
+        limit: int,
+        totals: TotalCount,
+        after: int | None = None,
+        estimate=None,
+    ):
+        query = self._alive(query, await self._tombstoned())
+        total = await totals.aresolve(lambda: self.col.count_documents(query), estimate)
+        cursor = (
+            self.col.find(self._after_query(query, after))
+            .skip(offset)
+            .limit(limit)
+            .sort("_id", -1)
+        )
+        return [self._doc(d) async for d in cursor], total
+
+    async def list_by_game(
+        self,
+        game_id: int,
+        offset: int,
+        limit: int,
+        after: int | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        return await self._page({"game_id": int(game_id)}, offset, limit, totals, after)
+
+    async def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        return await self._page(
+            self._list_query(search),
+            offset,
+            limit,
+            totals,
+            estimate=None if search else self.col.estimated_document_count,
+        )
+
+    async def create(self, review_data: dict):
+        doc = dict(review_data)
+
+        if "id" not in doc and "_id" not in doc:
+            raise ValueError(
+                "Mongo review create requires integer 'id' for backend switching."
+            )
+        doc.setdefault("_id", doc.get("id"))
+
+        res = await self.col.insert_one(doc)
+        doc["_id"] = res.inserted_id
+        await self._update_games(review_deltas(None, self._rated(doc)))
+        return self._doc(doc)
+
+    async def create_many(self, rows):
+        docs = [dict(r) for r in rows]
+        try:
+            ids = await ainsert_many(self.col, docs, key="id")
+        except BulkRowsRejected as e:
+            ids, rejected = e.ids, e
+        else:
+            rejected = None
+        updates = self._game_updates(docs, ids)
+        if updates:
+            await self.games.bulk_write(updates, ordered=False)
+        if rejected:
+            raise rejected
+        return ids
+
+    async def update(self, review_id: int, review_data: dict):
+        before = await self.col.find_one_and_update(
+            {"id": int(review_id)},
+            {"$set": dict(review_data)},
+            projection=RATED,
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            return None
+        await self._update_games(
+            review_deltas(self._rated(before), self._rated(before, review_data))
+        )
+        return await self.get(review_id)
+
+    async def delete(self, review_id: int) -> bool:
+        before = await self.col.find_one_and_delete(
+            {"id": int(review_id)}, projection=RATED
+        )
+        if before is None:
+            return False
+        await self._update_games(review_deltas(self._rated(before), None))
+        return True
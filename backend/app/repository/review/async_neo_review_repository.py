@@ -0,0 +1,128 @@
+from neo4j import AsyncDriver
+
+from app.repository.review.neo_review_repository import ReviewRepositoryNeo
+from app.utility.review_aggregates import NEO_UPDATE_QUERY, created_deltas, neo_rows
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+
+class ReviewRepositoryNeoAsync(ReviewRepositoryNeo):
+    """ReviewRepositoryNeo on the async Neo4j driver. Queries are shared with the sync class."""
+
+    def __init__(self, driver: AsyncDriver):
+        self.driver = driver
+
+    async def _single(self, session, query: str, **params):
+        result = await session.run(query, **params)
+        return await result.single()
+
+    async def _acount(self, session, query: str, **params) -> int:
+        rec = await self._single(session, query, **params)
+        return rec["count"] if rec else 0
+
+    async def _awrite(self, tx, query: str, deltas, **params):
+        rec = await self._single(tx, query, **params)
+        changed = deltas(rec) if rec else None
+        if changed:
+            await (await tx.run(NEO_UPDATE_QUERY, rows=neo_rows(changed))).consume()
+        return rec
+
+    async def get(self, review_id: int):
+        async with self.driver.session() as session:
+            rec = await self._single(session, self.GET_QUERY, id=int(review_id))
+            return self._rec_to_review(rec) if rec else None
+
+    async def get_review_count_for_game(self, game_id: int) -> int:
+        async with self.driver.session() as session:
+            return await self._acount(
+                session, self.REVIEW_COUNT_QUERY, game_id=int(game_id)
+            )
+
+    async def list_by_game(
+        self,
+        game_id: int,
+        offset: int,
+        limit: int,
+        after: int | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        async with self.driver.session() as session:
+            result = await session.run(
+                self.LIST_BY_GAME_QUERY,
+                game_id=int(game_id),
+                after=after,
+                skip=offset,
+                limit=limit,
+            )
+            items = [self._rec_to_review(rec) async for rec in result]
+
+            total = await totals.aresolve(
+                lambda: self._acount(
+                    session, self.COUNT_FOR_GAME_QUERY, game_id=int(game_id)
+                )
+            )
+
+            return items, total
+
+    async def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        query, count_q, params = self._list_queries(offset, limit, search)
+
+        async with self.driver.session() as session:
+            result = await session.run(query, **params)
+            items = [self._rec_to_review(rec) async for rec in result]
+
+            total = await totals.aresolve(
+                lambda: self._acount(
+                    session, count_q, **({"search": search} if search else {})
+                )
+            )
+
+            return items, total
+
+    async def create(self, review_data: dict):
+        async with self.driver.session() as session:
+            await session.execute_write(
+                self._awrite,
+                self.CREATE_QUERY,
+                self._created,
+                game_id=int(review_data["game_id"]),
+                user_id=int(review_data["user_id"]),
+                props=dict(review_data),
+            )
+        return dict(review_data)
+
+    async def create_many(self, rows):
+        async def write(tx):
+            result = await tx.run(self.CREATE_MANY_QUERY, rows=[dict(r) for r in rows])
+            recs = [rec async for rec in result]
+            deltas = created_deltas((rec["game_id"], rec["stars"]) for rec in recs)
+            if deltas:
+                await (await tx.run(NEO_UPDATE_QUERY, rows=neo_rows(deltas))).consume()
+            return {rec["i"]: rec["id"] for rec in recs}
+
+        async with self.driver.session() as session:
+            created = await session.execute_write(write)
+        return self._created_ids(created, len(rows))
+
+    async def update(self, review_id: int, review_data: dict):
+        async with self.driver.session() as session:
+            rec = await session.execute_write(
+                self._awrite,
+                self.UPDATE_QUERY,
+                self._updated,
+                id=int(review_id),
+                props=dict(review_data),
+            )
+            return self._node(rec["r"]) if rec else None
+
+    async def delete(self, review_id: int) -> bool:
+        async with self.driver.session() as session:
+            rec = await session.execute_write(
+                self._awrite, self.DELETE_QUERY, self._deleted, id=int(review_id)
+            )
+            return rec is not None
@@ -0,0 +1,118 @@
+from functools import partial
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.review_model import Review
+from app.repository.review.sql_review_repository import ReviewRepositorySQL
+from app.utility.db_sql import count_rows, estimate_row_count
+from app.utility.outbox import record_change
+from app.utility.review_aggregates import review_deltas
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+
+class ReviewRepositorySQLAsync(ReviewRepositorySQL):
+    """ReviewRepositorySQL on an AsyncSession. Statements are shared with the sync class."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, review_id: int) -> Review | None:
+        return (await self.db.execute(self._get_stmt(review_id))).scalars().first()
+
+    async def get_review_count_for_game(self, game_id: int) -> int:
+        return (await self.db.execute(self._count_for_game_stmt(game_id))).scalar() or 0
+
+    async def _page(
+        self,
+        stmt,
+        offset: int,
+        limit: int,
+        totals: TotalCount,
+        after: int | None = None,
+        estimate=None,
+    ):
+        total = await totals.aresolve(
+            lambda: self.db.run_sync(count_rows, stmt), estimate
+        )
+        page = self._after_stmt(stmt, after).offset(offset).limit(limit)
+        rows = (await self.db.execute(page)).scalars().all()
+        return rows, total
+
+    async def list_by_game(
+        self,
+        game_id: int,
+        offset: int,
+        limit: int,
+        after: int | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        return await self._page(
+            self._list_by_game_stmt(game_id), offset, limit, totals, after
+        )
+
+    async def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        estimate = (
+            None if search else partial(self.db.run_sync, estimate_row_count, "review")
+        )
+        return await self._page(
+            self._list_stmt(search), offset, limit, totals, estimate=estimate
+        )
+
+    async def create(self, review_data: dict) -> Review:
+        stmt, params = self._procedure_call(review_data)
+
+        row = (await self.db.execute(stmt, params)).fetchone()
+        if not row or row[0] is None:
+            raise ValueError("add_game_review did not return a new review id")
+
+        review = await self.db.get(Review, int(row[0]))
+        if not review:
+            raise ValueError("Review created but could not be loaded by id")
+        record_change(self.db.sync_session, "review", review.id)
+        await self.db.run_sync(
+            self._update_games, review_deltas(None, self._rated(review))
+        )
+
+        await self.db.commit()
+        await self.db.refresh(review)
+        return review
+
+    async def create_many(self, rows):
+        try:
+            ids = await self.db.run_sync(self._insert_many, rows)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return ids
+
+    async def update(self, review_id: int, review_data: dict) -> Review | None:
+        obj = await self.get(review_id)
+        if not obj:
+            return None
+        before = self._rated(obj)
+        for k, v in review_data.items():
+            setattr(obj, k, v)
+        await self.db.run_sync(
+            self._update_games, review_deltas(before, self._rated(obj))
+        )
+        await self.db.commit()
+        await self.db.refresh(obj)
+        return obj
+
+    async def delete(self, review_id: int) -> bool:
+        obj = await self.get(review_id)
+        if not obj:
+            return False
+        await self.db.run_sync(
+            self._update_games, review_deltas(self._rated(obj), None)
+        )
+        await self.db.delete(obj)
+        await self.db.commit()
+        return True
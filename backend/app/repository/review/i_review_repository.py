@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class IReviewRepository(ABC):
@@ -9,14 +12,42 @@ class IReviewRepository(ABC):
     def get_review_count_for_game(self, game_id: int) -> int: ...
 
     @abstractmethod
-    def list_by_game(self, game_id: int, offset: int, limit: int): ...
+    def list_by_game(
+        self,
+        game_id: int,
+        offset: int,
+        limit: int,
+        after: int | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        """Newest reviews first. ``after`` is the id of the last review already seen."""
+
+    @abstractmethod
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ): ...
 
     @abstractmethod
-    def list(self, offset: int, limit: int, search: str | None): ...
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """``fields`` of every review with an id above ``after``, in id order.
+
+        Streamed from a server-side cursor ``batch_size`` rows at a time, so
+        memory stays flat however many there are.
+        """
 
     @abstractmethod
     def create(self, review_data: dict): ...
 
+    @abstractmethod
+    def create_many(self, rows):
+        """Inserts ``rows`` as one batch and returns their new ids in order."""
+
     @abstractmethod
     def update(self, review_id: int, review_data: dict): ...
 
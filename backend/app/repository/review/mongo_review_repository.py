@@ -1,11 +1,26 @@
+from pymongo import ReturnDocument, UpdateOne
 from pymongo.collection import Collection
 
 from app.repository.review.i_review_repository import IReviewRepository
+from app.utility.bulk import BulkRowsRejected
+from app.utility.db_mongo import TOMBSTONES, insert_many, iter_by_id
+from app.utility.review_aggregates import (
+    AggregateDelta,
+    created_deltas,
+    mongo_update,
+    review_deltas,
+)
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
+# what the game aggregates need from a review
+RATED = {"game_id": 1, "star_amount": 1}
 
 
 class ReviewRepositoryMongo(IReviewRepository):
     def __init__(self, db):
         self.col: Collection = db["reviews"]
+        self.games: Collection = db["games"]
+        self.tombstones: Collection = db[TOMBSTONES]
 
     def _doc(self, doc: dict | None):
         if not doc:
@@ -13,29 +28,125 @@ class ReviewRepositoryMongo(IReviewRepository):
         doc["id"] = doc.get("id", doc.get("_id"))
         return doc
 
+    @staticmethod
+    def _gone(tombstones) -> dict[str, list[int]]:
+        gone = {"game": [], "user": []}
+        for doc in tombstones:
+            gone[doc["entity"]].append(doc["entity_id"])
+        return gone
+
+    def _tombstoned(self) -> dict[str, list[int]]:
+        # only what the purger has not reached yet, so a short list
+        return self._gone(self.tombstones.find({}, {"entity": 1, "entity_id": 1}))
+
+    @staticmethod
+    def _alive(query: dict, gone: dict[str, list[int]]) -> dict:
+        """``query`` without the reviews of tombstoned games and users.
+
+        Those reviews wait for the purger; reads leave them out, as on SQL.
+        """
+        hidden = []
+        if gone["game"]:
+            hidden.append({"game_id": {"$nin": gone["game"]}})
+        if gone["user"]:
+            # reviews written by the API carry user_id, migrated ones only user.id
+            hidden.append({"user_id": {"$nin": gone["user"]}})
+            hidden.append({"user.id": {"$nin": gone["user"]}})
+        return {"$and": [query, *hidden]} if hidden else query
+
+    @staticmethod
+    def _get_query(review_id: int) -> dict:
+        return {"$or": [{"id": int(review_id)}, {"_id": int(review_id)}]}
+
     def get(self, review_id: int):
-        doc = self.col.find_one({"id": int(review_id)}) or self.col.find_one(
-            {"_id": int(review_id)}
-        )
-        return self._doc(doc)
+        query = self._alive(self._get_query(review_id), self._tombstoned())
+        return self._doc(self.col.find_one(query))
 
     def get_review_count_for_game(self, game_id: int) -> int:
-        return self.col.count_documents({"game_id": int(game_id)})
+        # kept on the game document by create, update and delete
+        doc = self.games.find_one({"_id": int(game_id)}, {"review_count": 1})
+        return (doc or {}).get("review_count") or 0
+
+    @staticmethod
+    def _rated(doc: dict, changes: dict | None = None) -> tuple[int, int]:
+        changes = changes or {}
+        return (
+            changes.get("game_id", doc["game_id"]),
+            changes.get("star_amount", doc["star_amount"]),
+        )
+
+    def _update_games(self, deltas: dict[int, AggregateDelta]) -> None:
+        # not one transaction with the review; backfill repairs a failed write
+        for game_id, delta in deltas.items():
+            self.games.update_one({"_id": int(game_id)}, mongo_update(delta))
 
-    def list_by_game(self, game_id: int, offset: int, limit: int):
-        query = {"game_id": int(game_id)}
-        total = self.col.count_documents(query)
-        cursor = self.col.find(query).skip(offset).limit(limit).sort("id", -1)
+    @staticmethod
+    def _game_updates(docs: list[dict], ids: list) -> list[UpdateOne]:
+        # one pipeline update per game for the documents that were inserted
+        deltas = created_deltas(
+            (d["game_id"], d["star_amount"])
+            for d, i in zip(docs, ids, strict=True)
+            if i is not None
+        )
+        return [UpdateOne({"_id": int(g)}, mongo_update(d)) for g, d in deltas.items()]
+
+    def _after_query(self, query: dict, after: int | None) -> dict:
+        # migrated reviews have their id only in _id, and new ones get it
+        # there too, so _id is the key every review can be paged on
+        return query if after is None else {**query, "_id": {"$lt": int(after)}}
+
+    def list_by_game(
+        self,
+        game_id: int,
+        offset: int,
+        limit: int,
+        after: int | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        query = self._alive({"game_id": int(game_id)}, self._tombstoned())
+        total = totals.resolve(lambda: self.col.count_documents(query))
+        cursor = (
+            self.col.find(self._after_query(query, after))
+            .skip(offset)
+            .limit(limit)
+            .sort("_id", -1)
+        )
         return [self._doc(d) for d in cursor], total
 
-    def list(self, offset: int, limit: int, search: str | None):
+    def _list_query(self, search: str | None) -> dict:
         query = {}
         if search:
             query["comment"] = {"$regex": search, "$options": "i"}
-        total = self.col.count_documents(query)
-        cursor = self.col.find(query).skip(offset).limit(limit).sort("id", -1)
+        return query
+
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        query = self._alive(self._list_query(search), self._tombstoned())
+        total = totals.resolve(
+            lambda: self.col.count_documents(query),
+            None if search else self.col.estimated_document_count,
+        )
+        cursor = self.col.find(query).skip(offset).limit(limit).sort("_id", -1)
         return [self._doc(d) for d in cursor], total
 
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ):
+        projection = {**dict.fromkeys(fields, 1), "user.id": 1}
+        query = self._alive({}, self._tombstoned())
+        for doc in iter_by_id(self.col, projection, after, batch_size, query):
+            row = {f: doc.get(f) for f in fields}
+            row["id"] = doc["export_id"]
+            # migrated reviews only have the user embedded
+            if "user_id" in row and row["user_id"] is None:
+                row["user_id"] = (doc.get("user") or {}).get("id")
+            yield row
+
     def create(self, review_data: dict):
         doc = dict(review_data)
 
@@ -44,17 +155,46 @@ class ReviewRepositoryMongo(IReviewRepository):
             raise ValueError(
                 "Mongo review create requires integer 'id' for backend switching."
             )
+        # as insert_many does, so reviews page on _id like migrated ones
+        doc.setdefault("_id", doc.get("id"))
 
         res = self.col.insert_one(doc)
         doc["_id"] = res.inserted_id
+        self._update_games(review_deltas(None, self._rated(doc)))
         return self._doc(doc)
 
+    def create_many(self, rows):
+        docs = [dict(r) for r in rows]
+        try:
+            ids = insert_many(self.col, docs, key="id")
+        except BulkRowsRejected as e:
+            ids, rejected = e.ids, e
+        else:
+            rejected = None
+        updates = self._game_updates(docs, ids)
+        if updates:
+            self.games.bulk_write(updates, ordered=False)
+        if rejected:
+            raise rejected
+        return ids
+
     def update(self, review_id: int, review_data: dict):
-        res = self.col.update_one({"id": int(review_id)}, {"$set": dict(review_data)})
-        if res.matched_count == 0:
+        before = self.col.find_one_and_update(
+            {"id": int(review_id)},
+            {"$set": dict(review_data)},
+            projection=RATED,
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
             return None
+        self._update_games(
+            review_deltas(self._rated(before), self._rated(before, review_data))
+        )
         return self.get(review_id)
 
     def delete(self, review_id: int) -> bool:
-        res = self.col.delete_one({"id": int(review_id)})
-        return res.deleted_count == 1
+        before = self.col.find_one_and_delete({"id": int(review_id)}, projection=RATED)
+        if before is None:
+            return False
+        self._update_games(review_deltas(self._rated(before), None))
+        return True
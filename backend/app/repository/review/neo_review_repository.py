@@ -1,9 +1,91 @@
 from neo4j import Driver
 
 from app.repository.review.i_review_repository import IReviewRepository
+from app.utility.bulk import BulkRowsRejected
+from app.utility.review_aggregates import (
+    NEO_UPDATE_QUERY,
+    created_deltas,
+    neo_rows,
+    review_deltas,
+)
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class ReviewRepositoryNeo(IReviewRepository):
+    GET_QUERY = """
+        MATCH (u:User)-[:WROTE]->(r:Review {id: $id})
+        MATCH (r)-[:FOR_GAME]-(g:Game)
+        RETURN r, g.id AS game_id, u AS user
+    """
+
+    EXPORT_QUERY = """
+        MATCH (u:User)-[:WROTE]->(r:Review)-[:FOR_GAME]-(g:Game)
+        WHERE r.id > $after
+        RETURN r, g.id AS game_id, u.id AS user_id
+        ORDER BY r.id
+    """
+
+    # deleting relabels a game DeletedGame and a user DeletedUser, so matching
+    # the Game and User labels leaves their reviews out until the purge
+    COUNT_FOR_GAME_QUERY = """
+        MATCH (:User)-[:WROTE]->(:Review)-[:FOR_GAME]-(:Game {id: $game_id})
+        RETURN count(*) AS count
+    """
+
+    # kept on the game node by create, update and delete
+    REVIEW_COUNT_QUERY = """
+        MATCH (g:Game {id: $game_id})
+        RETURN coalesce(g.review_count, 0) AS count
+    """
+
+    LIST_BY_GAME_QUERY = """
+        MATCH (u:User)-[:WROTE]->(r:Review)-[:FOR_GAME]-(g:Game {id: $game_id})
+        WHERE $after IS NULL OR r.id < $after
+        RETURN r, g.id AS game_id, u AS user
+        ORDER BY r.id DESC
+        SKIP $skip LIMIT $limit
+    """
+
+    CREATE_QUERY = """
+        MATCH (g:Game {id: $game_id})
+        MATCH (u:User {id: $user_id})
+        CREATE (r:Review $props)
+        CREATE (r)-[:FOR_GAME]->(g)
+        CREATE (u)-[:WROTE]->(r)
+        RETURN g.id AS game_id, r.star_amount AS stars
+    """
+
+    # rows whose game or user is missing match nothing and are left out
+    CREATE_MANY_QUERY = """
+        OPTIONAL MATCH (x:Review)
+        WITH coalesce(max(x.id), 0) AS top
+        UNWIND range(0, size($rows) - 1) AS i
+        WITH top, i, $rows[i] AS row
+        MATCH (g:Game {id: row.game_id})
+        MATCH (u:User {id: row.user_id})
+        CREATE (r:Review)
+        SET r = row, r.id = coalesce(row.id, top + i + 1)
+        CREATE (r)-[:FOR_GAME]->(g)
+        CREATE (u)-[:WROTE]->(r)
+        RETURN i, r.id AS id, g.id AS game_id, r.star_amount AS stars
+    """
+
+    UPDATE_QUERY = """
+        MATCH (r:Review {id: $id})
+        OPTIONAL MATCH (r)-[:FOR_GAME]-(g:Game)
+        WITH r, g.id AS game_id, r.star_amount AS old_stars
+        SET r += $props
+        RETURN r, game_id, old_stars
+    """
+
+    DELETE_QUERY = """
+        MATCH (r:Review {id: $id})
+        OPTIONAL MATCH (r)-[:FOR_GAME]-(g:Game)
+        WITH r, g.id AS game_id, r.star_amount AS stars
+        DETACH DELETE r
+        RETURN 1 AS ok, game_id, stars
+    """
+
     def __init__(self, driver: Driver):
         self.driver = driver
 
@@ -34,166 +116,207 @@ class ReviewRepositoryNeo(IReviewRepository):
 
         return r
 
+    def _rec_to_review(self, rec) -> dict:
+        r = dict(rec["r"])
+        r["id"] = int(r.get("id") or 0)
+        r["game_id"] = int(rec["game_id"])
+
+        u = dict(rec["user"])
+        r["user"] = {
+            "id": int(u["id"]),
+            "display_name": u.get("display_name") or u.get("username"),
+        }
+        r["user_id"] = int(u["id"])
+        return r
+
+    @staticmethod
+    def _count(session, query: str, **params) -> int:
+        rec = session.run(query, **params).single()
+        return rec["count"] if rec else 0
+
+    @staticmethod
+    def _rating(game_id, stars) -> tuple[int, int] | None:
+        return None if game_id is None or stars is None else (game_id, stars)
+
+    @classmethod
+    def _created(cls, rec) -> dict:
+        return review_deltas(None, cls._rating(rec["game_id"], rec["stars"]))
+
+    @classmethod
+    def _updated(cls, rec) -> dict:
+        return review_deltas(
+            cls._rating(rec["game_id"], rec["old_stars"]),
+            cls._rating(rec["game_id"], rec["r"].get("star_amount")),
+        )
+
+    @classmethod
+    def _deleted(cls, rec) -> dict:
+        return review_deltas(cls._rating(rec["game_id"], rec["stars"]), None)
+
+    @staticmethod
+    def _write(tx, query: str, deltas, **params):
+        """Runs a review write and its game aggregate update in one transaction."""
+        rec = tx.run(query, **params).single()
+        changed = deltas(rec) if rec else None
+        if changed:
+            tx.run(NEO_UPDATE_QUERY, rows=neo_rows(changed)).consume()
+        return rec
+
+    @staticmethod
+    def _created_ids(created: dict[int, int], size: int):
+        ids = [created.get(i) for i in range(size)]
+        if len(created) < size:
+            missing = [i for i in range(size) if i not in created]
+            raise BulkRowsRejected(
+                ids, dict.fromkeys(missing, "Game or user not found")
+            )
+        return ids
+
     def get(self, review_id: int):
         with self.driver.session() as session:
             rec = session.run(
-                """
-                MATCH (u:User)-[:WROTE]->(r:Review {id: $id})
-                MATCH (r)-[:FOR_GAME]-(g:Game)
-                RETURN r, g.id AS game_id, u AS user
-                """,
+                self.GET_QUERY,
                 id=int(review_id),
             ).single()
 
-            if not rec:
-                return None
-
-            r = dict(rec["r"])
-            r["id"] = int(r.get("id") or 0)
-            r["game_id"] = int(rec["game_id"])
-
-            u = dict(rec["user"])
-            r["user"] = {
-                "id": int(u["id"]),
-                "display_name": u.get("display_name") or u.get("username"),
-            }
-            r["user_id"] = int(u["id"])
-
-            return r
+            return self._rec_to_review(rec) if rec else None
 
     def get_review_count_for_game(self, game_id: int) -> int:
         with self.driver.session() as session:
             rec = session.run(
-                """
-                MATCH (:Review)-[:FOR_GAME]-(:Game {id: $game_id})
-                RETURN count(*) AS count
-                """,
+                self.REVIEW_COUNT_QUERY,
                 game_id=int(game_id),
             ).single()
 
             return rec["count"] if rec else 0
 
-    def list_by_game(self, game_id: int, offset: int, limit: int):
+    def list_by_game(
+        self,
+        game_id: int,
+        offset: int,
+        limit: int,
+        after: int | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
         with self.driver.session() as session:
             recs = session.run(
-                """
-                MATCH (u:User)-[:WROTE]->(r:Review)-[:FOR_GAME]-(g:Game {id: $game_id})
-                RETURN r, g.id AS game_id, u AS user
-                ORDER BY r.id DESC
-                SKIP $skip LIMIT $limit
-                """,
+                self.LIST_BY_GAME_QUERY,
                 game_id=int(game_id),
+                after=after,
                 skip=offset,
                 limit=limit,
             )
 
-            items = []
-            for rec in recs:
-                r = dict(rec["r"])
-                r["id"] = int(r.get("id") or 0)
-                r["game_id"] = int(rec["game_id"])
+            items = [self._rec_to_review(rec) for rec in recs]
 
-                u = dict(rec["user"])
-                r["user"] = {
-                    "id": int(u["id"]),
-                    "display_name": u.get("display_name") or u.get("username"),
-                }
-                r["user_id"] = int(u["id"])
-                items.append(r)
-
-            count_rec = session.run(
-                """
-                MATCH (:Review)-[:FOR_GAME]-(:Game {id: $game_id})
-                RETURN count(*) AS count
-                """,
-                game_id=int(game_id),
-            ).single()
-            total = count_rec["count"] if count_rec else 0
+            total = totals.resolve(
+                lambda: self._count(
+                    session, self.COUNT_FOR_GAME_QUERY, game_id=int(game_id)
+                )
+            )
 
             return items, total
 
-    def list(self, offset: int, limit: int, search: str | None):
-        with self.driver.session() as session:
-            params = {"skip": offset, "limit": limit}
-            where = ""
-            if search:
-                where = " WHERE r.title CONTAINS $search OR r.text CONTAINS $search"
-                params["search"] = search
-
-            recs = session.run(
-                f"""
-                MATCH (u:User)-[:WROTE]->(r:Review)-[:FOR_GAME]-(g:Game)
-                {where}
-                RETURN r, g.id AS game_id, u AS user
-                ORDER BY r.id DESC
-                SKIP $skip LIMIT $limit
-                """,
-                **params,
-            )
-
-            items = []
-            for rec in recs:
-                r = dict(rec["r"])
-                r["id"] = int(r.get("id") or 0)
-                r["game_id"] = int(rec["game_id"])
+    def _list_queries(
+        self, offset: int, limit: int, search: str | None
+    ) -> tuple[str, str, dict]:
+        params = {"skip": offset, "limit": limit}
+        where = ""
+        if search:
+            where = " WHERE r.title CONTAINS $search OR r.text CONTAINS $search"
+            params["search"] = search
 
-                u = dict(rec["user"])
-                r["user"] = {
-                    "id": int(u["id"]),
-                    "display_name": u.get("display_name") or u.get("username"),
-                }
-                r["user_id"] = int(u["id"])
-                items.append(r)
+        query = f"""
+            MATCH (u:User)-[:WROTE]->(r:Review)-[:FOR_GAME]-(g:Game)
+            {where}
+            RETURN r, g.id AS game_id, u AS user
+            ORDER BY r.id DESC
+            SKIP $skip LIMIT $limit
+            """
 
-            count_q = f"""
+        count_q = f"""
             MATCH (u:User)-[:WROTE]->(r:Review)-[:FOR_GAME]-(g:Game)
             {where}
             RETURN count(r) AS count
             """
-            count_rec = session.run(
-                count_q, **({"search": search} if search else {})
-            ).single()
-            total = count_rec["count"] if count_rec else 0
+
+        return query, count_q, params
+
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        query, count_q, params = self._list_queries(offset, limit, search)
+
+        with self.driver.session() as session:
+            recs = session.run(query, **params)
+
+            items = [self._rec_to_review(rec) for rec in recs]
+
+            total = totals.resolve(
+                lambda: self._count(
+                    session, count_q, **({"search": search} if search else {})
+                )
+            )
 
             return items, total
 
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ):
+        # records are pulled fetch_size at a time as the caller iterates
+        with self.driver.session(fetch_size=batch_size) as session:
+            after = -1 if after is None else after
+            for rec in session.run(self.EXPORT_QUERY, after=after):
+                row = {
+                    **dict(rec["r"]),
+                    "game_id": rec["game_id"],
+                    "user_id": rec["user_id"],
+                }
+                yield {f: row.get(f) for f in fields}
+
     def create(self, review_data: dict):
         with self.driver.session() as session:
-            session.run(
-                """
-                MATCH (g:Game {id: $game_id})
-                MATCH (u:User {id: $user_id})
-                CREATE (r:Review $props)
-                CREATE (r)-[:FOR_GAME]->(g)
-                CREATE (u)-[:WROTE]->(r)
-                """,
+            session.execute_write(
+                self._write,
+                self.CREATE_QUERY,
+                self._created,
                 game_id=int(review_data["game_id"]),
                 user_id=int(review_data["user_id"]),
                 props=dict(review_data),
             )
         return dict(review_data)
 
+    def create_many(self, rows):
+        def write(tx):
+            # the reviews and their games' aggregates in one transaction
+            recs = list(tx.run(self.CREATE_MANY_QUERY, rows=[dict(r) for r in rows]))
+            deltas = created_deltas((rec["game_id"], rec["stars"]) for rec in recs)
+            if deltas:
+                tx.run(NEO_UPDATE_QUERY, rows=neo_rows(deltas)).consume()
+            return {rec["i"]: rec["id"] for rec in recs}
+
+        with self.driver.session() as session:
+            created = session.execute_write(write)
+        return self._created_ids(created, len(rows))
+
     def update(self, review_id: int, review_data: dict):
         with self.driver.session() as session:
-            rec = session.run(
-                """
-                MATCH (r:Review {id: $id})
-                SET r += $props
-                RETURN r
-                """,
+            rec = session.execute_write(
+                self._write,
+                self.UPDATE_QUERY,
+                self._updated,
                 id=int(review_id),
                 props=dict(review_data),
-            ).single()
+            )
             return self._node(rec["r"]) if rec else None
 
     def delete(self, review_id: int) -> bool:
         with self.driver.session() as session:
-            rec = session.run(
-                """
-                MATCH (r:Review {id: $id})
-                DETACH DELETE r
-                RETURN 1 AS ok
-                """,
-                id=int(review_id),
-            ).single()
+            rec = session.execute_write(
+                self._write, self.DELETE_QUERY, self._deleted, id=int(review_id)
+            )
             return rec is not None
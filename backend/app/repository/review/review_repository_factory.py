@@ -1,25 +1,90 @@
 import os
 
-from app.repository.review.mongo_review_repository import ReviewRepositoryMongo
-from app.repository.review.neo_review_repository import ReviewRepositoryNeo
-from app.repository.review.sql_review_repository import ReviewRepositorySQL
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
+from app.repository.review.async_sql_review_repository import ReviewRepositorySQLAsync
+from app.repository.review.sql_review_repository import ReviewRepositorySQL
 from app.utility.db_sql import get_sql_db
+from app.utility.db_sql_async import get_async_sql_db
+
+
+def _mongo_repository():
+    from app.repository.review.mongo_review_repository import ReviewRepositoryMongo
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return ReviewRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.review.neo_review_repository import ReviewRepositoryNeo
+    from app.utility.db_neo import get_neo
 
+    driver = get_neo()
+    return ReviewRepositoryNeo(driver)
 
-def get_review_repository():
+
+def get_review_repository(sql_db: Session = Depends(get_sql_db)):
     db_mode = os.getenv("DB_MODE", "sql").lower()
 
     if db_mode == "sql":
-        db = next(get_sql_db())
-        return ReviewRepositorySQL(db)
+        return ReviewRepositorySQL(sql_db)
     if db_mode == "mongo":
-        db = next(get_mongo_db())
-        return ReviewRepositoryMongo(db)
+        return _mongo_repository()
     if db_mode == "neo":
-        driver = get_neo()
-        return ReviewRepositoryNeo(driver)
+        return _neo_repository()
+    if db_mode == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "review",
+            ReviewRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
+
+    raise ValueError(f"Unknown DB_MODE: {db_mode}")
+
+
+def _mongo_async_repository():
+    from app.repository.review.async_mongo_review_repository import (
+        ReviewRepositoryMongoAsync,
+    )
+    from app.utility.db_mongo import MONGO_DB, get_async_client
+
+    return ReviewRepositoryMongoAsync(get_async_client()[MONGO_DB])
+
+
+def _neo_async_repository():
+    from app.repository.review.async_neo_review_repository import (
+        ReviewRepositoryNeoAsync,
+    )
+    from app.utility.db_neo import get_async_neo
+
+    return ReviewRepositoryNeoAsync(get_async_neo())
+
+
+async def get_async_review_repository(
+    sql_db: AsyncSession = Depends(get_async_sql_db),
+):
+    db_mode = os.getenv("DB_MODE", "sql").lower()
+
+    if db_mode == "sql":
+        return ReviewRepositorySQLAsync(sql_db)
+    if db_mode == "mongo":
+        return _mongo_async_repository()
+    if db_mode == "neo":
+        return _neo_async_repository()
+    if db_mode == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "review",
+            ReviewRepositorySQLAsync(sql_db),
+            mongo=_mongo_async_repository,
+            neo=_neo_async_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {db_mode}")
@@ -1,54 +1,171 @@
-from sqlalchemy import func, select
+from sqlalchemy import Integer, and_, case, cast, exists, func, select, text, update
 from sqlalchemy.orm import Session
 
+from app.model.game_model import Game
 from app.model.review_model import Review
+from app.model.user_model import User
 from app.repository.review.i_review_repository import IReviewRepository
 from app.schema.review_schema import ReviewCreate  # only if you want to reuse it
+from app.utility.db_sql import count_rows, estimate_row_count, insert_many, iter_rows
+from app.utility.outbox import record_change
+from app.utility.review_aggregates import (
+    AggregateDelta,
+    created_deltas,
+    review_deltas,
+)
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class ReviewRepositorySQL(IReviewRepository):
+    # reviews of soft-deleted games and users wait for the purger with them;
+    # every read leaves them out
+    ALIVE = and_(
+        exists().where(Game.id == Review.game_id, Game.deleted_at.is_(None)),
+        exists().where(User.id == Review.user_id, User.deleted_at.is_(None)),
+    )
+
     def __init__(self, db: Session):
         self.db = db
 
+    def _get_stmt(self, review_id: int):
+        return select(Review).where(Review.id == review_id, self.ALIVE)
+
     def get(self, review_id: int) -> Review | None:
-        return self.db.get(Review, review_id)
+        return self.db.execute(self._get_stmt(review_id)).scalars().first()
 
-    def get_review_count_for_game(self, game_id: int) -> int:
-        stmt = select(func.count()).select_from(Review).where(Review.game_id == game_id)
-        return self.db.execute(stmt).scalar_one()
+    def _count_for_game_stmt(self, game_id: int):
+        # kept on the game row by create, update and delete
+        return select(Game.review_count).where(Game.id == game_id)
+
+    @staticmethod
+    def _rated(review: Review) -> tuple[int, int]:
+        return review.game_id, review.star_amount
+
+    @staticmethod
+    def _aggregate_stmt(game_id: int, delta: AggregateDelta):
+        """One UPDATE applying ``delta`` in place, so concurrent reviews never race.
+
+        MySQL assigns SET columns left to right and later ones see the new
+        values, so user_rating goes first and is computed from the old ones.
+        """
+        count = Game.review_count + delta.count
+        total = Game.rating_sum + delta.total
+        # * 1.0 so SQLite divides as floats too
+        values = [(Game.user_rating, case((count > 0, total * 1.0 / count)))]
+        if delta.stars:
+            args = []
+            for stars, n in delta.stars.items():
+                path = f'$."{stars}"'
+                current = func.json_extract(Game.star_histogram, path)
+                args += [path, func.coalesce(cast(current, Integer), 0) + n]
+            doc = func.coalesce(Game.star_histogram, func.json_object())
+            values.append((Game.star_histogram, func.json_set(doc, *args)))
+        values += [(Game.review_count, count), (Game.rating_sum, total)]
 
-    def list_by_game(self, game_id: int, offset: int, limit: int):
-        stmt = (
-            select(Review).where(Review.game_id == game_id).order_by(Review.id.desc())
+        return (
+            update(Game)
+            .where(Game.id == game_id)
+            .ordered_values(*values)
+            # the commit expires the game anyway, and json_set has no Python twin
+            .execution_options(synchronize_session=False)
         )
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
-        rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
-        return rows, total
 
-    def list(self, offset: int, limit: int, search: str | None):
-        stmt = select(Review)
+    @classmethod
+    def _update_games(cls, db: Session, deltas: dict[int, AggregateDelta]) -> None:
+        # in the review's transaction, committed with it
+        for game_id, delta in deltas.items():
+            db.execute(cls._aggregate_stmt(game_id, delta))
+            # a plain UPDATE, so the outbox flush hooks do not see it
+            record_change(db, "game", game_id)
+
+    def _list_by_game_stmt(self, game_id: int):
+        return (
+            select(Review)
+            .where(Review.game_id == game_id, self.ALIVE)
+            .order_by(Review.id.desc())
+        )
+
+    def _list_stmt(self, search: str | None):
+        stmt = select(Review).where(self.ALIVE)
         if search:
             stmt = stmt.where(Review.comment.ilike(f"%{search}%"))
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        return stmt
+
+    def get_review_count_for_game(self, game_id: int) -> int:
+        return self.db.execute(self._count_for_game_stmt(game_id)).scalar() or 0
+
+    def _after_stmt(self, stmt, after: int | None):
+        return stmt if after is None else stmt.where(Review.id < after)
+
+    def list_by_game(
+        self,
+        game_id: int,
+        offset: int,
+        limit: int,
+        after: int | None = None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        stmt = self._list_by_game_stmt(game_id)
+        total = totals.resolve(lambda: count_rows(self.db, stmt))
+        page = self._after_stmt(stmt, after).offset(offset).limit(limit)
+        rows = self.db.execute(page).scalars().all()
+        return rows, total
+
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        stmt = self._list_stmt(search)
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "review"),
+        )
         rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
         return rows, total
 
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ):
+        yield from iter_rows(self.db, Review, fields, after, batch_size, self.ALIVE)
+
     def create(self, review_data: dict) -> Review:
         review = self._create_via_procedure(review_data)
+        self._update_games(self.db, review_deltas(None, self._rated(review)))
         self.db.commit()
         self.db.refresh(review)
         return review
 
+    @classmethod
+    def _insert_many(cls, db: Session, rows):
+        # plain INSERTs rather than add_game_review, one round trip per batch
+        ids = insert_many(db, Review, rows)
+        for review_id in ids:
+            record_change(db, "review", review_id)
+        cls._update_games(
+            db, created_deltas((r["game_id"], r["star_amount"]) for r in rows)
+        )
+        return ids
+
+    def create_many(self, rows):
+        try:
+            ids = self._insert_many(self.db, rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ids
+
     def update(self, review_id: int, review_data: dict) -> Review | None:
         obj = self.get(review_id)
         if not obj:
             return None
+        before = self._rated(obj)
         for k, v in review_data.items():
             setattr(obj, k, v)
+        self._update_games(self.db, review_deltas(before, self._rated(obj)))
         self.db.commit()
         self.db.refresh(obj)
         return obj
@@ -57,11 +174,29 @@ class ReviewRepositorySQL(IReviewRepository):
         obj = self.get(review_id)
         if not obj:
             return False
+        self._update_games(self.db, review_deltas(self._rated(obj), None))
         self.db.delete(obj)
         self.db.commit()
         return True
 
     def _create_via_procedure(self, review_data: dict) -> Review:
+        stmt, params = self._procedure_call(review_data)
+
+        result = self.db.execute(stmt, params)
+        row = result.fetchone()
+        if not row or row[0] is None:
+            raise ValueError("add_game_review did not return a new review id")
+
+        new_id = int(row[0])
+        obj = self.db.get(Review, new_id)
+        if not obj:
+            raise ValueError("Review created but could not be loaded by id")
+        # the procedure inserted the row, so the flush hooks never saw it
+        record_change(self.db, "review", new_id)
+        return obj
+
+    @staticmethod
+    def _procedure_call(review_data: dict):
         # Adjust keys if payload use star_amount and not stars
         # or similar
         stmt = text(
@@ -85,14 +220,4 @@ class ReviewRepositorySQL(IReviewRepository):
                 review_data.get("star_amount") or review_data.get("stars") or 0
             ),
         }
-
-        result = self.db.execute(stmt, params)
-        row = result.fetchone()
-        if not row or row[0] is None:
-            raise ValueError("add_game_review did not return a new review id")
-
-        new_id = int(row[0])
-        obj = self.db.get(Review, new_id)
-        if not obj:
-            raise ValueError("Review created but could not be loaded by id")
-        return obj
+        return stmt, params
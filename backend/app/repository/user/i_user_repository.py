@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class IUserRepository(ABC):
@@ -12,7 +15,23 @@ class IUserRepository(ABC):
     def get_by_email(self, email: str): ...
 
     @abstractmethod
-    def list(self, offset: int, limit: int, search: str | None): ...
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ): ...
+
+    @abstractmethod
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """``fields`` of every user with an id above ``after``, in id order.
+
+        Streamed from a server-side cursor ``batch_size`` rows at a time, so
+        memory stays flat however many there are.
+        """
 
     @abstractmethod
     def create(self, user_data: dict): ...
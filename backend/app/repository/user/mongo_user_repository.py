@@ -1,11 +1,14 @@
 from pymongo.collection import Collection
 
 from app.repository.user.i_user_repository import IUserRepository
+from app.utility.db_mongo import TOMBSTONES, iter_by_id, tombstone
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class UserRepositoryMongo(IUserRepository):
     def __init__(self, db):
         self.col: Collection = db["users"]
+        self.tombstones: Collection = db[TOMBSTONES]
 
     def _doc(self, doc: dict | None):
         if not doc:
@@ -25,7 +28,13 @@ class UserRepositoryMongo(IUserRepository):
     def get_by_email(self, email: str):
         return self._doc(self.col.find_one({"email": email}))
 
-    def list(self, offset: int, limit: int, search: str | None):
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
         query = {}
         if search:
             query["$or"] = [
@@ -33,10 +42,20 @@ class UserRepositoryMongo(IUserRepository):
                 {"email": {"$regex": search, "$options": "i"}},
             ]
 
-        total = self.col.count_documents(query)
+        total = totals.resolve(
+            lambda: self.col.count_documents(query),
+            None if query else self.col.estimated_document_count,
+        )
         cursor = self.col.find(query).skip(offset).limit(limit).sort("username", 1)
         return [self._doc(d) for d in cursor], total
 
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ):
+        projection = dict.fromkeys(fields, 1)
+        for doc in iter_by_id(self.col, projection, after, batch_size):
+            yield {**{f: doc.get(f) for f in fields}, "id": doc["export_id"]}
+
     def create(self, user_data: dict):
         doc = dict(user_data)
         if "id" not in doc and "_id" not in doc:
@@ -55,4 +74,8 @@ class UserRepositoryMongo(IUserRepository):
 
     def delete(self, user_id: int) -> bool:
         res = self.col.delete_one({"id": int(user_id)})
-        return res.deleted_count == 1
+        if res.deleted_count != 1:
+            return False
+        # the user's reviews, and what they add to their games, go in the purger
+        self.tombstones.insert_one(tombstone("user", user_id))
+        return True
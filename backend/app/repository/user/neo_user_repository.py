@@ -3,6 +3,7 @@ import datetime
 from neo4j import Driver
 
 from app.repository.user.i_user_repository import IUserRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class UserRepositoryNeo(IUserRepository):
@@ -46,7 +47,13 @@ class UserRepositoryNeo(IUserRepository):
             ).single()
             return self._node(rec["u"]) if rec else None
 
-    def list(self, offset: int, limit: int, search: str | None):
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
         with self.driver.session() as session:
             base = "MATCH (u:User)"
             where = ""
@@ -62,14 +69,28 @@ class UserRepositoryNeo(IUserRepository):
             records = session.run(query, **params)
             items = [self._node(r["u"]) for r in records]
 
-            count_q = base + where + " RETURN count(u) AS count"
-            count_rec = session.run(
-                count_q, **({"search": search} if search else {})
-            ).single()
-            total = count_rec["count"] if count_rec else 0
+            def count():
+                count_q = base + where + " RETURN count(u) AS count"
+                count_rec = session.run(
+                    count_q, **({"search": search} if search else {})
+                ).single()
+                return count_rec["count"] if count_rec else 0
+
+            total = totals.resolve(count, None if search else count)
 
             return items, total
 
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ):
+        query = "MATCH (u:User) WHERE u.id > $after RETURN u ORDER BY u.id"
+        # records are pulled fetch_size at a time as the caller iterates
+        with self.driver.session(fetch_size=batch_size) as session:
+            after = -1 if after is None else after
+            for rec in session.run(query, after=after):
+                user = self._node(rec["u"])
+                yield {f: user.get(f) for f in fields}
+
     def create(self, user_data: dict):
         with self.driver.session() as session:
             session.run(
@@ -94,11 +115,13 @@ class UserRepositoryNeo(IUserRepository):
             return self._node(rec["u"]) if rec else None
 
     def delete(self, user_id: int) -> bool:
+        # hidden from every (u:User) match; the purger removes reviews and node
         with self.driver.session() as session:
             rec = session.run(
                 """
                 MATCH (u:User {id: $id})
-                DETACH DELETE u
+                REMOVE u:User
+                SET u:DeletedUser, u.deleted_at = datetime()
                 RETURN 1 AS ok
                 """,
                 id=int(user_id),
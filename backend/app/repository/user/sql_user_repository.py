@@ -1,38 +1,58 @@
-from sqlalchemy import func, select
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.model.user_model import User
-from app.model.review_model import Review
 from app.repository.user.i_user_repository import IUserRepository
+from app.utility.db_sql import count_rows, estimate_row_count, iter_rows
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class UserRepositorySQL(IUserRepository):
+    # soft-deleted users wait for the purger; every read leaves them out
+    ALIVE = User.deleted_at.is_(None)
+
     def __init__(self, db: Session):
         self.db = db
 
     def get(self, user_id: int) -> User | None:
-        return self.db.get(User, user_id)
+        stmt = select(User).where(User.id == user_id, self.ALIVE)
+        return self.db.execute(stmt).scalars().first()
 
     def get_by_username(self, username: str) -> User | None:
-        stmt = select(User).where(User.username == username)
+        stmt = select(User).where(User.username == username, self.ALIVE)
         return self.db.execute(stmt).scalars().first()
 
     def get_by_email(self, email: str) -> User | None:
-        stmt = select(User).where(User.email == email)
+        stmt = select(User).where(User.email == email, self.ALIVE)
         return self.db.execute(stmt).scalars().first()
 
-    def list(self, offset: int, limit: int, search: str | None):
-        stmt = select(User)
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        totals: TotalCount = EXACT_TOTAL,
+    ):
+        stmt = select(User).where(self.ALIVE)
         if search:
             like = f"%{search}%"
             stmt = stmt.where((User.username.ilike(like)) | (User.email.ilike(like)))
 
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "user"),
+        )
         rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
         return rows, total
 
+    def iter_export(
+        self, fields: tuple[str, ...], after: int | None = None, batch_size: int = 1000
+    ):
+        yield from iter_rows(self.db, User, fields, after, batch_size, self.ALIVE)
+
     def create(self, user_data: dict) -> User:
         obj = User(**user_data)
         self.db.add(obj)
@@ -51,20 +71,24 @@ class UserRepositorySQL(IUserRepository):
         return obj
 
     def delete(self, user_id: int) -> bool:
-        obj = self.get(user_id)
-        if not obj:
-            return False
-
-        try:
-            self.db.execute(select(Review).where(Review.user_id == int(user_id)))
-            self.db.query(Review).filter(Review.user_id == int(user_id)).delete(
-                synchronize_session=False
+        # O(1) however many reviews the user wrote; those go in the purger.
+        # The unique username and display name are freed at once, so they
+        # can be registered again before the purger gets to the row.
+        freed = f"deleted:{uuid.uuid4().hex}"
+        stmt = (
+            update(User)
+            .where(User.id == int(user_id), self.ALIVE)
+            .values(
+                deleted_at=datetime.now(UTC).replace(tzinfo=None),
+                username=freed,
+                display_name=freed,
             )
-
-            self.db.delete(obj)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            deleted = self.db.execute(stmt).rowcount == 1
             self.db.commit()
-            return True
-
+            return deleted
         except Exception:
             self.db.rollback()
             raise
@@ -1,25 +1,45 @@
 import os
 
-from app.repository.user.mongo_user_repository import UserRepositoryMongo
-from app.repository.user.neo_user_repository import UserRepositoryNeo
-from app.repository.user.sql_user_repository import UserRepositorySQL
+from fastapi import Depends
+from sqlalchemy.orm import Session
 
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
+from app.repository.user.sql_user_repository import UserRepositorySQL
 from app.utility.db_sql import get_sql_db
 
 
-def get_user_repository():
+def _mongo_repository():
+    from app.repository.user.mongo_user_repository import UserRepositoryMongo
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return UserRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.user.neo_user_repository import UserRepositoryNeo
+    from app.utility.db_neo import get_neo
+
+    driver = get_neo()
+    return UserRepositoryNeo(driver)
+
+
+def get_user_repository(sql_db: Session = Depends(get_sql_db)):
     db_mode = os.getenv("DB_MODE", "sql").lower()
 
     if db_mode == "sql":
-        db = next(get_sql_db())
-        return UserRepositorySQL(db)
+        return UserRepositorySQL(sql_db)
     if db_mode == "mongo":
-        db = next(get_mongo_db())
-        return UserRepositoryMongo(db)
+        return _mongo_repository()
     if db_mode == "neo":
-        driver = get_neo()
-        return UserRepositoryNeo(driver)
+        return _neo_repository()
+    if db_mode == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "user",
+            UserRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {db_mode}")
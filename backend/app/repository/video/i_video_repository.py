@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from app.utility.totals import EXACT_TOTAL, TotalCount
+
 
 class IVideoRepository(ABC):
     @abstractmethod
@@ -13,6 +15,7 @@ class IVideoRepository(ABC):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ): ...
 
     @abstractmethod
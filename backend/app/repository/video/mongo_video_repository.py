@@ -3,6 +3,7 @@ from typing import Any
 from pymongo.collection import Collection
 
 from app.repository.video.i_video_repository import IVideoRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class VideoRepositoryMongo(IVideoRepository):
@@ -23,12 +24,16 @@ class VideoRepositoryMongo(IVideoRepository):
         search: str | None,
         sort_by: str | None = None,
         sort_order: str | None = None,
+        totals: TotalCount = EXACT_TOTAL,
     ):
         query = {}
         if search:
             query["title"] = {"$regex": search, "$options": "i"}
 
-        total = self.col.count_documents(query)
+        total = totals.resolve(
+            lambda: self.col.count_documents(query),
+            None if query else self.col.estimated_document_count,
+        )
 
         sort_field = "title"
         sort_dir = 1 if (sort_order or "asc") == "asc" else -1
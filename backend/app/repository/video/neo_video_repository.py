@@ -1,6 +1,7 @@
 from neo4j import Driver
 
 from app.repository.video.i_video_repository import IVideoRepository
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class VideoRepositoryNeo(IVideoRepository):
@@ -29,6 +30,7 @@ class VideoRepositoryNeo(IVideoRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ):
         with self.driver.session() as session:
             base = "MATCH (v:Video)"
@@ -51,13 +53,16 @@ class VideoRepositoryNeo(IVideoRepository):
             records = session.run(query, **params)
             items = [self._node_to_video(r["v"]) for r in records]
 
-            count_query = base + where + " RETURN count(v) AS count"
-            if search:
-                count_query = "MATCH (v:Video) WHERE v.title CONTAINS $search RETURN count(v) AS count"
-            count_res = session.run(
-                count_query, **({"search": search} if search else {})
-            ).single()
-            total = count_res["count"] if count_res else 0
+            def count():
+                count_query = base + where + " RETURN count(v) AS count"
+                if search:
+                    count_query = "MATCH (v:Video) WHERE v.title CONTAINS $search RETURN count(v) AS count"
+                count_res = session.run(
+                    count_query, **({"search": search} if search else {})
+                ).single()
+                return count_res["count"] if count_res else 0
+
+            total = totals.resolve(count, None if search else count)
 
             return items, total
 
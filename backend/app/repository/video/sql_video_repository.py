@@ -1,8 +1,10 @@
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.model.video_model import Video
 from app.repository.video.i_video_repository import IVideoRepository
+from app.utility.db_sql import count_rows, estimate_row_count
+from app.utility.totals import EXACT_TOTAL, TotalCount
 
 
 class VideoRepositorySQL(IVideoRepository):
@@ -24,6 +26,7 @@ class VideoRepositorySQL(IVideoRepository):
         search: str | None,
         sort_by: str | None,
         sort_order: str | None = "asc",
+        totals: TotalCount = EXACT_TOTAL,
     ) -> tuple[list[Video], int]:
         stmt = select(Video)
 
@@ -40,9 +43,10 @@ class VideoRepositorySQL(IVideoRepository):
         else:
             stmt = stmt.order_by(Video.title.asc())
 
-        total = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        total = totals.resolve(
+            lambda: count_rows(self.db, stmt),
+            None if search else lambda: estimate_row_count(self.db, "video"),
+        )
 
         rows = self.db.execute(stmt.offset(offset).limit(limit)).scalars().all()
         return rows, total
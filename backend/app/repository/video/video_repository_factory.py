@@ -1,24 +1,45 @@
 import os
 
-from app.repository.video.mongo_video_repository import VideoRepositoryMongo
-from app.repository.video.neo_video_repository import VideoRepositoryNeo
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
 from app.repository.video.sql_video_repository import VideoRepositorySQL
-from app.utility.db_mongo import get_db as get_mongo_db
-from app.utility.db_neo import get_neo
 from app.utility.db_sql import get_sql_db
 
 
-def get_video_repository():
+def _mongo_repository():
+    from app.repository.video.mongo_video_repository import VideoRepositoryMongo
+    from app.utility.db_mongo import get_db as get_mongo_db
+
+    db = next(get_mongo_db())
+    return VideoRepositoryMongo(db)
+
+
+def _neo_repository():
+    from app.repository.video.neo_video_repository import VideoRepositoryNeo
+    from app.utility.db_neo import get_neo
+
+    driver = get_neo()
+    return VideoRepositoryNeo(driver)
+
+
+def get_video_repository(sql_db: Session = Depends(get_sql_db)):
     db_mode = os.getenv("DB_MODE", "sql").lower()
 
     if db_mode == "sql":
-        db = next(get_sql_db())
-        return VideoRepositorySQL(db)
+        return VideoRepositorySQL(sql_db)
     if db_mode == "mongo":
-        db = next(get_mongo_db())
-        return VideoRepositoryMongo(db)
+        return _mongo_repository()
     if db_mode == "neo":
-        driver = get_neo()
-        return VideoRepositoryNeo(driver)
+        return _neo_repository()
+    if db_mode == "hybrid":
+        from app.repository.hybrid_repository import HybridRepository
+
+        return HybridRepository(
+            "video",
+            VideoRepositorySQL(sql_db),
+            mongo=_mongo_repository,
+            neo=_neo_repository,
+        )
 
     raise ValueError(f"Unknown DB_MODE: {db_mode}")
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class AutocompleteItem(BaseModel):
+    id: int
+    name: str
+
+
+class AutocompleteRead(BaseModel):
+    games: list[AutocompleteItem]
+    designers: list[AutocompleteItem]
+    artists: list[AutocompleteItem]
+    publishers: list[AutocompleteItem]
+    mechanics: list[AutocompleteItem]
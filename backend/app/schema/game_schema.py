@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import os
 import re
+from typing import Annotated, Any
 
 from pydantic import (
     BaseModel,
+    BeforeValidator,
     ConfigDict,
     Field,
     confloat,
@@ -15,10 +18,22 @@ from app.schema.artist_schema import ArtistRead
 from app.schema.designer_schema import DesignerRead
 from app.schema.mechanic_schema import MechanicRead
 from app.schema.publisher_schema import PublisherRead
+from app.schema.review_schema import STARS
 
 MAX_BYTES = 65535
 
 
+def _star_counts(raw: Any) -> dict[int, int]:
+    # stores keep only the star amounts they have seen, with string keys
+    counts = {int(s): int(n or 0) for s, n in (raw or {}).items()}
+    return {s: counts.get(s, 0) for s in STARS}
+
+
+# games stored before the review aggregates existed have no value yet
+ReviewCount = Annotated[int, BeforeValidator(lambda v: v or 0)]
+StarHistogram = Annotated[dict[int, int], BeforeValidator(_star_counts)]
+
+
 class ORMModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -201,6 +216,52 @@ class GameUpdate(GameBase):
         return v
 
 
+class GameFilter(BaseModel):
+    """The query of /api/games/filter: facets a game must match, with bounds
+    inclusive, and the page to return.
+
+    One model, because FastAPI only reads a model's fields as separate query
+    parameters when it is the endpoint's only query parameter.
+    """
+
+    offset: int = Field(0, ge=0)
+    limit: int = Field(20, ge=1, le=100)
+    facets: bool = Field(True, description="Also count the matches per facet value")
+    fields: str | None = Field(
+        None, description="Comma separated fields to return, e.g. id,name,thumbnail"
+    )
+    players: list[Annotated[int, Field(ge=1, le=999)]] = Field(
+        [], description="Player counts the game must support"
+    )
+    min_time: int | None = Field(None, ge=0, description="Playing time in minutes")
+    max_time: int | None = Field(None, ge=0, description="Playing time in minutes")
+    min_difficulty: float | None = Field(None, ge=1, le=5)
+    max_difficulty: float | None = Field(None, ge=1, le=5)
+    min_year: int | None = None
+    max_year: int | None = None
+    mechanic: list[int] = Field([], description="Mechanic ids the game must all have")
+    genre: list[int] = Field([], description="Genre ids the game must all have")
+    designer: list[int] = Field([], description="Designer ids the game must all have")
+    publisher: list[int] = Field([], description="Publisher ids the game must all have")
+
+    def search_filters(self) -> dict:
+        """The facets as keyword arguments of ``game_facets.search``."""
+        return {
+            "players": self.players,
+            "ranges": {
+                "playing_time": (self.min_time, self.max_time),
+                "difficulty": (self.min_difficulty, self.max_difficulty),
+                "year": (self.min_year, self.max_year),
+            },
+            "links": {
+                "mechanic": self.mechanic,
+                "genre": self.genre,
+                "designer": self.designer,
+                "publisher": self.publisher,
+            },
+        }
+
+
 class GameRead(ORMModel):
     id: int
     name: str
@@ -214,9 +275,32 @@ class GameRead(ORMModel):
     max_players: int | None = None
     image: str | None = None
     thumbnail: str | None = None
+    review_count: ReviewCount = 0
+    rating_sum: ReviewCount = 0
+    user_rating: float | None = None
+
+
+# neighbours kept per game; also the largest limit a lookup can ask for
+SIMILAR_TOP_K = int(os.getenv("SIMILAR_TOP_K", "20"))
+
+
+class SimilarGame(GameRead):
+    # cosine of the two games' weighted links, 1 for the same links
+    score: float
+
+
+class RecommendedGame(GameRead):
+    # the user's stars on their reviewed games, weighted by similarity to this one
+    predicted: float
+    # how many of those reviewed games it is similar to
+    support: int
 
 
 class GameDetail(GameRead):
+    # review count per star amount
+    star_histogram: StarHistogram = Field(
+        default_factory=lambda: dict.fromkeys(STARS, 0)
+    )
     artists: list[ArtistRead] = []
     designers: list[DesignerRead] = []
     publishers: list[PublisherRead] = []
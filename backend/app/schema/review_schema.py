@@ -4,6 +4,9 @@ from pydantic import BaseModel, ConfigDict, constr, field_validator
 
 from app.schema.user_schema import UserDisplayName
 
+# the star amounts a review may give
+STARS = tuple(range(1, 11))
+
 
 class ORMModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -33,7 +36,7 @@ class ReviewBase(ORMModel):
     @field_validator("star_amount")
     @classmethod
     def validate_star_amount(cls, v: int) -> int:
-        if v < 1 or v > 10:
+        if v not in STARS:
             raise ValueError("Star amount must be between 1 and 10")
         return v
 
@@ -84,3 +87,13 @@ class ReviewRead(ORMModel):
     user: UserDisplayName
     game_id: int
     user_id: int | None = None
+
+
+class ReviewExport(ORMModel):
+    # flat, so a review is one CSV row
+    id: int
+    title: str
+    text: str | None = None
+    star_amount: int
+    game_id: int
+    user_id: int | None = None
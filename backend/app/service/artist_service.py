@@ -1,13 +1,19 @@
+from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from app.model.artists_model import Artist
 from app.repository.artist.artist_repository_factory import get_artist_repository
+from app.repository.artist.i_artist_repository import IArtistRepository
 from app.schema.artist_schema import ArtistCreate, ArtistRead, ArtistUpdate
+from app.utility.autocomplete import autocomplete_index
+from app.utility.bulk import BulkResult, unique_names, validate_chunk, write_chunk
+from app.utility.etag import entity_versions
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
 
 class ArtistService:
-    def __init__(self):
-        self.repo = get_artist_repository()
+    def __init__(self, repo: IArtistRepository = Depends(get_artist_repository)):
+        self.repo = repo
 
     def get(self, artist_id: int) -> ArtistRead | None:
         obj = self.repo.get(artist_id)
@@ -16,10 +22,21 @@ class ArtistService:
         return ArtistRead.model_validate(obj)
 
     def list(
-        self, offset: int, limit: int, search: str | None
-    ) -> tuple[list[ArtistRead], int]:
-        rows, total = self.repo.list(offset=offset, limit=limit, search=search)
-        return [ArtistRead.model_validate(r) for r in rows], total
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[ArtistRead], int | None, bool]:
+        # one extra row tells whether another page exists
+        rows, total = self.repo.list(
+            offset=offset,
+            limit=limit + 1,
+            search=search,
+            totals=TotalCount(count, "artist", (search,)),
+        )
+        items = [ArtistRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: ArtistCreate) -> ArtistRead:
         if self.repo.get_by_name(payload.name):
@@ -27,8 +44,24 @@ class ArtistService:
 
         artist_obj = Artist(**payload.model_dump())
         artist_obj = self.repo.create(artist_obj)
+        count_cache.invalidate("artist")
+        entity_versions.bump("artist")
 
-        return ArtistRead.model_validate(artist_obj)
+        item = ArtistRead.model_validate(artist_obj)
+        autocomplete_index.upsert("artists", item.id, item.name)
+        return item
+
+    def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(ArtistCreate, chunk, result)
+        valid = unique_names(valid, self.repo.get_by_name, "Artist", result)
+        rows = [(i, item.model_dump()) for i, item in valid]
+        created = write_chunk(rows, self.repo.create_many, result)
+        if created:
+            count_cache.invalidate("artist")
+            entity_versions.bump("artist")
+        names = dict(valid)
+        for index, artist_id in created:
+            autocomplete_index.upsert("artists", artist_id, names[index].name)
 
     def update(self, artist_id: int, payload: ArtistUpdate) -> ArtistRead | None:
         obj = self.repo.get(artist_id)
@@ -46,7 +79,21 @@ class ArtistService:
             setattr(obj, key, value)
 
         obj = self.repo.update(obj)
-        return ArtistRead.model_validate(obj) if obj else None
+        count_cache.invalidate("artist")
+        entity_versions.bump("artist")
+        if not obj:
+            return None
+        item = ArtistRead.model_validate(obj)
+        autocomplete_index.upsert("artists", item.id, item.name)
+        return item
 
     def delete(self, artist_id: int) -> bool:
-        return self.repo.delete(artist_id)
+        from app.utility.similarity import similar_games
+
+        deleted = self.repo.delete(artist_id)
+        count_cache.invalidate("artist")
+        entity_versions.bump("artist")
+        if deleted:
+            autocomplete_index.remove("artists", artist_id)
+            similar_games.remove_feature("artists", artist_id)
+        return deleted
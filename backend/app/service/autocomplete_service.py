@@ -0,0 +1,49 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.repository.artist.artist_repository_factory import get_artist_repository
+from app.repository.designer.designer_repository_factory import get_designer_repository
+from app.repository.game.game_repository_factory import get_game_repository
+from app.repository.mechanic.mechanic_repository_factory import (
+    get_mechanic_repository,
+)
+from app.repository.publisher.publisher_repository_factory import (
+    get_publisher_repository,
+)
+from app.utility.autocomplete import autocomplete_index
+
+logger = logging.getLogger(__name__)
+
+
+def _unranked(rows):
+    return ((entity_id, name, None) for entity_id, name in rows)
+
+
+def build_autocomplete_index(sql_db: Session) -> None:
+    """Fill the autocomplete index from the active DB_MODE backend.
+
+    Runs once at startup; afterwards the services keep it current.
+    """
+    sources = {
+        "games": lambda: get_game_repository(sql_db).iter_names(),
+        "designers": lambda: _unranked(get_designer_repository(sql_db).iter_names()),
+        "artists": lambda: _unranked(get_artist_repository(sql_db).iter_names()),
+        "publishers": lambda: _unranked(get_publisher_repository(sql_db).iter_names()),
+        "mechanics": lambda: _unranked(get_mechanic_repository(sql_db).iter_names()),
+    }
+
+    for kind, rows in sources.items():
+        try:
+            autocomplete_index.load(kind, rows())
+        except Exception:
+            # a missing table or collection should not keep the API from starting
+            logger.exception("Could not load %s into the autocomplete index", kind)
+
+    autocomplete_index.ready = True
+    logger.info("Autocomplete index loaded: %s", autocomplete_index.snapshot())
+
+
+class AutocompleteService:
+    def suggest(self, q: str, limit: int) -> dict[str, list[dict]]:
+        return autocomplete_index.search(q, limit)
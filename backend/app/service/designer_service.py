@@ -1,21 +1,39 @@
+from fastapi import Depends
+
 from app.model.designer_model import Designer
 from app.repository.designer.designer_repository_factory import get_designer_repository
+from app.repository.designer.i_designer_repository import IDesignerRepository
 from app.schema.designer_schema import DesignerCreate, DesignerRead, DesignerUpdate
+from app.utility.autocomplete import autocomplete_index
+from app.utility.bulk import BulkResult, unique_names, validate_chunk, write_chunk
+from app.utility.etag import entity_versions
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
 
 class DesignerService:
-    def __init__(self):
-        self.repo = get_designer_repository()
+    def __init__(self, repo: IDesignerRepository = Depends(get_designer_repository)):
+        self.repo = repo
 
     def get(self, designer_id: int) -> DesignerRead | None:
         obj = self.repo.get(designer_id)
         return DesignerRead.model_validate(obj) if obj else None
 
     def list(
-        self, offset: int, limit: int, search: str | None
-    ) -> tuple[list[DesignerRead], int]:
-        rows, total = self.repo.list(offset=offset, limit=limit, search=search)
-        return [DesignerRead.model_validate(r) for r in rows], total
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[DesignerRead], int | None, bool]:
+        # one extra row tells whether another page exists
+        rows, total = self.repo.list(
+            offset=offset,
+            limit=limit + 1,
+            search=search,
+            totals=TotalCount(count, "designer", (search,)),
+        )
+        items = [DesignerRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: DesignerCreate) -> DesignerRead:
         if self.repo.get_by_name(payload.name):
@@ -23,7 +41,23 @@ class DesignerService:
 
         obj = Designer(**payload.model_dump())
         obj = self.repo.create(obj)
-        return DesignerRead.model_validate(obj)
+        count_cache.invalidate("designer")
+        entity_versions.bump("designer")
+        item = DesignerRead.model_validate(obj)
+        autocomplete_index.upsert("designers", item.id, item.name)
+        return item
+
+    def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(DesignerCreate, chunk, result)
+        valid = unique_names(valid, self.repo.get_by_name, "Designer", result)
+        rows = [(i, item.model_dump()) for i, item in valid]
+        created = write_chunk(rows, self.repo.create_many, result)
+        if created:
+            count_cache.invalidate("designer")
+            entity_versions.bump("designer")
+        names = dict(valid)
+        for index, designer_id in created:
+            autocomplete_index.upsert("designers", designer_id, names[index].name)
 
     def update(self, designer_id: int, payload: DesignerUpdate) -> DesignerRead | None:
         obj = self.repo.get(designer_id)
@@ -41,7 +75,21 @@ class DesignerService:
             setattr(obj, key, value)
 
         obj = self.repo.update(obj)
-        return DesignerRead.model_validate(obj) if obj else None
+        count_cache.invalidate("designer")
+        entity_versions.bump("designer")
+        item = DesignerRead.model_validate(obj)
+        autocomplete_index.upsert("designers", item.id, item.name)
+        return item if obj else None
 
     def delete(self, designer_id: int) -> bool:
-        return self.repo.delete(designer_id)
+        from app.utility.facets import game_facets
+        from app.utility.similarity import similar_games
+
+        deleted = self.repo.delete(designer_id)
+        count_cache.invalidate("designer")
+        entity_versions.bump("designer")
+        if deleted:
+            autocomplete_index.remove("designers", designer_id)
+            similar_games.remove_feature("designers", designer_id)
+            game_facets.remove_value("designer", designer_id)
+        return deleted
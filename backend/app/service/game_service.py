@@ -1,63 +1,445 @@
-from app.repository.game.game_repository_factory import get_game_repository
+import logging
+
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+
+from app.repository.game.game_repository_factory import (
+    get_async_game_repository,
+    get_game_repository,
+)
+from app.repository.game.i_game_repository import IGameRepository
 from app.schema.artist_schema import ArtistRead
 from app.schema.designer_schema import DesignerRead
-from app.schema.game_schema import GameCreate, GameDetail, GameRead, GameUpdate
+from app.schema.game_schema import (
+    GameCreate,
+    GameDetail,
+    GameFilter,
+    GameRead,
+    GameUpdate,
+    RecommendedGame,
+    SimilarGame,
+)
 from app.schema.mechanic_schema import MechanicRead
 from app.schema.publisher_schema import PublisherRead
+from app.utility.autocomplete import autocomplete_index
+from app.utility.bulk import BulkResult, awrite_chunk, validate_chunk, write_chunk
+from app.utility.cursor import decode_cursor, encode_cursor
+from app.utility.etag import entity_versions
+from app.utility.export import EXPORT_BATCH_SIZE, export_rows
+from app.utility.fields import parse_fields, partial_dump, with_field
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
+# lists read exactly these columns, so rows arrive as plain dicts
+GAME_READ_FIELDS = tuple(GameRead.model_fields)
+GAME_LIST = TypeAdapter(list[GameRead])
+SIMILAR_LIST = TypeAdapter(list[SimilarGame])
+RECOMMENDED_LIST = TypeAdapter(list[RecommendedGame])
 
-class GameService:
-    def __init__(self):
-        self.repo = get_game_repository()
+logger = logging.getLogger(__name__)
+
+
+# the indexes import numpy and scipy, so they load on first use, not with the app
+def _similar():
+    from app.utility.similarity import similar_games
+
+    return similar_games
+
+
+def _facets():
+    from app.utility.facets import game_facets
+
+    return game_facets
+
+
+def build_similar_index(sql_db) -> None:
+    """Fill the similar games index from the active DB_MODE backend.
+
+    Runs once at startup; afterwards the services keep it current.
+    """
+    similar_games = _similar()
+    try:
+        similar_games.load(get_game_repository(sql_db).iter_features())
+    except Exception:
+        # a missing table or collection should not keep the API from starting
+        logger.exception("Could not load the similar games index")
+    similar_games.ready = True
+    logger.info("Similar games index loaded: %s", similar_games.snapshot())
+
+
+def build_facet_index(sql_db) -> None:
+    """Fill the game facet index from the active DB_MODE backend.
+
+    Runs once at startup; afterwards the services keep it current.
+    """
+    from app.utility.facets import FACET_FIELDS, LINK_KINDS, game_facets
+
+    repo = get_game_repository(sql_db)
+    try:
+        game_facets.load(
+            repo.iter_export(FACET_FIELDS, None, EXPORT_BATCH_SIZE),
+            repo.iter_features(tuple(LINK_KINDS.values())),
+        )
+    except Exception:
+        logger.exception("Could not load the game facet index")
+    game_facets.ready = True
+    logger.info("Game facet index loaded: %s", game_facets.snapshot())
+
+
+def _decode_after(cursor: str | None, sort_by, sort_order):
+    if not cursor:
+        return None
+
+    payload = decode_cursor(cursor)
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise ValueError("Cursor does not match the requested sort")
+    return payload.get("v"), payload["id"]
+
+
+def _next_cursor(rows, limit, field, sort_by, sort_order) -> str | None:
+    # rows holds one extra item when another page exists
+    if len(rows) <= limit:
+        return None
 
-    def list(self, offset, limit, search, sort_by, sort_order):
-        rows, total = self.repo.list(offset, limit, search, sort_by, sort_order)
+    last = rows[limit - 1]
+    # sparse fieldsets come back as dicts
+    value = last.get if isinstance(last, dict) else lambda key: getattr(last, key)
+    return encode_cursor(
+        {
+            "s": sort_by,
+            "o": sort_order,
+            "v": value(field) if field else None,
+            "id": value("id"),
+        }
+    )
 
-        for r in rows:
-            if r.bgg_rating is not None:
-                r.bgg_rating = round(r.bgg_rating, 2)
 
-            # clean data before validation
-            if r.year_published is not None and r.year_published < 1901:
-                r.year_published = 1901
-            if r.min_players is not None and r.min_players < 1:
-                r.min_players = 1
-            if r.max_players is not None and r.max_players < 1:
-                r.max_players = 1
+def _clean(row: dict) -> dict:
+    # clean data before validation
+    if row.get("bgg_rating") is not None:
+        row["bgg_rating"] = round(row["bgg_rating"], 2)
+    # the SQL column is a string
+    if row.get("year_published") is not None and int(row["year_published"]) < 1901:
+        row["year_published"] = 1901
+    for key in ("min_players", "max_players"):
+        if row.get(key) is not None and row[key] < 1:
+            row[key] = 1
+    return row
 
-        return [GameRead.model_validate(r) for r in rows], total
 
-    def get(self, game_id):
-        obj = self.repo.get(game_id)
-        if not obj:
-            return None
+def _to_game_list(rows: list[dict]) -> list[GameRead]:
+    """Column rows to read models in a single validator call, no ORM objects."""
+    return GAME_LIST.validate_python([_clean(r) for r in rows])
 
-        if obj.bgg_rating is not None:
-            obj.bgg_rating = round(obj.bgg_rating, 2)
 
-        return GameRead.model_validate(obj)
+def _to_fields(row, fields, model=GameRead) -> dict | None:
+    """Only ``fields`` of ``row``, cleaned the way _to_game_list does."""
+    if not row:
+        return None
 
-    def get_detail(self, game_id):
-        obj = self.repo.get_detail(game_id)
-        if not obj:
-            return None
+    if not isinstance(row, dict):
+        row = {f: getattr(row, f) for f in fields}
+    return partial_dump(model, _clean(row), fields)
 
-        return GameDetail.model_validate(
+
+def _to_game(obj) -> GameRead | None:
+    if not obj:
+        return None
+
+    if obj.bgg_rating is not None:
+        obj.bgg_rating = round(obj.bgg_rating, 2)
+
+    return GameRead.model_validate(obj)
+
+
+def _to_detail(obj) -> GameDetail | None:
+    if not obj:
+        return None
+
+    return GameDetail.model_validate(
+        {
+            **obj.__dict__,
+            "artists": [ArtistRead.model_validate(a) for a in obj.artists],
+            "designers": [DesignerRead.model_validate(d) for d in obj.designers],
+            "publishers": [PublisherRead.model_validate(p) for p in obj.publishers],
+            "mechanics": [MechanicRead.model_validate(m) for m in obj.mechanics],
+        }
+    )
+
+
+def _with_scores(rows: list[dict], neighbours) -> list[SimilarGame]:
+    scores = dict(neighbours)
+    return SIMILAR_LIST.validate_python(
+        [{**_clean(r), "score": scores[r["id"]]} for r in rows]
+    )
+
+
+def _with_predictions(rows: list[dict], ranked) -> list[RecommendedGame]:
+    predictions = {game_id: (p, n) for game_id, p, n in ranked}
+    return RECOMMENDED_LIST.validate_python(
+        [
             {
-                **obj.__dict__,
-                "artists": [ArtistRead.model_validate(a) for a in obj.artists],
-                "designers": [DesignerRead.model_validate(d) for d in obj.designers],
-                "publishers": [PublisherRead.model_validate(p) for p in obj.publishers],
-                "mechanics": [MechanicRead.model_validate(m) for m in obj.mechanics],
+                **_clean(r),
+                "predicted": round(predictions[r["id"]][0], 2),
+                "support": predictions[r["id"]][1],
             }
+            for r in rows
+        ]
+    )
+
+
+def _to_items(rows, fields) -> list:
+    if fields is not None:
+        return [_to_fields(r, fields) for r in rows]
+    return _to_game_list(rows)
+
+
+# GameService and AsyncGameService differ only in how they call the repository:
+# each read builds the repository arguments and a function that turns what the
+# repository returns into the response, and each write ends in one side effect
+# helper, which the async service runs off the event loop.
+
+
+def _list_query(
+    repo, offset, limit, search, sort_by, sort_order, cursor, count, fields
+):
+    after = _decode_after(cursor, sort_by, sort_order)
+    fields = parse_fields(fields, GameRead.model_fields)
+    # the keyset cursor needs the sort field even when it was not asked for
+    field = repo.cursor_field(sort_by)
+    args = (
+        0 if after is not None else offset,
+        limit + 1,
+        search,
+        sort_by,
+        sort_order,
+        after,
+        TotalCount(count, "game", (search,)),
+        with_field(fields or GAME_READ_FIELDS, field),
+    )
+
+    def page(rows, total):
+        next_cursor = _next_cursor(rows, limit, field, sort_by, sort_order)
+        return _to_items(rows[:limit], fields), total, next_cursor
+
+    return args, page
+
+
+def _search_query(q, offset, limit, count, fields):
+    fields = parse_fields(fields, GameRead.model_fields)
+    # one extra row tells whether another page exists
+    args = (
+        q,
+        offset,
+        limit + 1,
+        TotalCount(count, "game", ("search", q)),
+        fields or GAME_READ_FIELDS,
+    )
+
+    def page(rows, total):
+        return _to_items(rows[:limit], fields), total, len(rows) > limit
+
+    return args, page
+
+
+def _get_query(game_id, fields):
+    fields = parse_fields(fields, GameRead.model_fields)
+    if fields is not None:
+        return (game_id, fields), lambda row: _to_fields(row, fields)
+    return (game_id,), _to_game
+
+
+def _detail_query(game_id, fields):
+    fields = parse_fields(fields, GameDetail.model_fields)
+    if fields is not None:
+        return (game_id, fields), lambda row: _to_fields(row, fields, GameDetail)
+    return (game_id,), _to_detail
+
+
+def _filter_query(query: GameFilter):
+    fields = parse_fields(query.fields, GameRead.model_fields)
+    ids, total, facets = _facets().search(
+        query.offset, query.limit, counts=query.facets, **query.search_filters()
+    )
+
+    def page(rows):
+        return _to_items(rows, fields), total, facets
+
+    return (ids, fields or GAME_READ_FIELDS), page
+
+
+def _saved(obj) -> GameRead | None:
+    """Counts, versions and indexes after a create or update, then the read model."""
+    count_cache.invalidate("game")
+    entity_versions.bump("game")
+    if not obj:
+        return None
+
+    game = GameRead.model_validate(obj)
+    autocomplete_index.upsert("games", game.id, game.name, game.bgg_rating)
+    _facets().update(game.id, game.model_dump())
+    return game
+
+
+def _bulk_created(valid: list[tuple[int, GameCreate]], created) -> None:
+    if not created:
+        return
+
+    count_cache.invalidate("game")
+    entity_versions.bump("game")
+    games = dict(valid)
+    for index, game_id in created:
+        game = games[index]
+        autocomplete_index.upsert("games", game_id, game.name, game.bgg_rating)
+        _facets().update(game_id, game.model_dump())
+
+
+def _deleted(game_id, deleted: bool) -> bool:
+    # reviews go with the game
+    count_cache.invalidate("game", "review")
+    entity_versions.bump("game", "review")
+    if deleted:
+        autocomplete_index.remove("games", int(game_id))
+        _similar().remove(game_id)
+        _facets().remove(game_id)
+    return deleted
+
+
+class GameService:
+    def __init__(self, repo: IGameRepository = Depends(get_game_repository)):
+        self.repo = repo
+
+    def list(
+        self,
+        offset,
+        limit,
+        search,
+        sort_by,
+        sort_order,
+        cursor=None,
+        count: TotalMode = TotalMode.exact,
+        fields: str | None = None,
+    ):
+        args, page = _list_query(
+            self.repo, offset, limit, search, sort_by, sort_order, cursor, count, fields
         )
+        return page(*self.repo.list(*args))
+
+    def search(self, q, offset, limit, count: TotalMode = TotalMode.exact, fields=None):
+        args, page = _search_query(q, offset, limit, count, fields)
+        return page(*self.repo.search(*args))
+
+    def get(self, game_id, fields=None):
+        args, to_read = _get_query(game_id, fields)
+        return to_read(self.repo.get(*args))
+
+    def get_detail(self, game_id, fields=None):
+        args, to_read = _detail_query(game_id, fields)
+        return to_read(self.repo.get_detail(*args))
 
     def create(self, payload: GameCreate):
-        return GameRead.model_validate(self.repo.create(payload.model_dump()))
+        return _saved(self.repo.create(payload.model_dump()))
+
+    def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(GameCreate, chunk, result)
+        rows = [(i, g.model_dump()) for i, g in valid]
+        _bulk_created(valid, write_chunk(rows, self.repo.create_many, result))
 
     def update(self, game_id, payload: GameUpdate):
-        obj = self.repo.update(game_id, payload.model_dump(exclude_unset=True))
-        return GameRead.model_validate(obj) if obj else None
+        return _saved(self.repo.update(game_id, payload.model_dump(exclude_unset=True)))
 
     def delete(self, game_id):
-        return self.repo.delete(game_id)
+        return _deleted(game_id, self.repo.delete(game_id))
+
+    def similar(self, game_id, limit: int):
+        """Nearest games by shared links, or None when the game does not exist."""
+        neighbours = _similar().neighbours(game_id, limit)
+        if not neighbours:
+            return [] if self.repo.get(game_id, ("id",)) else None
+        ids = [other for other, _ in neighbours]
+        return _with_scores(self.repo.get_many(ids, GAME_READ_FIELDS), neighbours)
+
+    def filter(self, query: GameFilter):
+        """One page of the games matching ``query``, their total and facet counts."""
+        (ids, fields), page = _filter_query(query)
+        return page(self.repo.get_many(ids, fields) if ids else [])
+
+    def recommended(self, ranked):
+        """The games of (game id, predicted, support) rows, in their order."""
+        ids = [game_id for game_id, _, _ in ranked]
+        return _with_predictions(self.repo.get_many(ids, GAME_READ_FIELDS), ranked)
+
+    def export(self, after=None):
+        rows = self.repo.iter_export(GAME_READ_FIELDS, after, EXPORT_BATCH_SIZE)
+        return export_rows(rows, GameRead)
+
+
+class AsyncGameService:
+    """GameService over the async drivers, for the routes when DB_ASYNC is on.
+
+    Only games and reviews have async repositories; the other entities are
+    served from the threadpool either way.
+    """
+
+    def __init__(self, repo: IGameRepository = Depends(get_async_game_repository)):
+        self.repo = repo
+
+    async def list(
+        self,
+        offset,
+        limit,
+        search,
+        sort_by,
+        sort_order,
+        cursor=None,
+        count: TotalMode = TotalMode.exact,
+        fields: str | None = None,
+    ):
+        args, page = _list_query(
+            self.repo, offset, limit, search, sort_by, sort_order, cursor, count, fields
+        )
+        return page(*await self.repo.list(*args))
+
+    async def search(
+        self, q, offset, limit, count: TotalMode = TotalMode.exact, fields=None
+    ):
+        args, page = _search_query(q, offset, limit, count, fields)
+        return page(*await self.repo.search(*args))
+
+    async def get(self, game_id, fields=None):
+        args, to_read = _get_query(game_id, fields)
+        return to_read(await self.repo.get(*args))
+
+    async def get_detail(self, game_id, fields=None):
+        args, to_read = _detail_query(game_id, fields)
+        return to_read(await self.repo.get_detail(*args))
+
+    async def create(self, payload: GameCreate):
+        obj = await self.repo.create(payload.model_dump())
+        return await run_in_threadpool(_saved, obj)
+
+    async def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(GameCreate, chunk, result)
+        rows = [(i, g.model_dump()) for i, g in valid]
+        created = await awrite_chunk(rows, self.repo.create_many, result)
+        await run_in_threadpool(_bulk_created, valid, created)
+
+    async def update(self, game_id, payload: GameUpdate):
+        obj = await self.repo.update(game_id, payload.model_dump(exclude_unset=True))
+        return await run_in_threadpool(_saved, obj)
+
+    async def delete(self, game_id):
+        deleted = await self.repo.delete(game_id)
+        return await run_in_threadpool(_deleted, game_id, deleted)
+
+    async def similar(self, game_id, limit: int):
+        neighbours = _similar().neighbours(game_id, limit)
+        if not neighbours:
+            return [] if await self.repo.get(game_id, ("id",)) else None
+        ids = [other for other, _ in neighbours]
+        rows = await self.repo.get_many(ids, GAME_READ_FIELDS)
+        return _with_scores(rows, neighbours)
+
+    async def filter(self, query: GameFilter):
+        (ids, fields), page = _filter_query(query)
+        return page(await self.repo.get_many(ids, fields) if ids else [])
@@ -1,23 +1,39 @@
+from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from app.model.genre_model import Genre
 from app.repository.genre.genre_repository_factory import get_genre_repository
+from app.repository.genre.i_genre_repository import IGenreRepository
 from app.schema.genre_schema import GenreCreate, GenreRead, GenreUpdate
+from app.utility.bulk import BulkResult, unique_names, validate_chunk, write_chunk
+from app.utility.etag import entity_versions
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
 
 class GenreService:
-    def __init__(self):
-        self.repo = get_genre_repository()
+    def __init__(self, repo: IGenreRepository = Depends(get_genre_repository)):
+        self.repo = repo
 
     def get(self, genre_id: int) -> GenreRead | None:
         obj = self.repo.get(genre_id)
         return GenreRead.model_validate(obj) if obj else None
 
     def list(
-        self, offset: int, limit: int, search: str | None
-    ) -> tuple[list[GenreRead], int]:
-        rows, total = self.repo.list(offset=offset, limit=limit, search=search)
-        return [GenreRead.model_validate(r) for r in rows], total
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[GenreRead], int | None, bool]:
+        # one extra row tells whether another page exists
+        rows, total = self.repo.list(
+            offset=offset,
+            limit=limit + 1,
+            search=search,
+            totals=TotalCount(count, "genre", (search,)),
+        )
+        items = [GenreRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: GenreCreate) -> GenreRead:
         if self.repo.get_by_name(payload.name):
@@ -25,8 +41,19 @@ class GenreService:
 
         obj = Genre(**payload.model_dump())
         obj = self.repo.create(obj)
+        count_cache.invalidate("genre")
+        entity_versions.bump("genre")
         return GenreRead.model_validate(obj)
 
+    def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(GenreCreate, chunk, result)
+        valid = unique_names(valid, self.repo.get_by_name, "Genre", result)
+        rows = [(i, item.model_dump()) for i, item in valid]
+        created = write_chunk(rows, self.repo.create_many, result)
+        if created:
+            count_cache.invalidate("genre")
+            entity_versions.bump("genre")
+
     def update(self, genre_id: int, payload: GenreUpdate) -> GenreRead | None:
         obj = self.repo.get(genre_id)
         if not obj:
@@ -43,8 +70,18 @@ class GenreService:
             setattr(obj, key, value)
 
         obj = self.repo.update(obj)
+        count_cache.invalidate("genre")
+        entity_versions.bump("genre")
         return GenreRead.model_validate(obj)
 
     def delete(self, genre_id: int) -> bool:
-        return self.repo.delete(genre_id)
+        from app.utility.facets import game_facets
+        from app.utility.similarity import similar_games
 
+        deleted = self.repo.delete(genre_id)
+        count_cache.invalidate("genre")
+        entity_versions.bump("genre")
+        if deleted:
+            similar_games.remove_feature("genres", genre_id)
+            game_facets.remove_value("genre", genre_id)
+        return deleted
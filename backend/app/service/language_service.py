@@ -1,28 +1,46 @@
+from fastapi import Depends
+
+from app.repository.language.i_language_repository import ILanguageRepository
 from app.repository.language.language_repository_factory import (
     get_language_repository,
 )
 from app.schema.language_schema import LanguageCreate, LanguageRead, LanguageUpdate
+from app.utility.etag import entity_versions
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
 
 class LanguageService:
-    def __init__(self):
-        self.repo = get_language_repository()
+    def __init__(self, repo: ILanguageRepository = Depends(get_language_repository)):
+        self.repo = repo
 
     def get(self, language_id: int) -> LanguageRead | None:
         obj = self.repo.get(language_id)
         return LanguageRead.model_validate(obj) if obj else None
 
     def list(
-        self, offset: int = 0, limit: int = 50, search: str | None = None
-    ) -> tuple[list[LanguageRead], int]:
-        rows, total = self.repo.list(offset=offset, limit=limit, search=search)
-        return [LanguageRead.model_validate(r) for r in rows], total
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[LanguageRead], int | None, bool]:
+        # one extra row tells whether another page exists
+        rows, total = self.repo.list(
+            offset=offset,
+            limit=limit + 1,
+            search=search,
+            totals=TotalCount(count, "language", (search,)),
+        )
+        items = [LanguageRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: LanguageCreate) -> LanguageRead:
         if self.repo.get_by_name(payload.language):
             raise ValueError("Language with this name already exists")
 
         obj = self.repo.create(payload.model_dump())
+        count_cache.invalidate("language")
+        entity_versions.bump("language")
         return LanguageRead.model_validate(obj)
 
     def update(self, language_id: int, payload: LanguageUpdate) -> LanguageRead | None:
@@ -40,7 +58,12 @@ class LanguageService:
                     raise ValueError("Language with this name already exists")
 
         obj = self.repo.update(language_id, update_data)
+        count_cache.invalidate("language")
+        entity_versions.bump("language")
         return LanguageRead.model_validate(obj) if obj else None
 
     def delete(self, language_id: int) -> bool:
-        return self.repo.delete(language_id)
+        deleted = self.repo.delete(language_id)
+        count_cache.invalidate("language")
+        entity_versions.bump("language")
+        return deleted
@@ -1,23 +1,41 @@
+from fastapi import Depends
+
 from app.model.mechanic_model import Mechanic
+from app.repository.mechanic.i_mechanic_repository import IMechanicRepository
 from app.repository.mechanic.mechanic_repository_factory import (
     get_mechanic_repository,
 )
 from app.schema.mechanic_schema import MechanicCreate, MechanicRead, MechanicUpdate
+from app.utility.autocomplete import autocomplete_index
+from app.utility.bulk import BulkResult, unique_names, validate_chunk, write_chunk
+from app.utility.etag import entity_versions
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
 
 class MechanicService:
-    def __init__(self):
-        self.repo = get_mechanic_repository()
+    def __init__(self, repo: IMechanicRepository = Depends(get_mechanic_repository)):
+        self.repo = repo
 
     def get(self, mechanic_id: int) -> MechanicRead | None:
         obj = self.repo.get(mechanic_id)
         return MechanicRead.model_validate(obj) if obj else None
 
     def list(
-        self, offset: int = 0, limit: int = 50, search: str | None = None
-    ) -> tuple[list[MechanicRead], int]:
-        rows, total = self.repo.list(offset=offset, limit=limit, search=search)
-        return [MechanicRead.model_validate(r) for r in rows], total
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[MechanicRead], int | None, bool]:
+        # one extra row tells whether another page exists
+        rows, total = self.repo.list(
+            offset=offset,
+            limit=limit + 1,
+            search=search,
+            totals=TotalCount(count, "mechanic", (search,)),
+        )
+        items = [MechanicRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: MechanicCreate) -> MechanicRead:
         if self.repo.get_by_name(payload.name):
@@ -26,9 +44,24 @@ class MechanicService:
         obj = Mechanic(**payload.model_dump())
         obj = self.repo.create(obj)
         self.db.commit()
+        count_cache.invalidate("mechanic")
+        entity_versions.bump("mechanic")
         self.db.refresh(obj)
+        autocomplete_index.upsert("mechanics", obj.id, obj.name)
         return MechanicRead.model_validate(obj)
 
+    def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(MechanicCreate, chunk, result)
+        valid = unique_names(valid, self.repo.get_by_name, "Mechanic", result)
+        rows = [(i, item.model_dump()) for i, item in valid]
+        created = write_chunk(rows, self.repo.create_many, result)
+        if created:
+            count_cache.invalidate("mechanic")
+            entity_versions.bump("mechanic")
+        names = dict(valid)
+        for index, mechanic_id in created:
+            autocomplete_index.upsert("mechanics", mechanic_id, names[index].name)
+
     def update(self, mechanic_id: int, payload: MechanicUpdate) -> MechanicRead | None:
         obj = self.repo.get(mechanic_id)
         if not obj:
@@ -46,13 +79,24 @@ class MechanicService:
 
         obj = self.repo.update(obj)
         self.db.commit()
+        count_cache.invalidate("mechanic")
+        entity_versions.bump("mechanic")
         self.db.refresh(obj)
+        autocomplete_index.upsert("mechanics", obj.id, obj.name)
         return MechanicRead.model_validate(obj)
 
     def delete(self, mechanic_id: int) -> bool:
+        from app.utility.facets import game_facets
+        from app.utility.similarity import similar_games
+
         obj = self.repo.get(mechanic_id)
         if not obj:
             return False
         self.repo.delete(obj)
         self.db.commit()
+        count_cache.invalidate("mechanic")
+        entity_versions.bump("mechanic")
+        autocomplete_index.remove("mechanics", mechanic_id)
+        similar_games.remove_feature("mechanics", mechanic_id)
+        game_facets.remove_value("mechanic", mechanic_id)
         return True
@@ -1,12 +1,19 @@
+from fastapi import Depends
+
+from app.repository.publisher.i_publisher_repository import IPublisherRepository
 from app.repository.publisher.publisher_repository_factory import (
     get_publisher_repository,
 )
 from app.schema.publisher_schema import PublisherCreate, PublisherRead, PublisherUpdate
+from app.utility.autocomplete import autocomplete_index
+from app.utility.bulk import BulkResult, unique_names, validate_chunk, write_chunk
+from app.utility.etag import entity_versions
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
 
 class PublisherService:
-    def __init__(self):
-        self.repo = get_publisher_repository()
+    def __init__(self, repo: IPublisherRepository = Depends(get_publisher_repository)):
+        self.repo = repo
 
     def get(self, publisher_id: int) -> PublisherRead | None:
         obj = self.repo.get(publisher_id)
@@ -19,22 +26,42 @@ class PublisherService:
         search: str | None = None,
         sort_by: str | None = None,
         sort_order: str | None = None,
-    ) -> tuple[list[PublisherRead], int]:
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[PublisherRead], int | None, bool]:
+        # one extra row tells whether another page exists
         rows, total = self.repo.list(
             offset,
-            limit,
+            limit + 1,
             search,
             sort_by,
             sort_order,
+            totals=TotalCount(count, "publisher", (search,)),
         )
-        return [PublisherRead.model_validate(r) for r in rows], total
+        items = [PublisherRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: PublisherCreate) -> PublisherRead:
         if self.repo.get_by_name(payload.name):
             raise ValueError("Publisher with this name already exists")
 
         obj = self.repo.create(payload.model_dump())
-        return PublisherRead.model_validate(obj)
+        count_cache.invalidate("publisher")
+        entity_versions.bump("publisher")
+        item = PublisherRead.model_validate(obj)
+        autocomplete_index.upsert("publishers", item.id, item.name)
+        return item
+
+    def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(PublisherCreate, chunk, result)
+        valid = unique_names(valid, self.repo.get_by_name, "Publisher", result)
+        rows = [(i, item.model_dump()) for i, item in valid]
+        created = write_chunk(rows, self.repo.create_many, result)
+        if created:
+            count_cache.invalidate("publisher")
+            entity_versions.bump("publisher")
+        names = dict(valid)
+        for index, publisher_id in created:
+            autocomplete_index.upsert("publishers", publisher_id, names[index].name)
 
     def update(
         self, publisher_id: int, payload: PublisherUpdate
@@ -47,7 +74,11 @@ class PublisherService:
                 raise ValueError("Publisher with this name already exists")
 
         obj = self.repo.update(publisher_id, update_data)
-        return PublisherRead.model_validate(obj) if obj else None
+        count_cache.invalidate("publisher")
+        entity_versions.bump("publisher")
+        item = PublisherRead.model_validate(obj)
+        autocomplete_index.upsert("publishers", item.id, item.name)
+        return item if obj else None
 
     def delete(self, publisher_id: int) -> bool:
         obj = self.repo.get(publisher_id)
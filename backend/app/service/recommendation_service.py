@@ -0,0 +1,26 @@
+from fastapi import Depends
+
+from app.repository.recommendation.i_recommendation_repository import (
+    IRecommendationRepository,
+)
+from app.repository.recommendation.recommendation_repository_factory import (
+    get_recommendation_repository,
+)
+from app.service.game_service import GameService
+
+
+class RecommendationService:
+    def __init__(
+        self,
+        repo: IRecommendationRepository = Depends(get_recommendation_repository),
+        games: GameService = Depends(),
+    ):
+        self.repo = repo
+        self.games = games
+
+    def for_user(self, user_id: int, limit: int):
+        """Games for a user from the precomputed model: one query, one get_many."""
+        ranked = self.repo.list_for_user(user_id, limit)
+        if not ranked:
+            return []
+        return self.games.recommended(ranked)
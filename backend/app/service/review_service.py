@@ -1,45 +1,192 @@
-from app.repository.review.review_repository_factory import get_review_repository
-from app.schema.review_schema import ReviewCreate, ReviewRead, ReviewUpdate
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+
+from app.repository.review.i_review_repository import IReviewRepository
+from app.repository.review.review_repository_factory import (
+    get_async_review_repository,
+    get_review_repository,
+)
+from app.schema.review_schema import (
+    ReviewCreate,
+    ReviewExport,
+    ReviewRead,
+    ReviewUpdate,
+)
+from app.utility.bulk import BulkResult, awrite_chunk, validate_chunk, write_chunk
+from app.utility.cursor import decode_cursor, encode_cursor
+from app.utility.etag import entity_versions
+from app.utility.export import EXPORT_BATCH_SIZE, export_rows
+from app.utility.totals import TotalCount, TotalMode, count_cache
+
+REVIEW_EXPORT_FIELDS = tuple(ReviewExport.model_fields)
+
+
+def _decode_after(cursor: str | None) -> int | None:
+    if not cursor:
+        return None
+
+    after = decode_cursor(cursor)["id"]
+    if not isinstance(after, int):
+        raise ValueError("Invalid cursor")
+    return after
+
+
+def _next_cursor(items: list[ReviewRead], limit: int) -> str | None:
+    # items holds one extra review when another page exists
+    if len(items) <= limit:
+        return None
+    return encode_cursor({"id": items[limit - 1].id})
+
+
+def _to_review(obj) -> ReviewRead | None:
+    return ReviewRead.model_validate(obj) if obj else None
+
+
+# ReviewService and AsyncReviewService differ only in how they call the
+# repository; the async one runs the write side effects off the event loop.
+
+
+def _list_by_game_query(game_id, offset, limit, cursor, count):
+    after = _decode_after(cursor)
+    args = (
+        game_id,
+        0 if after is not None else offset,
+        limit + 1,
+        after,
+        TotalCount(count, "review", ("game", game_id)),
+    )
+
+    def page(rows, total):
+        items = [ReviewRead.model_validate(r) for r in rows]
+        return items[:limit], total, _next_cursor(items, limit)
+
+    return args, page
+
+
+def _list_query(offset, limit, search, count):
+    # one extra row tells whether another page exists
+    args = (offset, limit + 1, search, TotalCount(count, "review", (search,)))
+
+    def page(rows, total):
+        items = [ReviewRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
+
+    return args, page
+
+
+def _changed() -> None:
+    count_cache.invalidate("review")
+    # games are read with their review aggregates
+    entity_versions.bump("review", "game")
 
 
 class ReviewService:
-    def __init__(self):
-        self.repo = get_review_repository()
+    def __init__(self, repo: IReviewRepository = Depends(get_review_repository)):
+        self.repo = repo
 
     def get(self, review_id: int) -> ReviewRead | None:
-        obj = self.repo.get(review_id)
-        return ReviewRead.model_validate(obj) if obj else None
+        return _to_review(self.repo.get(review_id))
 
     def get_review_count_for_game(self, game_id: int) -> int:
         return self.repo.get_review_count_for_game(game_id)
 
     def list_by_game(
-        self, game_id: int, offset: int = 0, limit: int = 5
-    ) -> tuple[list[ReviewRead], int]:
-        rows, total = self.repo.list_by_game(game_id, offset, limit)
-        return [ReviewRead.model_validate(r) for r in rows], total
+        self,
+        game_id: int,
+        offset: int = 0,
+        limit: int = 5,
+        cursor: str | None = None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[ReviewRead], int | None, str | None]:
+        args, page = _list_by_game_query(game_id, offset, limit, cursor, count)
+        return page(*self.repo.list_by_game(*args))
 
     def list(
-        self, offset: int = 0, limit: int = 50, search: str | None = None
-    ) -> tuple[list[ReviewRead], int]:
-        rows, total = self.repo.list(offset, limit, search)
-        return [ReviewRead.model_validate(r) for r in rows], total
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[ReviewRead], int | None, bool]:
+        args, page = _list_query(offset, limit, search, count)
+        return page(*self.repo.list(*args))
 
     def create(self, payload: ReviewCreate) -> ReviewRead:
         # review = self.repo.create_via_procedure(payload)  # uses stored procedure
         # Perhaps use again?
         obj = self.repo.create(payload.model_dump())
+        _changed()
         return ReviewRead.model_validate(obj)
 
+    def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(ReviewCreate, chunk, result)
+        rows = [(i, r.model_dump()) for i, r in valid]
+        if write_chunk(rows, self.repo.create_many, result):
+            _changed()
+
     def update(self, review_id: int, payload: ReviewUpdate) -> ReviewRead | None:
-        obj = self.repo.update(
-            review_id,
-            payload.model_dump(exclude_unset=True),
-        )
-        return ReviewRead.model_validate(obj) if obj else None
+        obj = self.repo.update(review_id, payload.model_dump(exclude_unset=True))
+        _changed()
+        return _to_review(obj)
 
     def delete(self, review_id: int) -> bool:
-        obj = self.repo.delete(review_id)
-        if not obj:
-            return False
-        return True
+        deleted = self.repo.delete(review_id)
+        _changed()
+        return bool(deleted)
+
+    def export(self, after: int | None = None):
+        rows = self.repo.iter_export(REVIEW_EXPORT_FIELDS, after, EXPORT_BATCH_SIZE)
+        return export_rows(rows, ReviewExport)
+
+
+class AsyncReviewService:
+    def __init__(self, repo: IReviewRepository = Depends(get_async_review_repository)):
+        self.repo = repo
+
+    async def get(self, review_id: int) -> ReviewRead | None:
+        return _to_review(await self.repo.get(review_id))
+
+    async def get_review_count_for_game(self, game_id: int) -> int:
+        return await self.repo.get_review_count_for_game(game_id)
+
+    async def list_by_game(
+        self,
+        game_id: int,
+        offset: int = 0,
+        limit: int = 5,
+        cursor: str | None = None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[ReviewRead], int | None, str | None]:
+        args, page = _list_by_game_query(game_id, offset, limit, cursor, count)
+        return page(*await self.repo.list_by_game(*args))
+
+    async def list(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[ReviewRead], int | None, bool]:
+        args, page = _list_query(offset, limit, search, count)
+        return page(*await self.repo.list(*args))
+
+    async def create(self, payload: ReviewCreate) -> ReviewRead:
+        obj = await self.repo.create(payload.model_dump())
+        await run_in_threadpool(_changed)
+        return ReviewRead.model_validate(obj)
+
+    async def create_many(self, chunk, result: BulkResult) -> None:
+        valid = validate_chunk(ReviewCreate, chunk, result)
+        rows = [(i, r.model_dump()) for i, r in valid]
+        if await awrite_chunk(rows, self.repo.create_many, result):
+            await run_in_threadpool(_changed)
+
+    async def update(self, review_id: int, payload: ReviewUpdate) -> ReviewRead | None:
+        obj = await self.repo.update(review_id, payload.model_dump(exclude_unset=True))
+        await run_in_threadpool(_changed)
+        return _to_review(obj)
+
+    async def delete(self, review_id: int) -> bool:
+        deleted = await self.repo.delete(review_id)
+        await run_in_threadpool(_changed)
+        return bool(deleted)
@@ -1,18 +1,24 @@
-import bcrypt
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
 
+from app.repository.user.i_user_repository import IUserRepository
 from app.repository.user.user_repository_factory import get_user_repository
 from app.schema.user_schema import UserCreate, UserRead, UserUpdate
+from app.utility.etag import entity_versions
+from app.utility.export import EXPORT_BATCH_SIZE, export_rows
+from app.utility.password_hasher import password_hasher
+from app.utility.principal_cache import principal_cache
+from app.utility.totals import TotalCount, TotalMode, count_cache
+
+USER_EXPORT_FIELDS = tuple(UserRead.model_fields)
 
 
 class UserService:
-    def __init__(self):
-        self.repo = get_user_repository()
+    def __init__(self, repo: IUserRepository = Depends(get_user_repository)):
+        self.repo = repo
 
     def _hash_password(self, password: str) -> str:
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-
-    def _verify_password(self, password: str, hashed: str) -> bool:
-        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        return password_hasher.hash_blocking(password)
 
     def get(self, user_id: int) -> UserRead | None:
         obj = self.repo.get(user_id)
@@ -27,16 +33,29 @@ class UserService:
         return UserRead.model_validate(obj) if obj else None
 
     def list(
-        self, offset: int, limit: int, search: str | None
-    ) -> tuple[list[UserRead], int]:
-        rows, total = self.repo.list(offset=offset, limit=limit, search=search)
-        return [UserRead.model_validate(r) for r in rows], total
+        self,
+        offset: int,
+        limit: int,
+        search: str | None,
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[UserRead], int | None, bool]:
+        # one extra row tells whether another page exists
+        rows, total = self.repo.list(
+            offset=offset,
+            limit=limit + 1,
+            search=search,
+            totals=TotalCount(count, "user", (search,)),
+        )
+        items = [UserRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: UserCreate) -> UserRead:
         data = payload.model_dump()
         data["password"] = self._hash_password(data["password"])
 
         obj = self.repo.create(data)
+        count_cache.invalidate("user")
+        entity_versions.bump("user")
         return UserRead.model_validate(obj)
 
     def update(self, user_id: int, payload: UserUpdate) -> UserRead | None:
@@ -46,18 +65,34 @@ class UserService:
             update_data["password"] = self._hash_password(update_data["password"])
 
         obj = self.repo.update(user_id, update_data)
+        count_cache.invalidate("user")
+        # cached logins would keep the old is_admin and profile, in every worker
+        entity_versions.bump("user", "principal")
+        principal_cache.invalidate(user_id)
         return UserRead.model_validate(obj)
 
     def delete(self, user_id: int) -> bool:
-        return self.repo.delete(user_id)
-
-    def authenticate(self, username: str, password: str):
-        user = self.repo.get_by_username(username)
+        deleted = self.repo.delete(user_id)
+        # the user's reviews are hidden from now on, before the purger runs
+        count_cache.invalidate("user", "review")
+        entity_versions.bump("user", "review", "principal")
+        principal_cache.invalidate(user_id)
+        return deleted
+
+    def export(self, after: int | None = None):
+        # UserRead has no password, so the hashes never leave the store
+        rows = self.repo.iter_export(USER_EXPORT_FIELDS, after, EXPORT_BATCH_SIZE)
+        return export_rows(rows, UserRead)
+
+    async def authenticate(self, username: str, password: str) -> UserRead | None:
+        # the lookup is a short sync query; bcrypt runs on the hasher's own
+        # executor so a login burst cannot take over the request threadpool
+        user = await run_in_threadpool(self.repo.get_by_username, username)
 
         if not user:
             return None
 
-        if not self._verify_password(password, user.password):
+        if not await password_hasher.verify(password, user.password):
             return None
 
         return UserRead.model_validate(user)
@@ -1,10 +1,15 @@
+from fastapi import Depends
+
+from app.repository.video.i_video_repository import IVideoRepository
 from app.repository.video.video_repository_factory import get_video_repository
 from app.schema.video_schema import VideoCreate, VideoRead, VideoUpdate
+from app.utility.etag import entity_versions
+from app.utility.totals import TotalCount, TotalMode, count_cache
 
 
 class VideoService:
-    def __init__(self):
-        self.repo = get_video_repository()
+    def __init__(self, repo: IVideoRepository = Depends(get_video_repository)):
+        self.repo = repo
 
     def get(self, video_id: int) -> VideoRead | None:
         obj = self.repo.get(video_id)
@@ -17,23 +22,34 @@ class VideoService:
         search: str | None = None,
         sort_by: str | None = None,
         sort_order: str | None = None,
-    ) -> tuple[list[VideoRead], int]:
+        count: TotalMode = TotalMode.exact,
+    ) -> tuple[list[VideoRead], int | None, bool]:
+        # one extra row tells whether another page exists
         rows, total = self.repo.list(
             offset,
-            limit,
+            limit + 1,
             search,
             sort_by,
             sort_order,
+            totals=TotalCount(count, "video", (search,)),
         )
-        return [VideoRead.model_validate(r) for r in rows], total
+        items = [VideoRead.model_validate(r) for r in rows[:limit]]
+        return items, total, len(rows) > limit
 
     def create(self, payload: VideoCreate) -> VideoRead:
         obj = self.repo.create(payload.model_dump())
+        count_cache.invalidate("video")
+        entity_versions.bump("video")
         return VideoRead.model_validate(obj)
 
     def update(self, video_id: int, payload: VideoUpdate) -> VideoRead | None:
         obj = self.repo.update(video_id, payload.model_dump(exclude_unset=True))
+        count_cache.invalidate("video")
+        entity_versions.bump("video")
         return VideoRead.model_validate(obj) if obj else None
 
     def delete(self, video_id: int) -> bool:
-        return self.repo.delete(video_id)
+        deleted = self.repo.delete(video_id)
+        count_cache.invalidate("video")
+        entity_versions.bump("video")
+        return deleted
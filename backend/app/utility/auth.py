@@ -1,5 +1,5 @@
 import os
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 import jwt
 from fastapi import Depends, HTTPException, status
@@ -8,7 +8,9 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.model.user_model import User
+from app.schema.user_schema import UserRead
 from app.utility.db_sql import get_sql_db
+from app.utility.principal_cache import principal_cache
 
 # Configuration
 SECRET_KEY = os.getenv(
@@ -17,6 +19,14 @@ SECRET_KEY = os.getenv(
 )
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# "true" signs is_admin into tokens and trusts it in require_admin, so admin
+# checks need no lookup; a token keeps its is_admin until it expires, even
+# after a demotion or delete
+AUTH_ADMIN_CLAIM = os.getenv("AUTH_ADMIN_CLAIM", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
@@ -24,20 +34,28 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 class TokenData(BaseModel):
     user_id: int
     username: str
+    iat: int | None = None
+    is_admin: bool | None = None
 
 
 def create_access_token(
-    user_id: int, username: str, expires_delta: timedelta | None = None
+    user_id: int,
+    username: str,
+    expires_delta: timedelta | None = None,
+    is_admin: bool | None = None,
 ) -> str:
     if expires_delta is None:
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    expire = datetime.utcnow() + expires_delta
+    now = datetime.now(UTC)
     to_encode = {
         "user_id": user_id,
         "username": username,
-        "exp": expire,
+        "iat": now,
+        "exp": now + expires_delta,
     }
+    if AUTH_ADMIN_CLAIM and is_admin is not None:
+        to_encode["is_admin"] = is_admin
 
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -52,7 +70,12 @@ def verify_token(token: str) -> TokenData | None:
         if user_id is None or username is None:
             return None
 
-        return TokenData(user_id=user_id, username=username)
+        return TokenData(
+            user_id=user_id,
+            username=username,
+            iat=payload.get("iat"),
+            is_admin=payload.get("is_admin"),
+        )
     except jwt.ExpiredSignatureError:
         # token expired
         return None
@@ -61,31 +84,59 @@ def verify_token(token: str) -> TokenData | None:
         return None
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_sql_db),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
+def get_token_data(token: str = Depends(oauth2_scheme)) -> TokenData:
     token_data = verify_token(token)
     if token_data is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token_data
+
 
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+def load_principal(token_data: TokenData, db: Session) -> UserRead:
+    """The user a valid token names, from the principal cache when possible."""
+    principal = principal_cache.get(token_data.user_id, token_data.iat)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation(token_data.user_id)
+    user = (
+        db.query(User)
+        .filter(User.id == token_data.user_id, User.deleted_at.is_(None))
+        .first()
+    )
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-    return user
+    principal = UserRead.model_validate(user)
+    principal_cache.set(token_data.user_id, token_data.iat, principal, generation)
+    return principal
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
-    is_admin = bool(getattr(current_user, "is_admin", False))
+def get_current_user(
+    token_data: TokenData = Depends(get_token_data),
+    db: Session = Depends(get_sql_db),
+) -> UserRead:
+    return load_principal(token_data, db)
 
-    if not is_admin:
+
+def require_admin(
+    token_data: TokenData = Depends(get_token_data),
+    db: Session = Depends(get_sql_db),
+) -> TokenData | UserRead:
+    if AUTH_ADMIN_CLAIM and token_data.is_admin is not None:
+        # signed, so trusted as issued; demotions show once the token expires
+        current_user = token_data
+    else:
+        current_user = load_principal(token_data, db)
+
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
@@ -95,7 +146,7 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
 
 def require_self_or_admin(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserRead = Depends(get_current_user),
 ):
     is_admin = bool(getattr(current_user, "is_admin", False))
 
@@ -0,0 +1,191 @@
+import heapq
+import os
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections.abc import Iterable
+
+AUTOCOMPLETE_KINDS = ("games", "designers", "artists", "publishers", "mechanics")
+
+# keys are cut to this many characters; longer queries are cut the same way
+MAX_KEY_LENGTH = 32
+# ranked ids kept per prefix; also the largest limit a lookup can ask for
+TOP_K = 20
+# prefixes up to this length match so many names that their top lists are
+# computed up front instead of on the first lookup
+SHORT_PREFIX = 3
+# longer prefixes whose top lists are kept between lookups, per kind
+MEMO_SIZE = int(os.getenv("AUTOCOMPLETE_MEMO_SIZE", "10000"))
+
+
+def normalize(text: str) -> str:
+    """Case and accent insensitive form used for keys and queries."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _word_keys(norm: str) -> set[str]:
+    # the whole name plus the tail starting at every later word, so "ring"
+    # finds "War of the Ring"
+    keys = {norm[:MAX_KEY_LENGTH]}
+    for i in range(1, len(norm)):
+        if norm[i].isalnum() and not norm[i - 1].isalnum():
+            keys.add(norm[i : i + MAX_KEY_LENGTH])
+    return keys
+
+
+def _prefixes(keys: set[str]) -> set[str]:
+    return {key[:n] for key in keys for n in range(1, len(key) + 1)}
+
+
+class PrefixIndex:
+    """Names of one kind of entity, looked up by the prefix of any word.
+
+    Keys sit in a sorted list with a parallel list of ids, so finding the
+    matches of a prefix is two binary searches. Ranking them is the costly
+    part, so the top TOP_K ids per prefix are kept: precomputed for short
+    prefixes, memoized for longer ones, and patched in place on writes.
+    """
+
+    def __init__(self, rows: Iterable[tuple[int, str, float | None]] = ()):
+        self._lock = threading.Lock()
+        # id -> (name, normalized name, rank)
+        self._entries: dict[int, tuple[str, str, float]] = {}
+        pairs = []
+        for entity_id, name, rank in rows:
+            if not name:
+                continue
+            norm = normalize(name)
+            self._entries[entity_id] = (name, norm, rank or 0.0)
+            pairs += [(key, entity_id) for key in _word_keys(norm)]
+
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._ids = [entity_id for _, entity_id in pairs]
+
+        self._short: dict[str, list[int]] = {}
+        self._memo: dict[str, list[int]] = {}
+        short = {key[:n] for key in self._keys for n in range(1, SHORT_PREFIX + 1)}
+        for prefix in short:
+            self._short[prefix] = self._rank(prefix)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _order(self, prefix: str):
+        def key(entity_id):
+            name, norm, score = self._entries[entity_id]
+            # whole-name prefix first, then higher rank, then shorter name
+            return (not norm.startswith(prefix), -score, len(name), entity_id)
+
+        return key
+
+    def _rank(self, prefix: str) -> list[int]:
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        return heapq.nsmallest(TOP_K, set(self._ids[lo:hi]), key=self._order(prefix))
+
+    def _tops(self, prefix: str) -> dict[str, list[int]]:
+        return self._short if len(prefix) <= SHORT_PREFIX else self._memo
+
+    def _insert(self, entity_id: int, name: str, rank: float | None) -> None:
+        norm = normalize(name)
+        self._entries[entity_id] = (name, norm, rank or 0.0)
+        keys = _word_keys(norm)
+        for key in keys:
+            i = bisect_left(self._keys, key)
+            self._keys.insert(i, key)
+            self._ids.insert(i, entity_id)
+
+        # the new top K is within the old top K plus the new id; prefixes
+        # without a list are ranked from the keys on their next lookup
+        for prefix in _prefixes(keys):
+            tops = self._tops(prefix)
+            if prefix in tops:
+                merged = tops[prefix] + [entity_id]
+                tops[prefix] = sorted(merged, key=self._order(prefix))[:TOP_K]
+
+    def _delete(self, entity_id: int) -> None:
+        entry = self._entries.get(entity_id)
+        if entry is None:
+            return
+
+        keys = _word_keys(entry[1])
+        for key in keys:
+            i = bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key:
+                if self._ids[i] == entity_id:
+                    del self._keys[i]
+                    del self._ids[i]
+                    break
+                i += 1
+
+        for prefix in _prefixes(keys):
+            tops = self._tops(prefix)
+            top = tops.get(prefix)
+            if top is None or entity_id not in top:
+                continue
+            # a short list held every match; a full one has to be re-ranked
+            if len(top) < TOP_K:
+                top.remove(entity_id)
+            else:
+                del tops[prefix]
+        del self._entries[entity_id]
+
+    def upsert(self, entity_id: int, name: str | None, rank: float | None = None):
+        with self._lock:
+            self._delete(entity_id)
+            if name:
+                self._insert(entity_id, name, rank)
+
+    def remove(self, entity_id: int) -> None:
+        with self._lock:
+            self._delete(entity_id)
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        query = normalize(prefix).strip()[:MAX_KEY_LENGTH]
+        if not query:
+            return []
+
+        with self._lock:
+            tops = self._tops(query)
+            top = tops.get(query)
+            if top is None:
+                top = self._rank(query)
+                if len(self._memo) >= MEMO_SIZE:
+                    self._memo.clear()
+                tops[query] = top
+
+            return [{"id": i, "name": self._entries[i][0]} for i in top[:limit]]
+
+
+class AutocompleteIndex:
+    """One PrefixIndex per kind, filled at startup and kept current by the services."""
+
+    def __init__(self):
+        self._indexes = {kind: PrefixIndex() for kind in AUTOCOMPLETE_KINDS}
+        self.ready = False
+
+    def load(self, kind: str, rows: Iterable[tuple[int, str, float | None]]):
+        # build aside and swap, so lookups keep working during a reload
+        self._indexes[kind] = PrefixIndex(rows)
+
+    def upsert(self, kind: str, entity_id, name: str | None, rank=None) -> None:
+        self._indexes[kind].upsert(entity_id, name, rank)
+
+    def remove(self, kind: str, entity_id) -> None:
+        self._indexes[kind].remove(entity_id)
+
+    def search(self, prefix: str, limit: int) -> dict[str, list[dict]]:
+        return {
+            kind: index.search(prefix, limit) for kind, index in self._indexes.items()
+        }
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            **{kind: len(index) for kind, index in self._indexes.items()},
+        }
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,222 @@
+import json
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from app.utility.dispatch import call
+
+# items validated and written per batch
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+# items accepted in one request
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "100000"))
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# marks an NDJSON line that was reported as an error already
+_INVALID = object()
+
+
+class BulkRowsRejected(Exception):
+    """A store kept part of a batch; ``ids`` has None where ``errors`` has a reason."""
+
+    def __init__(self, ids: list, errors: dict[int, str]):
+        super().__init__(f"{len(errors)} of {len(ids)} rows rejected")
+        self.ids = ids
+        self.errors = errors
+
+
+class BulkResult:
+    """Ids of the created items and an error entry per rejected one, by input index."""
+
+    def __init__(self):
+        self.received = 0
+        self.ids: list[tuple[int, Any]] = []
+        self.errors: list[dict[str, Any]] = []
+
+    def fail(self, index: int, error: Any) -> None:
+        self.errors.append({"index": index, "error": error})
+
+    def as_response(self) -> dict[str, Any]:
+        return {
+            "received": self.received,
+            "created": len(self.ids),
+            "failed": len(self.errors),
+            "ids": [item_id for _, item_id in sorted(self.ids, key=lambda p: p[0])],
+            "errors": sorted(self.errors, key=lambda e: e["index"]),
+        }
+
+
+def _counted(result: BulkResult) -> None:
+    result.received += 1
+    if result.received > BULK_MAX_ITEMS:
+        raise HTTPException(413, f"At most {BULK_MAX_ITEMS} items per request")
+
+
+async def _ndjson_items(request: Request, result: BulkResult) -> AsyncIterator[Any]:
+    # lines are parsed as they arrive, so a large import never sits in memory
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line, result)
+    if buffer.strip():
+        yield _parse_line(buffer, result)
+
+
+def _parse_line(line: bytes, result: BulkResult) -> Any:
+    _counted(result)
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        result.fail(result.received - 1, f"Invalid JSON: {e}")
+        return _INVALID
+
+
+async def read_chunks(
+    request: Request, result: BulkResult, size: int | None = None
+) -> AsyncIterator[list[tuple[int, Any]]]:
+    """(index, item) chunks of a JSON array or NDJSON request body."""
+    size = size or BULK_CHUNK_SIZE
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in NDJSON_TYPES:
+        chunk: list[tuple[int, Any]] = []
+        async for item in _ndjson_items(request, result):
+            if item is not _INVALID:
+                chunk.append((result.received - 1, item))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    try:
+        items = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(400, f"Body is not valid JSON: {e}") from e
+    if not isinstance(items, list):
+        raise HTTPException(400, "Body must be a JSON array or NDJSON")
+    for _ in items:
+        _counted(result)
+    for start in range(0, len(items), size):
+        yield list(enumerate(items[start : start + size], start))
+
+
+def validate_chunk(
+    schema: type[BaseModel], chunk: list[tuple[int, Any]], result: BulkResult
+) -> list[tuple[int, BaseModel]]:
+    valid = []
+    for index, item in chunk:
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            result.fail(index, e.errors(include_url=False, include_context=False))
+    return valid
+
+
+def unique_names(
+    valid: list[tuple[int, BaseModel]],
+    get_by_name: Callable[[str], Any],
+    label: str,
+    result: BulkResult,
+) -> list[tuple[int, BaseModel]]:
+    """Drops items whose name exists already, in the store or earlier in the chunk."""
+    seen: set[str] = set()
+    kept = []
+    for index, item in valid:
+        if item.name in seen or get_by_name(item.name):
+            result.fail(index, f"{label} with this name already exists")
+        else:
+            seen.add(item.name)
+            kept.append((index, item))
+    return kept
+
+
+def _reason(error: Exception) -> str:
+    # the first line names the problem without the statement and parameters
+    return f"{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}"
+
+
+def _partial(
+    rows, error: BulkRowsRejected, result: BulkResult
+) -> list[tuple[int, Any]]:
+    created = []
+    for position, (index, _) in enumerate(rows):
+        if position in error.errors:
+            result.fail(index, error.errors[position])
+        else:
+            created.append((index, error.ids[position]))
+    return created
+
+
+def write_chunk(
+    rows: list[tuple[int, dict]],
+    write: Callable[[list[dict]], list],
+    result: BulkResult,
+) -> list[tuple[int, Any]]:
+    """Writes ``rows`` as one batch; if that fails, row by row to find the bad ones."""
+    if not rows:
+        return []
+    try:
+        created = list(
+            zip((i for i, _ in rows), write([r for _, r in rows]), strict=True)
+        )
+    except BulkRowsRejected as e:
+        created = _partial(rows, e, result)
+    except NotImplementedError:
+        raise
+    except Exception as e:
+        if len(rows) == 1:
+            result.fail(rows[0][0], _reason(e))
+            return []
+        return [c for row in rows for c in write_chunk([row], write, result)]
+    result.ids.extend(created)
+    return created
+
+
+async def awrite_chunk(
+    rows: list[tuple[int, dict]],
+    write: Callable[[list[dict]], Awaitable[list]],
+    result: BulkResult,
+) -> list[tuple[int, Any]]:
+    """write_chunk for async repositories."""
+    if not rows:
+        return []
+    try:
+        ids = await write([r for _, r in rows])
+        created = list(zip((i for i, _ in rows), ids, strict=True))
+    except BulkRowsRejected as e:
+        created = _partial(rows, e, result)
+    except NotImplementedError:
+        raise
+    except Exception as e:
+        if len(rows) == 1:
+            result.fail(rows[0][0], _reason(e))
+            return []
+        created = []
+        for row in rows:
+            created += await awrite_chunk([row], write, result)
+        return created
+    result.ids.extend(created)
+    return created
+
+
+async def run_bulk(request: Request, create_many: Callable) -> dict[str, Any]:
+    """Feeds the request body to a service's ``create_many(chunk, result)``.
+
+    Sync services run in the threadpool, one chunk at a time. A store that
+    cannot take the entity at all answers 501 instead of an error per item.
+    """
+    result = BulkResult()
+    try:
+        async for chunk in read_chunks(request, result):
+            await call(create_many, chunk, result)
+    except NotImplementedError as e:
+        raise HTTPException(501, str(e)) from e
+    return result.as_response()
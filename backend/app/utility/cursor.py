@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+
+
+def encode_cursor(payload: dict) -> str:
+    """Pack a keyset position into an opaque, URL safe token."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> dict:
+    """Unpack a token made by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, dict) or "id" not in payload:
+        raise ValueError("Invalid cursor")
+    return payload
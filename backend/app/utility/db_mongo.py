@@ -1,12 +1,19 @@
 import os
+from collections.abc import Iterator
+from datetime import UTC, datetime
 
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient, ReturnDocument, monitoring
+from pymongo.errors import BulkWriteError
+
+from app.utility.bulk import BulkRowsRejected
+from app.utility.pool_metrics import PoolWaitTimer
 
 MONGO_HOST = os.getenv("MONGODB_HOST")
 MONGO_PORT = os.getenv("MONGODB_PORT")
 MONGO_DB = os.getenv("MONGODB_DATABASE")
 MONGO_USER = os.getenv("MONGODB_USER")
 MONGO_PASS = os.getenv("MONGODB_PASSWORD")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
 
 _url = (
     f"mongodb://{MONGO_USER}:{MONGO_PASS}@{MONGO_HOST}:{MONGO_PORT}/"
@@ -14,12 +21,73 @@ _url = (
 )
 
 client = None
+async_client = None
+
+# games and users deleted from MongoDB whose reviews the purger still removes
+TOMBSTONES = "tombstones"
+# each game's most similar games by rating, rebuilt by the recommender job
+GAME_RECOMMENDATIONS = "game_recommendations"
+# one document per entity counting its writes, which the ETags follow
+ENTITY_VERSIONS = "entity_versions"
+# one document per collection holding the last integer id handed out
+COUNTERS = "counters"
+
+pool_wait = PoolWaitTimer()
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Feeds pymongo connection pool events into pool_wait."""
+
+    def __init__(self):
+        self.open_connections = 0
+
+    def connection_checked_out(self, event):
+        pool_wait.acquired()
+        pool_wait.record(getattr(event, "duration", 0.0) or 0.0)
+
+    def connection_checked_in(self, event):
+        pool_wait.released()
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_closed(self, event):
+        self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+_listener = PoolStatsListener()
 
 
 def get_client():
     global client
     if client is None:
-        client = MongoClient(_url, serverSelectionTimeoutMS=5000)
+        client = MongoClient(
+            _url,
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            event_listeners=[_listener],
+        )
     return client
 
 
@@ -30,3 +98,169 @@ def get_db():
         yield client[MONGO_DB]
     finally:
         pass
+
+
+def get_async_client():
+    global async_client
+    if async_client is None:
+        async_client = AsyncMongoClient(
+            _url,
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            event_listeners=[_listener],
+        )
+    return async_client
+
+
+async def get_async_db():
+    yield get_async_client()[MONGO_DB]
+
+
+def _missing_ids(docs: list[dict], key: str) -> list[dict]:
+    return [d for d in docs if d.get(key) is None]
+
+
+def _with_ids(docs: list[dict], top: int, key: str) -> list[int]:
+    # the documents without an id take the ones reserved after ``top``
+    for offset, doc in enumerate(_missing_ids(docs, key), 1):
+        doc[key] = top + offset
+    for doc in docs:
+        doc.setdefault("_id", doc[key])
+    return [doc[key] for doc in docs]
+
+
+# migrated documents only have the integer in _id, API ones in both fields
+_ID_FIELDS = ("_id", "id")
+
+
+def _highest_id(col) -> int:
+    top = 0
+    for field in _ID_FIELDS:
+        # ObjectIds sort above numbers, so only numeric ids are compared
+        query = {field: {"$type": "number"}}
+        doc = col.find_one(query, {field: 1}, sort=[(field, -1)])
+        if doc:
+            top = max(top, int(doc[field]))
+    return top
+
+
+async def _ahighest_id(col) -> int:
+    top = 0
+    for field in _ID_FIELDS:
+        query = {field: {"$type": "number"}}
+        doc = await col.find_one(query, {field: 1}, sort=[(field, -1)])
+        if doc:
+            top = max(top, int(doc[field]))
+    return top
+
+
+def reserve_ids(col, count: int) -> int:
+    """Reserves ``count`` integer ids for ``col`` and returns the one before them.
+
+    The counter is one atomic ``$inc``, so concurrent writers never get the
+    same ids. It is seeded from the highest id already stored; ``$max`` keeps
+    a seed racing another writer from moving it back.
+    """
+    counters = col.database[COUNTERS]
+    if counters.find_one({"_id": col.name}) is None:
+        counters.update_one(
+            {"_id": col.name}, {"$max": {"seq": _highest_id(col)}}, upsert=True
+        )
+    counter = counters.find_one_and_update(
+        {"_id": col.name},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["seq"] - count
+
+
+async def areserve_ids(col, count: int) -> int:
+    counters = col.database[COUNTERS]
+    if await counters.find_one({"_id": col.name}) is None:
+        await counters.update_one(
+            {"_id": col.name}, {"$max": {"seq": await _ahighest_id(col)}}, upsert=True
+        )
+    counter = await counters.find_one_and_update(
+        {"_id": col.name},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["seq"] - count
+
+
+def _rejected(ids: list[int], error: BulkWriteError) -> BulkRowsRejected:
+    errors = {e["index"]: e["errmsg"] for e in error.details.get("writeErrors", [])}
+    return BulkRowsRejected(
+        [None if i in errors else x for i, x in enumerate(ids)], errors
+    )
+
+
+def insert_many(col, docs: list[dict], key: str = "_id") -> list[int]:
+    """Inserts ``docs`` unordered in one round trip and returns their ``key`` ids.
+
+    A duplicate or otherwise rejected document does not stop the others.
+    """
+    missing = len(_missing_ids(docs, key))
+    ids = _with_ids(docs, reserve_ids(col, missing) if missing else 0, key)
+    try:
+        col.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        raise _rejected(ids, e) from e
+    return ids
+
+
+async def ainsert_many(col, docs: list[dict], key: str = "_id") -> list[int]:
+    missing = len(_missing_ids(docs, key))
+    ids = _with_ids(docs, await areserve_ids(col, missing) if missing else 0, key)
+    try:
+        await col.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        raise _rejected(ids, e) from e
+    return ids
+
+
+def iter_by_id(
+    col,
+    projection: dict,
+    after: int | None = None,
+    batch_size: int = 1000,
+    query: dict | None = None,
+) -> Iterator[dict]:
+    """Documents in integer id order, ``batch_size`` per cursor batch.
+
+    Migrated documents carry the SQL id in ``_id``; ones created through the
+    API keep an ObjectId there and the integer in ``id``. The order is on
+    whichever is set, as ``export_id``. ``query`` leaves documents out first.
+    """
+    pipeline: list[dict] = [{"$match": query}] if query else []
+    pipeline.append({"$addFields": {"export_id": {"$ifNull": ["$id", "$_id"]}}})
+    if after is not None:
+        pipeline.append({"$match": {"export_id": {"$gt": after}}})
+    pipeline += [
+        {"$sort": {"export_id": 1}},
+        {"$project": {**projection, "export_id": 1}},
+    ]
+    yield from col.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size)
+
+
+def tombstone(entity: str, entity_id: int) -> dict:
+    """A TOMBSTONES entry: the game or user is gone, its reviews are not yet."""
+    return {
+        "entity": entity,
+        "entity_id": int(entity_id),
+        "deleted_at": datetime.now(UTC),
+    }
+
+
+def get_pool_stats() -> dict | None:
+    if client is None and async_client is None:
+        return None
+
+    return {
+        "max_size": MONGO_MAX_POOL_SIZE,
+        "open": _listener.open_connections,
+        "checked_out": pool_wait.in_use,
+        **pool_wait.snapshot(),
+    }
@@ -1,12 +1,78 @@
 import os
+import time
 
-from neo4j import Driver, GraphDatabase
+from neo4j import AsyncDriver, AsyncGraphDatabase, Driver, GraphDatabase
+
+from app.utility.pool_metrics import PoolWaitTimer
 
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
 
 _driver: Driver | None = None
+_async_driver: AsyncDriver | None = None
+
+pool_wait = PoolWaitTimer()
+
+
+def _instrument_pool(driver: Driver) -> None:
+    # The driver has no pool listener API, so time acquire/release directly.
+    pool = getattr(driver, "_pool", None)
+    if pool is None:
+        return
+
+    acquire = pool.acquire
+    release = pool.release
+    kill_and_release = pool.kill_and_release
+
+    def timed_acquire(*args, **kwargs):
+        start = time.perf_counter()
+        connection = acquire(*args, **kwargs)
+        pool_wait.record(time.perf_counter() - start)
+        pool_wait.acquired()
+        return connection
+
+    def counted_release(*connections):
+        pool_wait.released(len(connections))
+        return release(*connections)
+
+    def counted_kill_and_release(*connections):
+        pool_wait.released(len(connections))
+        return kill_and_release(*connections)
+
+    pool.acquire = timed_acquire
+    pool.release = counted_release
+    pool.kill_and_release = counted_kill_and_release
+
+
+def _instrument_async_pool(driver: AsyncDriver) -> None:
+    pool = getattr(driver, "_pool", None)
+    if pool is None:
+        return
+
+    acquire = pool.acquire
+    release = pool.release
+    kill_and_release = pool.kill_and_release
+
+    async def timed_acquire(*args, **kwargs):
+        start = time.perf_counter()
+        connection = await acquire(*args, **kwargs)
+        pool_wait.record(time.perf_counter() - start)
+        pool_wait.acquired()
+        return connection
+
+    async def counted_release(*connections):
+        pool_wait.released(len(connections))
+        return await release(*connections)
+
+    def counted_kill_and_release(*connections):
+        pool_wait.released(len(connections))
+        return kill_and_release(*connections)
+
+    pool.acquire = timed_acquire
+    pool.release = counted_release
+    pool.kill_and_release = counted_kill_and_release
 
 
 def get_neo() -> Driver:
@@ -15,5 +81,53 @@ def get_neo() -> Driver:
         _driver = GraphDatabase.driver(
             NEO4J_URI,
             auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
         )
+        _instrument_pool(_driver)
     return _driver
+
+
+def get_async_neo() -> AsyncDriver:
+    global _async_driver
+    if _async_driver is None:
+        _async_driver = AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+        )
+        _instrument_async_pool(_async_driver)
+    return _async_driver
+
+
+# ids continue after the highest one; the label is a constant of the caller
+CREATE_NODES_QUERY = """
+    OPTIONAL MATCH (n:{label})
+    WITH coalesce(max(n.id), 0) AS top
+    UNWIND range(0, size($rows) - 1) AS i
+    CREATE (n:{label})
+    SET n = $rows[i], n.id = coalesce($rows[i].id, top + i + 1)
+    RETURN n.id AS id
+    ORDER BY i
+"""
+
+
+def create_nodes(tx, label: str, rows: list[dict]) -> list[int]:
+    """Creates one ``label`` node per row with a single UNWIND; returns their ids."""
+    result = tx.run(CREATE_NODES_QUERY.format(label=label), rows=rows)
+    return [rec["id"] for rec in result]
+
+
+async def acreate_nodes(tx, label: str, rows: list[dict]) -> list[int]:
+    result = await tx.run(CREATE_NODES_QUERY.format(label=label), rows=rows)
+    return [rec["id"] async for rec in result]
+
+
+def get_pool_stats() -> dict | None:
+    if _driver is None and _async_driver is None:
+        return None
+
+    return {
+        "max_size": NEO4J_MAX_POOL_SIZE,
+        "checked_out": pool_wait.in_use,
+        **pool_wait.snapshot(),
+    }
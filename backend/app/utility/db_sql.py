@@ -1,8 +1,14 @@
 import os
+import time
+from collections.abc import Iterator
 from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.utility.pool_metrics import PoolWaitTimer
+from app.utility.sql_profiler import install_profiler
 
 
 def get_database_url() -> str:
@@ -36,34 +42,152 @@ def get_database_url() -> str:
 
 DATABASE_URL = get_database_url()
 
+pool_wait = PoolWaitTimer()
+
 
-engine_kwargs: dict[str, Any] = {
-    "pool_pre_ping": True,
-    "future": True,
-}
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
 
-if DATABASE_URL.startswith("sqlite"):
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
-else:
-    engine_kwargs["pool_size"] = 20
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.record(time.perf_counter() - start)
 
-engine = create_engine(DATABASE_URL, **engine_kwargs)
 
+_engine = None
+
+# bound to the engine when get_engine() first builds it
 SessionLocal = sessionmaker(
-    bind=engine,
     autoflush=False,
     autocommit=False,
     future=True,
 )
 
 
+def get_engine():
+    """The engine, built on first use so importing this module stays cheap
+    (and a MySQL URL does not import its driver until it is needed)."""
+    global _engine
+    if _engine is None:
+        engine_kwargs: dict[str, Any] = {
+            "pool_pre_ping": True,
+            "future": True,
+        }
+
+        if DATABASE_URL.startswith("sqlite"):
+            engine_kwargs["connect_args"] = {"check_same_thread": False}
+        else:
+            engine_kwargs["poolclass"] = TimedQueuePool
+            engine_kwargs["pool_size"] = int(os.getenv("SQL_POOL_SIZE", "20"))
+            engine_kwargs["max_overflow"] = int(os.getenv("SQL_MAX_OVERFLOW", "10"))
+            engine_kwargs["pool_timeout"] = float(os.getenv("SQL_POOL_TIMEOUT", "30"))
+
+        _engine = create_engine(DATABASE_URL, **engine_kwargs)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def __getattr__(name: str):
+    # keeps ``db_sql.engine`` working for callers that predate get_engine()
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+install_profiler()
+
+
 class Base(DeclarativeBase):
     pass
 
 
 def get_sql_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def count_rows(db: Session, stmt) -> int:
+    return db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
+
+
+def estimate_row_count(db: Session, table: str) -> int | None:
+    """Row count from MySQL table statistics; None where the dialect keeps none."""
+    if db.get_bind().dialect.name != "mysql":
+        return None
+
+    return db.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        ),
+        {"table": table},
+    ).scalar()
+
+
+def insert_many(db: Session, model, rows: list[dict]) -> list[int]:
+    """Inserts ``rows`` in multi-row INSERTs and returns their new ids in order.
+
+    Where INSERT .. RETURNING exists the ids come back with the rows. MySQL
+    has none, so the rows go in as one statement; InnoDB gives a single
+    INSERT of known size consecutive ids, starting at LAST_INSERT_ID().
+    """
+    if not rows:
+        return []
+    table = model.__table__
+    if db.get_bind().dialect.insert_returning:
+        stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return list(db.execute(stmt, rows).scalars())
+
+    first = db.execute(insert(table).values(rows)).lastrowid
+    return list(range(first, first + len(rows)))
+
+
+def iter_rows(
+    db: Session,
+    model,
+    fields: tuple[str, ...],
+    after: int | None = None,
+    batch_size: int = 1000,
+    *criteria,
+) -> Iterator[dict]:
+    """``fields`` of ``model`` rows with an id above ``after``, in id order.
+
+    yield_per streams the result off a server-side cursor (SSCursor on MySQL),
+    so only ``batch_size`` rows are held at a time. One statement reads one
+    consistent snapshot however long the client takes to read it.
+    """
+    stmt = select(*(getattr(model, f) for f in fields)).where(*criteria)
+    if after is not None:
+        stmt = stmt.where(model.id > after)
+    stmt = stmt.order_by(model.id).execution_options(yield_per=batch_size)
+    for row in db.execute(stmt).mappings():
+        yield dict(row)
+
+
+def queue_pool_stats(pool) -> dict[str, Any]:
+    stats: dict[str, Any] = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": pool._max_overflow,
+            }
+        )
+    return stats
+
+
+def get_pool_stats() -> dict | None:
+    if _engine is None:
+        return None
+
+    return {**queue_pool_stats(_engine.pool), **pool_wait.snapshot()}
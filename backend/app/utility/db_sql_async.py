@@ -0,0 +1,59 @@
+import os
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.utility.db_sql import DATABASE_URL, queue_pool_stats
+
+# sync driver -> async driver for the same database
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    url = os.getenv("ASYNC_DATABASE_URL")
+    if url:
+        return url
+
+    scheme, rest = DATABASE_URL.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+ASYNC_DATABASE_URL = get_async_database_url()
+
+_engine = None
+_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine():
+    global _engine, _session_factory
+    if _engine is None:
+        engine_kwargs: dict[str, Any] = {"pool_pre_ping": True}
+        if not ASYNC_DATABASE_URL.startswith("sqlite"):
+            engine_kwargs["pool_size"] = int(os.getenv("SQL_POOL_SIZE", "20"))
+            engine_kwargs["max_overflow"] = int(os.getenv("SQL_MAX_OVERFLOW", "10"))
+            engine_kwargs["pool_timeout"] = float(os.getenv("SQL_POOL_TIMEOUT", "30"))
+
+        _engine = create_async_engine(ASYNC_DATABASE_URL, **engine_kwargs)
+        _session_factory = async_sessionmaker(
+            bind=_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _engine
+
+
+async def get_async_sql_db():
+    get_async_engine()
+    async with _session_factory() as db:
+        yield db
+
+
+def get_pool_stats() -> dict | None:
+    if _engine is None:
+        return None
+
+    return queue_pool_stats(_engine.pool)
@@ -0,0 +1,16 @@
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+
+async def call(method: Callable, *args, **kwargs) -> Any:
+    """Awaits an async service method, or runs a sync one in the threadpool.
+
+    This way one set of routes serves a sync service and its DB_ASYNC twin,
+    and the sync one still runs off the event loop like a ``def`` endpoint.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
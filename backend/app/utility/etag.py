@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import os
+import threading
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.model.entity_version_model import EntityVersion
+
+logger = logging.getLogger(__name__)
+
+
+def _session_factory():
+    from app.utility.db_sql import SessionLocal, get_engine
+
+    get_engine()
+    return SessionLocal()
+
+
+class SQLVersionStore:
+    """One entity_version row per entity, added by its first write."""
+
+    name = "sql"
+
+    def __init__(self, session_factory=_session_factory):
+        self.session_factory = session_factory
+
+    def get(self, entities: tuple[str, ...]) -> dict[str, int]:
+        stmt = select(EntityVersion.entity, EntityVersion.version).where(
+            EntityVersion.entity.in_(entities)
+        )
+        with self.session_factory() as db:
+            return dict(db.execute(stmt).all())
+
+    @staticmethod
+    def _bump(db, entities: tuple[str, ...]) -> None:
+        for entity in entities:
+            stmt = (
+                update(EntityVersion)
+                .where(EntityVersion.entity == entity)
+                .values(version=EntityVersion.version + 1)
+            )
+            if db.execute(stmt).rowcount == 0:
+                db.add(EntityVersion(entity=entity, version=1))
+        db.commit()
+
+    def bump(self, entities: tuple[str, ...]) -> None:
+        with self.session_factory() as db:
+            try:
+                self._bump(db, entities)
+            except IntegrityError:
+                # another worker added the first row at the same moment
+                db.rollback()
+                self._bump(db, entities)
+
+
+class MongoVersionStore:
+    """One ENTITY_VERSIONS document per entity, keyed by its name."""
+
+    name = "mongo"
+
+    def __init__(self, db):
+        from app.utility.db_mongo import ENTITY_VERSIONS
+
+        self.col = db[ENTITY_VERSIONS]
+
+    def get(self, entities: tuple[str, ...]) -> dict[str, int]:
+        docs = self.col.find({"_id": {"$in": list(entities)}})
+        return {doc["_id"]: doc["version"] for doc in docs}
+
+    def bump(self, entities: tuple[str, ...]) -> None:
+        from pymongo import UpdateOne
+
+        self.col.bulk_write(
+            [
+                UpdateOne({"_id": e}, {"$inc": {"version": 1}}, upsert=True)
+                for e in entities
+            ]
+        )
+
+
+class NeoVersionStore:
+    """One EntityVersion node per entity."""
+
+    name = "neo"
+
+    GET = """
+        MATCH (v:EntityVersion) WHERE v.entity IN $entities
+        RETURN v.entity AS entity, v.version AS version
+    """
+
+    BUMP = """
+        UNWIND $entities AS entity
+        MERGE (v:EntityVersion {entity: entity})
+        SET v.version = coalesce(v.version, 0) + 1
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get(self, entities: tuple[str, ...]) -> dict[str, int]:
+        with self.driver.session() as session:
+            records = session.run(self.GET, entities=list(entities))
+            return {r["entity"]: r["version"] for r in records}
+
+    def bump(self, entities: tuple[str, ...]) -> None:
+        with self.driver.session() as session:
+            session.run(self.BUMP, entities=list(entities)).consume()
+
+
+def build_store(mode: str):
+    # hybrid serves reads and writes from SQL, so the versions live there
+    if mode in ("sql", "hybrid"):
+        return SQLVersionStore()
+    if mode == "mongo":
+        from app.utility.db_mongo import MONGO_DB, get_client
+
+        return MongoVersionStore(get_client()[MONGO_DB])
+    if mode == "neo":
+        from app.utility.db_neo import get_neo
+
+        return NeoVersionStore(get_neo())
+    raise ValueError(f"Unknown DB_MODE: {mode}")
+
+
+class EntityVersions:
+    """Version counter per entity, bumped by the services on every write.
+
+    Responses built only from unchanged entities are identical, so a version
+    tuple stands in for a content hash at the cost of one small lookup. The
+    counters are kept in the active backend rather than in the process, so
+    every worker and replica answers with the same ETag; writes made outside
+    the API are still not seen.
+    """
+
+    def __init__(self, store=None):
+        self._store = store
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                self._store = build_store(os.getenv("DB_MODE", "sql").lower())
+            return self._store
+
+    def get(self, *entities: str) -> tuple[int, ...]:
+        versions = self.store.get(entities)
+        return tuple(versions.get(e, 0) for e in entities)
+
+    def bump(self, *entities: str) -> None:
+        try:
+            self.store.bump(entities)
+        except Exception:
+            # the write itself went through; do not fail the request over it
+            logger.exception("Could not bump the versions of %s", entities)
+
+    async def abump(self, *entities: str) -> None:
+        await run_in_threadpool(self.bump, *entities)
+
+
+entity_versions = EntityVersions()
+
+
+def make_etag(request: Request, entities: tuple[str, ...]) -> str | None:
+    try:
+        versions = entity_versions.get(*entities)
+    except Exception:
+        logger.exception("Could not read the versions of %s", entities)
+        return None
+    key = f"{versions}:{request.url.path}?{request.url.query}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ is ignored
+    tags = (t.strip().removeprefix("W/") for t in if_none_match.split(","))
+    return etag in tags
+
+
+def conditional(*entities: str):
+    """Dependency that answers 304 Not Modified from the versions of ``entities``.
+
+    It runs before the endpoint, so a matching If-None-Match skips the
+    endpoint's queries and serialization alike. Otherwise the ETag is set on the
+    response and returned for endpoints that build their own Response.
+    """
+
+    def check(request: Request, response: Response) -> str | None:
+        etag = make_etag(request, entities)
+        # without the versions no ETag is sent, so nothing stale can match
+        if etag is None:
+            return None
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+
+    return check
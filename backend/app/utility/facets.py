@@ -0,0 +1,518 @@
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+
+import numpy as np
+
+# an array container past this many values is larger than a bitset one
+ARRAY_MAX = 4096
+# values listed per linked facet in the counts, most games first
+FACET_LIMIT = int(os.getenv("FACET_LIMIT", "20"))
+# player counts listed in the counts; larger ones can still be filtered on
+FACET_MAX_PLAYERS = int(os.getenv("FACET_MAX_PLAYERS", "12"))
+
+# range facet -> the game field it is keyed on
+RANGE_FIELDS = {
+    "min_players": "min_players",
+    "max_players": "max_players",
+    "playing_time": "playing_time",
+    "difficulty": "difficulty_rating",
+    "year": "year_published",
+}
+# linked facet -> the iter_features kind it is read from
+LINK_KINDS = {
+    "mechanic": "mechanics",
+    "genre": "genres",
+    "designer": "designers",
+    "publisher": "publishers",
+}
+FACETS = (*RANGE_FIELDS, *LINK_KINDS)
+# game fields the index is built from
+FACET_FIELDS = ("id", *RANGE_FIELDS.values())
+
+
+def _flags(container: np.ndarray) -> np.ndarray:
+    """A container as 65536 booleans."""
+    if container.dtype == np.uint16:
+        flags = np.zeros(1 << 16, dtype=bool)
+        flags[container] = True
+        return flags
+    return np.unpackbits(container, bitorder="little").view(bool)
+
+
+def _bits(container: np.ndarray) -> np.ndarray:
+    if container.dtype == np.uint8:
+        return container
+    return np.packbits(_flags(container), bitorder="little")
+
+
+def _cardinality(container: np.ndarray) -> int:
+    if container.dtype == np.uint16:
+        return len(container)
+    return int(np.bitwise_count(container).sum())
+
+
+def _compact(container: np.ndarray) -> np.ndarray | None:
+    """The smaller form of a container, or None when it is empty."""
+    n = _cardinality(container)
+    if not n:
+        return None
+    if container.dtype == np.uint16:
+        return container if n <= ARRAY_MAX else _bits(container)
+    if n > ARRAY_MAX:
+        return container
+    return np.flatnonzero(_flags(container)).astype(np.uint16)
+
+
+def _and(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if a.dtype == b.dtype == np.uint16:
+        return np.intersect1d(a, b, assume_unique=True)
+    if a.dtype == np.uint16:
+        return a[_flags(b)[a]]
+    if b.dtype == np.uint16:
+        return b[_flags(a)[b]]
+    return a & b
+
+
+def _andnot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if a.dtype == np.uint16:
+        return a[~_flags(b)[a]]
+    return a & ~_bits(b)
+
+
+class Bitmap:
+    """A set of non-negative ints in the roaring layout.
+
+    Values are split on their high 16 bits into containers of their low 16
+    bits: a sorted uint16 array while it holds at most ARRAY_MAX values, and
+    an 8 KiB bitset beyond that, so sparse and dense sets both stay small.
+    Set operations work one container at a time with numpy. Containers are
+    never changed in place, so bitmaps may share them.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, containers: dict[int, np.ndarray] | None = None):
+        self._containers = containers if containers is not None else {}
+
+    @classmethod
+    def from_values(cls, values: Iterable[int]) -> "Bitmap":
+        values = np.unique(np.fromiter(values, dtype=np.int64))
+        containers = {}
+        highs = values >> 16
+        for chunk in np.split(values, np.flatnonzero(np.diff(highs)) + 1):
+            if len(chunk):
+                low = (chunk & 0xFFFF).astype(np.uint16)
+                containers[int(chunk[0] >> 16)] = _compact(low)
+        return cls(containers)
+
+    @classmethod
+    def union(cls, bitmaps: Iterable["Bitmap"]) -> "Bitmap":
+        parts = defaultdict(list)
+        for bitmap in bitmaps:
+            for high, container in bitmap._containers.items():
+                parts[high].append(container)
+        containers = {}
+        for high, group in parts.items():
+            if len(group) == 1:
+                containers[high] = group[0]
+            elif sum(_cardinality(c) for c in group) <= ARRAY_MAX:
+                containers[high] = np.unique(np.concatenate(group))
+            else:
+                # marking flags beats sorting once the result is a bitset
+                flags = np.zeros(1 << 16, dtype=bool)
+                for container in group:
+                    if container.dtype == np.uint16:
+                        flags[container] = True
+                    else:
+                        flags |= _flags(container)
+                containers[high] = np.packbits(flags, bitorder="little")
+        return cls(containers)
+
+    def _combine(self, other: "Bitmap", op, keep_unmatched: bool) -> "Bitmap":
+        containers = {}
+        for high, container in self._containers.items():
+            theirs = other._containers.get(high)
+            if theirs is None:
+                if keep_unmatched:
+                    containers[high] = container
+                continue
+            combined = _compact(op(container, theirs))
+            if combined is not None:
+                containers[high] = combined
+        return Bitmap(containers)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        return self._combine(other, _and, keep_unmatched=False)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        return self._combine(other, _andnot, keep_unmatched=True)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap.union((self, other))
+
+    def __len__(self) -> int:
+        return sum(_cardinality(c) for c in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __contains__(self, value: int) -> bool:
+        high, low = divmod(int(value), 1 << 16)
+        container = self._containers.get(high)
+        if container is None:
+            return False
+        if container.dtype == np.uint16:
+            i = np.searchsorted(container, low)
+            return bool(i < len(container) and container[i] == low)
+        return bool(container[low >> 3] >> (low & 7) & 1)
+
+    def add(self, value: int) -> None:
+        if value in self:
+            return
+        high, low = divmod(int(value), 1 << 16)
+        container = self._containers.get(high)
+        if container is None:
+            container = np.array([low], dtype=np.uint16)
+        elif container.dtype == np.uint16:
+            container = np.insert(container, np.searchsorted(container, low), low)
+        else:
+            container = container.copy()
+            container[low >> 3] |= 1 << (low & 7)
+        self._containers[high] = _compact(container)
+
+    def discard(self, value: int) -> None:
+        if value not in self:
+            return
+        high, low = divmod(int(value), 1 << 16)
+        container = self._containers[high]
+        if container.dtype == np.uint16:
+            container = np.delete(container, np.searchsorted(container, low))
+        else:
+            container = container.copy()
+            container[low >> 3] &= 0xFF ^ (1 << (low & 7))
+        container = _compact(container)
+        if container is None:
+            del self._containers[high]
+        else:
+            self._containers[high] = container
+
+    def _values(self, high: int) -> np.ndarray:
+        container = self._containers[high]
+        if container.dtype == np.uint8:
+            container = np.flatnonzero(_flags(container))
+        return (high << 16) + container.astype(np.int64)
+
+    def max(self) -> int:
+        return int(self._values(max(self._containers))[-1])
+
+    def to_array(self) -> np.ndarray:
+        """Every value, ascending."""
+        if not self._containers:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._values(h) for h in sorted(self._containers)])
+
+    def select(self, offset: int, limit: int) -> list[int]:
+        """Up to ``limit`` values in ascending order, skipping the first ``offset``."""
+        values: list[int] = []
+        for high in sorted(self._containers):
+            if len(values) >= limit:
+                break
+            n = _cardinality(self._containers[high])
+            if offset >= n:
+                offset -= n
+                continue
+            taken = self._values(high)[offset : offset + limit - len(values)]
+            values.extend(taken.tolist())
+            offset = 0
+        return values
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._containers.values())
+
+
+class _Postings:
+    """One facet's bitmaps laid end to end: each key's game ids as a segment.
+
+    Counting a result against every key is then a single gather and
+    ``np.add.reduceat`` instead of one intersection per key.
+    """
+
+    def __init__(self, bitmaps: Mapping):
+        self.keys = list(bitmaps)
+        arrays = [bitmaps[k].to_array() for k in self.keys]
+        self.sizes = np.array([len(a) for a in arrays], dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(self.sizes)[:-1]))
+        self.ids = np.concatenate(arrays) if arrays else np.empty(0, np.int64)
+        self._dense: np.ndarray | None = None
+
+    def counts(self, members: np.ndarray | None) -> np.ndarray:
+        if members is None or not len(self.ids):
+            return self.sizes
+        return np.add.reduceat(members[self.ids], self.starts)
+
+    def dense(self, size: int) -> np.ndarray:
+        """Each game's key, 0 for none; for facets with one key per game."""
+        if self._dense is None or len(self._dense) != size:
+            keys = np.repeat(np.array(self.keys, dtype=np.int64), self.sizes)
+            self._dense = np.zeros(size, dtype=np.int64)
+            self._dense[self.ids] = keys
+        return self._dense
+
+
+def _key(facet: str, value):
+    """A field value as the key of its range facet, None when it has none."""
+    if value is None:
+        return None
+    try:
+        if facet == "difficulty":
+            return round(float(value), 1)
+        # year_published is a string column in SQL
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _range_values(row: Mapping) -> dict[str, tuple]:
+    keys = {}
+    for facet, field in RANGE_FIELDS.items():
+        key = _key(facet, row.get(field))
+        if key is not None:
+            keys[facet] = (key,)
+    return keys
+
+
+class FacetIndex:
+    """A Bitmap of the games having each facet value, for faceted filtering.
+
+    Range facets are keyed on the value itself (difficulty to one decimal),
+    so a range is the union of the bitmaps of the keys inside it; linked
+    facets on the mechanic, genre, designer or publisher id. A filter
+    intersects those, smallest first. Counts gather the result's members
+    over each facet's postings, laid out again after a write.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Mapping] = (),
+        links: Iterable[tuple[int, str, int]] = (),
+    ):
+        self._lock = threading.Lock()
+        # game id -> facet -> its keys
+        self._values: dict[int, dict[str, tuple]] = {
+            int(row["id"]): _range_values(row) for row in rows
+        }
+        facets = {kind: facet for facet, kind in LINK_KINDS.items()}
+        for game_id, kind, value_id in links:
+            values = self._values.get(int(game_id))
+            facet = facets.get(kind)
+            if values is None or not facet or value_id is None:
+                continue
+            keys = values.get(facet, ())
+            if int(value_id) not in keys:
+                values[facet] = (*keys, int(value_id))
+
+        members = {facet: defaultdict(list) for facet in FACETS}
+        for game_id, values in self._values.items():
+            for facet, keys in values.items():
+                for key in keys:
+                    members[facet][key].append(game_id)
+        self._bitmaps: dict[str, dict] = {
+            facet: {key: Bitmap.from_values(ids) for key, ids in keyed.items()}
+            for facet, keyed in members.items()
+        }
+        self._all = Bitmap.from_values(self._values)
+        # facet -> _Postings, dropped when a write changes that facet
+        self._postings: dict[str, _Postings] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _set(self, game_id: int, values: dict[str, tuple]) -> None:
+        old = self._values.get(game_id, {})
+        for facet in FACETS:
+            before, after = set(old.get(facet, ())), set(values.get(facet, ()))
+            for key in before - after:
+                bitmap = self._bitmaps[facet].get(key)
+                if bitmap is not None:
+                    bitmap.discard(game_id)
+                    if not bitmap:
+                        del self._bitmaps[facet][key]
+            for key in after - before:
+                self._bitmaps[facet].setdefault(key, Bitmap()).add(game_id)
+            if before != after:
+                self._postings.pop(facet, None)
+
+    def update(self, game_id, row: Mapping) -> None:
+        """Re-key a game's range facets from ``row``; its links are kept."""
+        game_id = int(game_id)
+        with self._lock:
+            old = self._values.get(game_id, {})
+            links = {f: keys for f, keys in old.items() if f in LINK_KINDS}
+            values = {**_range_values(row), **links}
+            self._set(game_id, values)
+            self._values[game_id] = values
+            self._all.add(game_id)
+
+    def remove(self, game_id) -> None:
+        game_id = int(game_id)
+        with self._lock:
+            self._set(game_id, {})
+            self._values.pop(game_id, None)
+            self._all.discard(game_id)
+
+    def remove_value(self, facet: str, key) -> None:
+        with self._lock:
+            bitmap = self._bitmaps[facet].pop(key, None)
+            if bitmap is None:
+                return
+            for game_id in bitmap.to_array().tolist():
+                values = self._values[game_id]
+                values[facet] = tuple(k for k in values[facet] if k != key)
+            self._postings.pop(facet, None)
+
+    def _range(self, facet: str, low=None, high=None) -> Bitmap:
+        return Bitmap.union(
+            bitmap
+            for key, bitmap in self._bitmaps[facet].items()
+            if (low is None or key >= low) and (high is None or key <= high)
+        )
+
+    def _match(self, players, ranges, links) -> Bitmap | None:
+        parts = []
+        for n in players:
+            parts.append(self._range("min_players", high=n))
+            parts.append(self._range("max_players", low=n))
+        for facet, (low, high) in ranges.items():
+            if low is not None or high is not None:
+                parts.append(self._range(facet, low, high))
+        for facet, keys in links.items():
+            parts.extend(self._bitmaps[facet].get(int(k), Bitmap()) for k in keys)
+        if not parts:
+            return None
+        parts.sort(key=len)
+        result = parts[0] & self._all
+        for part in parts[1:]:
+            if not result:
+                break
+            result = result & part
+        return result
+
+    def _facet_postings(self, facet: str) -> _Postings:
+        postings = self._postings.get(facet)
+        if postings is None:
+            postings = self._postings[facet] = _Postings(self._bitmaps[facet])
+        return postings
+
+    def _player_counts(self, members: np.ndarray | None, size: int) -> np.ndarray:
+        # a game supports n players when min_players <= n <= max_players
+        low = self._facet_postings("min_players").dense(size)
+        high = self._facet_postings("max_players").dense(size)
+        known = (low > 0) & (high >= low)
+        if members is not None:
+            known &= members
+        low = np.clip(low[known], 1, FACET_MAX_PLAYERS + 1)
+        high = np.clip(high[known], 0, FACET_MAX_PLAYERS)
+        starts = np.bincount(low, minlength=FACET_MAX_PLAYERS + 2)
+        ends = np.bincount(high + 1, minlength=FACET_MAX_PLAYERS + 2)
+        return np.cumsum(starts - ends)[1 : FACET_MAX_PLAYERS + 1]
+
+    def _counts(self, result: Bitmap | None) -> dict[str, list[dict]]:
+        size = self._all.max() + 1 if self._all else 1
+        members = None
+        if result is not None:
+            members = np.zeros(size, dtype=bool)
+            members[result.to_array()] = True
+
+        players = self._player_counts(members, size)
+        facets = {
+            "players": [
+                {"value": n, "count": int(c)}
+                for n, c in enumerate(players.tolist(), start=1)
+                if c
+            ]
+        }
+        for facet in ("playing_time", "difficulty", "year"):
+            postings = self._facet_postings(facet)
+            counts = postings.counts(members).tolist()
+            facets[facet] = [
+                {"value": k, "count": n}
+                for k, n in sorted(zip(postings.keys, counts, strict=True))
+                if n
+            ]
+        for facet in LINK_KINDS:
+            postings = self._facet_postings(facet)
+            counts = postings.counts(members)
+            # most games first, the lower id winning a tie
+            order = np.lexsort((np.array(postings.keys), -counts))[:FACET_LIMIT]
+            facets[facet] = [
+                {"value": postings.keys[i], "count": int(counts[i])}
+                for i in order.tolist()
+                if counts[i]
+            ]
+        return facets
+
+    def search(
+        self,
+        offset: int,
+        limit: int,
+        players: Iterable[int] = (),
+        ranges: Mapping[str, tuple] | None = None,
+        links: Mapping[str, Iterable[int]] | None = None,
+        counts: bool = True,
+    ) -> tuple[list[int], int, dict | None]:
+        """The ids of one page of matching games, in id order, their total and,
+        with ``counts``, how many of them have each facet value.
+
+        ``players`` are counts a game must support; ``ranges`` maps range
+        facets to inclusive (low, high) bounds, either of which may be None;
+        ``links`` maps linked facets to ids a game must all have.
+        """
+        with self._lock:
+            result = self._match(players, ranges or {}, links or {})
+            matched = self._all if result is None else result
+            page = matched.select(offset, limit)
+            facets = self._counts(result) if counts else None
+            return page, len(matched), facets
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            bitmaps = [b for keyed in self._bitmaps.values() for b in keyed.values()]
+            return {
+                "games": len(self._values),
+                "values": len(bitmaps),
+                "bytes": sum(b.nbytes for b in bitmaps) + self._all.nbytes,
+            }
+
+
+class GameFacets:
+    """A FacetIndex built at startup and kept current by the services."""
+
+    def __init__(self):
+        self._index = FacetIndex()
+        self.ready = False
+
+    def load(self, rows: Iterable[Mapping], links: Iterable[tuple]) -> None:
+        # build aside and swap, so filtering keeps working during a rebuild
+        self._index = FacetIndex(rows, links)
+
+    def update(self, game_id, row: Mapping) -> None:
+        self._index.update(game_id, row)
+
+    def remove(self, game_id) -> None:
+        self._index.remove(game_id)
+
+    def remove_value(self, facet: str, key) -> None:
+        """Drop a deleted mechanic, genre, designer or publisher from every game."""
+        self._index.remove_value(facet, int(key))
+
+    def search(self, offset: int, limit: int, **filters):
+        return self._index.search(offset, limit, **filters)
+
+    def snapshot(self) -> dict:
+        return {"ready": self.ready, **self._index.snapshot()}
+
+
+game_facets = GameFacets()
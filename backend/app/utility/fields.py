@@ -0,0 +1,48 @@
+from collections.abc import Iterable
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+
+def parse_fields(raw: str | None, allowed: Iterable[str]) -> tuple[str, ...] | None:
+    """Split a ?fields= value into field names. None means every field.
+
+    id is always included so clients can key the rows. Raises ValueError for
+    names that are not in ``allowed``.
+    """
+    if not raw:
+        return None
+
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+
+    return fields if "id" in fields else ("id", *fields)
+
+
+def with_field(fields: tuple[str, ...] | None, extra: str | None):
+    """fields plus one the query needs internally, e.g. the keyset sort key."""
+    if fields is None or extra is None or extra in fields:
+        return fields
+    return (*fields, extra)
+
+
+@cache
+def _adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+def partial_dump(
+    model: type[BaseModel], row: Any, fields: Iterable[str]
+) -> dict[str, Any]:
+    """Validate and dump only ``fields`` of ``row`` the way ``model`` would."""
+    data = {}
+    for name in fields:
+        value = row.get(name) if isinstance(row, dict) else getattr(row, name, None)
+        adapter = _adapter(model, name)
+        data[name] = adapter.dump_python(
+            adapter.validate_python(value, from_attributes=True)
+        )
+    return data
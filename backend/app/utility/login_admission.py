@@ -0,0 +1,117 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, status
+
+# login attempts allowed in a burst, refilled at the per-minute rate
+LOGIN_USER_BURST = int(os.getenv("LOGIN_USER_BURST", "5"))
+LOGIN_USER_PER_MINUTE = float(os.getenv("LOGIN_USER_PER_MINUTE", "10"))
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "20"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "60"))
+# buckets remembered per kind; the least recently seen are forgotten first
+LOGIN_TRACKED_KEYS = int(os.getenv("LOGIN_TRACKED_KEYS", "100000"))
+
+
+class TokenBuckets:
+    """One token bucket per key, least recently seen first out."""
+
+    def __init__(self, burst: int, per_minute: float, max_keys: int):
+        self.burst = burst
+        self.rate = per_minute / 60
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def _tokens(self, key: str, now: float) -> float:
+        tokens, seen = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - seen) * self.rate)
+
+    def retry_after(self, key: str, now: float) -> float:
+        """Seconds until ``key`` has a token, 0 when it has one now."""
+        tokens = self._tokens(key, now)
+        if tokens >= 1:
+            return 0.0
+        return (1 - tokens) / self.rate if self.rate else math.inf
+
+    def take(self, key: str, now: float) -> None:
+        self._buckets[key] = (self._tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginAdmission:
+    """Rate limits password checks per username and per client IP.
+
+    Runs before any bcrypt work, so guessing one account or flooding from one
+    address is turned away with 429 without spending a hash.
+    """
+
+    def __init__(
+        self,
+        user_burst: int,
+        user_per_minute: float,
+        ip_burst: int,
+        ip_per_minute: float,
+        max_keys: int,
+    ):
+        self._users = TokenBuckets(user_burst, user_per_minute, max_keys)
+        self._ips = TokenBuckets(ip_burst, ip_per_minute, max_keys)
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected_user = 0
+        self.rejected_ip = 0
+
+    def admit(self, username: str, ip: str | None) -> None:
+        """Takes a token for both keys or raises 429 without taking any."""
+        user_key = username.lower()
+        ip_key = ip or "unknown"
+        with self._lock:
+            now = time.monotonic()
+            wait_ip = self._ips.retry_after(ip_key, now)
+            wait_user = self._users.retry_after(user_key, now)
+            if wait_ip or wait_user:
+                if wait_ip:
+                    self.rejected_ip += 1
+                else:
+                    self.rejected_user += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts",
+                    headers={"Retry-After": str(math.ceil(max(wait_ip, wait_user)))},
+                )
+            self._ips.take(ip_key, now)
+            self._users.take(user_key, now)
+            self.admitted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users._buckets.clear()
+            self._ips._buckets.clear()
+            self.admitted = 0
+            self.rejected_user = 0
+            self.rejected_ip = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                "rejected_user": self.rejected_user,
+                "rejected_ip": self.rejected_ip,
+                "tracked_users": len(self._users),
+                "tracked_ips": len(self._ips),
+            }
+
+
+login_admission = LoginAdmission(
+    LOGIN_USER_BURST,
+    LOGIN_USER_PER_MINUTE,
+    LOGIN_IP_BURST,
+    LOGIN_IP_PER_MINUTE,
+    LOGIN_TRACKED_KEYS,
+)
@@ -0,0 +1,389 @@
+import functools
+import importlib
+import inspect
+import pkgutil
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+# seconds; covers a cached lookup up to a slow export
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+REPOSITORY_BACKENDS = ("sql", "mongo", "neo")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: tuple = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        # per label set: count per bucket (the last one is +Inf), sum
+        self._series: dict[tuple, tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: tuple, seconds: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            counts, total = series
+            i = 0
+            while i < len(self.buckets) and seconds > self.buckets[i]:
+                i += 1
+            counts[i] += 1
+            total[0] += seconds
+
+    def count(self, labels: tuple) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = [(k, list(c), t[0]) for k, (c, t) in self._series.items()]
+        lines = self.header()
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += count
+                le = _labels((*self.labelnames, "le"), (*labels, bound))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            base = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{base} {_number(total)}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics plus collectors that read other components' snapshots at scrape time."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], list[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], list[Metric]]) -> Callable[[], list[Metric]]:
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        metrics = list(self._metrics)
+        for collect in self._collectors:
+            metrics.extend(collect())
+        return "\n".join(line for m in metrics for line in m.render()) + "\n"
+
+
+registry = Registry()
+
+http_request_seconds = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Request latency by route template.",
+        ("method", "route", "status"),
+    )
+)
+http_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "Requests being served right now.")
+)
+repository_seconds = registry.register(
+    Histogram(
+        "repository_call_duration_seconds",
+        "Repository method latency by backend.",
+        ("backend", "entity", "method"),
+    )
+)
+repository_errors = registry.register(
+    Counter(
+        "repository_call_errors_total",
+        "Repository calls that raised.",
+        ("backend", "entity", "method"),
+    )
+)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request, labelled by the route it matched.
+
+    The route template (``/api/games/{game_id}``) is known only after routing,
+    so it is read from the scope once the app returns; unmatched paths share
+    one label to keep the series count bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            http_request_seconds.observe(
+                (
+                    scope["method"],
+                    getattr(route, "path", "unmatched"),
+                    str(status),
+                ),
+                time.perf_counter() - start,
+            )
+
+
+def _timed(fn, labels: tuple[str, str, str]):
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def timed_async(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                repository_errors.inc(labels)
+                raise
+            finally:
+                repository_seconds.observe(labels, time.perf_counter() - start)
+
+        timed = timed_async
+    else:
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                repository_errors.inc(labels)
+                raise
+            finally:
+                repository_seconds.observe(labels, time.perf_counter() - start)
+
+    timed.__instrumented__ = True
+    return timed
+
+
+def instrument_class(cls: type, backend: str, entity: str) -> None:
+    """Wraps the public methods ``cls`` defines itself with repository timings.
+
+    Inherited methods are wrapped on the class that defines them. Generators
+    are left alone, since timing them would only time their creation.
+    """
+    for name, attr in list(vars(cls).items()):
+        if (
+            name.startswith("_")
+            or not inspect.isfunction(attr)
+            or getattr(attr, "__instrumented__", False)
+            or inspect.isgeneratorfunction(attr)
+            or inspect.isasyncgenfunction(attr)
+        ):
+            continue
+        setattr(cls, name, _timed(attr, (backend, entity, name)))
+
+
+def instrument_repositories(
+    package: str = "app.repository",
+    backends: Iterable[str] = REPOSITORY_BACKENDS,
+) -> None:
+    """Instruments every concrete repository class of ``backends`` under ``package``.
+
+    The backend comes from the module name (``sql_game_repository``,
+    ``artist_repository_mongo``) and the entity from its subpackage. Modules
+    of other backends are not imported at all.
+    """
+    root = importlib.import_module(package)
+    # the entity folders have no __init__.py, which walk_packages skips
+    for entity_dir in sorted(Path(root.__path__[0]).iterdir()):
+        if not entity_dir.is_dir() or entity_dir.name.startswith("_"):
+            continue
+        for info in pkgutil.iter_modules([str(entity_dir)]):
+            tokens = info.name.split("_")
+            backend = next((b for b in REPOSITORY_BACKENDS if b in tokens), None)
+            if backend in backends:
+                module = importlib.import_module(
+                    f"{package}.{entity_dir.name}.{info.name}"
+                )
+                _instrument_module(module, backend, entity_dir.name)
+
+
+def _instrument_module(module, backend: str, entity: str) -> None:
+    for cls in vars(module).values():
+        if (
+            inspect.isclass(cls)
+            and cls.__module__ == module.__name__
+            and "Repository" in cls.__name__
+            and not inspect.isabstract(cls)
+        ):
+            instrument_class(cls, backend, entity)
+
+
+def _gauges(name: str, help: str, label: str, stats: dict[str, dict]) -> list[Metric]:
+    """One gauge per numeric field of each labelled snapshot."""
+    gauges: dict[str, Gauge] = {}
+    for value_of, snapshot in stats.items():
+        for key, value in snapshot.items():
+            if isinstance(value, bool) or not isinstance(value, int | float):
+                continue
+            gauge = gauges.get(key)
+            if gauge is None:
+                gauge = gauges[key] = Gauge(
+                    f"{name}_{key}", f"{help} ({key}).", (label,)
+                )
+            gauge.set((value_of,), value)
+    return list(gauges.values())
+
+
+@registry.collector
+def collect_runtime_stats() -> list[Metric]:
+    from app.utility.autocomplete import autocomplete_index
+    from app.utility.facets import game_facets
+    from app.utility.login_admission import login_admission
+    from app.utility.outbox_sync import outbox_sync
+    from app.utility.password_hasher import password_hasher
+    from app.utility.pool_metrics import get_pool_stats
+    from app.utility.principal_cache import principal_cache
+    from app.utility.purger import purger
+    from app.utility.recommender import recommender
+    from app.utility.similarity import similar_games
+    from app.utility.totals import count_cache
+    from app.utility.weather_client import weather_client
+
+    pools = get_pool_stats()
+    for stats in pools.values():
+        limit = stats.get("max_size") or stats.get("size", 0) + stats.get(
+            "max_overflow", 0
+        )
+        if limit:
+            stats["utilisation"] = round(stats.get("checked_out", 0) / limit, 3)
+
+    autocomplete_entries = Gauge(
+        "autocomplete_entries", "Names in the autocomplete index.", ("kind",)
+    )
+    for kind, size in autocomplete_index.snapshot().items():
+        if kind != "ready":
+            autocomplete_entries.set((kind,), size)
+
+    purge = purger.snapshot()
+    purge_kinds = {kind: {"removed": n} for kind, n in purge.get("removed", {}).items()}
+    for kind, n in purge.get("pending", {}).items():
+        purge_kinds[kind]["pending"] = n
+
+    recommend = recommender.snapshot()
+    recommend_store = {recommend["store"]: recommend} if recommend else {}
+
+    return [
+        *_gauges("db_pool", "Connection pool", "backend", pools),
+        *_gauges(
+            "cache",
+            "Cache",
+            "cache",
+            {
+                "count": count_cache.snapshot(),
+                "principal": principal_cache.snapshot(),
+                "weather": weather_client.snapshot(),
+            },
+        ),
+        autocomplete_entries,
+        *_gauges(
+            "login",
+            "Login",
+            "component",
+            {
+                "hasher": password_hasher.snapshot(),
+                "admission": login_admission.snapshot(),
+            },
+        ),
+        *_gauges("outbox", "Outbox sync", "target", outbox_sync.snapshot()),
+        *_gauges("purge", "Tombstone purge", "kind", purge_kinds),
+        *_gauges(
+            "similar",
+            "Similar games index",
+            "index",
+            {"games": similar_games.snapshot()},
+        ),
+        *_gauges(
+            "facets", "Game facet index", "index", {"games": game_facets.snapshot()}
+        ),
+        *_gauges("recommend", "Recommendation model", "store", recommend_store),
+    ]
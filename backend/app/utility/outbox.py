@@ -0,0 +1,65 @@
+import os
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.model.game_model import Game
+from app.model.outbox_model import OutboxEvent
+from app.model.review_model import Review
+from app.model.video_model import Video
+
+# "true" records game and review changes in outbox_event for the sync worker
+OUTBOX_ENABLED = os.getenv("OUTBOX", "false").lower() in ("1", "true", "yes")
+
+
+def _changes(obj, op: str) -> list[tuple[str, int, str]]:
+    """Outbox keys for one flushed object; videos live inside the game document."""
+    if isinstance(obj, Game):
+        return [("game", obj.id, op)]
+    if isinstance(obj, Review):
+        return [("review", obj.id, op)]
+    if isinstance(obj, Video) and obj.game_id is not None:
+        return [("game", obj.game_id, "upsert")]
+    return []
+
+
+def _after_flush(session: Session, _context) -> None:
+    if not OUTBOX_ENABLED:
+        return
+    pending = session.info.setdefault("outbox", {})
+    # ids are assigned by now, and new/dirty/deleted still describe this flush
+    for obj in session.new:
+        pending.update({(e, i): op for e, i, op in _changes(obj, "upsert")})
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            pending.update({(e, i): op for e, i, op in _changes(obj, "upsert")})
+    for obj in session.deleted:
+        pending.update({(e, i): op for e, i, op in _changes(obj, "delete")})
+
+
+def _after_flush_postexec(session: Session, _context) -> None:
+    pending = session.info.pop("outbox", None)
+    if pending:
+        # flushed by the commit that is already under way, in its transaction
+        session.add_all(
+            OutboxEvent(entity=entity, entity_id=entity_id, op=op)
+            for (entity, entity_id), op in pending.items()
+        )
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop("outbox", None)
+
+
+def record_change(session: Session, entity: str, entity_id: int, op: str = "upsert"):
+    """Records a change made with plain SQL, which the flush hooks cannot see."""
+    if OUTBOX_ENABLED:
+        session.add(OutboxEvent(entity=entity, entity_id=entity_id, op=op))
+
+
+def install_outbox() -> None:
+    """Listens on every Session, including the ones behind AsyncSession."""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_flush_postexec", _after_flush_postexec)
+        event.listen(Session, "after_rollback", _after_rollback)
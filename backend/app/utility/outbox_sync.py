@@ -0,0 +1,459 @@
+"""
+Applies outbox_event rows to MongoDB and Neo4j, batch by batch.
+
+Each target keeps its own position in outbox_cursor, so a store that is down
+only holds back itself. Events only say which game or review changed; the
+worker reads the current SQL row and makes the target match it (or deletes
+the target's copy when the row is gone). Replaying an event is therefore
+harmless, and several events for one row cost a single write.
+
+Runs inside the API with OUTBOX_SYNC=true, or on its own:
+
+    uv run python -m app.utility.outbox_sync
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import selectinload
+
+from app.model.game_model import Game
+from app.model.outbox_model import OutboxCursor, OutboxEvent
+from app.model.review_model import Review
+from app.schema.artist_schema import ArtistRead
+from app.schema.designer_schema import DesignerRead
+from app.schema.game_schema import GameRead
+from app.schema.genre_schema import GenreRead
+from app.schema.mechanic_schema import MechanicRead
+from app.schema.publisher_schema import PublisherRead
+from app.schema.video_schema import VideoRead
+
+logger = logging.getLogger(__name__)
+
+# "true" runs the worker in the API process
+OUTBOX_SYNC = os.getenv("OUTBOX_SYNC", "false").lower() in ("1", "true", "yes")
+OUTBOX_TARGETS = [
+    t.strip() for t in os.getenv("OUTBOX_TARGETS", "mongo,neo").split(",") if t.strip()
+]
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+# seconds between polls while the outbox is drained
+OUTBOX_SYNC_INTERVAL = float(os.getenv("OUTBOX_SYNC_INTERVAL", "1.0"))
+# an id gap younger than this may be a transaction that has not committed yet
+OUTBOX_GAP_GRACE = float(os.getenv("OUTBOX_GAP_GRACE", "5.0"))
+
+RELATIONS = {
+    "artists": ArtistRead,
+    "designers": DesignerRead,
+    "publishers": PublisherRead,
+    "mechanics": MechanicRead,
+    "genres": GenreRead,
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _year(value) -> int | None:
+    # the SQL column is a string
+    return int(value) if value not in (None, "") and str(value).isdigit() else None
+
+
+def game_snapshot(game: Game, review_ids: list[int]) -> dict:
+    """Store-neutral copy of a game with its relations and review ids."""
+    row = {field: getattr(game, field) for field in GameRead.model_fields}
+    row["year_published"] = _year(row["year_published"])
+    for name, schema in RELATIONS.items():
+        row[name] = [
+            schema.model_validate(item).model_dump(mode="json")
+            for item in getattr(game, name)
+        ]
+    row["videos"] = [
+        VideoRead.model_validate(v).model_dump(mode="json") for v in game.videos
+    ]
+    row["review_ids"] = sorted(review_ids)
+    row["star_histogram"] = dict(game.star_histogram or {})
+    return row
+
+
+def review_snapshot(review: Review) -> dict:
+    user = review.user
+    return {
+        "id": review.id,
+        "title": review.title,
+        "text": review.text,
+        "star_amount": review.star_amount,
+        "game_id": review.game_id,
+        "user_id": review.user_id,
+        "user": {
+            "id": review.user_id,
+            "display_name": user.display_name if user else None,
+            "username": user.username if user else None,
+        },
+    }
+
+
+def load_changes(db, events) -> tuple[dict[int, dict | None], dict[int, dict | None]]:
+    """Current SQL state of every game and review the events name; None = deleted."""
+    game_ids = {e.entity_id for e in events if e.entity == "game"}
+    review_ids = {e.entity_id for e in events if e.entity == "review"}
+    games: dict[int, dict | None] = dict.fromkeys(game_ids)
+    reviews: dict[int, dict | None] = dict.fromkeys(review_ids)
+
+    if game_ids:
+        reviews_of: dict[int, list[int]] = {}
+        stmt = select(Review.game_id, Review.id).where(Review.game_id.in_(game_ids))
+        for game_id, review_id in db.execute(stmt):
+            reviews_of.setdefault(game_id, []).append(review_id)
+        stmt = (
+            select(Game)
+            # a soft-deleted game is gone as far as the targets are concerned
+            .where(Game.id.in_(game_ids), Game.deleted_at.is_(None))
+            .options(
+                *(selectinload(getattr(Game, name)) for name in RELATIONS),
+                selectinload(Game.videos),
+            )
+        )
+        for game in db.execute(stmt).scalars():
+            games[game.id] = game_snapshot(game, reviews_of.get(game.id, []))
+
+    if review_ids:
+        stmt = (
+            select(Review)
+            .where(Review.id.in_(review_ids))
+            .options(selectinload(Review.user))
+        )
+        for review in db.execute(stmt).scalars():
+            reviews[review.id] = review_snapshot(review)
+
+    return games, reviews
+
+
+class MongoSyncTarget:
+    """Game documents (relations embedded) and review documents, keyed by SQL id."""
+
+    name = "mongo"
+
+    def __init__(self, db):
+        self.games = db["games"]
+        self.reviews = db["reviews"]
+
+    @staticmethod
+    def _game_doc(row: dict) -> dict:
+        doc = {k: v for k, v in row.items() if k not in ("id", "image", "thumbnail")}
+        return {
+            "_id": row["id"],
+            **doc,
+            "images": {"thumbnail": row["thumbnail"], "image": row["image"]},
+        }
+
+    def apply(self, games: dict, reviews: dict) -> None:
+        from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+        game_ops = [
+            ReplaceOne({"_id": i}, self._game_doc(row), upsert=True)
+            if row
+            else DeleteOne({"_id": i})
+            for i, row in games.items()
+        ]
+        if game_ops:
+            self.games.bulk_write(game_ops, ordered=False)
+
+        review_ops = []
+        link_ops = []
+        for i, row in reviews.items():
+            if row:
+                review_ops.append(
+                    ReplaceOne({"_id": i}, {"_id": i, **row}, upsert=True)
+                )
+                link_ops.append(
+                    UpdateOne({"_id": row["game_id"]}, {"$addToSet": {"review_ids": i}})
+                )
+            else:
+                review_ops.append(DeleteOne({"_id": i}))
+        if review_ops:
+            self.reviews.bulk_write(review_ops, ordered=False)
+        if link_ops:
+            self.games.bulk_write(link_ops, ordered=False)
+
+        deleted = [i for i, row in reviews.items() if row is None]
+        if deleted:
+            self.games.update_many(
+                {"review_ids": {"$in": deleted}},
+                {"$pull": {"review_ids": {"$in": deleted}}},
+            )
+
+
+class NeoSyncTarget:
+    """Game and review nodes with their relationships, keyed by SQL id."""
+
+    name = "neo"
+
+    # relation name -> (relationship type, node label)
+    RELATIONSHIPS = {
+        "artists": ("ART_BY", "Artist"),
+        "designers": ("DESIGNED_BY", "Designer"),
+        "publishers": ("PUBLISHED_BY", "Publisher"),
+        "mechanics": ("USES_MECHANIC", "Mechanic"),
+        "genres": ("IN_GENRE", "Genre"),
+    }
+
+    UPSERT_GAMES = """
+        UNWIND $rows AS row
+        MERGE (g:Game {id: row.id})
+        SET g = row.props
+        WITH g
+        OPTIONAL MATCH (g)-[old:ART_BY|DESIGNED_BY|PUBLISHED_BY|USES_MECHANIC|IN_GENRE]->()
+        DELETE old
+    """
+
+    LINK = """
+        UNWIND $rows AS row
+        MATCH (g:Game {{id: row.id}})
+        UNWIND row.{name} AS item
+        MERGE (x:{label} {{id: item.id}})
+        SET x += item
+        MERGE (g)-[:{rel}]->(x)
+    """
+
+    UPSERT_REVIEWS = """
+        UNWIND $rows AS row
+        MERGE (r:Review {id: row.id})
+        SET r = row.props
+        WITH r, row
+        OPTIONAL MATCH (r)-[old:FOR_GAME]->()
+        DELETE old
+        WITH DISTINCT r, row
+        MATCH (g:Game {id: row.game_id})
+        MERGE (r)-[:FOR_GAME]->(g)
+        MERGE (u:User {id: row.user.id})
+        ON CREATE SET u.username = row.user.username,
+                      u.display_name = row.user.display_name
+        MERGE (u)-[:WROTE]->(r)
+    """
+
+    DELETE_REVIEWS = "UNWIND $ids AS id MATCH (r:Review {id: id}) DETACH DELETE r"
+    DELETE_GAMES = "UNWIND $ids AS id MATCH (g:Game {id: id}) DETACH DELETE g"
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @staticmethod
+    def _props(row: dict, skip: tuple[str, ...]) -> dict:
+        return {k: v for k, v in row.items() if k not in skip and v is not None}
+
+    @classmethod
+    def _game_props(cls, row: dict) -> dict:
+        skip = (*cls.RELATIONSHIPS, "videos", "review_ids", "star_histogram")
+        # nodes cannot hold maps, so the histogram is one property per star
+        stars = {f"stars_{s}": n for s, n in row["star_histogram"].items()}
+        return {**cls._props(row, skip), **stars}
+
+    def _write(self, tx, games: dict, reviews: dict) -> None:
+        upserted = [row for row in games.values() if row]
+        if upserted:
+            rows = [{**row, "props": self._game_props(row)} for row in upserted]
+            tx.run(self.UPSERT_GAMES, rows=rows)
+            for name, (rel, label) in self.RELATIONSHIPS.items():
+                tx.run(self.LINK.format(name=name, label=label, rel=rel), rows=rows)
+
+        upserted = [row for row in reviews.values() if row]
+        if upserted:
+            rows = [{**row, "props": self._props(row, ("user",))} for row in upserted]
+            tx.run(self.UPSERT_REVIEWS, rows=rows)
+
+        deleted = [i for i, row in reviews.items() if row is None]
+        if deleted:
+            tx.run(self.DELETE_REVIEWS, ids=deleted)
+        deleted = [i for i, row in games.items() if row is None]
+        if deleted:
+            tx.run(self.DELETE_GAMES, ids=deleted)
+
+    def apply(self, games: dict, reviews: dict) -> None:
+        with self.driver.session() as session:
+            session.execute_write(self._write, games, reviews)
+
+
+def build_targets(names: list[str]) -> list:
+    targets = []
+    for name in names:
+        if name == "mongo":
+            from app.utility.db_mongo import MONGO_DB, get_client
+
+            targets.append(MongoSyncTarget(get_client()[MONGO_DB]))
+        elif name == "neo":
+            from app.utility.db_neo import get_neo
+
+            targets.append(NeoSyncTarget(get_neo()))
+        else:
+            raise ValueError(f"Unknown outbox target: {name}")
+    return targets
+
+
+def _session_factory():
+    from app.utility.db_sql import SessionLocal, get_engine
+
+    get_engine()
+    return SessionLocal()
+
+
+class OutboxSync:
+    """Moves each target's cursor through the outbox and keeps per-target stats."""
+
+    def __init__(
+        self,
+        session_factory=_session_factory,
+        targets: list | None = None,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        gap_grace: float = OUTBOX_GAP_GRACE,
+    ):
+        self.session_factory = session_factory
+        self._targets = targets
+        self.batch_size = batch_size
+        self.gap_grace = gap_grace
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    @property
+    def targets(self) -> list:
+        if self._targets is None:
+            self._targets = build_targets(OUTBOX_TARGETS)
+        return self._targets
+
+    def _settled(self, events, last_id: int) -> list:
+        """The events up to the first id gap that may still be filled."""
+        now = _utcnow()
+        expected = last_id + 1
+        settled = []
+        for event in events:
+            if event.id != expected:
+                age = (now - event.created_at).total_seconds()
+                if age < self.gap_grace:
+                    break
+            settled.append(event)
+            expected = event.id + 1
+        return settled
+
+    def _cursor(self, db, name: str) -> OutboxCursor | None:
+        stmt = select(OutboxCursor).where(OutboxCursor.target == name)
+        cursor = db.execute(stmt.with_for_update(skip_locked=True)).scalar_one_or_none()
+        if cursor is None and db.get(OutboxCursor, name) is None:
+            cursor = OutboxCursor(target=name, last_id=0)
+            db.add(cursor)
+            db.flush()
+        # None: another worker holds this target right now
+        return cursor
+
+    def _record(self, name: str, **values) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                name,
+                {
+                    "applied": 0,
+                    "batches": 0,
+                    "errors": 0,
+                    "last_error": None,
+                    "last_batch_ms": 0.0,
+                    "last_id": 0,
+                    "pending": 0,
+                    "lag_seconds": 0.0,
+                },
+            )
+            for key, value in values.items():
+                if key in ("applied", "batches", "errors"):
+                    stats[key] += value
+                else:
+                    stats[key] = value
+
+    def sync_target(self, target) -> int:
+        """Applies the next batch to ``target``; returns how many events it covered."""
+        with self.session_factory() as db:
+            cursor = self._cursor(db, target.name)
+            if cursor is None:
+                return 0
+
+            stmt = (
+                select(OutboxEvent)
+                .where(OutboxEvent.id > cursor.last_id)
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+            )
+            events = self._settled(db.execute(stmt).scalars().all(), cursor.last_id)
+            if events:
+                start = time.perf_counter()
+                try:
+                    target.apply(*load_changes(db, events))
+                except Exception as exc:
+                    db.rollback()
+                    logger.exception("outbox sync to %s failed", target.name)
+                    self._record(target.name, errors=1, last_error=repr(exc))
+                    return 0
+                cursor.last_id = events[-1].id
+                cursor.synced_at = _utcnow()
+                self._record(
+                    target.name,
+                    applied=len(events),
+                    batches=1,
+                    last_batch_ms=round((time.perf_counter() - start) * 1000, 1),
+                )
+
+            last_id = cursor.last_id
+            db.commit()
+            pending, oldest = db.execute(
+                select(func.count(), func.min(OutboxEvent.created_at)).where(
+                    OutboxEvent.id > last_id
+                )
+            ).one()
+            lag = (_utcnow() - oldest).total_seconds() if oldest else 0.0
+            self._record(
+                target.name, last_id=last_id, pending=pending, lag_seconds=round(lag, 3)
+            )
+            return len(events)
+
+    def purge(self) -> int:
+        """Deletes events every target has applied."""
+        names = [t.name for t in self.targets]
+        with self.session_factory() as db:
+            stmt = select(func.count(), func.min(OutboxCursor.last_id)).where(
+                OutboxCursor.target.in_(names)
+            )
+            count, applied = db.execute(stmt).one()
+            if count < len(names) or not applied:
+                return 0
+            deleted = db.execute(delete(OutboxEvent).where(OutboxEvent.id <= applied))
+            db.commit()
+            return deleted.rowcount
+
+    def run_once(self) -> int:
+        applied = sum(self.sync_target(target) for target in self.targets)
+        if applied:
+            self.purge()
+        return applied
+
+    async def run_forever(self, interval: float = OUTBOX_SYNC_INTERVAL) -> None:
+        while True:
+            try:
+                applied = await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("outbox sync pass failed")
+                applied = 0
+            # a full batch means there is more waiting, so go again right away
+            if applied < self.batch_size:
+                await asyncio.sleep(interval)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+outbox_sync = OutboxSync()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(outbox_sync.run_forever())
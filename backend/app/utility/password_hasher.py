@@ -0,0 +1,134 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+from fastapi import HTTPException, status
+
+# "process" runs bcrypt in worker processes instead of threads
+BCRYPT_EXECUTOR = os.getenv("BCRYPT_EXECUTOR", "thread").lower()
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# hashes allowed to wait for a worker before new ones are turned away
+BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", "32"))
+
+
+def _hashpw(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class HasherBusy(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many logins in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+class PasswordHasher:
+    """bcrypt on its own small executor, away from FastAPI's threadpool.
+
+    Only ``workers`` hashes run at once and at most ``max_queue`` more may
+    wait; beyond that HasherBusy (503) is raised at once, so a login burst
+    is shed instead of piling up behind the CPU.
+    """
+
+    def __init__(self, workers: int, max_queue: int, kind: str = "thread"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._busy_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        # created on first use so importing the app starts no processes
+        if self._executor is None:
+            if self.kind == "process":
+                # forking a threaded server can deadlock the children
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HasherBusy()
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+            executor = self._get_executor()
+
+        submitted = time.perf_counter()
+
+        def done(_):
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self._busy_seconds += time.perf_counter() - submitted
+
+        future = executor.submit(fn, *args)
+        future.add_done_callback(done)
+        return future
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        future = self._submit(
+            _checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+        )
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        future = self._submit(_hashpw, password.encode("utf-8"))
+        return (await asyncio.wrap_future(future)).decode("utf-8")
+
+    def hash_blocking(self, password: str) -> str:
+        """For sync callers; still bounded by the executor and its queue."""
+        return self._submit(_hashpw, password.encode("utf-8")).result().decode("utf-8")
+
+    def verify_blocking(self, password: str, hashed: str) -> bool:
+        future = self._submit(
+            _checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+        )
+        return future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "pending": self.pending,
+                "queued": max(0, self.pending - self.workers),
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": round(self._busy_seconds / self.completed * 1000, 2)
+                if self.completed
+                else 0.0,
+            }
+
+
+password_hasher = PasswordHasher(BCRYPT_WORKERS, BCRYPT_MAX_QUEUE, BCRYPT_EXECUTOR)
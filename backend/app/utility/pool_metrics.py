@@ -0,0 +1,65 @@
+import sys
+import threading
+
+
+class PoolWaitTimer:
+    """Thread-safe accumulator for connection checkout wait times."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.in_use = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            if seconds > self.max_wait:
+                self.max_wait = seconds
+
+    def acquired(self) -> None:
+        with self._lock:
+            self.in_use += 1
+
+    def released(self, count: int = 1) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - count)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(avg * 1000, 3),
+                "wait_max_ms": round(self.max_wait * 1000, 3),
+                "wait_total_ms": round(self.total_wait * 1000, 3),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+
+def get_pool_stats() -> dict:
+    """Collect pool statistics for every backend whose client has been created.
+
+    Only modules something already imported are asked, so a scrape does not
+    pull in the drivers of inactive backends.
+    """
+    stats = {}
+    for name, module in (
+        ("sql", "app.utility.db_sql"),
+        ("sql_async", "app.utility.db_sql_async"),
+        ("mongo", "app.utility.db_mongo"),
+        ("neo", "app.utility.db_neo"),
+    ):
+        loaded = sys.modules.get(module)
+        pool = loaded.get_pool_stats() if loaded else None
+        if pool is not None:
+            stats[name] = pool
+
+    return stats
@@ -0,0 +1,146 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.utility.etag import entity_versions
+
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+# seconds between checks of the shared principal version; the longest another
+# worker keeps serving a user changed elsewhere
+AUTH_CACHE_SYNC = float(os.getenv("AUTH_CACHE_SYNC", "1"))
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """Authenticated users per (user id, token iat), least recently used first out.
+
+    UserService drops a user's entries when it updates or deletes them and
+    bumps the shared "principal" entity version. Every ``sync_interval``
+    seconds the cache reads ``version()`` and, when it moved, drops all its
+    entries, so other workers and replicas catch up within that interval.
+    The TTL bounds staleness from writes made outside the API.
+
+    A user's generation is the tick of their last invalidation. Only the
+    ``max_size`` most recent are kept; a forgotten one reads as the floor,
+    the newest tick forgotten, so a load started before a forgotten
+    invalidation still is not cached.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_size: int,
+        version: Callable[[], Any] | None = None,
+        sync_interval: float = 0.0,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version = version
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, int | None], tuple[Any, float]] = (
+            OrderedDict()
+        )
+        self._generations: OrderedDict[int, int] = OrderedDict()
+        self._tick = 0
+        self._floor = 0
+        # moves when another process invalidated someone; loads across it are dropped
+        self._epoch = 0
+        self._seen_version = None
+        self._synced_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def generation(self, user_id: int) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(user_id, self._floor)
+
+    def sync(self) -> None:
+        """Drops every entry once the shared version moved since the last check."""
+        if self.version is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now < self._synced_at + self.sync_interval:
+                return
+            self._synced_at = now
+        try:
+            version = self.version()
+        except Exception:
+            # keep serving; the TTL still bounds how stale an entry gets
+            logger.exception("Could not read the shared principal version")
+            return
+        with self._lock:
+            if version != self._seen_version:
+                self._seen_version = version
+                self._epoch += 1
+                self._entries.clear()
+
+    def get(self, user_id: int, iat: int | None):
+        self.sync()
+        key = (user_id, iat)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def set(
+        self, user_id: int, iat: int | None, principal, generation: tuple[int, int]
+    ) -> None:
+        with self._lock:
+            # the user was written while loading, so the value may already be stale
+            if (self._epoch, self._generations.get(user_id, self._floor)) != generation:
+                return
+            self._entries[(user_id, iat)] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end((user_id, iat))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._tick += 1
+            self._generations[user_id] = self._tick
+            self._generations.move_to_end(user_id)
+            while len(self._generations) > self.max_size:
+                _, self._floor = self._generations.popitem(last=False)
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "generations": len(self._generations),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+principal_cache = PrincipalCache(
+    AUTH_CACHE_TTL,
+    AUTH_CACHE_SIZE,
+    version=lambda: entity_versions.get("principal"),
+    sync_interval=AUTH_CACHE_SYNC,
+)
@@ -0,0 +1,468 @@
+"""
+Removes what soft-deleted games and users leave behind, batch by batch.
+
+DELETE /api/games/{id} and /api/users/{id} only tombstone the row: SQL sets
+deleted_at, MongoDB deletes the document and records it in TOMBSTONES, and
+Neo4j relabels the node DeletedGame / DeletedUser. Reads stop seeing it right
+away. The purger then deletes reviews, videos and relation links with
+set-based statements of at most PURGE_BATCH_SIZE rows, each batch its own
+transaction, and finally the tombstoned rows. Reviews of a deleted user are
+taken off their games' aggregates as they go.
+
+Runs inside the API with PURGE_WORKER=true, or on its own:
+
+    uv run python -m app.utility.purger
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import delete, func, select
+
+from app.model.game_model import (
+    Game,
+    game_artists,
+    game_designers,
+    game_genres,
+    game_mechanics,
+    game_publishers,
+)
+from app.model.review_model import Review
+from app.model.user_model import User
+from app.model.video_model import Video
+from app.repository.review.sql_review_repository import ReviewRepositorySQL
+from app.utility.etag import entity_versions
+from app.utility.outbox import record_change
+from app.utility.review_aggregates import (
+    NEO_UPDATE_QUERY,
+    mongo_update,
+    neo_rows,
+    removed_deltas,
+)
+from app.utility.totals import count_cache
+
+logger = logging.getLogger(__name__)
+
+# "true" runs the worker in the API process
+PURGE_WORKER = os.getenv("PURGE_WORKER", "false").lower() in ("1", "true", "yes")
+# rows deleted per statement, and tombstones taken on per batch
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))
+# seconds between passes once nothing is left
+PURGE_INTERVAL = float(os.getenv("PURGE_INTERVAL", "5.0"))
+
+# the entities whose reads change when a batch removes these rows; removed
+# reviews also come off their games' aggregates
+CHANGED_ENTITIES = {"reviews": ("review", "game"), "videos": ("video",)}
+
+GAME_LINKS = (
+    game_artists,
+    game_designers,
+    game_publishers,
+    game_mechanics,
+    game_genres,
+)
+
+
+def _session_factory():
+    from app.utility.db_sql import SessionLocal, get_engine
+
+    get_engine()
+    return SessionLocal()
+
+
+class SQLPurgeStore:
+    """Tombstones are rows with deleted_at set; dependants go before the row."""
+
+    name = "sql"
+
+    def __init__(self, session_factory=_session_factory):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _tombstoned(db, model, limit: int) -> list[int]:
+        stmt = (
+            select(model.id)
+            .where(model.deleted_at.is_not(None))
+            .order_by(model.deleted_at, model.id)
+            .limit(limit)
+        )
+        return list(db.execute(stmt).scalars())
+
+    @staticmethod
+    def _locked(db, stmt):
+        # concurrent purgers split the rows instead of removing them twice
+        return db.execute(stmt.with_for_update(skip_locked=True)).all()
+
+    def _purge_games(self, db, batch_size: int) -> Counter:
+        removed = Counter()
+        game_ids = self._tombstoned(db, Game, batch_size)
+        if not game_ids:
+            return removed
+
+        stmt = select(Review.id).where(Review.game_id.in_(game_ids)).limit(batch_size)
+        review_ids = [row.id for row in self._locked(db, stmt)]
+        if review_ids:
+            db.execute(delete(Review).where(Review.id.in_(review_ids)))
+            for review_id in review_ids:
+                record_change(db, "review", review_id, "delete")
+            removed["reviews"] = len(review_ids)
+            return removed
+
+        stmt = select(Video.id).where(Video.game_id.in_(game_ids)).limit(batch_size)
+        video_ids = [row.id for row in self._locked(db, stmt)]
+        if video_ids:
+            db.execute(delete(Video).where(Video.id.in_(video_ids)))
+            removed["videos"] = len(video_ids)
+            return removed
+
+        # a game has few links, so all of them go with the game
+        for table in GAME_LINKS:
+            res = db.execute(delete(table).where(table.c.game_id.in_(game_ids)))
+            removed["links"] += res.rowcount
+        res = db.execute(delete(Game).where(Game.id.in_(game_ids)))
+        removed["games"] = res.rowcount
+        return removed
+
+    def _purge_users(self, db, batch_size: int) -> Counter:
+        removed = Counter()
+        user_ids = self._tombstoned(db, User, batch_size)
+        if not user_ids:
+            return removed
+
+        stmt = (
+            select(Review.id, Review.game_id, Review.star_amount)
+            .where(Review.user_id.in_(user_ids))
+            .limit(batch_size)
+        )
+        rows = self._locked(db, stmt)
+        if rows:
+            db.execute(delete(Review).where(Review.id.in_([r.id for r in rows])))
+            for row in rows:
+                record_change(db, "review", row.id, "delete")
+            ReviewRepositorySQL._update_games(
+                db, removed_deltas((r.game_id, r.star_amount) for r in rows)
+            )
+            removed["reviews"] = len(rows)
+            return removed
+
+        res = db.execute(delete(User).where(User.id.in_(user_ids)))
+        removed["users"] = res.rowcount
+        return removed
+
+    def purge_batch(self, batch_size: int) -> Counter:
+        with self.session_factory() as db:
+            try:
+                removed = self._purge_games(db, batch_size)
+                removed += self._purge_users(db, batch_size)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            return removed
+
+    def pending(self) -> dict[str, int]:
+        with self.session_factory() as db:
+            return {
+                key: db.execute(
+                    select(func.count()).where(model.deleted_at.is_not(None))
+                ).scalar_one()
+                for key, model in (("games", Game), ("users", User))
+            }
+
+
+class MongoPurgeStore:
+    """Tombstones are TOMBSTONES documents; the game or user document is gone.
+
+    MongoDB has no row locks, so run a single purger against it.
+    """
+
+    name = "mongo"
+
+    def __init__(self, db):
+        from app.utility.db_mongo import TOMBSTONES
+
+        self.tombstones = db[TOMBSTONES]
+        self.reviews = db["reviews"]
+        self.games = db["games"]
+
+    def _tombstoned(self, entity: str, limit: int) -> list[int]:
+        cursor = (
+            self.tombstones.find({"entity": entity}, {"entity_id": 1})
+            .sort("deleted_at", 1)
+            .limit(limit)
+        )
+        return [doc["entity_id"] for doc in cursor]
+
+    def _done(self, entity: str, ids: list[int]) -> int:
+        res = self.tombstones.delete_many({"entity": entity, "entity_id": {"$in": ids}})
+        return res.deleted_count
+
+    def _purge_games(self, batch_size: int) -> Counter:
+        removed = Counter()
+        game_ids = self._tombstoned("game", batch_size)
+        if not game_ids:
+            return removed
+
+        # videos and relations are embedded in the game document, gone already
+        cursor = self.reviews.find({"game_id": {"$in": game_ids}}, {"_id": 1})
+        review_ids = [doc["_id"] for doc in cursor.limit(batch_size)]
+        if review_ids:
+            res = self.reviews.delete_many({"_id": {"$in": review_ids}})
+            removed["reviews"] = res.deleted_count
+            return removed
+
+        removed["games"] = self._done("game", game_ids)
+        return removed
+
+    def _purge_users(self, batch_size: int) -> Counter:
+        removed = Counter()
+        user_ids = self._tombstoned("user", batch_size)
+        if not user_ids:
+            return removed
+
+        # reviews written by the API carry user_id, migrated ones only user.id
+        query = {
+            "$or": [
+                {"user_id": {"$in": user_ids}},
+                {"user.id": {"$in": user_ids}},
+            ]
+        }
+        cursor = self.reviews.find(query, {"game_id": 1, "star_amount": 1})
+        docs = list(cursor.limit(batch_size))
+        if docs:
+            from pymongo import UpdateOne
+
+            res = self.reviews.delete_many({"_id": {"$in": [d["_id"] for d in docs]}})
+            deltas = removed_deltas((d["game_id"], d["star_amount"]) for d in docs)
+            self.games.bulk_write(
+                [UpdateOne({"_id": int(g)}, mongo_update(d)) for g, d in deltas.items()]
+            )
+            removed["reviews"] = res.deleted_count
+            return removed
+
+        removed["users"] = self._done("user", user_ids)
+        return removed
+
+    def purge_batch(self, batch_size: int) -> Counter:
+        return self._purge_games(batch_size) + self._purge_users(batch_size)
+
+    def pending(self) -> dict[str, int]:
+        return {
+            f"{entity}s": self.tombstones.count_documents({"entity": entity})
+            for entity in ("game", "user")
+        }
+
+
+class NeoPurgeStore:
+    """Tombstones are DeletedGame and DeletedUser nodes."""
+
+    name = "neo"
+
+    GAME_REVIEWS = """
+        MATCH (r:Review)-[:FOR_GAME]->(:DeletedGame)
+        WITH r LIMIT $limit
+        DETACH DELETE r
+        RETURN count(r) AS deleted
+    """
+
+    # ids of deleted games may be handed out again before the purge, so only
+    # videos that no live game claims are removed
+    GAME_VIDEOS = """
+        MATCH (g:DeletedGame)
+        MATCH (v:Video {game_id: g.id})
+        WHERE NOT EXISTS { MATCH (:Game {id: g.id}) }
+        WITH DISTINCT v LIMIT $limit
+        DETACH DELETE v
+        RETURN count(v) AS deleted
+    """
+
+    GAMES = """
+        MATCH (g:DeletedGame)
+        WITH g ORDER BY g.deleted_at LIMIT $limit
+        DETACH DELETE g
+        RETURN count(g) AS deleted
+    """
+
+    USER_REVIEWS = """
+        MATCH (:DeletedUser)-[:WROTE]->(r:Review)
+        WITH r LIMIT $limit
+        OPTIONAL MATCH (r)-[:FOR_GAME]->(g:Game)
+        WITH r, g.id AS game_id, r.star_amount AS stars
+        DETACH DELETE r
+        RETURN game_id, stars
+    """
+
+    USERS = """
+        MATCH (u:DeletedUser)
+        WITH u ORDER BY u.deleted_at LIMIT $limit
+        DETACH DELETE u
+        RETURN count(u) AS deleted
+    """
+
+    PENDING = """
+        OPTIONAL MATCH (g:DeletedGame)
+        WITH count(g) AS games
+        OPTIONAL MATCH (u:DeletedUser)
+        RETURN games, count(u) AS users
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @staticmethod
+    def _count(tx, query: str, limit: int) -> int:
+        return tx.run(query, limit=limit).single()["deleted"]
+
+    @classmethod
+    def _purge_games(cls, tx, batch_size: int) -> Counter:
+        # a game node only goes once no review or video is left to point at it
+        removed = Counter()
+        for key, query in (("reviews", cls.GAME_REVIEWS), ("videos", cls.GAME_VIDEOS)):
+            removed[key] = cls._count(tx, query, batch_size)
+            if removed[key]:
+                return removed
+        removed["games"] = cls._count(tx, cls.GAMES, batch_size)
+        return removed
+
+    @classmethod
+    def _purge_users(cls, tx, batch_size: int) -> Counter:
+        removed = Counter()
+        recs = list(tx.run(cls.USER_REVIEWS, limit=batch_size))
+        if recs:
+            deltas = removed_deltas(
+                (rec["game_id"], rec["stars"])
+                for rec in recs
+                if rec["game_id"] is not None
+            )
+            if deltas:
+                tx.run(NEO_UPDATE_QUERY, rows=neo_rows(deltas)).consume()
+            removed["reviews"] = len(recs)
+            return removed
+        removed["users"] = cls._count(tx, cls.USERS, batch_size)
+        return removed
+
+    def purge_batch(self, batch_size: int) -> Counter:
+        with self.driver.session() as session:
+            removed = session.execute_write(self._purge_games, batch_size)
+            return removed + session.execute_write(self._purge_users, batch_size)
+
+    def pending(self) -> dict[str, int]:
+        with self.driver.session() as session:
+            return dict(session.run(self.PENDING).single())
+
+
+def build_store(mode: str):
+    # hybrid writes go to SQL; the outbox carries the purge to the other stores
+    if mode in ("sql", "hybrid"):
+        return SQLPurgeStore()
+    if mode == "mongo":
+        from app.utility.db_mongo import MONGO_DB, get_client
+
+        return MongoPurgeStore(get_client()[MONGO_DB])
+    if mode == "neo":
+        from app.utility.db_neo import get_neo
+
+        return NeoPurgeStore(get_neo())
+    raise ValueError(f"Unknown DB_MODE: {mode}")
+
+
+class Purger:
+    """Runs the active store's purge batch by batch and keeps progress stats."""
+
+    def __init__(self, store=None, batch_size: int = PURGE_BATCH_SIZE):
+        self._store = store
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._stats: dict = {}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = build_store(os.getenv("DB_MODE", "sql").lower())
+        return self._store
+
+    def _record(self, removed: Counter | None = None, **values) -> None:
+        with self._lock:
+            stats = self._stats
+            if not stats:
+                stats.update(
+                    store=self.store.name,
+                    removed=dict.fromkeys(
+                        ("games", "users", "reviews", "videos", "links"), 0
+                    ),
+                    batches=0,
+                    errors=0,
+                    last_error=None,
+                    last_batch_ms=0.0,
+                    pending={"games": 0, "users": 0},
+                )
+            for key, count in (removed or {}).items():
+                stats["removed"][key] += count
+            for key, value in values.items():
+                if key in ("batches", "errors"):
+                    stats[key] += value
+                else:
+                    stats[key] = value
+
+    def run_once(self) -> int:
+        """Purges one batch; returns how many rows it removed."""
+        start = time.perf_counter()
+        try:
+            removed = self.store.purge_batch(self.batch_size)
+        except Exception as exc:
+            logger.exception("purge on %s failed", self.store.name)
+            self._record(errors=1, last_error=repr(exc))
+            return 0
+        self._changed(removed)
+        self._record(
+            removed,
+            batches=1 if removed.total() else 0,
+            last_batch_ms=round((time.perf_counter() - start) * 1000, 1),
+            pending=self.store.pending(),
+        )
+        return removed.total()
+
+    @staticmethod
+    def _changed(removed: Counter) -> None:
+        entities = sorted(
+            {
+                e
+                for key, n in removed.items()
+                if n
+                for e in CHANGED_ENTITIES.get(key, ())
+            }
+        )
+        if entities:
+            # the versions are shared, so ETags of every worker change; the
+            # count cache is this process's, the TTL covers the others
+            entity_versions.bump(*entities)
+            count_cache.invalidate(*entities)
+
+    async def run_forever(self, interval: float = PURGE_INTERVAL) -> None:
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("purge pass failed")
+                removed = 0
+            # keep going while there is work, so a big cascade drains quickly
+            if not removed:
+                await asyncio.sleep(interval)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            if not self._stats:
+                return {}
+            return {**self._stats, "removed": dict(self._stats["removed"])}
+
+
+purger = Purger()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(purger.run_forever())
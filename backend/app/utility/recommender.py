@@ -0,0 +1,375 @@
+"""
+Rebuilds the item-item model behind /me/recommendations from the reviews.
+
+Two games are alike when the same users rated both on the same side of their
+own average: the adjusted cosine of the games' mean-centred rating columns.
+Only pairs rated by at least RECOMMEND_MIN_SUPPORT users and with a positive
+score are kept, RECOMMEND_TOP_K per game. SQL and MongoDB read the ratings
+out and compute the model with SciPy; Neo4j computes it in Cypher on the
+(:User)-[:WROTE]->(:Review)-[:FOR_GAME]->(:Game) graph. Either way the result
+replaces the stored table in one go, and requests only read that table.
+
+Runs inside the API with RECOMMEND_WORKER=true, or on its own for one build:
+
+    uv run python -m app.utility.recommender
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert, select
+
+from app.model.game_model import Game
+from app.model.game_recommendation_model import GameRecommendation
+from app.model.review_model import Review
+from app.model.user_model import User
+
+logger = logging.getLogger(__name__)
+
+# "true" rebuilds the model periodically in the API process
+RECOMMEND_WORKER = os.getenv("RECOMMEND_WORKER", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# seconds between builds
+RECOMMEND_INTERVAL = float(os.getenv("RECOMMEND_INTERVAL", "3600"))
+# similar games kept per game
+RECOMMEND_TOP_K = int(os.getenv("RECOMMEND_TOP_K", "50"))
+# users who must have rated both games of a pair
+RECOMMEND_MIN_SUPPORT = int(os.getenv("RECOMMEND_MIN_SUPPORT", "2"))
+# games whose row of the product is held at once while building
+RECOMMEND_BLOCK_ROWS = int(os.getenv("RECOMMEND_BLOCK_ROWS", "1024"))
+
+# (game id, similar game id, score, support)
+Pair = tuple[int, int, float, int]
+
+
+def item_similarities(
+    ratings: Iterable[tuple[int, int, int]],
+    top_k: int | None = None,
+    min_support: int | None = None,
+) -> list[Pair]:
+    """The top ``top_k`` similar games of every game from (user, game, stars).
+
+    Ratings become a sparse games x users matrix of deviations from each
+    user's mean; C @ C.T then holds the dot products and B @ B.T, over the
+    same matrix of ones, the co-rater counts. Both are computed
+    RECOMMEND_BLOCK_ROWS games at a time, so memory stays bounded.
+    """
+    top_k = top_k or RECOMMEND_TOP_K
+    min_support = min_support or RECOMMEND_MIN_SUPPORT
+    data = np.array(list(ratings), dtype=np.float64).reshape(-1, 3)
+    if not len(data):
+        return []
+
+    user_ids, users = np.unique(data[:, 0], return_inverse=True)
+    game_ids, games = np.unique(data[:, 1].astype(np.int64), return_inverse=True)
+    # a user who reviewed a game twice counts once
+    _, first = np.unique(users * len(game_ids) + games, return_index=True)
+    users, games, stars = users[first], games[first], data[first, 2]
+
+    shape = (len(game_ids), len(user_ids))
+    means = np.bincount(users, weights=stars) / np.bincount(users)
+    centred = sparse.csr_matrix((stars - means[users], (games, users)), shape=shape)
+    rated = sparse.csr_matrix((np.ones(len(games)), (games, users)), shape=shape)
+    norms = np.sqrt(np.asarray(centred.multiply(centred).sum(axis=1)).ravel())
+    centred_t, rated_t = centred.T.tocsr(), rated.T.tocsr()
+
+    pairs: list[Pair] = []
+    for start in range(0, shape[0], RECOMMEND_BLOCK_ROWS):
+        stop = start + RECOMMEND_BLOCK_ROWS
+        dots = (centred[start:stop] @ centred_t).tocoo()
+        keep = dots.data > 0
+        rows, cols = dots.row[keep], dots.col[keep]
+        support = np.asarray((rated[start:stop] @ rated_t)[rows, cols]).ravel()
+        scores = np.round(dots.data[keep] / (norms[rows + start] * norms[cols]), 4)
+        keep = (support >= min_support) & (cols != rows + start)
+        rows, cols, scores, support = (a[keep] for a in (rows, cols, scores, support))
+
+        # best first within each game, the lower id winning a tie
+        order = np.lexsort((game_ids[cols], -scores, rows))
+        rows, cols, scores, support = (a[order] for a in (rows, cols, scores, support))
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        best = rank < top_k
+        pairs.extend(
+            zip(
+                game_ids[rows[best] + start].tolist(),
+                game_ids[cols[best]].tolist(),
+                scores[best].tolist(),
+                support[best].astype(np.int64).tolist(),
+                strict=True,
+            )
+        )
+    return pairs
+
+
+def _session_factory():
+    from app.utility.db_sql import SessionLocal, get_engine
+
+    get_engine()
+    return SessionLocal()
+
+
+class _VectorizedStore:
+    """Reads the ratings out and computes the model in process with SciPy."""
+
+    def ratings(self) -> Iterable[tuple[int, int, int]]:
+        raise NotImplementedError
+
+    def save(self, pairs: list[Pair]) -> None:
+        raise NotImplementedError
+
+    def rebuild(self, top_k: int, min_support: int) -> dict[str, int]:
+        ratings = list(self.ratings())
+        pairs = item_similarities(ratings, top_k, min_support)
+        self.save(pairs)
+        return {
+            "ratings": len(ratings),
+            "games": len({pair[0] for pair in pairs}),
+            "pairs": len(pairs),
+        }
+
+
+class SQLRecommendStore(_VectorizedStore):
+    """Reviews of live games by live users in; game_recommendation out."""
+
+    name = "sql"
+
+    def __init__(self, session_factory=_session_factory, batch_size: int = 5000):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    def ratings(self):
+        stmt = (
+            select(Review.user_id, Review.game_id, Review.star_amount)
+            .join(Game, Game.id == Review.game_id)
+            .join(User, User.id == Review.user_id)
+            .where(Game.deleted_at.is_(None), User.deleted_at.is_(None))
+        )
+        with self.session_factory() as db:
+            yield from db.execute(stmt.execution_options(yield_per=self.batch_size))
+
+    def save(self, pairs):
+        # one transaction, so readers see the old model until the new one is in
+        columns = ("game_id", "similar_game_id", "score", "support")
+        with self.session_factory() as db:
+            try:
+                db.execute(delete(GameRecommendation))
+                for start in range(0, len(pairs), self.batch_size):
+                    batch = pairs[start : start + self.batch_size]
+                    db.execute(
+                        insert(GameRecommendation),
+                        [dict(zip(columns, pair, strict=True)) for pair in batch],
+                    )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+
+class MongoRecommendStore(_VectorizedStore):
+    """Reviews in; one GAME_RECOMMENDATIONS document per game out.
+
+    The documents are written to a side collection that is then renamed over
+    the old one, so readers switch models at once.
+    """
+
+    name = "mongo"
+
+    def __init__(self, db):
+        from app.utility.db_mongo import GAME_RECOMMENDATIONS
+
+        self.db = db
+        self.target = GAME_RECOMMENDATIONS
+        self.reviews = db["reviews"]
+
+    def ratings(self):
+        cursor = self.reviews.find(
+            {}, {"user_id": 1, "user.id": 1, "game_id": 1, "star_amount": 1}
+        )
+        for doc in cursor:
+            # migrated reviews only have the user embedded
+            user_id = doc.get("user_id")
+            if user_id is None:
+                user_id = (doc.get("user") or {}).get("id")
+            if user_id is not None:
+                yield user_id, doc["game_id"], doc["star_amount"]
+
+    def save(self, pairs):
+        similar = defaultdict(list)
+        for game_id, other, score, support in pairs:
+            similar[game_id].append({"id": other, "score": score, "support": support})
+        if not similar:
+            self.db[self.target].delete_many({})
+            return
+        building = self.db[f"{self.target}_build"]
+        building.drop()
+        building.insert_many(
+            {"_id": game_id, "similar": games} for game_id, games in similar.items()
+        )
+        building.rename(self.target, dropTarget=True)
+
+
+class NeoRecommendStore:
+    """Computes the model in Cypher as ALSO_LIKED relationships between games.
+
+    Each review keeps its deviation from its author's mean, and each game the
+    norm of its deviations, so the pair query is a sum over co-raters.
+    """
+
+    name = "neo"
+
+    DEVIATIONS = """
+        MATCH (u:User)-[:WROTE]->(r:Review)-[:FOR_GAME]->(:Game)
+        WITH u, collect(r) AS reviews, avg(toFloat(r.star_amount)) AS mean
+        UNWIND reviews AS r
+        SET r.deviation = r.star_amount - mean
+        RETURN count(r) AS ratings
+    """
+
+    NORMS = """
+        MATCH (r:Review)-[:FOR_GAME]->(g:Game)
+        WITH g, sqrt(sum(r.deviation * r.deviation)) AS norm
+        SET g.rating_norm = norm
+    """
+
+    CLEAR = "MATCH (:Game)-[s:ALSO_LIKED]->(:Game) DELETE s"
+
+    SIMILAR = """
+        MATCH (g:Game)<-[:FOR_GAME]-(r:Review)<-[:WROTE]-(u:User),
+              (u)-[:WROTE]->(o:Review)-[:FOR_GAME]->(other:Game)
+        WHERE other <> g AND g.rating_norm > 0 AND other.rating_norm > 0
+        WITH g, other,
+             sum(r.deviation * o.deviation) AS dot,
+             count(DISTINCT u) AS support
+        WHERE dot > 0 AND support >= $min_support
+        WITH g, other, support,
+             round(dot / (g.rating_norm * other.rating_norm), 4) AS score
+        ORDER BY score DESC, other.id
+        WITH g, collect({game: other, score: score, support: support})[..$top_k] AS top
+        UNWIND top AS t
+        WITH g, t.game AS other, t.score AS score, t.support AS support
+        CREATE (g)-[:ALSO_LIKED {score: score, support: support}]->(other)
+        RETURN count(DISTINCT g) AS games, count(*) AS pairs
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @classmethod
+    def _rebuild(cls, tx, top_k: int, min_support: int) -> dict[str, int]:
+        ratings = tx.run(cls.DEVIATIONS).single()["ratings"]
+        tx.run(cls.NORMS).consume()
+        tx.run(cls.CLEAR).consume()
+        rec = tx.run(cls.SIMILAR, top_k=top_k, min_support=min_support).single()
+        return {"ratings": ratings, "games": rec["games"], "pairs": rec["pairs"]}
+
+    def rebuild(self, top_k: int, min_support: int) -> dict[str, int]:
+        # one transaction, so readers see the old relationships until commit
+        with self.driver.session() as session:
+            return session.execute_write(self._rebuild, top_k, min_support)
+
+
+def build_store(mode: str):
+    # hybrid reads and writes reviews in SQL, so the model is built there
+    if mode in ("sql", "hybrid"):
+        return SQLRecommendStore()
+    if mode == "mongo":
+        from app.utility.db_mongo import MONGO_DB, get_client
+
+        return MongoRecommendStore(get_client()[MONGO_DB])
+    if mode == "neo":
+        from app.utility.db_neo import get_neo
+
+        return NeoRecommendStore(get_neo())
+    raise ValueError(f"Unknown DB_MODE: {mode}")
+
+
+class Recommender:
+    """Rebuilds the active store's model and keeps build stats."""
+
+    def __init__(
+        self,
+        store=None,
+        top_k: int = RECOMMEND_TOP_K,
+        min_support: int = RECOMMEND_MIN_SUPPORT,
+    ):
+        self._store = store
+        self.top_k = top_k
+        self.min_support = min_support
+        self._lock = threading.Lock()
+        self._stats: dict = {}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = build_store(os.getenv("DB_MODE", "sql").lower())
+        return self._store
+
+    def _record(self, **values) -> None:
+        with self._lock:
+            stats = self._stats
+            if not stats:
+                stats.update(
+                    store=self.store.name,
+                    ratings=0,
+                    games=0,
+                    pairs=0,
+                    builds=0,
+                    errors=0,
+                    last_error=None,
+                    last_build_ms=0.0,
+                    built_at=None,
+                )
+            for key, value in values.items():
+                if key in ("builds", "errors"):
+                    stats[key] += value
+                else:
+                    stats[key] = value
+
+    def run_once(self) -> bool:
+        """Rebuilds the model; returns whether the build went through."""
+        start = time.perf_counter()
+        try:
+            built = self.store.rebuild(self.top_k, self.min_support)
+        except Exception as exc:
+            logger.exception("recommendation build on %s failed", self.store.name)
+            self._record(errors=1, last_error=repr(exc))
+            return False
+        self._record(
+            builds=1,
+            last_build_ms=round((time.perf_counter() - start) * 1000, 1),
+            built_at=datetime.now(UTC).isoformat(),
+            **built,
+        )
+        logger.info("recommendations rebuilt: %s", built)
+        return True
+
+    async def run_forever(self, interval: float = RECOMMEND_INTERVAL) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("recommendation build failed")
+            await asyncio.sleep(interval)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+recommender = Recommender()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    raise SystemExit(0 if recommender.run_once() else 1)
@@ -0,0 +1,24 @@
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON encoded in one pass by pydantic-core.
+
+    Read models are written by their compiled serializers and everything else
+    (dicts, lists, dates) natively, so an endpoint that returns this skips
+    FastAPI's second validation and serialization against response_model.
+    Only hand it data that already went through the read models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def fast_json(content: Any, response: Response | None = None) -> FastJSONResponse:
+    """FastJSONResponse carrying the headers dependencies set on ``response``
+    (such as the ETag), which FastAPI only merges into responses it builds."""
+    return FastJSONResponse(content, headers=response.headers if response else None)
@@ -0,0 +1,237 @@
+import logging
+import os
+from collections import Counter
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from app.schema.review_schema import STARS
+
+logger = logging.getLogger(__name__)
+
+
+class AggregateDelta(NamedTuple):
+    """What one review write changes on its game: count, star sum, histogram."""
+
+    count: int
+    total: int
+    stars: dict[int, int]
+
+
+def review_deltas(
+    removed: tuple[int, int] | None, added: tuple[int, int] | None
+) -> dict[int, AggregateDelta]:
+    """Per-game deltas for a review going from ``removed`` to ``added``.
+
+    Both are ``(game_id, star_amount)``, None for a create or a delete. An
+    update that keeps the game and the stars changes nothing.
+    """
+    deltas: dict[int, AggregateDelta] = {}
+    for review, sign in ((removed, -1), (added, 1)):
+        if review is None:
+            continue
+        game_id, stars = int(review[0]), int(review[1])
+        count, total, histogram = deltas.get(game_id, (0, 0, {}))
+        histogram = {**histogram, stars: histogram.get(stars, 0) + sign}
+        deltas[game_id] = AggregateDelta(count + sign, total + sign * stars, histogram)
+
+    return {
+        game_id: AggregateDelta(
+            d.count, d.total, {s: n for s, n in d.stars.items() if n}
+        )
+        for game_id, d in deltas.items()
+        if d.count or d.total or any(d.stars.values())
+    }
+
+
+def created_deltas(added: Iterable[tuple[int, int]]) -> dict[int, AggregateDelta]:
+    """Per-game deltas for a batch of new reviews, so each game is updated once."""
+    counts: dict[int, Counter] = {}
+    for game_id, stars in added:
+        counts.setdefault(int(game_id), Counter())[int(stars)] += 1
+    return {
+        game_id: AggregateDelta(c.total(), sum(s * n for s, n in c.items()), dict(c))
+        for game_id, c in counts.items()
+    }
+
+
+def removed_deltas(removed: Iterable[tuple[int, int]]) -> dict[int, AggregateDelta]:
+    """created_deltas for a batch of deleted reviews."""
+    return {
+        game_id: AggregateDelta(-d.count, -d.total, {s: -n for s, n in d.stars.items()})
+        for game_id, d in created_deltas(removed).items()
+    }
+
+
+def mongo_update(delta: AggregateDelta) -> list[dict]:
+    """Pipeline update for a game document; the second stage sees the first."""
+    inc = {
+        "review_count": {"$add": [{"$ifNull": ["$review_count", 0]}, delta.count]},
+        "rating_sum": {"$add": [{"$ifNull": ["$rating_sum", 0]}, delta.total]},
+    }
+    for stars, n in delta.stars.items():
+        path = f"star_histogram.{stars}"
+        inc[path] = {"$add": [{"$ifNull": [f"${path}", 0]}, n]}
+
+    rating = {
+        "$cond": [
+            {"$gt": ["$review_count", 0]},
+            {"$divide": ["$rating_sum", "$review_count"]},
+            None,
+        ]
+    }
+    return [{"$set": inc}, {"$set": {"user_rating": rating}}]
+
+
+# Neo4j properties cannot hold maps, so the histogram is one property per star
+NEO_STAR_PROPS = tuple(f"stars_{s}" for s in STARS)
+
+NEO_UPDATE_QUERY = (
+    """
+    UNWIND $rows AS row
+    MATCH (g:Game {id: row.game_id})
+    SET g.review_count = coalesce(g.review_count, 0) + row.count,
+        g.rating_sum = coalesce(g.rating_sum, 0) + row.total,
+    """
+    + ",\n".join(
+        f"        g.{p} = coalesce(g.{p}, 0) + coalesce(row.stars.{p}, 0)"
+        for p in NEO_STAR_PROPS
+    )
+    + """
+    WITH g
+    SET g.user_rating = CASE WHEN g.review_count > 0
+        THEN toFloat(g.rating_sum) / g.review_count END
+    """
+)
+
+
+def neo_rows(deltas: dict[int, AggregateDelta]) -> list[dict]:
+    return [
+        {
+            "game_id": game_id,
+            "count": d.count,
+            "total": d.total,
+            "stars": {f"stars_{s}": n for s, n in d.stars.items()},
+        }
+        for game_id, d in deltas.items()
+    ]
+
+
+def neo_histogram(node: dict) -> dict[int, int]:
+    return {s: node.get(f"stars_{s}") or 0 for s in STARS}
+
+
+def backfill_sql(session) -> int:
+    """Recomputes every game's aggregates from its reviews."""
+    from sqlalchemy import func, select, update
+
+    from app.model.game_model import Game
+    from app.model.review_model import Review
+
+    counts: dict[int, dict[int, int]] = {}
+    rows = session.execute(
+        select(Review.game_id, Review.star_amount, func.count()).group_by(
+            Review.game_id, Review.star_amount
+        )
+    )
+    for game_id, stars, n in rows:
+        counts.setdefault(game_id, {})[int(stars)] = n
+
+    session.execute(
+        update(Game).values(
+            review_count=0, rating_sum=0, star_histogram=None, user_rating=None
+        )
+    )
+    for game_id, stars in counts.items():
+        count, total = sum(stars.values()), sum(s * n for s, n in stars.items())
+        session.execute(
+            update(Game)
+            .where(Game.id == game_id)
+            .values(
+                review_count=count,
+                rating_sum=total,
+                star_histogram={str(s): n for s, n in stars.items()},
+                user_rating=total / count,
+            )
+        )
+    session.commit()
+    return len(counts)
+
+
+def backfill_mongo(db) -> int:
+    pipeline = [
+        {"$group": {"_id": {"g": "$game_id", "s": "$star_amount"}, "n": {"$sum": 1}}}
+    ]
+    counts: dict[int, dict[int, int]] = {}
+    for row in db["reviews"].aggregate(pipeline):
+        counts.setdefault(row["_id"]["g"], {})[int(row["_id"]["s"])] = row["n"]
+
+    db["games"].update_many(
+        {},
+        {
+            "$set": {"review_count": 0, "rating_sum": 0, "star_histogram": {}},
+            "$unset": {"user_rating": ""},
+        },
+    )
+    for game_id, stars in counts.items():
+        count, total = sum(stars.values()), sum(s * n for s, n in stars.items())
+        db["games"].update_one(
+            {"_id": game_id},
+            {
+                "$set": {
+                    "review_count": count,
+                    "rating_sum": total,
+                    "star_histogram": {str(s): n for s, n in stars.items()},
+                    "user_rating": total / count,
+                }
+            },
+        )
+    return len(counts)
+
+
+NEO_BACKFILL_QUERY = (
+    """
+    MATCH (g:Game)
+    OPTIONAL MATCH (r:Review)-[:FOR_GAME]-(g)
+    WITH g, collect(r.star_amount) AS stars
+    WITH g, stars, reduce(t = 0, x IN stars | t + x) AS total
+    SET g.review_count = size(stars),
+        g.rating_sum = total,
+        g.user_rating = CASE WHEN size(stars) > 0
+            THEN toFloat(total) / size(stars) END,
+    """
+    + ",\n".join(
+        f"        g.stars_{s} = size([x IN stars WHERE x = {s}])" for s in STARS
+    )
+    + """
+    RETURN count(g) AS games
+    """
+)
+
+
+def backfill_neo(driver) -> int:
+    with driver.session() as session:
+        rec = session.run(NEO_BACKFILL_QUERY).single()
+        return rec["games"] if rec else 0
+
+
+def backfill(mode: str) -> int:
+    """Fills the aggregates of one store, for data written before they existed."""
+    if mode == "mongo":
+        from app.utility.db_mongo import get_db
+
+        return backfill_mongo(get_db())
+    if mode == "neo":
+        from app.utility.db_neo import get_neo
+
+        return backfill_neo(get_neo())
+
+    from app.utility.db_sql import SessionLocal
+
+    with SessionLocal() as session:
+        return backfill_sql(session)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    for store in os.getenv("AGGREGATE_BACKFILL", "sql,mongo,neo").split(","):
+        logger.info("%s: %d games backfilled", store, backfill(store.strip()))
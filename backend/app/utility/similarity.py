@@ -0,0 +1,236 @@
+import math
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+
+import numpy as np
+from scipy import sparse
+
+from app.schema.game_schema import SIMILAR_TOP_K
+
+# how much one shared link of each kind counts towards similarity
+FEATURE_WEIGHTS = {"mechanics": 1.0, "genres": 1.0, "designers": 0.6, "artists": 0.3}
+# rows of X @ X.T held at once while building; a genre most games share makes
+# the product close to dense, so this bounds the memory of a build
+SIMILAR_BLOCK_ROWS = int(os.getenv("SIMILAR_BLOCK_ROWS", "512"))
+
+Feature = tuple[str, int]
+
+
+def _idf(games: int, frequency: int) -> float:
+    # smoothed, so a link every game has still counts a little
+    return math.log((1 + games) / (1 + frequency)) + 1
+
+
+def _normalized(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix)
+
+
+class NeighbourIndex:
+    """The most similar games of every game, by cosine over shared links.
+
+    A game is a sparse row over its mechanics, genres, designers and artists,
+    each weighted by FEATURE_WEIGHTS and by inverse frequency, so a rare
+    mechanic says more than one half the catalogue has. Rows are L2
+    normalised, so X @ X.T holds the cosines; the top K of each row are kept,
+    computed SIMILAR_BLOCK_ROWS rows at a time.
+
+    Changing one game's links costs one sparse row product: its own list is
+    recomputed, lists it now beats the last entry of are patched, and lists it
+    was on are recomputed. Weights stay those of the build, and replaced rows
+    are only zeroed, until the next build.
+    """
+
+    def __init__(self, links: Iterable[tuple[int, str, int]] = (), top_k=None):
+        self._lock = threading.Lock()
+        self.top_k = top_k or SIMILAR_TOP_K
+        # game id -> its links
+        self._features: dict[int, set[Feature]] = defaultdict(set)
+        for game_id, kind, feature_id in links:
+            if kind in FEATURE_WEIGHTS and feature_id is not None:
+                self._features[int(game_id)].add((kind, int(feature_id)))
+        self._features = dict(self._features)
+
+        # link -> column of the matrix
+        self._columns: dict[Feature, int] = {}
+        frequency: dict[Feature, int] = defaultdict(int)
+        for features in self._features.values():
+            for feature in features:
+                self._columns.setdefault(feature, len(self._columns))
+                frequency[feature] += 1
+        self._games = len(self._features)
+        self._weights = np.array(
+            [
+                FEATURE_WEIGHTS[f[0]] * _idf(self._games, frequency[f])
+                for f in self._columns
+            ]
+        )
+
+        # matrix row -> game id; -1 marks a row whose game was updated or removed
+        self._ids = np.fromiter(self._features, dtype=np.int64, count=self._games)
+        self._rows = {int(game_id): row for row, game_id in enumerate(self._ids)}
+        rows, cols = [], []
+        for row, game_id in enumerate(self._ids):
+            for feature in self._features[int(game_id)]:
+                rows.append(row)
+                cols.append(self._columns[feature])
+        self._matrix = _normalized(
+            sparse.csr_matrix(
+                (self._weights[cols], (rows, cols)),
+                shape=(self._games, len(self._columns)),
+            )
+        )
+
+        # game id -> [(other id, cosine)], best first
+        self._neighbours: dict[int, list[tuple[int, float]]] = {}
+        # game id -> games whose lists hold it
+        self._listed_by: dict[int, set[int]] = defaultdict(set)
+        transposed = self._matrix.T.tocsr()
+        for start in range(0, self._games, SIMILAR_BLOCK_ROWS):
+            block = (
+                self._matrix[start : start + SIMILAR_BLOCK_ROWS] @ transposed
+            ).tocsr()
+            for offset in range(block.shape[0]):
+                lo, hi = block.indptr[offset], block.indptr[offset + 1]
+                game_id = int(self._ids[start + offset])
+                top = self._top(block.indices[lo:hi], block.data[lo:hi], game_id)
+                self._set_neighbours(game_id, top)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _top(self, rows: np.ndarray, scores: np.ndarray, game_id: int):
+        ids = self._ids[rows]
+        keep = (scores > 0) & (ids != game_id) & (ids >= 0)
+        ids, scores = ids[keep], np.round(scores[keep], 4)
+        if len(ids) > self.top_k:
+            # everything tied with the K-th best stays, so the lower id wins
+            kth = np.partition(scores, len(scores) - self.top_k)[-self.top_k]
+            best = scores >= kth
+            ids, scores = ids[best], scores[best]
+        order = np.lexsort((ids, -scores))[: self.top_k]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def _set_neighbours(self, game_id: int, top: list[tuple[int, float]]) -> None:
+        for other, _ in self._neighbours.get(game_id, ()):
+            self._listed_by[other].discard(game_id)
+        if top:
+            self._neighbours[game_id] = top
+        else:
+            self._neighbours.pop(game_id, None)
+        for other, _ in top:
+            self._listed_by[other].add(game_id)
+
+    def _vector(self, features: set[Feature]) -> sparse.csr_matrix:
+        for feature in features:
+            if feature not in self._columns:
+                # a link no game had at build time
+                self._columns[feature] = len(self._columns)
+                weight = FEATURE_WEIGHTS[feature[0]] * _idf(self._games, 1)
+                self._weights = np.append(self._weights, weight)
+        width = len(self._columns)
+        if self._matrix.shape[1] < width:
+            self._matrix.resize((self._matrix.shape[0], width))
+        cols = sorted(self._columns[f] for f in features)
+        vector = sparse.csr_matrix(
+            (self._weights[cols], ([0] * len(cols), cols)), shape=(1, width)
+        )
+        return _normalized(vector)
+
+    def _clear_row(self, game_id: int) -> None:
+        row = self._rows.pop(game_id, None)
+        if row is None:
+            return
+        lo, hi = self._matrix.indptr[row], self._matrix.indptr[row + 1]
+        self._matrix.data[lo:hi] = 0
+        self._ids[row] = -1
+
+    def _offer(self, game_id: int, candidate: int, score: float) -> None:
+        top = self._neighbours.get(game_id, [])
+        if len(top) >= self.top_k and (-score, candidate) > (-top[-1][1], top[-1][0]):
+            return
+        top = sorted([*top, (candidate, score)], key=lambda n: (-n[1], n[0]))
+        self._set_neighbours(game_id, top[: self.top_k])
+
+    def _update(self, game_id: int, features: set[Feature]) -> None:
+        self._clear_row(game_id)
+        self._set_neighbours(game_id, [])
+        # lists that held the game may now have room for another one
+        stale = self._listed_by.pop(game_id, set())
+        self._features.pop(game_id, None)
+
+        if features:
+            self._features[game_id] = features
+            vector = self._vector(features)
+            self._matrix = sparse.vstack([self._matrix, vector], format="csr")
+            self._ids = np.append(self._ids, game_id)
+            self._rows[game_id] = len(self._ids) - 1
+            product = (self._matrix @ vector.T).tocoo()
+            self._set_neighbours(game_id, self._top(product.row, product.data, game_id))
+            for row, score in zip(product.row, product.data, strict=True):
+                other = int(self._ids[row])
+                if score > 0 and other not in (game_id, -1) and other not in stale:
+                    self._offer(other, game_id, round(float(score), 4))
+
+        for other in stale:
+            row = self._rows.get(other)
+            if row is not None:
+                product = (self._matrix @ self._matrix[row].T).tocoo()
+                self._set_neighbours(other, self._top(product.row, product.data, other))
+
+    def update(self, game_id: int, features: Iterable[Feature]) -> None:
+        features = {(kind, int(i)) for kind, i in features if kind in FEATURE_WEIGHTS}
+        with self._lock:
+            self._update(int(game_id), features)
+
+    def remove_feature(self, feature: Feature) -> None:
+        with self._lock:
+            column = self._columns.get(feature)
+            if column is None:
+                return
+            rows = self._matrix[:, column].nonzero()[0]
+            for game_id in [int(self._ids[row]) for row in rows]:
+                self._update(game_id, self._features[game_id] - {feature})
+
+    def neighbours(self, game_id: int, limit: int) -> list[tuple[int, float]]:
+        with self._lock:
+            return self._neighbours.get(game_id, [])[:limit]
+
+
+class SimilarGames:
+    """A NeighbourIndex built at startup and kept current by the services."""
+
+    def __init__(self):
+        self._index = NeighbourIndex()
+        self.ready = False
+
+    def load(self, links: Iterable[tuple[int, str, int]]) -> None:
+        # build aside and swap, so lookups keep working during a rebuild
+        self._index = NeighbourIndex(links)
+
+    def update(self, game_id, features: Iterable[Feature]) -> None:
+        """Replace a game's links; no links takes it out of the index."""
+        self._index.update(game_id, features)
+
+    def remove(self, game_id) -> None:
+        self._index.update(game_id, ())
+
+    def remove_feature(self, kind: str, feature_id) -> None:
+        """Drop a deleted mechanic, genre, designer or artist from every game."""
+        self._index.remove_feature((kind, int(feature_id)))
+
+    def neighbours(self, game_id, limit: int) -> list[tuple[int, float]]:
+        return self._index.neighbours(int(game_id), limit)
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "games": len(self._index),
+            "top_k": self._index.top_k,
+        }
+
+
+similar_games = SimilarGames()
@@ -0,0 +1,213 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# "true" profiles every request and answers with a Server-Timing header
+SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+# a SELECT repeated this often within one request is reported as N+1
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+# slow statements also go to this file, rotated at SQL_SLOW_LOG_BYTES
+SQL_SLOW_LOG = os.getenv("SQL_SLOW_LOG")
+SQL_SLOW_LOG_BYTES = int(os.getenv("SQL_SLOW_LOG_BYTES", str(10 * 1024 * 1024)))
+SQL_SLOW_LOG_BACKUPS = int(os.getenv("SQL_SLOW_LOG_BACKUPS", "5"))
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger(f"{__name__}.slow")
+
+if SQL_SLOW_LOG:
+    _handler = RotatingFileHandler(
+        SQL_SLOW_LOG, maxBytes=SQL_SLOW_LOG_BYTES, backupCount=SQL_SLOW_LOG_BACKUPS
+    )
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_logger.addHandler(_handler)
+    slow_logger.setLevel(logging.WARNING)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\(\?\.\.\.\)|\(\?\))(?:\s*,\s*(?:\(\?\.\.\.\)|\(\?\)))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """The statement with literals, parameters and IN lists collapsed to ``?``.
+
+    Two calls that differ only in their values share a fingerprint, which is
+    what the N+1 check and the per-request counts group by.
+    """
+    text = _STRING.sub("?", statement)
+    text = _NUMBER.sub("?", text)
+    text = _PARAM.sub("?", text)
+    text = _LIST.sub("(?...)", text)
+    text = _ROWS.sub(r"\1...", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+class QueryProfile:
+    """Statements run while the profile was active, grouped by fingerprint."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self._lock = threading.Lock()
+        # fingerprint -> [executions, seconds]
+        self.statements: dict[str, list] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self.statements.get(key)
+            if entry is None:
+                self.statements[key] = [1, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return sum(n for n, _ in self.statements.values())
+
+    @property
+    def seconds(self) -> float:
+        with self._lock:
+            return sum(s for _, s in self.statements.values())
+
+    def n_plus_one(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """SELECTs repeated at least ``threshold`` times, most repeated first."""
+        with self._lock:
+            repeated = {
+                key: n
+                for key, (n, _) in self.statements.items()
+                if n >= threshold and key[:6].upper() == "SELECT"
+            }
+        return dict(sorted(repeated.items(), key=lambda item: -item[1]))
+
+    def report(self) -> str:
+        with self._lock:
+            rows = sorted(self.statements.items(), key=lambda item: -item[1][0])
+        return "\n".join(f"{n:4d}x {s * 1000:8.2f}ms  {key}" for key, (n, s) in rows)
+
+
+_current: ContextVar[QueryProfile | None] = ContextVar("sql_profile", default=None)
+# profiles opened by capture_queries, which see statements from every thread
+_captures: list[QueryProfile] = []
+_captures_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, *_):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, *_):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+    profile = _current.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    if _captures:
+        with _captures_lock:
+            captures = list(_captures)
+        for capture in captures:
+            capture.record(statement, elapsed)
+
+    if elapsed * 1000 >= SQL_SLOW_QUERY_MS:
+        slow_logger.warning(
+            "%.1fms %s [%s]",
+            elapsed * 1000,
+            fingerprint(statement),
+            profile.label if profile else "-",
+        )
+
+
+def _handle_error(context):
+    # the statement failed, so after_cursor_execute will not pop its start
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def install_profiler() -> None:
+    """Listens on every Engine, including the ones behind async engines."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryProfile]:
+    """Profiles every statement any thread runs until the block exits.
+
+    For tests: TestClient serves requests on another thread, which a
+    context-local profile would not see.
+    """
+    profile = QueryProfile("capture")
+    with _captures_lock:
+        _captures.append(profile)
+    try:
+        yield profile
+    finally:
+        with _captures_lock:
+            _captures.remove(profile)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryProfile]:
+    """Fails when the block runs more than ``limit`` statements."""
+    with capture_queries() as profile:
+        yield profile
+    if profile.count > limit:
+        raise AssertionError(
+            f"{profile.count} queries, expected at most {limit}:\n{profile.report()}"
+        )
+
+
+class SQLProfilerMiddleware:
+    """Per-request query profile when SQL_PROFILE is on.
+
+    Adds ``Server-Timing: db;dur=<ms>;desc="<n> queries"`` to the response
+    and logs a warning naming the route when a SELECT looks like N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_PROFILE:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(f"{scope['method']} {scope['path']}")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={profile.seconds * 1000:.1f};desc="{profile.count} queries"'
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode("latin-1")),
+                ]
+            await send(message)
+
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for key, n in profile.n_plus_one().items():
+                logger.warning(
+                    "possible N+1 on %s %s: %dx %s", scope["method"], route, n, key
+                )
@@ -0,0 +1,94 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# connections opened per pool before the app reports ready
+WARM_CONNECTIONS = int(os.getenv("WARM_CONNECTIONS", "2"))
+
+
+class StartupReport:
+    """How long each startup phase took and whether warm-up succeeded."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.ready = False
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = round(seconds * 1000, 1)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        return {"ready": self.ready, "phases_ms": self.phases, "errors": self.errors}
+
+
+startup_report = StartupReport()
+
+
+def _hybrid_backends() -> list[str]:
+    from app.repository.hybrid_repository import HYBRID_ROUTES
+
+    # SQL takes every write, the others only the reads routed to them
+    return ["sql", *sorted(set(HYBRID_ROUTES.values()) - {"sql"})]
+
+
+def warm_up(mode: str) -> None:
+    """Builds the active backend's client and opens its first connections,
+    so the first requests after readiness do not pay for the handshake."""
+    if mode == "hybrid":
+        for backend in _hybrid_backends():
+            warm_up(backend)
+    elif mode == "sql":
+        from app.utility.db_sql import get_engine
+
+        engine = get_engine()
+        connections = [engine.connect() for _ in range(WARM_CONNECTIONS)]
+        try:
+            connections[0].execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+    elif mode == "mongo":
+        from app.utility.db_mongo import get_client
+
+        get_client().admin.command("ping")
+    elif mode == "neo":
+        from app.utility.db_neo import get_neo
+
+        get_neo().verify_connectivity()
+    else:
+        raise ValueError(f"Unknown DB_MODE: {mode}")
+
+
+async def warm_up_async(mode: str) -> None:
+    """warm_up for the async clients that DB_ASYNC=true serves from."""
+    if mode == "hybrid":
+        for backend in _hybrid_backends():
+            await warm_up_async(backend)
+    elif mode == "sql":
+        from app.utility.db_sql_async import get_async_engine
+
+        async with get_async_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    elif mode == "mongo":
+        from app.utility.db_mongo import get_async_client
+
+        await get_async_client().admin.command("ping")
+    elif mode == "neo":
+        from app.utility.db_neo import get_async_neo
+
+        await get_async_neo().verify_connectivity()
+    else:
+        raise ValueError(f"Unknown DB_MODE: {mode}")
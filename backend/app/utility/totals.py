@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+
+TOTALS_CACHE_TTL = float(os.getenv("TOTALS_CACHE_TTL", "60"))
+
+
+class TotalMode(StrEnum):
+    """How a list endpoint reports its total, chosen with ?count=."""
+
+    exact = "exact"
+    cached = "cached"
+    estimate = "estimate"
+    none = "none"
+
+
+class CountCache:
+    """Exact list totals per (entity, filter), dropped when the entity is written.
+
+    The TTL bounds staleness from writers outside this process.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[int, float]] = {}
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, entity: str) -> int:
+        with self._lock:
+            return self._generations.get(entity, 0)
+
+    def get(self, key: tuple) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def set(self, key: tuple, value: int, generation: int) -> None:
+        with self._lock:
+            # a write landed while counting, so the value may already be stale
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def invalidate(self, *entities: str) -> None:
+        with self._lock:
+            for entity in entities:
+                self._generations[entity] = self._generations.get(entity, 0) + 1
+            self._entries = {
+                k: v for k, v in self._entries.items() if k[0] not in entities
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+count_cache = CountCache(TOTALS_CACHE_TTL)
+
+
+class TotalCount:
+    """Resolves the total of one list call according to its TotalMode.
+
+    Repositories supply an exact counter and, where the store keeps one, a
+    cheap estimate (table statistics, collection metadata). Filtered lists
+    have no estimate and fall back to the cached exact count.
+    """
+
+    def __init__(
+        self, mode: TotalMode = TotalMode.exact, entity: str = "", key: tuple = ()
+    ):
+        self.mode = mode
+        self.entity = entity
+        self.key = key
+
+    def resolve(
+        self,
+        exact: Callable[[], int],
+        estimate: Callable[[], int | None] | None = None,
+    ) -> int | None:
+        if self.mode == TotalMode.none:
+            return None
+        if self.mode == TotalMode.estimate and estimate is not None:
+            value = estimate()
+            if value is not None:
+                return value
+        if self.mode == TotalMode.exact:
+            return exact()
+
+        cache_key = (self.entity, self.key)
+        value = count_cache.get(cache_key)
+        if value is None:
+            generation = count_cache.generation(self.entity)
+            value = exact()
+            count_cache.set(cache_key, value, generation)
+        return value
+
+    async def aresolve(
+        self,
+        exact: Callable[[], Awaitable[int]],
+        estimate: Callable[[], Awaitable[int | None]] | None = None,
+    ) -> int | None:
+        if self.mode == TotalMode.none:
+            return None
+        if self.mode == TotalMode.estimate and estimate is not None:
+            value = await estimate()
+            if value is not None:
+                return value
+        if self.mode == TotalMode.exact:
+            return await exact()
+
+        cache_key = (self.entity, self.key)
+        value = count_cache.get(cache_key)
+        if value is None:
+            generation = count_cache.generation(self.entity)
+            value = await exact()
+            count_cache.set(cache_key, value, generation)
+        return value
+
+
+EXACT_TOTAL = TotalCount()
@@ -0,0 +1,177 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+WEATHER_BASE_URL = os.getenv(
+    "WEATHER_BASE_URL", "https://api.open-meteo.com/v1/forecast"
+)
+# forecasts are served from cache for this long, then refreshed
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+# past the TTL, entries this young are still served if the provider is slow or down
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "21600"))
+# how long a request with a stale entry waits for the refresh before using it
+WEATHER_STALE_AFTER = float(os.getenv("WEATHER_STALE_AFTER", "1.0"))
+WEATHER_TIMEOUT = float(os.getenv("WEATHER_TIMEOUT", "5"))
+WEATHER_MAX_CONNECTIONS = int(os.getenv("WEATHER_MAX_CONNECTIONS", "20"))
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "5000"))
+# 2 decimals is a ~1 km grid, finer than the provider's own
+WEATHER_GRID_DECIMALS = int(os.getenv("WEATHER_GRID_DECIMALS", "2"))
+
+
+class WeatherUnavailable(Exception):
+    pass
+
+
+class WeatherClient:
+    """Open-Meteo forecasts over one keep-alive async client.
+
+    Coordinates are rounded to a grid and each cell is cached for ``ttl``.
+    Concurrent requests for a cell share one upstream call, and once an entry
+    has expired it is still served (up to ``stale_ttl``) whenever the refresh
+    takes longer than ``stale_after`` or fails; the refresh then finishes in
+    the background. Everything runs on the event loop, so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        base_url: str = WEATHER_BASE_URL,
+        ttl: float = WEATHER_CACHE_TTL,
+        stale_ttl: float = WEATHER_STALE_TTL,
+        stale_after: float = WEATHER_STALE_AFTER,
+        timeout: float = WEATHER_TIMEOUT,
+        max_connections: int = WEATHER_MAX_CONNECTIONS,
+        max_entries: int = WEATHER_CACHE_SIZE,
+        decimals: int = WEATHER_GRID_DECIMALS,
+    ):
+        self.base_url = base_url
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stale_after = stale_after
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_entries = max_entries
+        self.decimals = decimals
+        self._client: httpx.AsyncClient | None = None
+        self._entries: OrderedDict[tuple[float, float], tuple[Any, float]] = (
+            OrderedDict()
+        )
+        self._inflight: dict[tuple[float, float], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+
+    def _key(self, latitude: float, longitude: float) -> tuple[float, float]:
+        return round(latitude, self.decimals), round(longitude, self.decimals)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # created on first use so it binds to the loop that serves requests
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def _fetch(self, key: tuple[float, float]) -> Any:
+        self.upstream_calls += 1
+        params = {"latitude": key[0], "longitude": key[1], "hourly": "temperature_2m"}
+        try:
+            r = await self._get_client().get(self.base_url, params=params)
+        except httpx.HTTPError as exc:
+            raise WeatherUnavailable(
+                f"Failed to contact weather provider (open-meteo): {exc}"
+            ) from exc
+
+        if r.status_code != 200:
+            raise WeatherUnavailable("Weather provider (open-meteo) returned an error")
+
+        data = r.json()
+        self._entries[key] = (data, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return data
+
+    def _refresh(self, key: tuple[float, float]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        def done(t: asyncio.Task) -> None:
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+            # also marks the error as retrieved when nobody awaited it
+            if not t.cancelled() and t.exception() is not None:
+                self.upstream_errors += 1
+
+        task = asyncio.create_task(self._fetch(key))
+        task.add_done_callback(done)
+        self._inflight[key] = task
+        return task
+
+    async def get(self, latitude: float, longitude: float) -> Any:
+        key = self._key(latitude, longitude)
+        entry = self._entries.get(key)
+        age = time.monotonic() - entry[1] if entry else None
+
+        if entry and age < self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        # shielded, so a client that disconnects does not cancel the shared call
+        task = asyncio.shield(self._refresh(key))
+        if not entry or age >= self.stale_ttl:
+            return await task
+
+        try:
+            return await asyncio.wait_for(task, self.stale_after)
+        except (TimeoutError, WeatherUnavailable):
+            self.stale_served += 1
+            return entry[0]
+
+    async def aclose(self) -> None:
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+weather_client = WeatherClient()
@@ -0,0 +1,116 @@
+"""
+Compare the sync (threadpool) and async data paths under concurrent load.
+
+Start the API twice against the same database, once per mode:
+
+    DB_ASYNC=false uv run uvicorn app.main:app --port 8000
+    DB_ASYNC=true  uv run uvicorn app.main:app --port 8001
+
+then point this script at both:
+
+    uv run python benchmarks/async_vs_sync.py \
+        --target sync=http://localhost:8000 --target async=http://localhost:8001 \
+        --concurrency 1000 --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+import httpx
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("bench")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DEFAULT_PATHS = [
+    "/api/games?limit=20",
+    "/api/games?limit=20&sort_by=bgg_rating&sort_order=desc",
+    "/api/reviews/gameid/1?limit=5",
+]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def run_target(
+    base_url: str, paths: list[str], total: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+
+        async def one(i: int):
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    r = await client.get(paths[i % len(paths)])
+                    if r.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="name=base_url, repeatable",
+    )
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for target in args.target:
+        name, base_url = target.split("=", 1)
+        logger.info("running %s against %s", name, base_url)
+        results[name] = await run_target(
+            base_url, args.paths or DEFAULT_PATHS, args.requests, args.concurrency
+        )
+        logger.info("%s: %s", name, json.dumps(results[name]))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+Write throughput of one POST per row against the bulk endpoints.
+
+"single" is how imports and seeding used to run: a POST /api/games or
+/api/reviews per item, each an add, commit and refresh. "bulk" sends the same
+items as one NDJSON body to /bulk, which writes them in multi-row INSERTs of
+BULK_CHUNK_SIZE. The app runs in process on a fresh SQLite file, so commits
+reach the disk as they would on a server:
+
+    uv run python -m benchmarks.bulk_insert --out bulk.json
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import tempfile
+import time
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("bench")
+
+DEFAULT_SIZES = [200, 1000, 5000]
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+def games(count: int, tag: str) -> list[dict]:
+    return [
+        {
+            "name": f"Bulk {tag} {i}",
+            "year_published": str(1950 + i % 70),
+            "bgg_rating": round(5 + (i % 500) / 100, 2),
+            "playing_time": 30 + i % 120,
+            "min_players": 1 + i % 2,
+            "max_players": 4,
+        }
+        for i in range(count)
+    ]
+
+
+def reviews(count: int, user_id: int, game_ids: list[int]) -> list[dict]:
+    return [
+        {
+            "title": f"Review {i}",
+            "star_amount": 1 + i % 10,
+            "user_id": user_id,
+            "game_id": game_ids[i % len(game_ids)],
+        }
+        for i in range(count)
+    ]
+
+
+def items_per_second(fn, items: list[dict]) -> float:
+    start = time.perf_counter()
+    fn(items)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", action="append", type=int, dest="sizes")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    args = parser.parse_args()
+    sizes = args.sizes or DEFAULT_SIZES
+
+    # the app modules build their engine on import
+    path = os.path.join(tempfile.mkdtemp(), "bulk.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{path}")
+    from fastapi.testclient import TestClient
+
+    import app.main
+    from app.model.review_model import Review
+    from app.model.user_model import User
+    from app.repository.review.sql_review_repository import ReviewRepositorySQL
+    from app.utility.auth import require_admin
+    from app.utility.db_sql import Base, SessionLocal, engine
+
+    def insert_review(self, review_data: dict) -> Review:
+        # SQLite has no add_game_review procedure
+        review = Review(**review_data)
+        self.db.add(review)
+        self.db.flush()
+        return review
+
+    ReviewRepositorySQL._create_via_procedure = insert_review
+    app.main.app.dependency_overrides[require_admin] = lambda: True
+    Base.metadata.create_all(engine)
+
+    with SessionLocal() as db:
+        user = User(
+            display_name="bench",
+            username="bench",
+            password="x",
+            dob=datetime.date(2000, 1, 1),
+            email="bench@example.com",
+        )
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    results = {}
+    with TestClient(app.main.app) as client:
+
+        def single(path):
+            def post(items):
+                for item in items:
+                    assert client.post(path, json=item).status_code == 201
+
+            return post
+
+        def bulk(path):
+            def post(items):
+                body = "\n".join(json.dumps(i) for i in items)
+                r = client.post(f"{path}/bulk", content=body, headers=NDJSON)
+                assert r.json()["created"] == len(items), r.text
+
+            return post
+
+        # games for the reviews to point at; also warms up both paths
+        bulk("/api/games")(games(50, "seed"))
+        single("/api/games")(games(5, "warm"))
+        game_ids = [g["id"] for g in client.get("/api/games?limit=50").json()["items"]]
+
+        for size in sizes:
+            for entity, path, make in (
+                ("games", "/api/games", games),
+                ("reviews", "/api/reviews", lambda n, _: reviews(n, user_id, game_ids)),
+            ):
+                single_rate = items_per_second(single(path), make(size, f"s{size}"))
+                bulk_rate = items_per_second(bulk(path), make(size, f"b{size}"))
+                results[f"{entity}/{size}"] = {
+                    "single_items_per_s": round(single_rate, 1),
+                    "bulk_items_per_s": round(bulk_rate, 1),
+                    "speedup": round(bulk_rate / single_rate, 1),
+                }
+                logger.info(
+                    "%5d %-7s %s",
+                    size,
+                    entity,
+                    json.dumps(results[f"{entity}/{size}"]),
+                )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Compare the substring filter on /api/games with ranked /api/games/search.
+
+Meant to run against the full BGG import (~170k games) once per backend:
+
+    DB_MODE=sql   uv run uvicorn app.main:app --port 8000
+    DB_MODE=mongo uv run uvicorn app.main:app --port 8001
+    DB_MODE=neo   uv run uvicorn app.main:app --port 8002
+
+    uv run python benchmarks/game_search.py \
+        --target sql=http://localhost:8000 --target mongo=http://localhost:8001 \
+        --target neo=http://localhost:8002 --out search.json
+
+Each term is also sent as its growing prefixes ("c", "ca", "cat", ...) to mimic
+a search box that queries on every keystroke. Provision the full-text indexes
+first (see the Search section of the README), otherwise /search errors out.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+import httpx
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("bench")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DEFAULT_TERMS = ["catan", "pandemic", "war of the ring", "dragon", "space", "card"]
+
+ENDPOINTS = {
+    "filter": "/api/games?limit={limit}&q={q}",
+    "search": "/api/games/search?limit={limit}&q={q}",
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def keystrokes(terms: list[str], min_length: int) -> list[str]:
+    queries = []
+    for term in terms:
+        queries += [term[:i] for i in range(min_length, len(term) + 1)]
+    return queries
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    template: str,
+    queries: list[str],
+    rounds: int,
+    concurrency: int,
+    limit: int,
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(q: str):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                r = await client.get(template.format(limit=limit, q=q))
+                if r.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(q) for _ in range(rounds) for q in queries))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+async def run_target(base_url: str, args) -> dict:
+    queries = keystrokes(args.terms or DEFAULT_TERMS, args.min_length)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        r = await client.get("/api/games?limit=1&count=estimate")
+        r.raise_for_status()
+        results = {"games": r.json()["total"], "queries": len(queries)}
+
+        for name, template in ENDPOINTS.items():
+            # one untimed pass so both endpoints start with warm caches
+            await run_endpoint(
+                client, template, queries, 1, args.concurrency, args.limit
+            )
+            results[name] = await run_endpoint(
+                client, template, queries, args.rounds, args.concurrency, args.limit
+            )
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="name=base_url, repeatable",
+    )
+    parser.add_argument("--term", action="append", dest="terms")
+    parser.add_argument("--min-length", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for target in args.target:
+        name, base_url = target.split("=", 1)
+        logger.info("running %s against %s", name, base_url)
+        results[name] = await run_target(base_url, args)
+        logger.info("%s: %s", name, json.dumps(results[name]))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,396 @@
+"""
+Replay a realistic request mix and report throughput plus p50/p95/p99 per endpoint.
+
+The mix is game lists with search and sort, ranked search, game detail, review
+pages, logins and admin writes. Against running servers, one per DB_MODE (the
+MySQL, MongoDB and Neo4j containers in docker-compose.dev.yml serve as local
+stand-ins), log in as an admin so the harness can seed data:
+
+    DB_MODE=sql   uv run uvicorn app.main:app --port 8000
+    DB_MODE=mongo uv run uvicorn app.main:app --port 8001
+    DB_MODE=neo   uv run uvicorn app.main:app --port 8002
+
+    uv run python -m benchmarks.load_mix \
+        --target sql=http://localhost:8000 --target mongo=http://localhost:8001 \
+        --target neo=http://localhost:8002 --username admin --password secret \
+        --out load.json
+
+Logins are rate limited per username and IP, so raise LOGIN_USER_BURST,
+LOGIN_USER_PER_MINUTE, LOGIN_IP_BURST and LOGIN_IP_PER_MINUTE on the servers
+under test; 429s are reported as "rejected". Without any server, --local runs
+the app in process on a fresh SQLite file:
+
+    uv run python -m benchmarks.load_mix --local --out load.json
+
+--baseline compares with an earlier --out file and exits with status 1 when an
+endpoint's p95 rose or its throughput fell by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("bench")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# relative weight of each scenario in the replayed traffic
+MIX = {
+    "list": 25,
+    "list_search_sort": 15,
+    "search": 10,
+    "detail": 20,
+    "reviews": 15,
+    "login": 5,
+    "admin_write": 10,
+}
+WORDS = ["war", "space", "dragon", "castle", "trade", "empire", "island", "train"]
+SORTS = ["bgg_rating", "name", "year_published", "playing_time"]
+PASSWORD = "bench-password"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(
+    latencies: list[float], errors: int, rejected: int, seconds: float
+) -> dict:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rejected": rejected,
+        "rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    r = await client.post(
+        "/auth/login", json={"username": username, "password": password}
+    )
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def create_user(client: httpx.AsyncClient, tag: str) -> dict:
+    r = await client.post(
+        "/api/users",
+        json={
+            "display_name": f"Bench {tag}",
+            "username": f"bench-{tag}",
+            "email": f"bench-{tag}@example.com",
+            "dob": "1990-01-01",
+            "password": PASSWORD,
+        },
+    )
+    r.raise_for_status()
+    return r.json()
+
+
+async def seed(
+    client: httpx.AsyncClient,
+    admin: dict[str, str],
+    games: int,
+    reviews_per_game: int,
+    concurrency: int,
+    rng: random.Random,
+    insert_reviews=None,
+) -> dict:
+    """Creates the dataset through the API, so every backend gets the same one.
+
+    ``insert_reviews`` writes the reviews directly instead; SQL review creation
+    goes through a MySQL stored procedure that SQLite does not have.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    tag = uuid.uuid4().hex[:8]
+    reviewer = await create_user(client, tag)
+
+    async def post(path: str, payload: dict) -> dict:
+        async with semaphore:
+            r = await client.post(path, json=payload, headers=admin)
+            r.raise_for_status()
+            return r.json()
+
+    created = await asyncio.gather(
+        *(
+            post(
+                "/api/games",
+                {
+                    "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {tag}-{i}",
+                    "description": " ".join(rng.choices(WORDS, k=30)),
+                    "year_published": 1950 + i % 75,
+                    "bgg_rating": round(rng.uniform(4, 9), 2),
+                    "playing_time": rng.choice([30, 45, 60, 90, 120]),
+                    "min_players": 1,
+                    "max_players": rng.randint(2, 6),
+                },
+            )
+            for i in range(games)
+        )
+    )
+    game_ids = [g["id"] for g in created]
+
+    reviews = [
+        {
+            "game_id": game_id,
+            "user_id": reviewer["id"],
+            "title": f"Review {n}",
+            "text": " ".join(rng.choices(WORDS, k=8)),
+            "star_amount": rng.randint(1, 10),
+        }
+        for game_id in game_ids
+        for n in range(reviews_per_game)
+    ]
+    if insert_reviews is not None:
+        insert_reviews(reviews)
+    else:
+        await asyncio.gather(*(post("/api/reviews", review) for review in reviews))
+    return {"game_ids": game_ids, "username": reviewer["username"]}
+
+
+def scenario_request(name: str, rng: random.Random, data: dict, admin: dict) -> tuple:
+    game_id = rng.choice(data["game_ids"])
+    if name == "list":
+        return "GET", f"/api/games?limit=20&offset={rng.randrange(0, 200, 20)}", {}
+    if name == "list_search_sort":
+        return (
+            "GET",
+            f"/api/games?limit=20&q={rng.choice(WORDS)}"
+            f"&sort_by={rng.choice(SORTS)}&sort_order={rng.choice(['asc', 'desc'])}",
+            {},
+        )
+    if name == "search":
+        return "GET", f"/api/games/search?limit=20&q={rng.choice(WORDS)}", {}
+    if name == "detail":
+        return "GET", f"/api/games/{game_id}/detail", {}
+    if name == "reviews":
+        return "GET", f"/api/reviews/gameid/{game_id}?limit=5", {}
+    if name == "login":
+        payload = {"username": data["username"], "password": PASSWORD}
+        return "POST", "/auth/login", {"json": payload}
+    if rng.random() < 0.5:
+        payload = {"name": f"Bench write {uuid.uuid4().hex[:12]}", "bgg_rating": 6.5}
+        return "POST", "/api/games", {"json": payload, "headers": admin}
+    payload = {"playing_time": rng.choice([30, 60, 90])}
+    return "PATCH", f"/api/games/{game_id}", {"json": payload, "headers": admin}
+
+
+async def run_mix(
+    client: httpx.AsyncClient,
+    data: dict,
+    admin: dict,
+    total: int,
+    concurrency: int,
+    rng: random.Random,
+) -> dict:
+    names = rng.choices(list(MIX), weights=list(MIX.values()), k=total)
+    plan = [(name, scenario_request(name, rng, data, admin)) for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in MIX}
+    errors = dict.fromkeys(MIX, 0)
+    rejected = dict.fromkeys(MIX, 0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(name: str, request: tuple):
+        method, path, kwargs = request
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                r = await client.request(method, path, **kwargs)
+                if r.status_code == 429:
+                    rejected[name] += 1
+                elif r.status_code >= 400:
+                    errors[name] += 1
+            except httpx.HTTPError:
+                errors[name] += 1
+            latencies[name].append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(name, request) for name, request in plan))
+    elapsed = time.perf_counter() - started
+
+    everything = [s for samples in latencies.values() for s in samples]
+    return {
+        "total": {
+            **summarize(
+                everything, sum(errors.values()), sum(rejected.values()), elapsed
+            ),
+            "seconds": round(elapsed, 3),
+        },
+        "endpoints": {
+            name: summarize(latencies[name], errors[name], rejected[name], elapsed)
+            for name in MIX
+            if latencies[name]
+        },
+    }
+
+
+async def run_target(
+    client: httpx.AsyncClient, admin_token: str, args, insert_reviews=None
+) -> dict:
+    rng = random.Random(args.seed)
+    admin = {"Authorization": f"Bearer {admin_token}"}
+    started = time.perf_counter()
+    data = await seed(
+        client,
+        admin,
+        args.games,
+        args.reviews_per_game,
+        args.concurrency,
+        rng,
+        insert_reviews,
+    )
+    logger.info("  seeded %d games in %.1fs", args.games, time.perf_counter() - started)
+    # one short pass so connection pools and caches are warm
+    await run_mix(client, data, admin, min(200, args.requests), args.concurrency, rng)
+    return await run_mix(client, data, admin, args.requests, args.concurrency, rng)
+
+
+def local_app():
+    """The app in process on a fresh SQLite file, plus direct-write helpers."""
+    path = os.path.join(tempfile.mkdtemp(prefix="load-mix-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["DB_MODE"] = "sql"
+    for name in ("LOGIN_USER_BURST", "LOGIN_IP_BURST"):
+        os.environ.setdefault(name, "1000000")
+    for name in ("LOGIN_USER_PER_MINUTE", "LOGIN_IP_PER_MINUTE"):
+        os.environ.setdefault(name, "1000000")
+
+    from sqlalchemy import update
+
+    import app.main
+    from app.model.review_model import Review
+    from app.model.user_model import User
+    from app.utility.db_sql import Base, SessionLocal, engine
+
+    Base.metadata.create_all(engine)
+
+    def make_admin(user_id: int) -> None:
+        with SessionLocal() as db:
+            db.execute(update(User).where(User.id == user_id).values(is_admin=True))
+            db.commit()
+
+    def insert_reviews(reviews: list[dict]) -> None:
+        with SessionLocal() as db:
+            db.add_all(Review(**review) for review in reviews)
+            db.commit()
+
+    return app.main.app, make_admin, insert_reviews
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for backend, result in results["backends"].items():
+        before = baseline.get("backends", {}).get(backend, {}).get("endpoints", {})
+        for name, now in result["endpoints"].items():
+            then = before.get(name)
+            if not then:
+                continue
+            if then["p95_ms"] and now["p95_ms"] > then["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{backend} {name}: p95 {then['p95_ms']} -> {now['p95_ms']} ms"
+                )
+            if then["rps"] and now["rps"] < then["rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{backend} {name}: rps {then['rps']} -> {now['rps']}"
+                )
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target", action="append", default=[], help="name=base_url, repeatable"
+    )
+    parser.add_argument(
+        "--local", action="store_true", help="also run the app in process on SQLite"
+    )
+    parser.add_argument("--username", help="admin login for seeding --target servers")
+    parser.add_argument("--password")
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--reviews-per-game", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--seed", type=int, default=1, help="makes the mix reproducible"
+    )
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="earlier --out file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    if not args.target and not args.local:
+        parser.error("give at least one --target or --local")
+    if args.target and not (args.username and args.password):
+        parser.error("--target needs --username and --password of an admin")
+
+    results = {
+        "mix": MIX,
+        "games": args.games,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "backends": {},
+    }
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    for target in args.target:
+        name, base_url = target.split("=", 1)
+        logger.info("running %s against %s", name, base_url)
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=60
+        ) as client:
+            token = await login(client, args.username, args.password)
+            results["backends"][name] = await run_target(client, token, args)
+        logger.info("%s: %s", name, json.dumps(results["backends"][name]["total"]))
+
+    if args.local:
+        logger.info("running local (in-process SQLite)")
+        app, make_admin, insert_reviews = local_app()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://local", timeout=60
+        ) as client:
+            admin = await create_user(client, uuid.uuid4().hex[:8])
+            make_admin(admin["id"])
+            token = await login(client, admin["username"], PASSWORD)
+            results["backends"]["local"] = await run_target(
+                client, token, args, insert_reviews
+            )
+        logger.info("local: %s", json.dumps(results["backends"]["local"]["total"]))
+
+    for backend, result in results["backends"].items():
+        for name, stats in result["endpoints"].items():
+            logger.info("%-8s %-17s %s", backend, name, json.dumps(stats))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            logger.error("regression: %s", line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,127 @@
+"""
+Per-item cost of turning a page of games into a JSON response body.
+
+"legacy" is the path /api/games used before: ORM objects, GameRead.model_validate
+per row, then FastAPI validating and serializing the dict again against
+response_model. "fast" is the current one: column rows validated in a single
+call and encoded by FastJSONResponse. Both read from the same in-memory SQLite
+database, so no server is needed:
+
+    uv run python -m benchmarks.serialization --out serialization.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+from typing import Any
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("bench")
+
+DEFAULT_SIZES = [50, 200, 1000]
+
+
+def seed(db, game_model, count: int) -> None:
+    db.add_all(
+        game_model(
+            name=f"Game {i}",
+            slug=f"game-{i}",
+            year_published=str(1950 + i % 70),
+            bgg_rating=5 + (i % 500) / 99,
+            difficulty_rating=2.5,
+            playing_time=30 + i % 120,
+            description="A game about trading, building and fighting. " * 12,
+            min_players=1 + i % 2,
+            max_players=4,
+            image=f"https://cf.geekdo-images.com/{i}/original.jpg",
+            thumbnail=f"https://cf.geekdo-images.com/{i}/thumb.jpg",
+        )
+        for i in range(count)
+    )
+    db.commit()
+
+
+def time_per_item(fn, size: int, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(size)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) / size * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", action="append", type=int, dest="sizes")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    args = parser.parse_args()
+    sizes = args.sizes or DEFAULT_SIZES
+
+    # the app modules build their engine on import
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from pydantic import TypeAdapter
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+
+    import app.main  # noqa: F401  (registers every mapped model)
+    from app.model.game_model import Game
+    from app.repository.game.sql_game_repository import GameRepositorySQL
+    from app.schema.game_schema import GameRead
+    from app.service.game_service import GameService
+    from app.utility.db_sql import Base
+    from app.utility.responses import FastJSONResponse
+    from app.utility.totals import TotalMode
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    seed(db, Game, max(sizes) + 1)
+
+    body_adapter = TypeAdapter(dict[str, Any])
+
+    def legacy(size: int) -> bytes:
+        rows = db.execute(select(Game).order_by(Game.id).limit(size)).scalars().all()
+        for r in rows:
+            if r.bgg_rating is not None:
+                r.bgg_rating = round(r.bgg_rating, 2)
+        items = [GameRead.model_validate(r) for r in rows]
+        body = {"total": None, "offset": 0, "limit": size, "items": items}
+        encoded = body_adapter.dump_json(body_adapter.validate_python(body))
+        # a request gets a fresh session, so nothing stays in the identity map
+        db.expunge_all()
+        return encoded
+
+    svc = GameService(GameRepositorySQL(db))
+
+    def fast(size: int) -> bytes:
+        items, total, next_cursor = svc.list(
+            0, size, None, None, "asc", count=TotalMode.none
+        )
+        body = {"total": total, "offset": 0, "limit": size, "items": items}
+        return FastJSONResponse(body).body
+
+    results = {}
+    for size in sizes:
+        # warm up both paths, then compare the payloads they produce
+        assert json.loads(legacy(size))["items"] == json.loads(fast(size))["items"]
+        legacy_us = time_per_item(legacy, size, args.rounds)
+        fast_us = time_per_item(fast, size, args.rounds)
+        results[size] = {
+            "legacy_us_per_item": round(legacy_us, 2),
+            "fast_us_per_item": round(fast_us, 2),
+            "speedup": round(legacy_us / fast_us, 2),
+        }
+        logger.info("%5d games: %s", size, json.dumps(results[size]))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Measure cold start per DB_MODE: how long importing app.main takes, which
+database drivers it pulls in, and (with --lifespan) the startup phases the
+app reports on /readyz.
+
+Every run is a fresh interpreter, so nothing is cached between samples:
+
+    uv run python -m benchmarks.startup --runs 7 --out startup.json
+
+--lifespan also runs warm-up and the autocomplete build, which needs the
+mode's database to be reachable (the docker-compose.dev.yml containers, or
+DATABASE_URL pointing at SQLite for the sql mode). To compare with an older
+revision, check it out next to this one and point --path at its backend:
+
+    git worktree add /tmp/before HEAD~1
+    uv run python -m benchmarks.startup --path /tmp/before/backend
+
+On one CPU, the median sql-mode import went from ~1380 ms, when every
+backend's drivers were imported whatever the mode, to ~1240 ms with neo4j no
+longer loaded. pymongo still is: Sentry's auto-enabled integration imports it
+whenever it is installed.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("bench")
+
+MODES = ["sql", "mongo", "neo"]
+DRIVERS = ["sqlalchemy", "aiomysql", "pymongo", "motor", "neo4j", "httpx"]
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+imported = (time.perf_counter() - start) * 1000
+report = {{"import_ms": imported, "drivers": [d for d in {drivers!r} if d in sys.modules]}}
+if {lifespan!r}:
+    from fastapi.testclient import TestClient
+    with TestClient(app.main.app) as client:
+        report["readyz"] = client.get("/readyz").json()
+print(json.dumps(report))
+"""
+
+
+def sample(path: str, mode: str, lifespan: bool, database_url: str) -> dict:
+    env = {
+        **os.environ,
+        "DB_MODE": mode,
+        "DATABASE_URL": database_url,
+        "PYTHONDONTWRITEBYTECODE": "0",
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(drivers=DRIVERS, lifespan=lifespan)],
+        cwd=path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(path: str, mode: str, runs: int, lifespan: bool, database_url: str) -> dict:
+    # the first run compiles bytecode, which a deployed image already has
+    sample(path, mode, False, database_url)
+    samples = [sample(path, mode, lifespan, database_url) for _ in range(runs)]
+    imports = [s["import_ms"] for s in samples]
+    result = {
+        "runs": runs,
+        "import_ms_median": round(statistics.median(imports), 1),
+        "import_ms_min": round(min(imports), 1),
+        "drivers": samples[-1]["drivers"],
+    }
+    if lifespan:
+        result["readyz"] = samples[-1]["readyz"]
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--path", default=".", help="backend directory to measure")
+    parser.add_argument("--mode", action="append", choices=MODES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lifespan", action="store_true")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = os.getenv("DATABASE_URL") or f"sqlite:///{tmp}/startup.db"
+        results = {}
+        for mode in args.mode or MODES:
+            results[mode] = measure(
+                args.path, mode, args.runs, args.lifespan, database_url
+            )
+            logger.info(
+                "%-5s import median %7.1f ms  min %7.1f ms  drivers %s",
+                mode,
+                results[mode]["import_ms_median"],
+                results[mode]["import_ms_min"],
+                ",".join(results[mode]["drivers"]),
+            )
+            if args.lifespan:
+                logger.info("      %s", results[mode]["readyz"])
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
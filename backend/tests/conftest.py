@@ -9,6 +9,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
+from app.model.review_model import Review
+from app.repository.review.sql_review_repository import ReviewRepositorySQL
 from app.utility.auth import get_current_user, require_admin
 from app.utility.db_sql import Base, get_sql_db
 
@@ -89,3 +91,18 @@ def _deny_admin():
     app.dependency_overrides[require_admin] = _deny
     yield
     app.dependency_overrides.pop(require_admin, None)
+
+
+def _insert_review(self, review_data: dict) -> Review:
+    # stands in for the add_game_review procedure, which SQLite does not have
+    review = Review(
+        **{k: review_data[k] for k in ("title", "star_amount", "user_id", "game_id")}
+    )
+    self.db.add(review)
+    self.db.flush()
+    return review
+
+
+@pytest.fixture
+def _procedure(monkeypatch):
+    monkeypatch.setattr(ReviewRepositorySQL, "_create_via_procedure", _insert_review)
@@ -0,0 +1,130 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.controller.async_game_controller import router as async_game_router
+from app.controller.async_review_controller import router as async_review_router
+from app.utility.auth import require_admin
+
+pytest.importorskip("aiosqlite")
+
+"""
+POSITIVE TESTS (DB_ASYNC routers on aiosqlite)
+- test creating and getting a game
+- test listing games with search q
+- test game detail
+- test deleting a game
+- test reviews by game for a game without reviews
+- test paging games with next_cursor
+- test searching games
+- test sparse fieldsets on list and detail
+"""
+
+
+@pytest.fixture(scope="module")
+def async_client():
+    app = FastAPI()
+    app.include_router(async_game_router)
+    app.include_router(async_review_router)
+    app.dependency_overrides[require_admin] = lambda: True
+
+    with TestClient(app) as c:
+        yield c
+
+
+def create_game(client, name):
+    r = client.post("/api/games", json={"name": name, "bgg_rating": 6.5})
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_async_create_and_get_game(async_client):
+    created = create_game(async_client, "Async Chess")
+
+    r = async_client.get(f"/api/games/{created['id']}")
+    assert r.status_code == 200, r.text
+    assert r.json()["name"] == "Async Chess"
+
+
+def test_async_list_games_search_q_filters(async_client):
+    needle = f"AsyncNeedle-{uuid.uuid4()}"
+    create_game(async_client, needle)
+
+    r = async_client.get(f"/api/games?q={needle}")
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert data["total"] == 1
+    assert data["items"][0]["name"] == needle
+
+
+def test_async_game_detail(async_client):
+    created = create_game(async_client, "Async Catan")
+
+    r = async_client.get(f"/api/games/{created['id']}/detail")
+    assert r.status_code == 200, r.text
+    assert r.json()["artists"] == []
+
+
+def test_async_delete_game_then_get_404(async_client):
+    created = create_game(async_client, "Async Risk")
+
+    r = async_client.delete(f"/api/games/{created['id']}")
+    assert r.status_code == 204, r.text
+
+    r = async_client.get(f"/api/games/{created['id']}")
+    assert r.status_code == 404
+
+
+def test_async_reviews_by_game_empty(async_client):
+    created = create_game(async_client, "Async Go")
+
+    r = async_client.get(f"/api/reviews/gameid/{created['id']}")
+    assert r.status_code == 200, r.text
+    assert r.json()["total"] == 0
+
+    r = async_client.get(f"/api/reviews/count?game_id={created['id']}")
+    assert r.json()["review_count"] == 0
+
+
+def test_async_list_games_cursor_pages(async_client):
+    prefix = f"AsyncCur-{uuid.uuid4()}"
+    for i in range(3):
+        create_game(async_client, f"{prefix}-{i}")
+
+    url = f"/api/games?q={prefix}&limit=2&sort_by=name"
+    first = async_client.get(url).json()
+    second = async_client.get(f"{url}&cursor={first['next_cursor']}").json()
+
+    names = [x["name"] for x in first["items"] + second["items"]]
+    assert len(set(names)) == 3
+    assert second["next_cursor"] is None
+
+
+def test_async_search_games(async_client):
+    tag = uuid.uuid4().hex[:8]
+    create_game(async_client, f"Other {tag} Island")
+    create_game(async_client, f"{tag} Island")
+
+    r = async_client.get(f"/api/games/search?q={tag}&limit=1")
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert data["total"] == 2
+    assert data["has_more"] is True
+    assert data["items"][0]["name"] == f"{tag} Island"
+
+
+def test_async_games_with_fields(async_client):
+    tag = uuid.uuid4().hex[:8]
+    created = create_game(async_client, f"{tag} Sparse")
+
+    r = async_client.get(f"/api/games?q={tag}&fields=name")
+    assert r.status_code == 200, r.text
+    assert r.json()["items"] == [{"id": created["id"], "name": f"{tag} Sparse"}]
+
+    r = async_client.get(f"/api/games/{created['id']}/detail?fields=mechanics")
+    assert r.status_code == 200, r.text
+    assert r.json() == {"id": created["id"], "mechanics": []}
@@ -0,0 +1,183 @@
+import uuid
+
+import pytest
+
+from app.main import app
+from app.utility import auth
+from app.utility.auth import create_access_token, get_current_user
+from app.utility.login_admission import login_admission
+from app.utility.principal_cache import PrincipalCache, principal_cache
+
+"""
+POSITIVE TESTS
+- test repeated requests with one token are served from the principal cache
+- test updating a user drops its cached principal
+- test a signed is_admin claim passes require_admin without a lookup
+- test the least recently used principal is evicted first
+- test only the most recent generations are kept
+- test an invalidation in another worker drops the cached principals
+
+NEGATIVE TESTS
+- test a deleted user's token is rejected
+- test a non-admin token is forbidden from admin writes
+- test a principal loaded across an invalidation is not cached
+- test a principal loaded across another worker's invalidation is not cached
+"""
+
+
+@pytest.fixture
+def real_auth():
+    # conftest replaces get_current_user with a fake user for every test
+    fake = app.dependency_overrides.pop(get_current_user, None)
+    principal_cache.clear()
+    login_admission.clear()
+    yield
+    if fake is not None:
+        app.dependency_overrides[get_current_user] = fake
+
+
+def create_user(client):
+    tag = uuid.uuid4().hex[:8]
+    r = client.post(
+        "/api/users",
+        json={
+            "display_name": f"Player {tag}",
+            "username": f"player-{tag}",
+            "email": f"{tag}@example.com",
+            "dob": "1990-01-01",
+            "password": "secret123",
+        },
+    )
+    assert r.status_code == 200, r.text
+    user = r.json()
+
+    r = client.post(
+        "/auth/login", json={"username": user["username"], "password": "secret123"}
+    )
+    assert r.status_code == 200, r.text
+    return user, {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.mark.usefixtures("real_auth")
+def test_repeated_requests_hit_principal_cache(client):
+    user, headers = create_user(client)
+
+    for _ in range(3):
+        r = client.get("/me", headers=headers)
+        assert r.status_code == 200, r.text
+        assert r.json()["id"] == user["id"]
+
+    stats = principal_cache.snapshot()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["hit_ratio"] == pytest.approx(0.667)
+
+
+@pytest.mark.usefixtures("real_auth")
+def test_user_update_drops_cached_principal(client):
+    user, headers = create_user(client)
+    assert (
+        client.get("/me", headers=headers).json()["display_name"]
+        == user["display_name"]
+    )
+
+    r = client.patch(
+        f"/api/user/{user['id']}", json={"display_name": "Renamed"}, headers=headers
+    )
+    assert r.status_code == 200, r.text
+
+    assert client.get("/me", headers=headers).json()["display_name"] == "Renamed"
+
+
+@pytest.mark.usefixtures("real_auth")
+def test_deleted_user_token_is_rejected(client, _allow_admin):
+    user, headers = create_user(client)
+    assert client.get("/me", headers=headers).status_code == 200
+
+    r = client.delete(f"/api/user/{user['id']}")
+    assert r.status_code in (200, 204), r.text
+
+    assert client.get("/me", headers=headers).status_code == 401
+
+
+@pytest.mark.usefixtures("real_auth")
+def test_non_admin_token_is_forbidden(client):
+    _, headers = create_user(client)
+
+    r = client.post("/api/games", json={"name": "Nope"}, headers=headers)
+    assert r.status_code == 403, r.text
+
+
+@pytest.mark.usefixtures("real_auth")
+def test_signed_admin_claim_skips_lookup(client, monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_ADMIN_CLAIM", True)
+    # no such user exists, so only the claim can let this through
+    token = create_access_token(user_id=10**9, username="ghost", is_admin=True)
+
+    r = client.post(
+        "/api/games",
+        json={"name": f"Claimed {uuid.uuid4()}"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert r.status_code == 201, r.text
+    assert principal_cache.snapshot()["misses"] == 0
+
+
+def test_principal_cache_evicts_least_recently_used():
+    cache = PrincipalCache(ttl=60, max_size=2)
+    for user_id in (1, 2):
+        cache.set(user_id, 100, f"user {user_id}", cache.generation(user_id))
+
+    assert cache.get(1, 100) == "user 1"
+    cache.set(3, 100, "user 3", cache.generation(3))
+
+    assert cache.get(2, 100) is None
+    assert cache.get(1, 100) == "user 1"
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_principal_cache_skips_value_loaded_across_invalidation():
+    cache = PrincipalCache(ttl=60, max_size=10)
+    generation = cache.generation(7)
+    cache.invalidate(7)
+
+    cache.set(7, 100, "stale", generation)
+    assert cache.get(7, 100) is None
+
+
+def test_principal_cache_generations_bounded():
+    cache = PrincipalCache(ttl=60, max_size=2)
+    generation = cache.generation(7)
+    for user_id in (7, 8, 9):
+        cache.invalidate(user_id)
+
+    # 7 was forgotten, yet its load from before the invalidation stays out
+    assert cache.snapshot()["generations"] == 2
+    cache.set(7, 100, "stale", generation)
+    assert cache.get(7, 100) is None
+    cache.set(7, 100, "fresh", cache.generation(7))
+    assert cache.get(7, 100) == "fresh"
+
+
+def test_principal_cache_follows_shared_version():
+    shared = {"version": (1,)}
+    cache = PrincipalCache(ttl=60, max_size=10, version=lambda: shared["version"])
+    cache.sync()
+    cache.set(7, 100, "user 7", cache.generation(7))
+    assert cache.get(7, 100) == "user 7"
+
+    # another worker updated some user and bumped the version
+    shared["version"] = (2,)
+    assert cache.get(7, 100) is None
+
+
+def test_principal_cache_skips_value_loaded_across_shared_bump():
+    shared = {"version": (1,)}
+    cache = PrincipalCache(ttl=60, max_size=10, version=lambda: shared["version"])
+    cache.sync()
+    generation = cache.generation(7)
+
+    shared["version"] = (2,)
+    cache.sync()
+    cache.set(7, 100, "stale", generation)
+    assert cache.get(7, 100) is None
@@ -0,0 +1,105 @@
+import time
+import uuid
+
+from app.utility.autocomplete import PrefixIndex
+
+"""
+POSITIVE TESTS
+- test created game is suggested by name prefix
+- test any word of the name matches, accents and case ignored
+- test renamed and deleted games leave the index
+- test whole-name prefix and rating order the suggestions
+- test lookups on a large index stay well under a millisecond
+
+NEGATIVE TESTS
+- test missing q
+- test limit over the maximum
+"""
+
+
+def create_game(client, name, bgg_rating=5.0):
+    r = client.post("/api/games", json={"name": name, "bgg_rating": bgg_rating})
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def suggested_names(client, q, kind="games"):
+    r = client.get(f"/api/autocomplete?q={q}")
+    assert r.status_code == 200, r.text
+    return [x["name"] for x in r.json()[kind]]
+
+
+def test_autocomplete_suggests_created_game(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    create_game(client, f"Zq{tag} Quest")
+
+    r = client.get(f"/api/autocomplete?q=zq{tag[:4]}")
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert set(data) == {"games", "designers", "artists", "publishers", "mechanics"}
+    assert [x["name"] for x in data["games"]] == [f"Zq{tag} Quest"]
+
+
+def test_autocomplete_matches_any_word_ignoring_accents(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    create_game(client, f"Formula Dé {tag}")
+
+    assert suggested_names(client, f"de {tag}") == [f"Formula Dé {tag}"]
+    assert suggested_names(client, tag.upper()) == [f"Formula Dé {tag}"]
+
+
+def test_autocomplete_follows_updates_and_deletes(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Old{tag}")
+
+    r = client.patch(f"/api/games/{game['id']}", json={"name": f"New{tag}"})
+    assert r.status_code == 200, r.text
+    assert suggested_names(client, f"old{tag}") == []
+    assert suggested_names(client, f"new{tag}") == [f"New{tag}"]
+
+    r = client.delete(f"/api/games/{game['id']}")
+    assert r.status_code in (200, 204), r.text
+    assert suggested_names(client, f"new{tag}") == []
+
+
+def test_prefix_index_ranks_name_prefix_then_rating():
+    index = PrefixIndex(
+        [
+            (1, "Lord of the Rings", 7.0),
+            (2, "War of the Ring", 8.5),
+            (3, "Ring Fit", 3.0),
+            (4, "Ringo", 6.0),
+        ]
+    )
+
+    names = [x["name"] for x in index.search("ring", 10)]
+    assert names == ["Ringo", "Ring Fit", "War of the Ring", "Lord of the Rings"]
+    assert [x["name"] for x in index.search("ring", 1)] == ["Ringo"]
+
+
+def test_prefix_index_lookup_is_sub_millisecond():
+    words = ["dragon", "castle", "space", "ring", "card", "war", "island", "train"]
+    index = PrefixIndex(
+        (i, f"{words[i % 8]} {words[i // 8 % 8]} {i}", i % 10) for i in range(50_000)
+    )
+
+    queries = [f"{w[:3]}{n}" for w in words for n in ("", " ")] * 20
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        index.search(q, 5)
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    assert samples[int(len(samples) * 0.99)] < 0.001
+
+
+def test_autocomplete_without_q_returns_422(client):
+    r = client.get("/api/autocomplete")
+    assert r.status_code == 422, r.text
+
+
+def test_autocomplete_limit_over_max_returns_422(client):
+    r = client.get("/api/autocomplete?q=a&limit=500")
+    assert r.status_code == 422, r.text
@@ -0,0 +1,270 @@
+import datetime
+import json
+import uuid
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.model.game_model import Game
+from app.model.review_model import Review
+from app.model.user_model import User
+from app.utility import bulk
+from app.utility.bulk import BulkResult, BulkRowsRejected, write_chunk
+from app.utility.db_mongo import COUNTERS, insert_many
+from app.utility.db_neo import create_nodes
+
+"""
+POSITIVE TESTS
+- test a JSON array of games is written and ids come back in input order
+- test an NDJSON stream is read and written chunk by chunk
+- test bulk reviews update each game's aggregates once
+- test bulk artists are indexed for autocomplete
+- test a failing batch is retried row by row to find the bad rows
+- test Mongo write errors become per-item errors
+- test Mongo ids continue after migrated reviews that only have an _id
+- test Neo4j nodes are created with one UNWIND
+
+NEGATIVE TESTS
+- test invalid items and JSON lines are reported while the rest is written
+- test names taken in the store or earlier in the request are rejected
+- test a body that is not an array is refused
+- test a request over the item limit is refused
+"""
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+def ndjson(items) -> str:
+    return "\n".join(i if isinstance(i, str) else json.dumps(i) for i in items)
+
+
+def make_user(db_session) -> int:
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        display_name=f"bulk-{tag}",
+        username=f"bulk-{tag}",
+        password="x",
+        dob=datetime.date(2000, 1, 1),
+        email=f"{tag}@example.com",
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+def make_game(client) -> int:
+    r = client.post("/api/games", json={"name": f"Bulk target {uuid.uuid4()}"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def aggregates(db_session, game_id: int) -> tuple:
+    db_session.expire_all()
+    game = db_session.get(Game, game_id)
+    stars = {int(s): n for s, n in (game.star_histogram or {}).items() if n}
+    return game.review_count, game.rating_sum, game.user_rating, stars
+
+
+def test_array_of_games_written_in_order(client, _allow_admin, db_session):
+    tag = uuid.uuid4().hex[:8]
+    games = [{"name": f"Bulk {tag} {n}", "playing_time": n} for n in range(5)]
+
+    r = client.post("/api/games/bulk", json=games)
+
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["received"], body["created"], body["failed"]) == (5, 5, 0)
+    names = [db_session.get(Game, game_id).name for game_id in body["ids"]]
+    assert names == [g["name"] for g in games]
+
+
+def test_ndjson_written_in_chunks(client, _allow_admin, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 2)
+    writes = []
+    original = bulk.write_chunk
+
+    def counted(rows, write, result):
+        writes.append(len(rows))
+        return original(rows, write, result)
+
+    monkeypatch.setattr("app.service.game_service.write_chunk", counted)
+    tag = uuid.uuid4().hex[:8]
+    body = ndjson({"name": f"Stream {tag} {n}"} for n in range(5)) + "\n"
+
+    r = client.post("/api/games/bulk", content=body, headers=NDJSON)
+
+    assert r.json()["created"] == 5
+    assert writes == [2, 2, 1]
+
+
+def test_bulk_reviews_update_aggregates(client, _allow_admin, db_session):
+    user_id = make_user(db_session)
+    game_id, other_id = make_game(client), make_game(client)
+    reviews = [
+        {"title": "a", "star_amount": 4, "user_id": user_id, "game_id": game_id},
+        {"title": "b", "star_amount": 8, "user_id": user_id, "game_id": game_id},
+        {"title": "c", "star_amount": 2, "user_id": user_id, "game_id": other_id},
+    ]
+
+    r = client.post("/api/reviews/bulk", json=reviews)
+
+    assert r.json()["created"] == 3
+    assert aggregates(db_session, game_id) == (2, 12, 6.0, {4: 1, 8: 1})
+    assert aggregates(db_session, other_id) == (1, 2, 2.0, {2: 1})
+    titles = {db_session.get(Review, i).title for i in r.json()["ids"]}
+    assert titles == {"a", "b", "c"}
+
+
+def test_bulk_artists_are_indexed(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    artists = [{"name": f"Painter{tag} {n}"} for n in range(3)]
+
+    r = client.post("/api/artists/bulk", json=artists)
+
+    assert r.json()["created"] == 3
+    found = client.get(f"/api/autocomplete?q=Painter{tag}").json()
+    assert len(found["artists"]) == 3
+
+
+def test_failing_batch_retried_row_by_row():
+    calls = []
+
+    def write(rows):
+        calls.append(len(rows))
+        if any(r["bad"] for r in rows):
+            raise ValueError("constraint failed\nINSERT INTO ...")
+        return [r["n"] * 10 for r in rows]
+
+    result = BulkResult()
+    rows = [(n, {"n": n, "bad": n == 2}) for n in range(4)]
+
+    created = write_chunk(rows, write, result)
+
+    assert created == [(0, 0), (1, 10), (3, 30)]
+    assert calls == [4, 1, 1, 1, 1]
+    assert result.errors == [{"index": 2, "error": "ValueError: constraint failed"}]
+
+
+class Counters:
+    def __init__(self):
+        self.seqs = {}
+
+    def find_one(self, query):
+        return {"seq": self.seqs[query["_id"]]} if query["_id"] in self.seqs else None
+
+    def update_one(self, query, update, upsert):
+        seq = self.seqs.get(query["_id"], 0)
+        self.seqs[query["_id"]] = max(seq, update["$max"]["seq"])
+
+    def find_one_and_update(self, query, update, upsert, return_document):
+        self.seqs[query["_id"]] = self.seqs.get(query["_id"], 0) + update["$inc"]["seq"]
+        return {"seq": self.seqs[query["_id"]]}
+
+
+class Reviews:
+    """Reviews as NoSQLMigrator leaves them: the integer id only in _id."""
+
+    name = "reviews"
+
+    def __init__(self, stored):
+        self.stored = stored
+        self.database = {COUNTERS: Counters()}
+
+    def find_one(self, query, projection, sort):
+        ((field, _),) = query.items()
+        ids = [d[field] for d in self.stored if isinstance(d.get(field), int)]
+        return {field: max(ids)} if ids else None
+
+    def insert_many(self, docs, ordered):
+        assert ordered is False
+        self.stored += docs
+
+
+def test_mongo_write_errors_become_item_errors():
+    class Rejecting(Reviews):
+        def insert_many(self, docs, ordered):
+            error = {"index": 1, "errmsg": "E11000 duplicate key"}
+            raise BulkWriteError({"writeErrors": [error]})
+
+    docs = [{"title": "a"}, {"title": "b", "id": 7}, {"title": "c"}]
+
+    with pytest.raises(BulkRowsRejected) as e:
+        insert_many(Rejecting([{"_id": 40}]), docs, key="id")
+
+    assert e.value.ids == [41, None, 42]
+    assert e.value.errors == {1: "E11000 duplicate key"}
+    assert [d["_id"] for d in docs] == [41, 7, 42]
+
+
+def test_mongo_ids_continue_after_migrated_reviews():
+    reviews = Reviews([{"_id": 40}, {"_id": 12}, {"_id": 30, "id": 30}])
+
+    first = insert_many(reviews, [{"title": "a"}, {"title": "b"}], key="id")
+    # the counter is taken from, so a second writer does not read the same top
+    second = insert_many(reviews, [{"title": "c"}], key="id")
+
+    assert (first, second) == ([41, 42], [43])
+    assert [d["_id"] for d in reviews.stored[3:]] == [41, 42, 43]
+
+
+def test_neo_nodes_created_with_one_unwind():
+    class Tx:
+        def run(self, query, **params):
+            self.query, self.params = query, params
+            return [{"id": 11}, {"id": 12}]
+
+    tx = Tx()
+
+    assert create_nodes(tx, "Artist", [{"name": "a"}, {"name": "b"}]) == [11, 12]
+    assert "UNWIND range(0, size($rows) - 1) AS i" in tx.query
+    assert "CREATE (n:Artist)" in tx.query
+    assert tx.params == {"rows": [{"name": "a"}, {"name": "b"}]}
+
+
+def test_invalid_items_reported_rest_written(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    lines = [
+        {"name": f"Fine {tag} 1"},
+        "{not json",
+        {"name": "   "},
+        {"name": f"Fine {tag} 2"},
+    ]
+
+    r = client.post("/api/games/bulk", content=ndjson(lines), headers=NDJSON)
+
+    body = r.json()
+    assert (body["received"], body["created"], body["failed"]) == (4, 2, 2)
+    first, second = body["errors"]
+    assert first["index"] == 1 and first["error"].startswith("Invalid JSON")
+    assert second["index"] == 2 and second["error"][0]["loc"] == ["name"]
+
+
+def test_taken_names_rejected(client, _allow_admin):
+    name = f"Taken {uuid.uuid4().hex[:8]}"
+    assert client.post("/api/artists", json={"name": name}).status_code == 200
+    fresh = f"Fresh {uuid.uuid4().hex[:8]}"
+
+    r = client.post(
+        "/api/artists/bulk",
+        json=[{"name": name}, {"name": fresh}, {"name": fresh}],
+    )
+
+    body = r.json()
+    assert body["created"] == 1
+    assert [e["index"] for e in body["errors"]] == [0, 2]
+    assert body["errors"][0]["error"] == "Artist with this name already exists"
+
+
+def test_body_not_array_refused(client, _allow_admin):
+    r = client.post("/api/games/bulk", json={"name": "Lonely"})
+
+    assert r.status_code == 400
+
+
+def test_over_item_limit_refused(client, _allow_admin, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_MAX_ITEMS", 2)
+    items = [{"name": f"Limit {n}"} for n in range(3)]
+
+    assert client.post("/api/games/bulk", json=items).status_code == 413
+    r = client.post("/api/games/bulk", content=ndjson(items), headers=NDJSON)
+    assert r.status_code == 413
@@ -0,0 +1,127 @@
+import uuid
+
+from app.utility.etag import EntityVersions, SQLVersionStore, entity_versions
+
+"""
+POSITIVE TESTS
+- test game detail answers 304 for a matching If-None-Match
+- test a write to the game changes its ETag
+- test a write to an embedded entity changes the detail ETag
+- test reference lists carry an ETag that follows writes
+- test 304 is answered without touching the service
+- test a write through another worker changes the ETag this one answers with
+
+NEGATIVE TESTS
+- test a stale or foreign ETag gets the full body
+- test no ETag is sent while the versions cannot be read
+"""
+
+
+def create_game(client, name):
+    r = client.post("/api/games", json={"name": name, "bgg_rating": 6.0})
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_game_detail_returns_304_for_matching_etag(client, _allow_admin):
+    game = create_game(client, f"Etag-{uuid.uuid4()}")
+    url = f"/api/games/{game['id']}/detail"
+
+    r = client.get(url)
+    assert r.status_code == 200, r.text
+    etag = r.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+    r = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert r.status_code == 304
+
+
+def test_game_write_changes_etag(client, _allow_admin):
+    game = create_game(client, f"Etag-{uuid.uuid4()}")
+    url = f"/api/games/{game['id']}"
+    etag = client.get(url).headers["etag"]
+
+    r = client.patch(url, json={"description": "changed"})
+    assert r.status_code == 200, r.text
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["description"] == "changed"
+    assert r.headers["etag"] != etag
+
+
+def test_embedded_entity_write_changes_detail_etag(client, _allow_admin):
+    game = create_game(client, f"Etag-{uuid.uuid4()}")
+    url = f"/api/games/{game['id']}/detail"
+    etag = client.get(url).headers["etag"]
+
+    r = client.post("/api/artists", json={"name": f"Artist-{uuid.uuid4()}"})
+    assert r.status_code in (200, 201), r.text
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_reference_list_etag_follows_writes(client, _allow_admin):
+    url = "/api/genres?limit=5"
+    r = client.get(url)
+    etag = r.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    # another query is another representation
+    other = client.get("/api/genres?limit=6").headers["etag"]
+    assert other != etag
+
+    r = client.post("/api/genres", json={"name": f"Genre {uuid.uuid4().hex[:8]}"})
+    assert r.status_code in (200, 201), r.text
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_not_modified_skips_the_service(client, _allow_admin, monkeypatch):
+    from app.service.game_service import GameService
+
+    url = "/api/games?limit=3"
+    etag = client.get(url).headers["etag"]
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("service called for a 304")
+
+    monkeypatch.setattr(GameService, "list", fail)
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_stale_etag_returns_full_body(client, _allow_admin):
+    game = create_game(client, f"Etag-{uuid.uuid4()}")
+
+    r = client.get(f"/api/games/{game['id']}", headers={"If-None-Match": '"stale"'})
+    assert r.status_code == 200
+    assert r.json()["id"] == game["id"]
+
+
+def test_other_worker_write_changes_etag(client, _allow_admin):
+    game = create_game(client, f"Etag-{uuid.uuid4()}")
+    url = f"/api/games/{game['id']}"
+    etag = client.get(url).headers["etag"]
+    # a second process shares nothing with this one but the database
+    other_worker = EntityVersions(SQLVersionStore())
+
+    other_worker.bump("game")
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_no_etag_without_versions(client, monkeypatch):
+    class Down:
+        def get(self, entities):
+            raise ConnectionError("db down")
+
+    monkeypatch.setattr(entity_versions, "_store", Down())
+
+    r = client.get("/api/genres?limit=5", headers={"If-None-Match": "*"})
+
+    assert r.status_code == 200
+    assert "etag" not in r.headers
@@ -0,0 +1,176 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import uuid
+
+from app.model.user_model import User
+from app.repository.game.neo_game_repository import GameRepositoryNeo
+from app.utility.export import accepts_gzip, chunked
+
+"""
+POSITIVE TESTS
+- test games stream as NDJSON in id order
+- test CSV has a header and one row per game
+- test the body is gzipped when the client accepts it
+- test an export resumes after the last id seen
+- test admins export users without their password hashes
+- test lines are gathered into chunks of about the chunk size
+- test Neo4j streams games with the driver's fetch size
+
+NEGATIVE TESTS
+- test deleted games are not exported
+- test users and reviews need an admin
+- test gzip refused with q=0 is not used
+"""
+
+
+def make_game(client, name: str) -> int:
+    r = client.post("/api/games", json={"name": name})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def make_user(db_session) -> int:
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        display_name=f"export-{tag}",
+        username=f"export-{tag}",
+        password="secret-hash",
+        dob=datetime.date(2000, 1, 1),
+        email=f"{tag}@example.com",
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+def ndjson(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_games_stream_as_ndjson(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    ids = [make_game(client, f"Export {tag} {n}") for n in range(3)]
+
+    r = client.get("/api/export/games")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="games.ndjson"' in r.headers["content-disposition"]
+    rows = ndjson(r.text)
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    exported = {row["id"]: row["name"] for row in rows}
+    assert [exported[i] for i in ids] == [f"Export {tag} {n}" for n in range(3)]
+
+
+def test_csv_has_header_and_rows(client, _allow_admin):
+    game_id = make_game(client, f"Csv {uuid.uuid4().hex[:8]}")
+
+    r = client.get("/api/export/games?format=csv")
+
+    assert r.headers["content-type"].startswith("text/csv")
+    reader = csv.DictReader(io.StringIO(r.text))
+    assert reader.fieldnames[:3] == ["id", "name", "slug"]
+    rows = {int(row["id"]): row for row in reader}
+    assert rows[game_id]["review_count"] == "0"
+
+
+def test_gzipped_when_accepted(client, _allow_admin):
+    make_game(client, f"Zipped {uuid.uuid4().hex[:8]}")
+
+    headers = {"Accept-Encoding": "gzip"}
+    with client.stream("GET", "/api/export/games", headers=headers) as r:
+        raw = b"".join(r.iter_raw())
+
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    plain = client.get("/api/export/games", headers={"Accept-Encoding": "identity"})
+    assert gzip.decompress(raw) == plain.content
+
+
+def test_resumes_after_last_id(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    first, second, third = (make_game(client, f"Resume {tag} {n}") for n in range(3))
+
+    r = client.get(f"/api/export/games?after={first}")
+
+    ids = [row["id"] for row in ndjson(r.text)]
+    assert first not in ids
+    assert ids[:2] == [second, third]
+
+
+def test_admin_exports_users_without_passwords(client, _allow_admin, db_session):
+    user_id = make_user(db_session)
+
+    r = client.get(f"/api/export/users?after={user_id - 1}")
+
+    row = ndjson(r.text)[0]
+    assert row["id"] == user_id
+    assert "password" not in row
+    assert "secret-hash" not in r.text
+
+
+def test_lines_gathered_into_chunks():
+    lines = ["abcd\n"] * 5
+
+    assert list(chunked(lines, size=10)) == [b"abcd\nabcd\n"] * 2 + [b"abcd\n"]
+
+
+def test_neo_streams_with_fetch_size():
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def run(self, query, **params):
+            self.query, self.params = query, params
+            return [{"g": {"id": 4, "name": "a"}}, {"g": {"id": 5, "name": "b"}}]
+
+    session = Session()
+
+    class Driver:
+        def session(self, **kwargs):
+            self.kwargs = kwargs
+            return session
+
+    driver = Driver()
+    rows = list(GameRepositoryNeo(driver).iter_export(("id", "name"), 3, 50))
+
+    assert rows == [{"id": 4, "name": "a"}, {"id": 5, "name": "b"}]
+    assert driver.kwargs == {"fetch_size": 50}
+    assert session.params == {"after": 3}
+    assert "ORDER BY g.id" in session.query
+
+
+def test_deleted_games_not_exported(client, _allow_admin):
+    game_id = make_game(client, f"Gone {uuid.uuid4().hex[:8]}")
+    assert client.delete(f"/api/games/{game_id}").status_code == 204
+
+    r = client.get(f"/api/export/games?after={game_id - 1}")
+
+    assert game_id not in [row["id"] for row in ndjson(r.text)]
+
+
+def test_users_and_reviews_need_admin(client, _deny_admin):
+    assert client.get("/api/export/users").status_code == 403
+    assert client.get("/api/export/reviews").status_code == 403
+
+
+def test_gzip_refused_with_q0(client):
+    r = client.get("/api/export/games", headers={"Accept-Encoding": "gzip;q=0"})
+
+    assert "content-encoding" not in r.headers
+
+
+def test_accepts_gzip_parses_quality():
+    class Request:
+        def __init__(self, value):
+            self.headers = {"accept-encoding": value}
+
+    assert accepts_gzip(Request("br, gzip;q=0.5"))
+    assert not accepts_gzip(Request("gzip; q=0"))
+    assert not accepts_gzip(Request("identity"))
@@ -0,0 +1,221 @@
+import random
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from app.model.game_model import game_genres, game_mechanics, game_publishers
+from app.model.genre_model import Genre
+from app.model.mechanic_model import Mechanic
+from app.model.publisher_model import Publisher
+from app.repository.game.mongo_game_repository import GameRepositoryMongo
+from app.repository.game.neo_game_repository import GameRepositoryNeo
+from app.service.game_service import build_facet_index
+from app.utility.facets import Bitmap
+
+"""
+POSITIVE TESTS
+- test bitmaps agree with sets across array and bitset containers
+- test players, playing time, difficulty and links are intersected
+- test facet counts are over the matching games only
+- test pages come in id order with the total
+- test an updated game is re-keyed, its links kept
+- test a deleted game and a deleted genre drop out
+- test MongoDB projects only the asked link kinds
+- test Neo4j matches only the asked relationships
+
+NEGATIVE TESTS
+- test an unknown mechanic matches nothing
+- test a limit above 100 or zero players is refused
+"""
+
+# (min_players, max_players, playing_time, difficulty_rating)
+GAMES = [(2, 4, 45, 2.0), (3, 5, 90, 3.5), (1, 3, 30, 1.5), (2, 2, 60, 2.5)]
+
+
+def make_game(client, min_players, max_players, playing_time, difficulty) -> int:
+    r = client.post(
+        "/api/games",
+        json={
+            "name": f"Faceted {uuid.uuid4()}",
+            "min_players": min_players,
+            "max_players": max_players,
+            "playing_time": playing_time,
+            "difficulty_rating": difficulty,
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def add(db_session, model, count: int) -> list[int]:
+    rows = [model(name=f"facet-{uuid.uuid4().hex[:8]}") for _ in range(count)]
+    db_session.add_all(rows)
+    db_session.commit()
+    return [r.id for r in rows]
+
+
+def link(db_session, table, column: str, game_id: int, ids: list[int]) -> None:
+    rows = [{"game_id": game_id, column: i} for i in ids]
+    db_session.execute(insert(table), rows)
+    db_session.commit()
+
+
+def filter_games(client, **params) -> dict:
+    r = client.get("/api/games/filter", params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+@pytest.fixture
+def games(client, _allow_admin, db_session):
+    """Four games on a fresh mechanic, two of them on a second one too."""
+    shared, worker = add(db_session, Mechanic, 2)
+    ids = [make_game(client, *game) for game in GAMES]
+    for game_id in ids:
+        link(db_session, game_mechanics, "mechanic_id", game_id, [shared])
+    for game_id in ids[:2]:
+        link(db_session, game_mechanics, "mechanic_id", game_id, [worker])
+    build_facet_index(db_session)
+    return ids, shared, worker
+
+
+def test_bitmap_agrees_with_sets():
+    rng = random.Random(7)
+    # a dense first chunk becomes a bitset, the sparse rest stay arrays
+    a = set(rng.sample(range(1 << 16), 6000)) | set(rng.sample(range(1 << 20), 900))
+    b = set(rng.sample(range(1 << 16), 5000)) | set(rng.sample(range(1 << 20), 900))
+    x, y = Bitmap.from_values(a), Bitmap.from_values(b)
+
+    assert len(x & y) == len(a & b)
+    assert (x - y).to_array().tolist() == sorted(a - b)
+    assert (x | y).to_array().tolist() == sorted(a | b)
+    assert x.select(100, 5) == sorted(a)[100:105]
+    assert all(v in x for v in rng.sample(sorted(a), 50))
+
+    copy = x & x
+    copy.add(1 << 21)
+    copy.discard(min(a))
+    assert (1 << 21) not in x and min(a) in x
+    assert len(copy) == len(a)
+
+
+def test_filters_intersected(client, games):
+    (two_four, three_five, one_three, two_two), shared, worker = games
+
+    assert filter_games(client, mechanic=shared, players=3)["total"] == 3
+    body = filter_games(client, mechanic=shared, players=[3, 4], max_time=60)
+    assert [i["id"] for i in body["items"]] == [two_four]
+    body = filter_games(client, mechanic=[shared, worker], max_difficulty=3)
+    assert [i["id"] for i in body["items"]] == [two_four]
+    body = filter_games(client, mechanic=shared, min_time=30, max_time=45)
+    assert [i["id"] for i in body["items"]] == [two_four, one_three]
+    assert two_two not in [i["id"] for i in body["items"]]
+
+
+def test_counts_over_matches(client, games):
+    _, shared, worker = games
+
+    facets = filter_games(client, mechanic=shared, players=2)["facets"]
+
+    assert {"value": worker, "count": 1} in facets["mechanic"]
+    assert {"value": shared, "count": 3} in facets["mechanic"]
+    assert facets["playing_time"] == [
+        {"value": 30, "count": 1},
+        {"value": 45, "count": 1},
+        {"value": 60, "count": 1},
+    ]
+    assert {"value": 2, "count": 3} in facets["players"]
+    assert {"value": 5, "count": 0} not in facets["players"]
+
+
+def test_pages_in_id_order(client, games):
+    ids, shared, _ = games
+
+    body = filter_games(client, mechanic=shared, offset=1, limit=2, facets=False)
+
+    assert [i["id"] for i in body["items"]] == ids[1:3]
+    assert body["total"] == 4
+    assert body["has_more"] is True
+    assert body["facets"] is None
+    body = filter_games(client, mechanic=shared, fields="id,name", limit=1)
+    assert set(body["items"][0]) == {"id", "name"}
+
+
+def test_updated_game_rekeyed(client, games):
+    (two_four, *_), shared, worker = games
+
+    r = client.patch(f"/api/games/{two_four}", json={"playing_time": 240})
+    assert r.status_code == 200, r.text
+
+    body = filter_games(client, mechanic=worker, min_time=200)
+    assert [i["id"] for i in body["items"]] == [two_four]
+    assert filter_games(client, mechanic=shared, max_time=45)["total"] == 1
+
+
+def test_deleted_game_and_genre_dropped(client, games, db_session):
+    (two_four, three_five, *_), shared, _ = games
+    (genre,) = add(db_session, Genre, 1)
+    (publisher,) = add(db_session, Publisher, 1)
+    link(db_session, game_genres, "genre_id", three_five, [genre])
+    link(db_session, game_publishers, "publisher_id", three_five, [publisher])
+    build_facet_index(db_session)
+    assert filter_games(client, genre=genre, publisher=publisher)["total"] == 1
+
+    assert client.delete(f"/api/genres/{genre}").status_code == 204
+    assert client.delete(f"/api/games/{two_four}").status_code == 204
+
+    assert filter_games(client, genre=genre)["total"] == 0
+    body = filter_games(client, mechanic=shared)
+    assert body["total"] == 3
+    assert all(f["value"] != genre for f in body["facets"]["genre"])
+
+
+def test_mongo_projects_asked_kinds():
+    class Collection:
+        def find(self, query, projection):
+            assert projection == {"mechanics.id": 1, "publishers.id": 1}
+            return [{"_id": 1, "mechanics": [{"id": 4}], "publishers": [{"id": 7}]}]
+
+    repo = GameRepositoryMongo({"games": Collection(), "tombstones": None})
+
+    assert list(repo.iter_features(("mechanics", "publishers"))) == [
+        (1, "mechanics", 4),
+        (1, "publishers", 7),
+    ]
+
+
+def test_neo_matches_asked_relationships():
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def run(self, query):
+            queries.append(query)
+            return [{"game_id": 1, "rel": "PUBLISHED_BY", "feature_id": 7}]
+
+    class Driver:
+        def session(self):
+            return Session()
+
+    queries = []
+    repo = GameRepositoryNeo(Driver())
+
+    assert list(repo.iter_features(("genres", "publishers"))) == [(1, "publishers", 7)]
+    assert "[r:IN_GENRE|PUBLISHED_BY]" in queries[0]
+
+
+def test_unknown_mechanic_matches_nothing(client):
+    body = filter_games(client, mechanic=987654321)
+
+    assert body["total"] == 0
+    assert body["items"] == []
+    assert body["has_more"] is False
+
+
+def test_bad_limit_and_players_refused(client):
+    assert client.get("/api/games/filter?limit=101").status_code == 422
+    assert client.get("/api/games/filter?players=0").status_code == 422
@@ -8,6 +8,21 @@ POSITIVE TESTS
 - test listing games
 - test listing games with pagination
 - test listing games with search q
+- test walking game pages with next_cursor
+- test skipping the total with count=none
+- test cached total is dropped after a create
+- test searching games ranks name prefix matches first
+- test search treats wildcards literally
+- test fields limits list items and still pages by cursor
+- test fields on get and detail
+- test list items are typed and cleaned like single games
+
+NEGATIVE TESTS
+- test malformed cursor
+- test cursor reused with another sort
+- test unknown count mode
+- test search without q
+- test unknown field
 """
 
 
@@ -80,7 +95,14 @@ def test_list_games_has_expected_shape(client, _allow_admin):
     assert r.status_code == 200, r.text
     data = r.json()
 
-    assert set(data.keys()) == {"total", "offset", "limit", "items"}
+    assert set(data.keys()) == {
+        "total",
+        "offset",
+        "limit",
+        "items",
+        "next_cursor",
+        "has_more",
+    }
     assert isinstance(data["total"], int)
     assert isinstance(data["offset"], int)
     assert isinstance(data["limit"], int)
@@ -122,6 +144,220 @@ def test_list_games_search_q_filters(client, _allow_admin):
     assert any(n == needle for n in names)
 
 
+def walk_cursor(client, url):
+    ids, pages = [], 0
+    r = client.get(url)
+    while True:
+        assert r.status_code == 200, r.text
+        data = r.json()
+        ids += [x["id"] for x in data["items"]]
+        pages += 1
+        if not data["next_cursor"]:
+            return ids, pages
+        r = client.get(f"{url}&cursor={data['next_cursor']}")
+
+
+def test_list_games_cursor_matches_offset_order(client, _allow_admin):
+    prefix = f"Cur-{uuid.uuid4()}"
+    for rating in (4.0, 7.5, 7.5, 2.0, 9.1):
+        create_game(
+            client, name=f"{prefix}-{rating}", description="d", bgg_rating=rating
+        )
+    r = client.post("/api/games", json={"name": f"{prefix}-unrated"})
+    assert r.status_code == 201, r.text
+
+    for sort in (
+        "",
+        "&sort_by=bgg_rating&sort_order=asc",
+        "&sort_by=bgg_rating&sort_order=desc",
+    ):
+        url = f"/api/games?q={prefix}&limit=2{sort}"
+        ids, pages = walk_cursor(client, url)
+
+        r = client.get(f"/api/games?q={prefix}&limit=10{sort}")
+        expected = [x["id"] for x in r.json()["items"]]
+
+        assert ids == expected
+        assert len(ids) == 6
+        assert pages == 3
+
+
+def test_list_games_malformed_cursor_returns_400(client):
+    r = client.get("/api/games?cursor=not-a-cursor")
+    assert r.status_code == 400, r.text
+
+
+def test_list_games_cursor_with_other_sort_returns_400(client, _allow_admin):
+    prefix = f"Mix-{uuid.uuid4()}"
+    create_game(client, name=f"{prefix}-a", description="d", bgg_rating=3.0)
+    create_game(client, name=f"{prefix}-b", description="d", bgg_rating=4.0)
+
+    r = client.get(f"/api/games?q={prefix}&limit=1&sort_by=name")
+    cursor = r.json()["next_cursor"]
+    assert cursor
+
+    r = client.get(f"/api/games?q={prefix}&limit=1&sort_by=bgg_rating&cursor={cursor}")
+    assert r.status_code == 400, r.text
+
+
+def test_list_games_count_none_skips_total(client, _allow_admin):
+    prefix = f"NoCount-{uuid.uuid4()}"
+    create_game(client, name=f"{prefix}-a", description="d", bgg_rating=3.0)
+    create_game(client, name=f"{prefix}-b", description="d", bgg_rating=4.0)
+
+    r = client.get(f"/api/games?q={prefix}&limit=1&count=none")
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["total"] is None
+    assert data["has_more"] is True
+    assert len(data["items"]) == 1
+
+    r = client.get(f"/api/games?q={prefix}&limit=1&offset=1&count=none")
+    assert r.json()["has_more"] is False
+
+
+def test_list_games_cached_total_invalidated_by_create(client, _allow_admin):
+    prefix = f"Cached-{uuid.uuid4()}"
+    create_game(client, name=f"{prefix}-a", description="d", bgg_rating=3.0)
+
+    url = f"/api/games?q={prefix}&count=cached"
+    assert client.get(url).json()["total"] == 1
+    assert client.get(url).json()["total"] == 1
+
+    create_game(client, name=f"{prefix}-b", description="d", bgg_rating=4.0)
+    assert client.get(url).json()["total"] == 2
+
+
+def test_list_games_unknown_count_mode_returns_422(client):
+    r = client.get("/api/games?count=sometimes")
+    assert r.status_code == 422, r.text
+
+
+def test_search_games_ranks_prefix_matches_first(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    create_game(client, name=f"The {tag} Expansion", description="d", bgg_rating=1.0)
+    create_game(client, name=f"{tag} Base Game", description="d", bgg_rating=1.0)
+
+    r = client.get(f"/api/games/search?q={tag}")
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert data["total"] == 2
+    assert data["has_more"] is False
+    assert [x["name"] for x in data["items"]] == [
+        f"{tag} Base Game",
+        f"The {tag} Expansion",
+    ]
+
+
+def test_search_games_treats_wildcards_literally(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    create_game(client, name=f"{tag} 100% Orange", description="d", bgg_rating=1.0)
+    create_game(client, name=f"{tag} 1000 Orange", description="d", bgg_rating=1.0)
+
+    r = client.get(f"/api/games/search?q={tag} 100%25")
+    assert r.status_code == 200, r.text
+    assert [x["name"] for x in r.json()["items"]] == [f"{tag} 100% Orange"]
+
+
+def test_search_games_without_q_returns_422(client):
+    r = client.get("/api/games/search")
+    assert r.status_code == 422, r.text
+
+
+def test_list_games_fields_limits_items_and_pages(client, _allow_admin):
+    prefix = f"Sparse-{uuid.uuid4()}"
+    for rating in (3.0, 6.0, 9.0):
+        create_game(
+            client, name=f"{prefix}-{rating}", description="long", bgg_rating=rating
+        )
+
+    url = f"/api/games?q={prefix}&limit=2&sort_by=bgg_rating&sort_order=asc&fields=name"
+    r = client.get(url)
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    # id always comes along; the sort field does not leak into the items
+    assert [set(x) for x in data["items"]] == [{"id", "name"}] * 2
+    assert data["next_cursor"]
+
+    r = client.get(f"{url}&cursor={data['next_cursor']}")
+    assert r.status_code == 200, r.text
+    assert len(r.json()["items"]) == 1
+
+    r = client.get(f"/api/games/search?q={prefix}&fields=name,bgg_rating")
+    assert r.status_code == 200, r.text
+    assert {x["bgg_rating"] for x in r.json()["items"]} == {3.0, 6.0, 9.0}
+
+
+def test_get_game_and_detail_with_fields(client, _allow_admin):
+    created = create_game(client, name="Go", description="Stones", bgg_rating=8.5)
+
+    r = client.get(f"/api/games/{created['id']}?fields=name,bgg_rating")
+    assert r.status_code == 200, r.text
+    assert r.json() == {"id": created["id"], "name": "Go", "bgg_rating": 8.5}
+
+    r = client.get(f"/api/games/{created['id']}/detail?fields=name,artists")
+    assert r.status_code == 200, r.text
+    assert r.json() == {"id": created["id"], "name": "Go", "artists": []}
+
+
+def test_list_games_items_are_typed_and_cleaned(client, _allow_admin):
+    prefix = f"Typed-{uuid.uuid4()}"
+    r = client.post(
+        "/api/games",
+        json={
+            "name": prefix,
+            "year_published": 1995,
+            "bgg_rating": 7.25,
+            "min_players": 2,
+        },
+    )
+    assert r.status_code == 201, r.text
+
+    r = client.get(f"/api/games?q={prefix}")
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "application/json"
+    assert "etag" in r.headers
+
+    (item,) = r.json()["items"]
+    assert item["year_published"] == 1995
+    assert item["bgg_rating"] == 7.25
+    assert item["min_players"] == 2
+    assert set(item) == {
+        "id",
+        "name",
+        "slug",
+        "year_published",
+        "bgg_rating",
+        "difficulty_rating",
+        "playing_time",
+        "description",
+        "min_players",
+        "max_players",
+        "image",
+        "thumbnail",
+        "review_count",
+        "rating_sum",
+        "user_rating",
+    }
+    assert (item["review_count"], item["user_rating"]) == (0, None)
+
+
+def test_games_unknown_field_returns_400(client, _allow_admin):
+    created = create_game(client, name="Hex", description="d", bgg_rating=6.0)
+
+    for url in (
+        "/api/games?fields=name,password",
+        "/api/games/search?q=Hex&fields=videos",
+        f"/api/games/{created['id']}?fields=artists",
+        f"/api/games/{created['id']}/detail?fields=reviews",
+    ):
+        r = client.get(url)
+        assert r.status_code == 400, r.text
+        assert "Unknown field" in r.json()["detail"]
+
+
 def test_update_game_patch_changes_fields(client, _allow_admin):
     created = create_game(client, name="Monopoly", description="Old", bgg_rating=6.5)
     game_id = created["id"]
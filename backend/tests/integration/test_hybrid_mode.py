@@ -0,0 +1,243 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from app.repository.game import game_repository_factory
+from app.repository.game.sql_game_repository import GameRepositorySQL
+from app.repository.hybrid_repository import (
+    HybridRepository,
+    ShadowRunner,
+    hybrid_stats,
+    parse_routes,
+    shadow_runner,
+)
+
+"""
+POSITIVE TESTS
+- test routed reads go to their store while writes stay on SQL
+- test hybrid game detail is served by the routed store and shows in /hybrid/stats
+- test shadow reads time the other stores without changing the result
+- test shadow reads run off the request thread, SQL ones on their own session
+- test async repositories are routed and awaited
+- test routes default to game detail on Mongo and can be overridden
+
+NEGATIVE TESTS
+- test routing a write or to an unknown store is rejected
+- test a failing shadow read is counted but not raised
+- test shadow reads beyond the workers and queue are dropped
+"""
+
+
+class Recorder:
+    """Stands in for one store's repository and logs what it was asked."""
+
+    SORT_FIELDS = {"name": "name"}
+
+    def __init__(self, backend: str, calls: list):
+        self.backend = backend
+        self.calls = calls
+
+    def get(self, item_id):
+        self.calls.append((self.backend, "get"))
+        return {"id": item_id, "from": self.backend}
+
+    def create(self, data):
+        self.calls.append((self.backend, "create"))
+        return data
+
+
+class FailingRecorder(Recorder):
+    def get(self, item_id):
+        raise ConnectionError(self.backend)
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    from app.repository import hybrid_repository
+
+    table = {}
+    monkeypatch.setattr(hybrid_repository, "HYBRID_ROUTES", table)
+    hybrid_stats.clear()
+    yield table
+    hybrid_stats.clear()
+
+
+def test_routed_reads_and_sql_writes(routes):
+    calls = []
+    routes["thing.get"] = "neo"
+    repo = HybridRepository(
+        "thing",
+        Recorder("sql", calls),
+        mongo=lambda: Recorder("mongo", calls),
+        neo=lambda: Recorder("neo", calls),
+    )
+
+    assert repo.get(1) == {"id": 1, "from": "neo"}
+    repo.create({"name": "x"})
+
+    assert calls == [("neo", "get"), ("sql", "create")]
+    assert repo.SORT_FIELDS == {"name": "name"}
+    # mongo was never asked for anything, so it was never built
+    assert set(repo._built) == {"sql", "neo"}
+    assert hybrid_stats.snapshot()["operations"]["thing.get"]["neo"]["calls"] == 1
+
+
+def test_hybrid_game_detail_served_by_routed_store(
+    client, _allow_admin, db_session, routes, monkeypatch
+):
+    served = []
+
+    class MongoStandIn(GameRepositorySQL):
+        def get_detail(self, game_id, fields=None):
+            served.append(game_id)
+            return super().get_detail(game_id, fields)
+
+    routes["game.get_detail"] = "mongo"
+    monkeypatch.setattr(game_repository_factory, "DB_MODE", "hybrid")
+    monkeypatch.setattr(
+        game_repository_factory, "_mongo_repository", lambda: MongoStandIn(db_session)
+    )
+
+    r = client.post("/api/games", json={"name": f"Hybrid {uuid.uuid4()}"})
+    assert r.status_code == 201, r.text
+    game_id = r.json()["id"]
+
+    assert client.get(f"/api/games/{game_id}/detail").status_code == 200
+    assert client.get(f"/api/games/{game_id}").status_code == 200
+
+    assert served == [str(game_id)]
+    stats = client.get("/hybrid/stats").json()
+    detail = stats["operations"]["game.get_detail"]["mongo"]
+    assert detail["served_by"] is True
+    assert detail["calls"] == 1
+    assert "game.get" not in stats["operations"]
+
+
+def test_shadow_reads_time_other_stores(routes, monkeypatch):
+    from app.repository import hybrid_repository
+
+    calls = []
+    routes["thing.get"] = "mongo"
+    monkeypatch.setattr(hybrid_repository, "HYBRID_SHADOW_RATE", 1.0)
+    repo = HybridRepository(
+        "thing",
+        Recorder("sql", calls),
+        mongo=lambda: Recorder("mongo", calls),
+        neo=lambda: Recorder("neo", calls),
+    )
+
+    assert repo.get(7)["from"] == "mongo"
+    repo.create({})
+    assert shadow_runner.wait_idle(5)
+
+    assert calls[0] == ("mongo", "get")
+    assert sorted(calls[1:]) == [("neo", "get"), ("sql", "create"), ("sql", "get")]
+    operation = hybrid_stats.snapshot()["operations"]["thing.get"]
+    assert operation["sql"]["shadow_calls"] == 1
+    assert operation["mongo"]["shadow_calls"] == 0
+
+
+def test_shadows_off_request_thread(routes, monkeypatch, db_session):
+    from app.repository import hybrid_repository
+
+    class SQLRecorder(GameRepositorySQL):
+        def get(self, game_id):
+            shadows.append((threading.current_thread().name, self.db))
+            return game_id
+
+    calls, shadows = [], []
+    routes["thing.get"] = "mongo"
+    monkeypatch.setattr(hybrid_repository, "HYBRID_SHADOW_RATE", 1.0)
+    repo = HybridRepository(
+        "thing", SQLRecorder(db_session), mongo=lambda: Recorder("mongo", calls)
+    )
+
+    assert repo.get(2)["from"] == "mongo"
+    assert shadow_runner.wait_idle(5)
+
+    ((thread, session),) = shadows
+    assert thread.startswith("hybrid-shadow")
+    # the request's session stays with the request
+    assert session is not db_session
+
+
+def test_async_repositories_routed(routes):
+    class AsyncRecorder:
+        def __init__(self, backend):
+            self.backend = backend
+
+        async def get(self, item_id):
+            return self.backend, item_id
+
+    routes["thing.get"] = "mongo"
+    repo = HybridRepository(
+        "thing", AsyncRecorder("sql"), mongo=lambda: AsyncRecorder("mongo")
+    )
+
+    assert asyncio.run(repo.get(3)) == ("mongo", 3)
+    assert hybrid_stats.snapshot()["operations"]["thing.get"]["mongo"]["calls"] == 1
+
+
+def test_default_and_overridden_routes():
+    assert parse_routes(None) == {"game.get_detail": "mongo"}
+    assert parse_routes("game.get_detail=sql, review.list_by_game=NEO") == {
+        "game.get_detail": "sql",
+        "review.list_by_game": "neo",
+    }
+
+
+@pytest.mark.parametrize(
+    "spec", ["game.create=mongo", "game.get=redis", "game=mongo", "get_detail"]
+)
+def test_invalid_routes_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_routes(spec)
+
+
+def test_failing_shadow_counted_not_raised(routes, monkeypatch):
+    from app.repository import hybrid_repository
+
+    calls = []
+    routes["thing.get"] = "sql"
+    monkeypatch.setattr(hybrid_repository, "HYBRID_SHADOW_RATE", 1.0)
+    repo = HybridRepository(
+        "thing", Recorder("sql", calls), neo=lambda: FailingRecorder("neo", calls)
+    )
+
+    assert repo.get(1)["from"] == "sql"
+    assert shadow_runner.wait_idle(5)
+
+    neo = hybrid_stats.snapshot()["operations"]["thing.get"]["neo"]
+    assert neo["errors"] == 1
+    assert neo["served_by"] is False
+
+
+def test_saturated_shadows_dropped(routes, monkeypatch):
+    from app.repository import hybrid_repository
+
+    class Blocked(Recorder):
+        def get(self, item_id):
+            release.wait(5)
+            return super().get(item_id)
+
+    release = threading.Event()
+    calls = []
+    routes["thing.get"] = "sql"
+    runner = ShadowRunner(workers=1, max_queue=1)
+    monkeypatch.setattr(hybrid_repository, "HYBRID_SHADOW_RATE", 1.0)
+    monkeypatch.setattr(hybrid_repository, "shadow_runner", runner)
+    repo = HybridRepository(
+        "thing", Recorder("sql", calls), neo=lambda: Blocked("neo", calls)
+    )
+
+    # one shadow runs, one waits, the rest are dropped; none holds a request up
+    assert [repo.get(i)["from"] for i in range(4)] == ["sql"] * 4
+    assert runner.snapshot()["dropped"] == 2
+    release.set()
+    assert runner.wait_idle(5)
+    runner.shutdown()
+
+    assert calls.count(("neo", "get")) == 2
+    assert runner.snapshot()["completed"] == 2
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import uuid
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+from app.controller import auth_controller
+from app.utility.login_admission import LoginAdmission
+from app.utility.password_hasher import HasherBusy, PasswordHasher
+
+"""
+POSITIVE TESTS
+- test login and token verify passwords on the hasher's executor
+- test the process executor verifies and hashes passwords
+
+NEGATIVE TESTS
+- test repeated logins for one username are rejected with 429
+- test one IP is limited across usernames
+- test a rejected attempt spends no token
+- test the hasher turns work away once its queue is full
+"""
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    limiter = LoginAdmission(
+        user_burst=2, user_per_minute=1, ip_burst=3, ip_per_minute=1, max_keys=100
+    )
+    monkeypatch.setattr(auth_controller, "login_admission", limiter)
+    return limiter
+
+
+def create_user(client) -> str:
+    tag = uuid.uuid4().hex[:8]
+    r = client.post(
+        "/api/users",
+        json={
+            "display_name": f"Player {tag}",
+            "username": f"player-{tag}",
+            "email": f"{tag}@example.com",
+            "dob": "1990-01-01",
+            "password": "secret123",
+        },
+    )
+    assert r.status_code == 200, r.text
+    return r.json()["username"]
+
+
+def test_login_and_token_use_hasher(client, _allow_admin):
+    username = create_user(client)
+    before = client.get("/auth/stats").json()["hasher"]["completed"]
+
+    r = client.post("/auth/login", json={"username": username, "password": "secret123"})
+    assert r.status_code == 200, r.text
+    r = client.post("/auth/token", data={"username": username, "password": "wrong"})
+    assert r.status_code == 400, r.text
+
+    stats = client.get("/auth/stats").json()["hasher"]
+    assert stats["completed"] == before + 2
+    assert stats["pending"] == 0
+
+
+def test_process_executor_hashes_and_verifies():
+    hasher = PasswordHasher(workers=1, max_queue=1, kind="process")
+    try:
+        hashed = hasher.hash_blocking("secret123")
+        assert bcrypt.checkpw(b"secret123", hashed.encode("utf-8"))
+        assert asyncio.run(hasher.verify("secret123", hashed))
+        assert not hasher.verify_blocking("nope", hashed)
+    finally:
+        hasher.shutdown()
+
+
+def test_repeated_logins_for_username_get_429(client, admission):
+    username = create_user(client)
+    payload = {"username": username, "password": "wrong"}
+
+    for _ in range(2):
+        assert client.post("/auth/login", json=payload).status_code == 401
+
+    r = client.post("/auth/login", json=payload)
+    assert r.status_code == 429, r.text
+    assert int(r.headers["Retry-After"]) >= 1
+    assert admission.snapshot()["rejected_user"] == 1
+
+
+def test_one_ip_is_limited_across_usernames(client, admission):
+    for i in range(3):
+        r = client.post(
+            "/auth/token", data={"username": f"nobody-{i}", "password": "x"}
+        )
+        assert r.status_code == 400, r.text
+
+    r = client.post("/auth/token", data={"username": "nobody-new", "password": "x"})
+    assert r.status_code == 429, r.text
+    assert admission.snapshot()["rejected_ip"] == 1
+
+
+def test_rejected_attempt_spends_no_token(admission):
+    admission.admit("alice", "10.0.0.1")
+    admission.admit("alice", "10.0.0.1")
+    with pytest.raises(HTTPException):
+        admission.admit("alice", "10.0.0.1")
+
+    # the IP still has the one token alice's rejected attempt did not take
+    admission.admit("bob", "10.0.0.1")
+    assert admission.snapshot()["admitted"] == 3
+
+
+def test_hasher_rejects_when_queue_is_full():
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = hasher._submit(release.wait)
+        queued = hasher._submit(release.wait)
+        with pytest.raises(HasherBusy) as exc:
+            hasher._submit(release.wait)
+        assert exc.value.status_code == 503
+
+        snapshot = hasher.snapshot()
+        assert snapshot["queued"] == 1
+        assert snapshot["rejected"] == 1
+    finally:
+        release.set()
+        running.result()
+        queued.result()
+        hasher.shutdown()
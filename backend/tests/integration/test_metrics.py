@@ -0,0 +1,126 @@
+import re
+
+import pytest
+
+from app.repository.game.sql_game_repository import GameRepositorySQL
+from app.utility.metrics import (
+    Histogram,
+    instrument_class,
+    repository_errors,
+    repository_seconds,
+)
+
+"""
+POSITIVE TESTS
+- test requests are timed per route template
+- test repository calls are timed by backend, entity and method
+- test the in-flight gauge counts the scrape itself
+- test pool and cache gauges are exported
+- test histogram buckets are cumulative
+
+NEGATIVE TESTS
+- test unmatched paths share one route label
+- test a repository call that raises is counted and re-raised
+"""
+
+
+def sample(text: str, name: str, **labels) -> float | None:
+    """Value of the sample with exactly these labels, None when absent."""
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    pattern = (
+        rf"^{re.escape(name)}{re.escape('{' + wanted + '}') if wanted else ''} (\S+)$"
+    )
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_requests_timed_per_route_template(client, _allow_admin):
+    before = client.get("/metrics").text
+    labels = {"method": "GET", "route": "/api/games/{game_id}", "status": "404"}
+    count = sample(before, "http_request_duration_seconds_count", **labels) or 0
+
+    client.get("/api/games/999999")
+    client.get("/api/games/999998")
+
+    text = client.get("/metrics").text
+    assert sample(text, "http_request_duration_seconds_count", **labels) == count + 2
+    assert '/api/games/999999"' not in text
+
+
+def test_repository_calls_timed_by_backend(client, _allow_admin):
+    labels = ("sql", "game", "list")
+    count = repository_seconds.count(labels)
+
+    assert client.get("/api/games?limit=1").status_code == 200
+
+    assert repository_seconds.count(labels) == count + 1
+    text = client.get("/metrics").text
+    assert (
+        sample(
+            text,
+            "repository_call_duration_seconds_count",
+            backend="sql",
+            entity="game",
+            method="list",
+        )
+        == count + 1
+    )
+    assert getattr(GameRepositorySQL.list, "__instrumented__", False)
+
+
+def test_in_flight_gauge_counts_scrape(client, _allow_admin):
+    r = client.get("/metrics")
+
+    assert r.headers["content-type"].startswith("text/plain")
+    assert sample(r.text, "http_requests_in_flight") == 1
+
+
+def test_pool_and_cache_gauges_exported(client, _allow_admin):
+    text = client.get("/metrics").text
+
+    assert sample(text, "db_pool_utilisation", backend="sql") is not None
+    assert sample(text, "cache_hit_ratio", cache="count") is not None
+    assert sample(text, "cache_hit_ratio", cache="principal") is not None
+    assert sample(text, "login_pending", component="hasher") is not None
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("demo_seconds", "Demo.", ("op",), buckets=(0.1, 1))
+    for seconds in (0.05, 0.5, 0.5, 5):
+        histogram.observe(("read",), seconds)
+
+    text = "\n".join(histogram.render())
+    assert sample(text, "demo_seconds_bucket", op="read", le=0.1) == 1
+    assert sample(text, "demo_seconds_bucket", op="read", le=1) == 3
+    assert sample(text, "demo_seconds_bucket", op="read", le="+Inf") == 4
+    assert sample(text, "demo_seconds_sum", op="read") == pytest.approx(6.05)
+    assert sample(text, "demo_seconds_count", op="read") == 4
+
+
+def test_unmatched_paths_share_one_label(client, _allow_admin):
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+
+    text = client.get("/metrics").text
+    assert sample(
+        text,
+        "http_request_duration_seconds_count",
+        method="GET",
+        route="unmatched",
+        status="404",
+    )
+    assert "/no/such/path" not in text
+
+
+def test_failing_repository_call_counted_and_reraised():
+    class FlakyRepository:
+        def get(self, item_id):
+            raise LookupError(item_id)
+
+    instrument_class(FlakyRepository, "sql", "flaky")
+
+    with pytest.raises(LookupError):
+        FlakyRepository().get(1)
+
+    assert repository_errors.value(("sql", "flaky", "get")) == 1
+    assert repository_seconds.count(("sql", "flaky", "get")) == 1
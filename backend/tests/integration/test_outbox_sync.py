@@ -0,0 +1,303 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.model.outbox_model import OutboxCursor, OutboxEvent
+from app.model.review_model import Review
+from app.model.user_model import User
+from app.utility import outbox
+from app.utility.outbox_sync import (
+    MongoSyncTarget,
+    NeoSyncTarget,
+    OutboxSync,
+    _utcnow,
+    load_changes,
+)
+from app.utility.sql_profiler import capture_queries
+
+"""
+POSITIVE TESTS
+- test game writes append outbox events in their own transaction
+- test the worker applies current SQL state in batches and advances its cursor
+- test replaying the outbox leaves the target unchanged
+- test review rows and their game are synced to Mongo documents
+- test the users of a batch of reviews are read in one query
+- test Neo4j gets one transaction with nodes, relationships and deletes
+- test lag and pending counts are reported per target
+
+NEGATIVE TESTS
+- test nothing is recorded while the outbox is off
+- test a failing target keeps its cursor while the others move on
+- test the worker waits at a fresh id gap and skips an old one
+"""
+
+
+class MemoryTarget:
+    """A store kept in dicts, which is what a target's apply must converge to."""
+
+    def __init__(self, name: str = "memory"):
+        self.name = name
+        self.games: dict[int, dict] = {}
+        self.reviews: dict[int, dict] = {}
+        self.batches = 0
+
+    def apply(self, games, reviews):
+        self.batches += 1
+        for store, changes in ((self.games, games), (self.reviews, reviews)):
+            for key, row in changes.items():
+                if row is None:
+                    store.pop(key, None)
+                else:
+                    store[key] = row
+
+
+class BrokenTarget(MemoryTarget):
+    def apply(self, games, reviews):
+        raise ConnectionError("store down")
+
+
+@pytest.fixture
+def _outbox_on(monkeypatch, db_session):
+    monkeypatch.setattr(outbox, "OUTBOX_ENABLED", True)
+    db_session.execute(delete(OutboxEvent))
+    db_session.execute(delete(OutboxCursor))
+    db_session.commit()
+
+
+def make_sync(db_session, *targets, **kwargs) -> OutboxSync:
+    factory = sessionmaker(bind=db_session.get_bind(), autoflush=False)
+    return OutboxSync(session_factory=factory, targets=list(targets), **kwargs)
+
+
+def events(db_session) -> list[tuple[str, str]]:
+    db_session.expire_all()
+    rows = db_session.execute(select(OutboxEvent).order_by(OutboxEvent.id)).scalars()
+    return [(e.entity, e.op) for e in rows]
+
+
+def create_game(client, **fields) -> int:
+    r = client.post("/api/games", json={"name": f"Outbox {uuid.uuid4()}", **fields})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def add_review(db_session, game_id: int) -> int:
+    user = User(
+        display_name=f"u{uuid.uuid4().hex[:12]}",
+        username=f"outbox-{uuid.uuid4()}",
+        password="x",
+        dob=_utcnow().date(),
+        email="outbox@example.com",
+    )
+    db_session.add(user)
+    db_session.flush()
+    review = Review(title="Good", star_amount=4, user_id=user.id, game_id=game_id)
+    db_session.add(review)
+    db_session.commit()
+    return review.id
+
+
+def test_game_writes_append_events(client, _allow_admin, db_session, _outbox_on):
+    game_id = create_game(client)
+    assert (
+        client.patch(f"/api/games/{game_id}", json={"playing_time": 30}).status_code
+        == 200
+    )
+    assert client.delete(f"/api/games/{game_id}").status_code in (200, 204)
+
+    assert events(db_session) == [
+        ("game", "upsert"),
+        ("game", "upsert"),
+        ("game", "delete"),
+    ]
+    # a rolled back write leaves no event behind
+    db_session.add(OutboxEvent(entity="game", entity_id=1, op="upsert"))
+    db_session.rollback()
+    assert len(events(db_session)) == 3
+
+
+def test_worker_applies_state_and_advances(
+    client, _allow_admin, db_session, _outbox_on
+):
+    target = MemoryTarget()
+    sync = make_sync(db_session, target, batch_size=2)
+    kept = create_game(client, playing_time=45)
+    gone = create_game(client)
+    client.patch(f"/api/games/{kept}", json={"playing_time": 60})
+    client.delete(f"/api/games/{gone}")
+
+    assert sync.run_once() == 2
+    assert sync.run_once() == 2
+    assert sync.run_once() == 0
+
+    assert set(target.games) == {kept}
+    assert target.games[kept]["playing_time"] == 60
+    assert target.games[kept]["review_ids"] == []
+    assert target.batches == 2
+    assert sync.snapshot()["memory"]["applied"] == 4
+    # the only target has applied everything, so the events are purged
+    assert events(db_session) == []
+    assert db_session.get(OutboxCursor, "memory").last_id > 0
+
+
+def test_replay_is_idempotent(client, _allow_admin, db_session, _outbox_on):
+    target = MemoryTarget()
+    game_id = create_game(client, min_players=2)
+    add_review(db_session, game_id)
+    client.patch(f"/api/games/{game_id}", json={"max_players": 4})
+    make_sync(db_session, target).sync_target(target)
+    first = (dict(target.games), dict(target.reviews))
+
+    db_session.execute(delete(OutboxCursor))
+    db_session.commit()
+    make_sync(db_session, target).sync_target(target)
+
+    assert (target.games, target.reviews) == first
+    assert len(target.reviews) == 1
+    assert target.games[game_id]["max_players"] == 4
+
+
+def test_review_and_game_synced_to_mongo(client, _allow_admin, db_session, _outbox_on):
+    class Collection:
+        def __init__(self):
+            self.ops = []
+
+        def bulk_write(self, ops, ordered):
+            self.ops.extend(ops)
+
+        def update_many(self, query, update):
+            self.ops.append(("update_many", query, update))
+
+    db = {"games": Collection(), "reviews": Collection()}
+    target = MongoSyncTarget(db)
+    game_id = create_game(client, thumbnail="t.png")
+    review_id = add_review(db_session, game_id)
+
+    make_sync(db_session, target).sync_target(target)
+
+    replace = db["games"].ops[0]
+    assert replace._filter == {"_id": game_id}
+    assert replace._doc["images"] == {"thumbnail": "t.png", "image": None}
+    assert replace._doc["review_ids"] == [review_id]
+    review = db["reviews"].ops[0]._doc
+    assert review["_id"] == review["id"] == review_id
+    assert review["user"]["display_name"].startswith("u")
+    assert db["games"].ops[1]._doc == {"$addToSet": {"review_ids": review_id}}
+
+
+def test_review_users_read_in_one_query(client, _allow_admin, db_session):
+    game_id = create_game(client)
+    review_ids = [add_review(db_session, game_id) for _ in range(5)]
+    changed = [OutboxEvent(entity="review", entity_id=i) for i in review_ids]
+
+    # a fresh session, so no user is in the identity map already
+    with sessionmaker(bind=db_session.get_bind())() as db, capture_queries() as q:
+        _, reviews = load_changes(db, changed)
+
+    assert all(reviews[i]["user"]["username"] for i in review_ids)
+    assert not q.n_plus_one()
+    assert q.count == 2
+
+
+def test_neo_gets_one_transaction(client, _allow_admin, db_session, _outbox_on):
+    queries = []
+
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def execute_write(self, fn, *args):
+            fn(self, *args)
+
+        def run(self, query, **params):
+            queries.append((" ".join(query.split()), params))
+
+    class Driver:
+        def session(self):
+            return Session()
+
+    target = NeoSyncTarget(Driver())
+    kept = create_game(client)
+    gone = create_game(client)
+    client.delete(f"/api/games/{gone}")
+
+    make_sync(db_session, target).sync_target(target)
+
+    assert queries[0][0].startswith("UNWIND $rows AS row MERGE (g:Game")
+    assert [row["id"] for row in queries[0][1]["rows"]] == [kept]
+    assert "artists" not in queries[0][1]["rows"][0]["props"]
+    assert len([q for q, _ in queries if "MERGE (x:" in q]) == 5
+    assert queries[-1][1] == {"ids": [gone]}
+
+
+def test_lag_and_pending_reported(client, _allow_admin, db_session, _outbox_on):
+    target = MemoryTarget()
+    sync = make_sync(db_session, target, batch_size=1)
+    create_game(client)
+    create_game(client)
+    db_session.execute(
+        OutboxEvent.__table__.update().values(
+            created_at=_utcnow() - timedelta(seconds=30)
+        )
+    )
+    db_session.commit()
+
+    sync.sync_target(target)
+
+    stats = sync.snapshot()["memory"]
+    assert stats["pending"] == 1
+    assert stats["lag_seconds"] >= 29
+    assert client.get("/outbox/stats").status_code == 200
+
+
+def test_nothing_recorded_when_off(
+    client, _allow_admin, db_session, _outbox_on, monkeypatch
+):
+    monkeypatch.setattr(outbox, "OUTBOX_ENABLED", False)
+
+    create_game(client)
+
+    assert events(db_session) == []
+
+
+def test_failing_target_keeps_its_cursor(client, _allow_admin, db_session, _outbox_on):
+    good, broken = MemoryTarget("good"), BrokenTarget("broken")
+    sync = make_sync(db_session, good, broken)
+    game_id = create_game(client)
+
+    assert sync.run_once() == 1
+
+    assert set(good.games) == {game_id}
+    stats = sync.snapshot()
+    assert stats["broken"]["errors"] == 1
+    assert "store down" in stats["broken"]["last_error"]
+    # nothing is purged while a target still needs the events
+    assert len(events(db_session)) == 1
+
+    broken.apply = MemoryTarget.apply.__get__(broken)
+    assert sync.sync_target(broken) == 1
+    assert set(broken.games) == {game_id}
+
+
+def test_waits_at_fresh_gap_skips_old_one(db_session, _outbox_on):
+    target = MemoryTarget()
+    sync = make_sync(db_session, target, gap_grace=60)
+    db_session.add(OutboxEvent(id=1, entity="game", entity_id=999001, op="delete"))
+    db_session.add(OutboxEvent(id=3, entity="game", entity_id=999003, op="delete"))
+    db_session.commit()
+
+    assert sync.sync_target(target) == 1
+
+    db_session.execute(
+        OutboxEvent.__table__.update().values(
+            created_at=_utcnow() - timedelta(minutes=5)
+        )
+    )
+    db_session.commit()
+    assert sync.sync_target(target) == 1
@@ -0,0 +1,41 @@
+import pytest
+
+from app.main import app
+from app.utility import db_sql
+from app.utility.db_sql import get_sql_db
+
+"""
+POSITIVE TESTS
+- test pool stats endpoint shape
+- test sessions are returned to the pool after each request
+
+NEGATIVE TESTS
+- test the stats and metrics endpoints need an admin
+"""
+
+
+def test_pool_stats_returns_sql_section(client, _allow_admin):
+    r = client.get("/pools")
+    assert r.status_code == 200, r.text
+    data = r.json()
+
+    assert "sql" in data
+    assert data["sql"]["pool"]
+    assert "checkouts" in data["sql"]
+    assert "wait_avg_ms" in data["sql"]
+
+
+def test_requests_return_sql_sessions_to_pool(client):
+    app.dependency_overrides.pop(get_sql_db, None)
+
+    for _ in range(30):
+        r = client.get("/api/games?limit=1")
+        assert r.status_code == 200, r.text
+
+    assert db_sql.engine.pool.checkedout() == 0
+
+
+@pytest.mark.parametrize("path", ["/pools", "/auth/stats", "/purge/stats", "/metrics"])
+def test_ops_endpoints_need_admin(client, path):
+    r = client.get(path)
+    assert r.status_code == 401, r.text
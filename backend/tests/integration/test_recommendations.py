@@ -0,0 +1,301 @@
+import datetime
+import types
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.model.game_recommendation_model import GameRecommendation
+from app.model.review_model import Review
+from app.model.user_model import User
+from app.repository.recommendation.mongo_recommendation_repository import (
+    RecommendationRepositoryMongo,
+)
+from app.utility.auth import get_current_user
+from app.utility.recommender import (
+    MongoRecommendStore,
+    NeoRecommendStore,
+    Recommender,
+    SQLRecommendStore,
+    item_similarities,
+)
+
+"""
+POSITIVE TESTS
+- test games rated alike by the same users are similar, opposite ones are not
+- test a pair needs enough co-raters and each game keeps its top K
+- test a build replaces the whole table
+- test /me/recommendations predicts from the user's own stars, unreviewed games only
+- test a deleted game is not recommended
+- test build stats are kept and served
+- test MongoDB builds aside and renames over the old model
+- test MongoDB serving weights the user's stars by similarity
+- test Neo4j builds the model in one write transaction
+
+NEGATIVE TESTS
+- test a user without reviews gets nothing
+- test a failing store is counted as an error
+- test a limit above 100 is refused
+"""
+
+# stars of three raters on four games: the first two like 0, 1 and 3 and
+# dislike 2, the third the other way round
+STARS = [(9, 9, 2, 8), (8, 9, 1, 9), (2, 3, 9, 3)]
+
+
+def make_user(db_session) -> int:
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        display_name=f"rater-{tag}",
+        username=f"rater-{tag}",
+        password="x",
+        dob=datetime.date(2000, 1, 1),
+        email=f"{tag}@example.com",
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+def make_game(client) -> int:
+    r = client.post("/api/games", json={"name": f"Liked {uuid.uuid4()}"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def rate(db_session, user_id: int, stars: dict[int, int]) -> None:
+    db_session.add_all(
+        Review(title="t", star_amount=s, user_id=user_id, game_id=g)
+        for g, s in stars.items()
+    )
+    db_session.commit()
+
+
+def make_recommender(db_session) -> Recommender:
+    factory = sessionmaker(bind=db_session.get_bind(), autoflush=False)
+    return Recommender(SQLRecommendStore(session_factory=factory))
+
+
+def login_as(user_id: int) -> None:
+    # conftest removes the override after each test
+    app.dependency_overrides[get_current_user] = lambda: types.SimpleNamespace(
+        id=user_id
+    )
+
+
+@pytest.fixture
+def games(client, _allow_admin, db_session):
+    """Four games rated by three users, and a model built from them."""
+    ids = [make_game(client) for _ in range(4)]
+    for stars in STARS:
+        rate(db_session, make_user(db_session), dict(zip(ids, stars, strict=True)))
+    assert make_recommender(db_session).run_once()
+    return ids
+
+
+def test_alike_ratings_similar():
+    ratings = [(u, g, s) for u, row in enumerate(STARS) for g, s in enumerate(row)]
+
+    pairs = {(g, o): (score, n) for g, o, score, n in item_similarities(ratings, 5, 2)}
+
+    assert pairs[0, 1][0] > 0.8
+    assert pairs[0, 1] == pairs[1, 0]
+    assert pairs[0, 1][1] == 3
+    assert (0, 2) not in pairs and (2, 0) not in pairs
+
+
+def test_support_and_top_k():
+    ratings = [(u, g, s) for u, row in enumerate(STARS) for g, s in enumerate(row)]
+    # a fourth game only one user rated, exactly like game 0
+    ratings += [(0, 4, 9)]
+
+    assert all(4 not in pair[:2] for pair in item_similarities(ratings, 5, 2))
+    pairs = item_similarities(ratings, 1, 1)
+    assert [p[:2] for p in pairs if p[0] == 0] == [(0, 1)]
+    assert len({p[0] for p in pairs}) == len(pairs)
+
+
+def test_build_replaces_table(games, db_session):
+    recommender = make_recommender(db_session)
+    stale = GameRecommendation(
+        game_id=games[0], similar_game_id=10**9, score=1, support=9
+    )
+    db_session.add(stale)
+    db_session.commit()
+
+    recommender.run_once()
+
+    db_session.expire_all()
+    rows = db_session.execute(
+        select(GameRecommendation.similar_game_id).where(
+            GameRecommendation.game_id == games[0]
+        )
+    ).scalars()
+    assert set(rows) == {games[1], games[3]}
+
+
+def test_recommendations_from_own_stars(client, games, db_session):
+    user_id = make_user(db_session)
+    rate(db_session, user_id, {games[0]: 9, games[2]: 2})
+    login_as(user_id)
+
+    r = client.get("/me/recommendations")
+
+    assert r.status_code == 200
+    items = r.json()
+    assert [i["id"] for i in items] == [games[1], games[3]]
+    assert [(i["predicted"], i["support"]) for i in items] == [(9.0, 1), (9.0, 1)]
+    assert items[0]["name"].startswith("Liked")
+
+
+def test_deleted_game_not_recommended(client, games, db_session):
+    user_id = make_user(db_session)
+    rate(db_session, user_id, {games[0]: 7})
+    login_as(user_id)
+
+    assert client.delete(f"/api/games/{games[1]}").status_code == 204
+
+    items = client.get("/me/recommendations").json()
+    assert [i["id"] for i in items] == [games[3]]
+
+
+@pytest.mark.usefixtures("games")
+def test_build_stats(client, db_session):
+    recommender = make_recommender(db_session)
+
+    recommender.run_once()
+
+    stats = recommender.snapshot()
+    assert stats["store"] == "sql"
+    assert stats["builds"] == 1
+    total = db_session.execute(select(func.count()).select_from(GameRecommendation))
+    assert stats["pairs"] == total.scalar_one()
+    assert stats["built_at"] is not None
+    assert client.get("/recommend/stats").status_code == 200
+
+
+def test_mongo_builds_aside_and_renames():
+    calls = []
+
+    class Collection:
+        def __init__(self, name):
+            self.name = name
+
+        def find(self, query, projection):
+            return [
+                {"user_id": u, "game_id": g, "star_amount": s}
+                for u, row in enumerate(STARS, start=1)
+                for g, s in enumerate(row)
+            ]
+
+        def drop(self):
+            calls.append((self.name, "drop"))
+
+        def insert_many(self, docs):
+            calls.append((self.name, "insert_many", {d["_id"] for d in docs}))
+
+        def rename(self, target, dropTarget):
+            calls.append((self.name, "rename", target, dropTarget))
+
+    class Db(dict):
+        def __missing__(self, name):
+            return Collection(name)
+
+    built = MongoRecommendStore(Db()).rebuild(top_k=5, min_support=2)
+
+    assert built["ratings"] == 12
+    assert calls == [
+        ("game_recommendations_build", "drop"),
+        ("game_recommendations_build", "insert_many", {0, 1, 3}),
+        ("game_recommendations_build", "rename", "game_recommendations", True),
+    ]
+
+
+def test_mongo_serving_weights_stars():
+    class Collection:
+        def __init__(self, docs):
+            self.docs = docs
+
+        def find(self, query, projection=None):
+            return self.docs
+
+    reviews = [{"game_id": 1, "star_amount": 8}, {"game_id": 2, "star_amount": 4}]
+    similar = [
+        {"_id": 1, "similar": [{"id": 3, "score": 0.75}, {"id": 2, "score": 0.5}]},
+        {"_id": 2, "similar": [{"id": 3, "score": 0.25}, {"id": 4, "score": 0.9}]},
+    ]
+    repo = RecommendationRepositoryMongo(
+        {"reviews": Collection(reviews), "game_recommendations": Collection(similar)}
+    )
+
+    assert repo.list_for_user(5, 10) == [(3, 7.0, 2), (4, 4.0, 1)]
+
+
+def test_neo_builds_in_one_transaction():
+    class Tx:
+        def __init__(self):
+            self.queries = []
+
+        def run(self, query, **params):
+            self.queries.append(query)
+            return self
+
+        def single(self):
+            return {"ratings": 12, "games": 3, "pairs": 4}
+
+        def consume(self):
+            pass
+
+    tx = Tx()
+
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def execute_write(self, work, *args):
+            return work(tx, *args)
+
+    class Driver:
+        def session(self):
+            return Session()
+
+    built = NeoRecommendStore(Driver()).rebuild(top_k=5, min_support=2)
+
+    assert built == {"ratings": 12, "games": 3, "pairs": 4}
+    assert "ALSO_LIKED" in tx.queries[-1]
+    assert "[:WROTE]" in tx.queries[0]
+
+
+@pytest.mark.usefixtures("games")
+def test_user_without_reviews_gets_nothing(client, db_session):
+    login_as(make_user(db_session))
+
+    r = client.get("/me/recommendations")
+
+    assert r.status_code == 200
+    assert r.json() == []
+
+
+def test_failing_store_counted():
+    class Broken:
+        name = "sql"
+
+        def rebuild(self, top_k, min_support):
+            raise ConnectionError("db down")
+
+    recommender = Recommender(Broken())
+
+    assert recommender.run_once() is False
+    assert recommender.snapshot()["errors"] == 1
+    assert "db down" in recommender.snapshot()["last_error"]
+
+
+def test_limit_above_100_refused(client):
+    login_as(1)
+
+    assert client.get("/me/recommendations?limit=101").status_code == 422
@@ -0,0 +1,265 @@
+import datetime
+import uuid
+
+from pymongo import ReturnDocument
+from sqlalchemy import select
+
+from app.model.game_model import Game
+from app.model.review_model import Review
+from app.model.user_model import User
+from app.repository.review.mongo_review_repository import ReviewRepositoryMongo
+from app.repository.review.neo_review_repository import ReviewRepositoryNeo
+from app.utility.outbox_sync import NeoSyncTarget, game_snapshot
+from app.utility.review_aggregates import (
+    NEO_UPDATE_QUERY,
+    AggregateDelta,
+    mongo_update,
+    review_deltas,
+)
+
+"""
+POSITIVE TESTS
+- test deltas for a create, a new star amount, a move to another game and a delete
+- test SQL create, update and delete keep count, sum, histogram and rating in step
+- test the review count endpoint reads the game row
+- test games sort by user rating and the detail shows the histogram
+- test Mongo reads the old review before updating the game document
+- test Neo4j updates the game node in the review's transaction
+- test synced Neo4j games get one property per star amount
+
+NEGATIVE TESTS
+- test an update that keeps the game and the stars changes nothing
+- test a missing review leaves the game untouched
+"""
+
+
+def make_user(db_session) -> int:
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        display_name=f"agg-{tag}",
+        username=f"agg-{tag}",
+        password="x",
+        dob=datetime.date(2000, 1, 1),
+        email=f"{tag}@example.com",
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+def make_game(client, name: str | None = None) -> int:
+    r = client.post("/api/games", json={"name": name or f"Rated {uuid.uuid4()}"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def review(client, user_id: int, game_id: int, stars: int) -> int:
+    payload = {
+        "title": "t",
+        "star_amount": stars,
+        "user_id": user_id,
+        "game_id": game_id,
+    }
+    r = client.post("/api/reviews", json=payload)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def aggregates(db_session, game_id: int) -> tuple:
+    db_session.expire_all()
+    game = db_session.get(Game, game_id)
+    stars = {int(s): n for s, n in (game.star_histogram or {}).items() if n}
+    return game.review_count, game.rating_sum, game.user_rating, stars
+
+
+def test_review_deltas():
+    assert review_deltas(None, (1, 4)) == {1: AggregateDelta(1, 4, {4: 1})}
+    assert review_deltas((1, 4), (1, 9)) == {1: AggregateDelta(0, 5, {4: -1, 9: 1})}
+    assert review_deltas((1, 4), (2, 4)) == {
+        1: AggregateDelta(-1, -4, {4: -1}),
+        2: AggregateDelta(1, 4, {4: 1}),
+    }
+    assert review_deltas((2, 3), None) == {2: AggregateDelta(-1, -3, {3: -1})}
+
+
+def test_update_keeping_game_and_stars_changes_nothing():
+    assert review_deltas((1, 4), (1, 4)) == {}
+
+
+def test_sql_writes_keep_aggregates(client, _allow_admin, db_session, _procedure):
+    user_id = make_user(db_session)
+    game_id, other_id = make_game(client), make_game(client)
+
+    first = review(client, user_id, game_id, 4)
+    review(client, user_id, game_id, 7)
+    review(client, user_id, game_id, 4)
+    assert aggregates(db_session, game_id) == (3, 15, 5.0, {4: 2, 7: 1})
+
+    assert (
+        client.patch(f"/api/reviews/{first}", json={"star_amount": 10}).status_code
+        == 200
+    )
+    assert aggregates(db_session, game_id) == (3, 21, 7.0, {4: 1, 7: 1, 10: 1})
+
+    assert (
+        client.patch(f"/api/reviews/{first}", json={"game_id": other_id}).status_code
+        == 200
+    )
+    assert aggregates(db_session, game_id) == (2, 11, 5.5, {4: 1, 7: 1})
+    assert aggregates(db_session, other_id) == (1, 10, 10.0, {10: 1})
+
+    assert client.delete(f"/api/reviews/{first}").status_code in (200, 204)
+    assert aggregates(db_session, other_id) == (0, 0, None, {})
+
+
+def test_count_endpoint_reads_game_row(client, _allow_admin, db_session, _procedure):
+    user_id = make_user(db_session)
+    game_id = make_game(client)
+    review(client, user_id, game_id, 5)
+    # a row the repository never saw does not count; the aggregate is what is read
+    db_session.add(Review(title="raw", star_amount=1, user_id=user_id, game_id=game_id))
+    db_session.commit()
+
+    r = client.get(f"/api/reviews/count?game_id={game_id}")
+
+    assert r.json() == {"game_id": game_id, "review_count": 1}
+    assert client.get("/api/reviews/count?game_id=999999").json()["review_count"] == 0
+
+
+def test_sort_by_user_rating_and_detail_histogram(
+    client, _allow_admin, db_session, _procedure
+):
+    user_id = make_user(db_session)
+    tag = uuid.uuid4().hex[:8]
+    low, high, unrated = (make_game(client, f"Sorted {tag} {n}") for n in "abc")
+    review(client, user_id, low, 3)
+    review(client, user_id, high, 9)
+    review(client, user_id, high, 8)
+
+    url = f"/api/games?q=Sorted {tag}&sort_by=user_rating&sort_order="
+    pages = {o: client.get(url + o).json()["items"] for o in ("asc", "desc")}
+    ids = [g["id"] for g in pages["desc"]]
+    assert ids in ([high, low, unrated], [unrated, low, high])
+    assert [g["id"] for g in pages["asc"]] == ids[::-1]
+    (rated,) = [g for g in pages["asc"] if g["id"] == high]
+    assert (rated["user_rating"], rated["review_count"]) == (8.5, 2)
+
+    detail = client.get(f"/api/games/{high}/detail").json()
+    assert detail["star_histogram"] == {str(s): int(s in (8, 9)) for s in range(1, 11)}
+    sparse = client.get(f"/api/games/{low}/detail?fields=star_histogram").json()
+    assert sparse["star_histogram"]["3"] == 1
+
+
+def test_mongo_reads_old_review_first():
+    calls = []
+
+    class Reviews:
+        def find_one_and_update(self, query, update, projection, return_document):
+            calls.append(("reviews", query, projection, return_document))
+            return {"game_id": 3, "star_amount": 6}
+
+        def find_one_and_delete(self, query, projection):
+            return None
+
+        def find_one(self, query):
+            return {"id": 1, "game_id": 3, "star_amount": 2}
+
+    class Games:
+        def update_one(self, query, update):
+            calls.append(("games", query, update))
+
+    class Tombstones:
+        def find(self, query, projection):
+            return []
+
+    repo = ReviewRepositoryMongo(
+        {"reviews": Reviews(), "games": Games(), "tombstones": Tombstones()}
+    )
+
+    assert repo.update(1, {"star_amount": 2})["star_amount"] == 2
+    assert repo.delete(99) is False
+
+    assert calls == [
+        ("reviews", {"id": 1}, {"game_id": 1, "star_amount": 1}, ReturnDocument.BEFORE),
+        ("games", {"_id": 3}, mongo_update(AggregateDelta(0, -4, {6: -1, 2: 1}))),
+    ]
+    first, second = calls[1][2]
+    assert first["$set"]["star_histogram.6"] == {
+        "$add": [{"$ifNull": ["$star_histogram.6", 0]}, -1]
+    }
+    assert "user_rating" in second["$set"]
+
+
+def test_neo_updates_game_in_review_transaction():
+    queries = []
+
+    class Result:
+        def __init__(self, record):
+            self.record = record
+
+        def single(self):
+            return self.record
+
+        def consume(self):
+            return None
+
+    class Tx:
+        def run(self, query, **params):
+            queries.append((query, params))
+            if query is ReviewRepositoryNeo.UPDATE_QUERY:
+                node = {"id": 5, "star_amount": params["props"]["star_amount"]}
+                return Result({"r": node, "game_id": 2, "old_stars": 3})
+            return Result(None)
+
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def execute_write(self, fn, *args, **kwargs):
+            return fn(Tx(), *args, **kwargs)
+
+    class Driver:
+        def session(self):
+            return Session()
+
+    repo = ReviewRepositoryNeo(Driver())
+
+    assert repo.update(5, {"star_amount": 8})["star_amount"] == 8
+    assert repo.delete(6) is False
+
+    (_, update), (aggregate, params), (delete, _) = queries
+    assert aggregate is NEO_UPDATE_QUERY
+    assert params["rows"] == [
+        {"game_id": 2, "count": 0, "total": 5, "stars": {"stars_3": -1, "stars_8": 1}}
+    ]
+    assert delete is ReviewRepositoryNeo.DELETE_QUERY
+
+
+def test_missing_review_leaves_game_untouched(client, _allow_admin, db_session):
+    game_id = make_game(client)
+
+    assert (
+        client.patch("/api/reviews/999999", json={"star_amount": 3}).status_code == 404
+    )
+    assert client.delete("/api/reviews/999999").status_code == 404
+
+    assert aggregates(db_session, game_id) == (0, 0, None, {})
+
+
+def test_synced_neo_game_gets_star_properties(
+    client, _allow_admin, db_session, _procedure
+):
+    user_id = make_user(db_session)
+    game_id = make_game(client)
+    review(client, user_id, game_id, 6)
+    game = db_session.execute(select(Game).where(Game.id == game_id)).scalar_one()
+    db_session.refresh(game)
+
+    props = NeoSyncTarget._game_props(game_snapshot(game, [1]))
+
+    assert props["stars_6"] == 1
+    assert props["review_count"] == 1
+    assert "star_histogram" not in props
@@ -0,0 +1,124 @@
+import datetime
+import uuid
+
+from app.model.game_model import Game
+from app.model.review_model import Review
+from app.model.user_model import User
+from app.repository.review.mongo_review_repository import ReviewRepositoryMongo
+
+"""
+POSITIVE TESTS
+- test walking reviews of a game with next_cursor
+- test offset paging still works
+- test MongoDB pages migrated reviews, which have their id only in _id
+
+NEGATIVE TESTS
+- test malformed cursor
+"""
+
+
+def seed_reviews(db_session, count):
+    # reviews are created through a MySQL procedure, so insert them directly
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        display_name=f"rev-{tag}",
+        username=f"rev-{tag}",
+        password="x",
+        dob=datetime.date(2000, 1, 1),
+        email=f"{tag}@example.com",
+    )
+    game = Game(name=f"Reviewed-{tag}")
+    db_session.add_all([user, game])
+    db_session.flush()
+
+    for i in range(count):
+        db_session.add(
+            Review(title=f"r{i}", star_amount=5, user_id=user.id, game_id=game.id)
+        )
+    db_session.commit()
+    return game.id
+
+
+def test_reviews_by_game_cursor_walks_newest_first(client, db_session):
+    game_id = seed_reviews(db_session, 5)
+
+    ids, cursor = [], None
+    while True:
+        url = f"/api/reviews/gameid/{game_id}?limit=2"
+        r = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert r.status_code == 200, r.text
+        data = r.json()
+        assert data["total"] == 5
+        ids += [x["id"] for x in data["items"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(ids) == 5
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_reviews_by_game_offset_still_works(client, db_session):
+    game_id = seed_reviews(db_session, 3)
+
+    r = client.get(f"/api/reviews/gameid/{game_id}?offset=2&limit=2")
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert len(data["items"]) == 1
+    assert data["next_cursor"] is None
+
+
+def test_mongo_pages_migrated_reviews():
+    # the migrator keeps the SQL id in _id and writes no id field
+    docs = [{"_id": i, "game_id": 3, "star_amount": 5} for i in (4, 9, 2, 7, 5)]
+
+    class Cursor:
+        def __init__(self, query):
+            self.query, self.skipped, self.limited = query, 0, None
+
+        def skip(self, n):
+            self.skipped = n
+            return self
+
+        def limit(self, n):
+            self.limited = n
+            return self
+
+        def sort(self, key, direction):
+            seek = self.query.get(key, {}).get("$lt")
+            rows = sorted(
+                (d for d in docs if seek is None or d[key] < seek),
+                key=lambda d: d[key],
+                reverse=direction < 0,
+            )
+            return iter(rows[self.skipped :][: self.limited])
+
+    class Collection:
+        def count_documents(self, query):
+            return len(docs)
+
+        def find(self, query):
+            return Cursor(query)
+
+    class Tombstones:
+        def find(self, query, projection):
+            return []
+
+    repo = ReviewRepositoryMongo(
+        {"reviews": Collection(), "games": None, "tombstones": Tombstones()}
+    )
+
+    pages, after = [], None
+    while True:
+        rows, _ = repo.list_by_game(3, 0, 2, after)
+        if not rows:
+            break
+        pages.append([r["id"] for r in rows])
+        after = rows[-1]["id"]
+
+    assert pages == [[9, 7], [5, 4], [2]]
+
+
+def test_reviews_by_game_malformed_cursor_returns_400(client):
+    r = client.get("/api/reviews/gameid/1?cursor=%%%")
+    assert r.status_code == 400, r.text
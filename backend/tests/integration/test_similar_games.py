@@ -0,0 +1,202 @@
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from app.model.game_model import game_genres, game_mechanics
+from app.model.genre_model import Genre
+from app.model.mechanic_model import Mechanic
+from app.repository.game.mongo_game_repository import GameRepositoryMongo
+from app.repository.game.neo_game_repository import GameRepositoryNeo
+from app.service.game_service import build_similar_index
+from app.utility.similarity import NeighbourIndex
+
+"""
+POSITIVE TESTS
+- test games sharing more links come first, with their cosine
+- test a link few games have counts more than one most games have
+- test a deleted game drops out of the other games' lists
+- test changing a game's links and changing them back restores every list
+- test deleting a genre updates the games that had it
+- test MongoDB features come from the embedded link lists
+- test Neo4j features are named after their relationship
+
+NEGATIVE TESTS
+- test an unknown game is 404
+- test a game without links has no similar games
+- test a limit above the kept neighbours is refused
+"""
+
+
+def make_game(client) -> int:
+    r = client.post("/api/games", json={"name": f"Alike {uuid.uuid4()}"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def make_mechanics(db_session, count: int) -> list[int]:
+    mechanics = [Mechanic(name=f"mech-{uuid.uuid4().hex[:8]}") for _ in range(count)]
+    db_session.add_all(mechanics)
+    db_session.commit()
+    return [m.id for m in mechanics]
+
+
+def link(db_session, table, column: str, game_id: int, ids: list[int]) -> None:
+    rows = [{"game_id": game_id, column: i} for i in ids]
+    db_session.execute(insert(table), rows)
+    db_session.commit()
+
+
+@pytest.fixture
+def games(client, _allow_admin, db_session):
+    """Four games over four fresh mechanics, loaded into the index."""
+    m = make_mechanics(db_session, 4)
+    ids = [make_game(client) for _ in range(4)]
+    links = [m[:3], m[:3], m[:2], [m[3]]]
+    for game_id, mechanic_ids in zip(ids, links, strict=True):
+        link(db_session, game_mechanics, "mechanic_id", game_id, mechanic_ids)
+    build_similar_index(db_session)
+    return ids, m
+
+
+def test_more_shared_links_first(client, games):
+    (first, twin, partial, other), _ = games
+
+    r = client.get(f"/api/games/{first}/similar")
+
+    assert r.status_code == 200
+    items = r.json()
+    assert [i["id"] for i in items] == [twin, partial]
+    assert items[0]["score"] == 1.0
+    assert 0 < items[1]["score"] < 1
+    assert other not in [i["id"] for i in items]
+
+
+def test_rare_link_counts_more(client, _allow_admin, db_session):
+    common = Genre(name=f"g-{uuid.uuid4().hex[:6]}")
+    db_session.add(common)
+    db_session.commit()
+    rare, ordinary = make_mechanics(db_session, 2)
+    crowd = [make_game(client) for _ in range(6)]
+    for game_id in crowd:
+        link(db_session, game_genres, "genre_id", game_id, [common.id])
+        link(db_session, game_mechanics, "mechanic_id", game_id, [ordinary])
+    game, rare_twin = make_game(client), make_game(client)
+    link(db_session, game_mechanics, "mechanic_id", game, [rare, ordinary])
+    link(db_session, game_genres, "genre_id", game, [common.id])
+    link(db_session, game_mechanics, "mechanic_id", rare_twin, [rare])
+
+    build_similar_index(db_session)
+
+    items = client.get(f"/api/games/{game}/similar").json()
+    assert items[0]["id"] == rare_twin
+
+
+def test_deleted_game_drops_out(client, games):
+    (first, twin, partial, _), _ = games
+
+    assert client.delete(f"/api/games/{twin}").status_code == 204
+
+    items = client.get(f"/api/games/{first}/similar").json()
+    assert [i["id"] for i in items] == [partial]
+
+
+def test_links_changed_and_back_restore_lists():
+    links = [
+        (game_id, kind, (game_id * 7 + n) % 9)
+        for game_id in range(1, 40)
+        for n, kind in enumerate(("mechanics", "genres", "designers"))
+    ]
+    index = NeighbourIndex(links, top_k=5)
+    before = {g: index.neighbours(g, 5) for g in range(1, 40)}
+    features = [(kind, i) for game_id, kind, i in links if game_id == 12]
+
+    index.update(12, [("artists", 3)])
+    assert index.neighbours(12, 5) == []
+    index.update(12, features)
+
+    assert {g: index.neighbours(g, 5) for g in range(1, 40)} == before
+
+
+def test_deleted_genre_dropped(client, games, db_session):
+    (first, twin, partial, _), _ = games
+    url = f"/api/games/{first}/similar"
+    before = client.get(url).json()
+    genre = Genre(name=f"g-{uuid.uuid4().hex[:6]}")
+    db_session.add(genre)
+    db_session.commit()
+    link(db_session, game_genres, "genre_id", first, [genre.id])
+    link(db_session, game_genres, "genre_id", twin, [genre.id])
+    build_similar_index(db_session)
+    # partial lacks the genre, so it is less alike now
+    assert client.get(url).json()[1]["score"] < before[1]["score"]
+
+    assert client.delete(f"/api/genres/{genre.id}").status_code == 204
+
+    assert client.get(url).json() == before
+
+
+def test_mongo_features_from_embedded_links():
+    class Collection:
+        def find(self, query, projection):
+            assert projection == {
+                "mechanics.id": 1,
+                "genres.id": 1,
+                "designers.id": 1,
+                "artists.id": 1,
+            }
+            return [
+                {"_id": 1, "mechanics": [{"id": 4}, {"id": 5}], "genres": [{"id": 2}]},
+                {"_id": 2},
+            ]
+
+    repo = GameRepositoryMongo({"games": Collection(), "tombstones": None})
+
+    assert list(repo.iter_features()) == [
+        (1, "mechanics", 4),
+        (1, "mechanics", 5),
+        (1, "genres", 2),
+    ]
+
+
+def test_neo_features_named_after_relationship():
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def run(self, query):
+            self.query = query
+            return [
+                {"game_id": 1, "rel": "USES_MECHANIC", "feature_id": 4},
+                {"game_id": 1, "rel": "ART_BY", "feature_id": 9},
+            ]
+
+    class Driver:
+        def session(self):
+            return Session()
+
+    repo = GameRepositoryNeo(Driver())
+
+    assert list(repo.iter_features()) == [(1, "mechanics", 4), (1, "artists", 9)]
+
+
+def test_unknown_game_404(client):
+    assert client.get("/api/games/987654321/similar").status_code == 404
+
+
+def test_game_without_links_has_none(client, _allow_admin):
+    game_id = make_game(client)
+
+    r = client.get(f"/api/games/{game_id}/similar")
+
+    assert r.status_code == 200
+    assert r.json() == []
+
+
+def test_limit_above_kept_refused(client, games):
+    (first, *_), _ = games
+
+    assert client.get(f"/api/games/{first}/similar?limit=1000").status_code == 422
@@ -0,0 +1,407 @@
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.model.artists_model import Artist
+from app.model.game_model import Game, game_artists
+from app.model.language_model import Language
+from app.model.review_model import Review
+from app.model.user_model import User
+from app.model.video_model import Video
+from app.repository.game.mongo_game_repository import GameRepositoryMongo
+from app.repository.game.neo_game_repository import GameRepositoryNeo
+from app.repository.review.mongo_review_repository import ReviewRepositoryMongo
+from app.repository.review.sql_review_repository import ReviewRepositorySQL
+from app.utility.etag import entity_versions
+from app.utility.purger import MongoPurgeStore, NeoPurgeStore, Purger, SQLPurgeStore
+
+"""
+POSITIVE TESTS
+- test a deleted game is gone from get, detail, list and search at once
+- test the purger removes reviews and videos in batches, then links and the game
+- test purging a deleted user's reviews takes them off their games' aggregates
+- test a deleted user is hidden from reads and from a second delete
+- test reviews of a deleted game or user are hidden before the purge
+- test a purge that removes reviews changes the review and game versions
+- test a deleted user's username and display name can be registered again
+- test purge stats report what was removed and what is pending
+- test MongoDB deletes the game document and records a tombstone
+- test MongoDB purges a deleted user's migrated reviews by their embedded user
+- test MongoDB review reads leave out tombstoned games and users
+- test Neo4j relabels the game node instead of detaching it
+
+NEGATIVE TESTS
+- test deleting a game twice answers 404 the second time
+- test a purge with nothing tombstoned removes nothing
+- test a failing store is counted as an error
+"""
+
+
+@pytest.fixture
+def _drained(db_session):
+    # tombstones left by other tests would share the batches
+    drain(make_purger(db_session, batch_size=10_000))
+
+
+def make_purger(db_session, **kwargs) -> Purger:
+    factory = sessionmaker(bind=db_session.get_bind(), autoflush=False)
+    return Purger(SQLPurgeStore(session_factory=factory), **kwargs)
+
+
+def drain(purger: Purger) -> list[int]:
+    removed = []
+    while count := purger.run_once():
+        removed.append(count)
+    return removed
+
+
+def make_user(db_session) -> int:
+    tag = uuid.uuid4().hex[:8]
+    user = User(
+        display_name=f"gone-{tag}",
+        username=f"gone-{tag}",
+        password="x",
+        dob=datetime.date(2000, 1, 1),
+        email=f"{tag}@example.com",
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+def make_game(client, name: str | None = None) -> int:
+    r = client.post("/api/games", json={"name": name or f"Doomed {uuid.uuid4()}"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def review(client, user_id: int, game_id: int, stars: int) -> int:
+    payload = {
+        "title": "t",
+        "star_amount": stars,
+        "user_id": user_id,
+        "game_id": game_id,
+    }
+    r = client.post("/api/reviews", json=payload)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def count(db_session, stmt) -> int:
+    return db_session.execute(
+        select(func.count()).select_from(stmt.subquery())
+    ).scalar()
+
+
+def test_deleted_game_hidden_at_once(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    game_id = make_game(client, f"Vanishing {tag}")
+
+    assert client.delete(f"/api/games/{game_id}").status_code == 204
+
+    assert client.get(f"/api/games/{game_id}").status_code == 404
+    assert client.get(f"/api/games/{game_id}/detail").status_code == 404
+    assert client.get(f"/api/games?q=Vanishing {tag}").json()["items"] == []
+    assert client.get(f"/api/games/search?q=Vanishing {tag}").json()["items"] == []
+
+
+def test_purger_removes_dependants_in_batches(
+    client, _allow_admin, db_session, _procedure, _drained
+):
+    user_id = make_user(db_session)
+    game_id = make_game(client)
+    for stars in (3, 5, 7):
+        review(client, user_id, game_id, stars)
+    language = Language(language=f"lang-{uuid.uuid4().hex[:8]}")
+    artist = Artist(name=f"artist-{uuid.uuid4().hex[:8]}")
+    db_session.add_all([language, artist])
+    db_session.flush()
+    db_session.add_all(
+        Video(
+            title="v", category="c", link="l", game_id=game_id, language_id=language.id
+        )
+        for _ in range(2)
+    )
+    db_session.execute(
+        insert(game_artists).values(game_id=game_id, artist_id=artist.id)
+    )
+    db_session.commit()
+    assert client.delete(f"/api/games/{game_id}").status_code == 204
+    purger = make_purger(db_session, batch_size=2)
+
+    # two review batches, one video batch, then links and the game together
+    assert drain(purger) == [2, 1, 2, 2]
+
+    db_session.expire_all()
+    assert db_session.get(Game, game_id) is None
+    assert count(db_session, select(Review).where(Review.game_id == game_id)) == 0
+    assert count(db_session, select(Video).where(Video.game_id == game_id)) == 0
+    assert db_session.get(Artist, artist.id) is not None
+
+
+def test_purged_user_reviews_leave_aggregates(
+    client, _allow_admin, db_session, _procedure, _drained
+):
+    gone, stays = make_user(db_session), make_user(db_session)
+    game_id = make_game(client)
+    review(client, gone, game_id, 2)
+    review(client, gone, game_id, 4)
+    review(client, stays, game_id, 9)
+
+    assert client.delete(f"/api/user/{gone}").status_code == 204
+    drain(make_purger(db_session, batch_size=1))
+
+    db_session.expire_all()
+    game = db_session.get(Game, game_id)
+    assert (game.review_count, game.rating_sum, game.user_rating) == (1, 9, 9.0)
+    assert {int(s): n for s, n in game.star_histogram.items() if n} == {9: 1}
+    assert db_session.get(User, gone) is None
+
+
+def test_deleted_user_hidden(client, _allow_admin, db_session):
+    user_id = make_user(db_session)
+
+    assert client.delete(f"/api/user/{user_id}").status_code == 204
+
+    assert client.get(f"/api/user/{user_id}").status_code == 404
+    db_session.expire_all()
+    assert db_session.get(User, user_id).deleted_at is not None
+    assert client.delete(f"/api/user/{user_id}").status_code == 404
+
+
+def test_reviews_of_deleted_game_and_user_hidden(
+    client, _allow_admin, db_session, _procedure
+):
+    gone, stays = make_user(db_session), make_user(db_session)
+    game_id, doomed = make_game(client), make_game(client)
+    hidden = review(client, gone, game_id, 2)
+    kept = review(client, stays, game_id, 4)
+    orphan = review(client, stays, doomed, 6)
+
+    assert client.delete(f"/api/user/{gone}").status_code == 204
+    assert client.delete(f"/api/games/{doomed}").status_code == 204
+
+    items = client.get(f"/api/reviews/gameid/{game_id}").json()["items"]
+    assert [i["id"] for i in items] == [kept]
+    assert client.get(f"/api/reviews/{kept}").status_code == 200
+    assert client.get(f"/api/reviews/{hidden}").status_code == 404
+    assert client.get(f"/api/reviews/{orphan}").status_code == 404
+    exported = {r["id"] for r in ReviewRepositorySQL(db_session).iter_export(("id",))}
+    assert kept in exported
+    assert not exported & {hidden, orphan}
+
+
+def test_purged_reviews_change_versions(
+    client, _allow_admin, db_session, _procedure, _drained
+):
+    user_id = make_user(db_session)
+    review(client, user_id, make_game(client), 5)
+    assert client.delete(f"/api/user/{user_id}").status_code == 204
+    before = entity_versions.get("review", "game")
+
+    drain(make_purger(db_session))
+
+    after = entity_versions.get("review", "game")
+    assert all(a > b for a, b in zip(after, before, strict=True))
+
+
+def test_deleted_username_registered_again(client, _allow_admin):
+    tag = uuid.uuid4().hex[:8]
+    payload = {
+        "display_name": f"again-{tag}",
+        "username": f"again-{tag}",
+        "password": "secret1",
+        "dob": "2000-01-01",
+        "email": f"{tag}@example.com",
+    }
+    first = client.post("/api/users", json=payload)
+    assert first.status_code == 200, first.text
+
+    assert client.delete(f"/api/user/{first.json()['id']}").status_code == 204
+
+    second = client.post("/api/users", json=payload)
+    assert second.status_code == 200, second.text
+    assert second.json()["id"] != first.json()["id"]
+    assert client.post("/api/users", json=payload).status_code == 400
+
+
+def test_purge_stats(client, _allow_admin, db_session, _drained):
+    game_id = make_game(client)
+    client.delete(f"/api/games/{game_id}")
+    purger = make_purger(db_session)
+
+    purger.run_once()
+
+    stats = purger.snapshot()
+    assert stats["store"] == "sql"
+    assert stats["removed"]["games"] == 1
+    assert stats["batches"] == 1
+    assert stats["pending"] == {"games": 0, "users": 0}
+    assert client.get("/purge/stats").status_code == 200
+
+
+def test_mongo_delete_records_tombstone():
+    calls = []
+
+    class Result:
+        deleted_count = 1
+
+    class Collection:
+        def __init__(self, name):
+            self.name = name
+
+        def delete_one(self, query):
+            calls.append((self.name, "delete_one", query))
+            return Result()
+
+        def insert_one(self, doc):
+            calls.append((self.name, "insert_one", doc["entity"], doc["entity_id"]))
+
+    repo = GameRepositoryMongo({n: Collection(n) for n in ("games", "tombstones")})
+
+    assert repo.delete("7") is True
+    assert calls == [
+        ("games", "delete_one", {"_id": 7}),
+        ("tombstones", "insert_one", "game", 7),
+    ]
+
+
+def test_mongo_purges_migrated_user_reviews():
+    # the migrator embeds the author as user.id and writes no user_id
+    reviews = [
+        {"_id": 1, "game_id": 4, "star_amount": 6, "user": {"id": 5}},
+        {"_id": 2, "game_id": 4, "star_amount": 8, "user_id": 5},
+        {"_id": 3, "game_id": 4, "star_amount": 2, "user": {"id": 9}},
+    ]
+    updates = []
+
+    def matches(doc, query):
+        return any(
+            doc.get("user_id") in part.get("user_id", {}).get("$in", ())
+            or doc.get("user", {}).get("id") in part.get("user.id", {}).get("$in", ())
+            for part in query["$or"]
+        )
+
+    class Cursor(list):
+        def sort(self, *_):
+            return self
+
+        def limit(self, n):
+            return Cursor(self[:n])
+
+    class Result:
+        def __init__(self, n):
+            self.deleted_count = n
+
+    class Reviews:
+        def find(self, query, projection):
+            return Cursor(d for d in reviews if matches(d, query))
+
+        def delete_many(self, query):
+            ids = query["_id"]["$in"]
+            reviews[:] = [d for d in reviews if d["_id"] not in ids]
+            return Result(len(ids))
+
+    class Tombstones:
+        def find(self, query, projection):
+            return Cursor([{"entity_id": 5}] if query["entity"] == "user" else [])
+
+    class Games:
+        def bulk_write(self, ops):
+            updates.extend(ops)
+
+    store = MongoPurgeStore(
+        {"tombstones": Tombstones(), "reviews": Reviews(), "games": Games()}
+    )
+
+    assert store.purge_batch(10)["reviews"] == 2
+    assert [d["_id"] for d in reviews] == [3]
+    assert len(updates) == 1
+
+
+def test_mongo_review_reads_skip_tombstoned():
+    class Collection:
+        def find(self, query, projection=None):
+            return [
+                {"entity": "game", "entity_id": 3},
+                {"entity": "user", "entity_id": 8},
+            ]
+
+        def find_one(self, query):
+            queries.append(query)
+
+    queries = []
+    repo = ReviewRepositoryMongo(
+        {"reviews": Collection(), "games": None, "tombstones": Collection()}
+    )
+
+    assert repo.get(5) is None
+
+    assert queries == [
+        {
+            "$and": [
+                {"$or": [{"id": 5}, {"_id": 5}]},
+                {"game_id": {"$nin": [3]}},
+                {"user_id": {"$nin": [8]}},
+                {"user.id": {"$nin": [8]}},
+            ]
+        }
+    ]
+
+
+def test_neo_delete_relabels_node():
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            return False
+
+        def run(self, query, **params):
+            self.query, self.params = query, params
+            return self
+
+        def single(self):
+            return {"deleted": 1}
+
+    session = Session()
+
+    class Driver:
+        def session(self):
+            return session
+
+    assert GameRepositoryNeo(Driver()).delete(3) is True
+    assert "REMOVE g:Game" in session.query and "DETACH" not in session.query
+    assert "DeletedGame" in NeoPurgeStore.GAMES
+    assert session.params == {"id": 3}
+
+
+def test_game_deleted_twice_is_404(client, _allow_admin):
+    game_id = make_game(client)
+
+    assert client.delete(f"/api/games/{game_id}").status_code == 204
+    assert client.delete(f"/api/games/{game_id}").status_code == 404
+
+
+def test_nothing_to_purge(db_session, _drained):
+    purger = make_purger(db_session)
+
+    assert purger.run_once() == 0
+    assert purger.snapshot()["batches"] == 0
+
+
+def test_failing_store_counted():
+    class Broken:
+        name = "sql"
+
+        def purge_batch(self, batch_size):
+            raise ConnectionError("db down")
+
+    purger = Purger(Broken())
+
+    assert purger.run_once() == 0
+    assert purger.snapshot()["errors"] == 1
+    assert "db down" in purger.snapshot()["last_error"]
@@ -0,0 +1,91 @@
+import logging
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.model.game_model import Game
+from app.utility import sql_profiler
+from app.utility.sql_profiler import assert_max_queries, capture_queries, fingerprint
+
+"""
+POSITIVE TESTS
+- test fingerprints collapse literals, parameters and IN lists
+- test game list and detail stay within their query budgets
+- test lazy loads in a loop are flagged as N+1
+- test SQL_PROFILE adds a Server-Timing header with the query count
+- test statements over the threshold go to the slow-query log
+
+NEGATIVE TESTS
+- test exceeding a query budget fails with the statements listed
+"""
+
+
+def create_games(client, count: int) -> list[int]:
+    ids = []
+    for _ in range(count):
+        r = client.post("/api/games", json={"name": f"Profiled {uuid.uuid4()}"})
+        assert r.status_code == 201, r.text
+        ids.append(r.json()["id"])
+    return ids
+
+
+def test_fingerprint_collapses_values():
+    a = fingerprint("SELECT * FROM game WHERE id IN (1, 2, 3) AND name = 'Catan'")
+    b = fingerprint("SELECT  *\nFROM game WHERE id IN (?, ?) AND name = %(name_1)s")
+
+    assert a == b == "SELECT * FROM game WHERE id IN (?...) AND name = ?"
+    assert fingerprint("SELECT anon_1.x FROM t LIMIT :param_1") == (
+        "SELECT anon_1.x FROM t LIMIT ?"
+    )
+
+
+def test_game_endpoints_within_query_budget(client, _allow_admin):
+    game_id = create_games(client, 1)[0]
+
+    # each also reads the entity versions behind its ETag
+    with assert_max_queries(2):
+        assert client.get("/api/games?limit=20&count=none").status_code == 200
+    # the game plus one selectin query per relation
+    with assert_max_queries(6):
+        assert client.get(f"/api/games/{game_id}/detail").status_code == 200
+
+
+def test_lazy_loads_in_loop_flagged_as_n_plus_one(client, _allow_admin, db_session):
+    ids = create_games(client, 6)
+    games = db_session.execute(select(Game).where(Game.id.in_(ids))).scalars().all()
+
+    with capture_queries() as profile:
+        for game in games:
+            list(game.artists)
+
+    repeated = profile.n_plus_one()
+    assert len(repeated) == 1
+    assert next(iter(repeated.values())) == 6
+    assert "FROM artist" in next(iter(repeated))
+
+
+def test_server_timing_header_reports_queries(client, monkeypatch):
+    monkeypatch.setattr(sql_profiler, "SQL_PROFILE", True)
+
+    r = client.get("/api/genres")
+
+    assert r.status_code == 200
+    assert r.headers["server-timing"].startswith("db;dur=")
+    # versions, count and page
+    assert r.headers["server-timing"].endswith('desc="3 queries"')
+
+
+def test_slow_statements_logged(client, monkeypatch, caplog):
+    monkeypatch.setattr(sql_profiler, "SQL_SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app.utility.sql_profiler.slow"):
+        client.get("/api/genres?count=none")
+
+    assert any("FROM genre" in r.getMessage() for r in caplog.records)
+
+
+def test_query_budget_exceeded_lists_statements(client):
+    with pytest.raises(AssertionError, match=r"3 queries, expected at most 1"):
+        with assert_max_queries(1):
+            client.get("/api/genres")
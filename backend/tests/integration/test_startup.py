@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utility import startup
+from app.utility.startup import startup_report
+
+"""
+POSITIVE TESTS
+- test /readyz reports ready with the timing of each startup phase
+- test the sql mode does not import the Mongo or Neo4j repositories or neo4j
+- test importing the app leaves out numpy, scipy, the indexes and hybrid mode
+
+NEGATIVE TESTS
+- test a failed warm-up still starts the app but /readyz answers 503
+- test an unknown DB_MODE fails warm-up
+"""
+
+
+def test_readyz_reports_startup_phases(client):
+    r = client.get("/readyz")
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["ready"] is True
+    assert body["errors"] == {}
+    assert {"import", "warm_up", "autocomplete", "startup"} <= set(body["phases_ms"])
+
+
+# loaded by the lifespan or the first request that needs them
+LAZY = {
+    "neo4j",
+    "numpy",
+    "scipy",
+    "app.utility.similarity",
+    "app.utility.recommender",
+    "app.repository.hybrid_repository",
+}
+
+
+def test_sql_mode_skips_other_backends():
+    code = (
+        f"import json, sys; import app.main; LAZY = {LAZY!r}; "
+        "print(json.dumps(sorted(m for m in sys.modules "
+        "if m in LAZY or m.endswith(('_mongo', '_neo')))))"
+    )
+    env = {**os.environ, "DB_MODE": "sql", "DATABASE_URL": "sqlite:///./test.db"}
+
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+
+
+def test_failed_warm_up_not_ready(monkeypatch):
+    def broken(_mode):
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr("app.main.warm_up", broken)
+    monkeypatch.setattr(startup_report, "errors", {})
+    monkeypatch.setattr(startup_report, "ready", True)
+
+    with TestClient(app) as c:
+        r = c.get("/readyz")
+
+    assert r.status_code == 503
+    assert "database down" in r.json()["errors"]["warm_up"]
+
+
+def test_unknown_mode_fails_warm_up():
+    with pytest.raises(ValueError, match="cassandra"):
+        startup.warm_up("cassandra")
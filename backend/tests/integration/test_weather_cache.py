@@ -0,0 +1,154 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.controller import weather_controller
+from app.utility.weather_client import WeatherClient, WeatherUnavailable
+
+"""
+POSITIVE TESTS
+- test nearby coordinates share one cached upstream call
+- test concurrent identical requests are coalesced into one upstream call
+- test a stale entry is served when the provider is slow, then refreshed
+
+NEGATIVE TESTS
+- test a provider error without a cached entry returns 502
+- test a provider error with a stale entry serves the stale forecast
+"""
+
+
+class StubProvider(BaseHTTPRequestHandler):
+    calls = 0
+    delay = 0.0
+    status = 200
+
+    def do_GET(self):
+        type(self).calls += 1
+        time.sleep(self.delay)
+        query = parse_qs(urlparse(self.path).query)
+        body = json.dumps(
+            {
+                "latitude": float(query["latitude"][0]),
+                "longitude": float(query["longitude"][0]),
+                "call": self.calls,
+            }
+        ).encode()
+        self.send_response(self.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def provider():
+    handler = type("Stub", (StubProvider,), {})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    handler.url = f"http://127.0.0.1:{server.server_port}/v1/forecast"
+    yield handler
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_client(provider, monkeypatch):
+    weather = WeatherClient(base_url=provider.url, timeout=2)
+    monkeypatch.setattr(weather_controller, "weather_client", weather)
+    return weather
+
+
+async def _with_client(weather: WeatherClient, scenario):
+    try:
+        return await scenario()
+    finally:
+        await weather.aclose()
+
+
+def test_nearby_coordinates_share_cached_call(client, provider, stub_client):
+    r = client.get("/api/weather/geo?latitude=55.6761&longitude=12.5683")
+    assert r.status_code == 200, r.text
+    assert r.json() == {"latitude": 55.68, "longitude": 12.57, "call": 1}
+
+    r = client.get("/api/weather/geo?latitude=55.6789&longitude=12.5712")
+    assert r.status_code == 200, r.text
+    assert r.json()["call"] == 1
+
+    assert provider.calls == 1
+    assert stub_client.snapshot()["hits"] == 1
+
+
+def test_concurrent_requests_are_coalesced(provider):
+    provider.delay = 0.2
+    weather = WeatherClient(base_url=provider.url, timeout=2)
+
+    async def scenario():
+        return await asyncio.gather(*(weather.get(55.6761, 12.5683) for _ in range(10)))
+
+    results = asyncio.run(_with_client(weather, scenario))
+
+    assert provider.calls == 1
+    assert all(r["call"] == 1 for r in results)
+    assert weather.snapshot()["coalesced"] == 9
+
+
+def test_stale_entry_served_when_provider_is_slow(provider):
+    weather = WeatherClient(base_url=provider.url, ttl=0, stale_after=0.05, timeout=2)
+
+    async def scenario():
+        first = await weather.get(55.6761, 12.5683)
+        provider.delay = 0.3
+
+        start = time.perf_counter()
+        stale = await weather.get(55.6761, 12.5683)
+        waited = time.perf_counter() - start
+
+        # the refresh keeps going in the background and lands in the cache
+        await asyncio.sleep(0.5)
+        weather.ttl = 60
+        fresh = await weather.get(55.6761, 12.5683)
+        return first, stale, waited, fresh
+
+    first, stale, waited, fresh = asyncio.run(_with_client(weather, scenario))
+
+    assert stale == first
+    assert waited < 0.25
+    assert fresh["call"] == 2
+    assert weather.snapshot()["stale_served"] == 1
+
+
+def test_provider_error_without_cache_returns_502(client, provider, stub_client):
+    provider.status = 500
+
+    r = client.get("/api/weather/geo?latitude=10&longitude=20")
+    assert r.status_code == 502, r.text
+    assert stub_client.snapshot()["upstream_errors"] == 1
+
+
+def test_provider_error_serves_stale_entry(provider):
+    weather = WeatherClient(base_url=provider.url, ttl=0, timeout=2)
+
+    async def scenario():
+        first = await weather.get(1.0, 2.0)
+        provider.status = 503
+        return first, await weather.get(1.0, 2.0)
+
+    first, second = asyncio.run(_with_client(weather, scenario))
+
+    assert second == first
+    assert weather.snapshot()["stale_served"] == 1
+
+    async def cold():
+        return await weather.get(3.0, 4.0)
+
+    with pytest.raises(WeatherUnavailable):
+        asyncio.run(_with_client(weather, cold))
@@ -3,22 +3,23 @@ import type { PaginatedResponse } from "../services/api-client";
 import type { Game } from "../entities/Game";
 import gameService from "../services/game/gameService";
 
+// what GameCard renders; the detail view fetches the rest
+const CARD_FIELDS = "id,name,thumbnail,year_published,description,bgg_rating,playing_time";
+
 export const useGames = (q?: string, sortBy?: string, sortOrder?: "asc" | "desc") =>
   useInfiniteQuery<PaginatedResponse<Game>, Error>({
     queryKey: ["games", q, sortBy, sortOrder],
-    queryFn: ({ pageParam = 0 }) =>
+    queryFn: ({ pageParam }) =>
       gameService.getAll({
         params: {
-          offset: pageParam,
+          cursor: pageParam,
           limit: 10,
           q,
           sort_by: sortBy,
           sort_order: sortOrder,
+          fields: CARD_FIELDS,
         },
       }),
-    getNextPageParam: (lastPage) => {
-      const nextOffset = lastPage.offset + lastPage.limit;
-      return nextOffset < lastPage.total ? nextOffset : undefined;
-    },
-    initialPageParam: 0,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    initialPageParam: undefined as string | undefined,
   });
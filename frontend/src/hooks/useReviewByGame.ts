@@ -6,10 +6,8 @@ import { getReviewsByGame } from "../services/review_Service";
 export const useReviewsByGame = (gameId: string) =>
 	useInfiniteQuery<PaginatedResponse<Review>, Error>({
 		queryKey: ["reviews/by-game", gameId],
-		queryFn: ({ pageParam = 0 }) => getReviewsByGame(gameId, pageParam as number, 5),
-		getNextPageParam: (lastPage) => {
-			const nextOffset = lastPage.offset + lastPage.limit;
-			return nextOffset < lastPage.total ? nextOffset : undefined;
-		},
-		initialPageParam: 0,
+		queryFn: ({ pageParam }) =>
+			getReviewsByGame(gameId, pageParam as string | undefined, 5),
+		getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+		initialPageParam: undefined as string | undefined,
 	});
\ No newline at end of file
@@ -6,6 +6,7 @@ export interface PaginatedResponse<T> {
 	offset: number;
 	limit: number;
 	items: T[];
+	next_cursor?: string | null;
 }
 
 const api = axios.create({
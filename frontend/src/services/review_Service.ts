@@ -11,10 +11,10 @@ class ReviewApiClient extends ApiClient<Review> {
 
 const reviewService = new ReviewApiClient("/reviews");
 
-export const getReviewsByGame = (gameId: string, offset = 0, limit = 10) => {
+export const getReviewsByGame = (gameId: string, cursor?: string, limit = 10) => {
 	return reviewService.getAll({
 		path: `/gameid/${gameId}`,
-		params: { offset, limit },
+		params: { cursor, limit },
 	});
 };
 